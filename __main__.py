@@ -1,14 +1,21 @@
 """Entry point: python -m memory_mcp."""
 
+import asyncio
+
 from memory_mcp.core.config import MCPConfig
-from memory_mcp.server import mcp
+from memory_mcp.server import mcp, run_worker
+from memory_mcp.supervisor import Supervisor
 
 
 def main():
     """CLI entry point for ``memory-mcp`` script."""
     config = MCPConfig()
-    if config.transport == "stdio":
+    if config.role == "worker":
+        asyncio.run(run_worker(config))
+    elif config.transport == "stdio":
         mcp.run(transport="stdio")
+    elif config.http_workers != 1:
+        Supervisor(config).run()
     else:
         mcp.run(transport="streamable-http", host="0.0.0.0", port=config.port)
 
@@ -13,6 +13,7 @@ RATE_LIMITS: str = "rate_limits"
 GOVERNANCE_PROFILES: str = "governance_profiles"
 PROMPTS: str = "prompts"
 DECISIONS: str = "decisions"
+JOB_RUNS: str = "job_runs"
 
 # ─── Standard (B-tree) Indexes ───────────────────────────────────
 #
@@ -35,15 +36,30 @@ STANDARD_INDEXES: list[dict] = [
     },
     {
         "collection": MEMORIES,
-        "keys": [("user_id", 1), ("conversation_id", 1)],
+        # created_at / _id: conversation_context pages in index order
+        "keys": [("user_id", 1), ("conversation_id", 1), ("created_at", -1), ("_id", -1)],
         "name": "ix_memories_conversation",
         "kwargs": {"partialFilterExpression": {"deleted_at": None}},
     },
+    {
+        # Memories linking to a deleted or merged memory (neighbor upkeep)
+        "collection": MEMORIES,
+        "keys": [("user_id", 1), ("neighbors._id", 1)],
+        "name": "ix_memories_neighbors",
+        "kwargs": {"partialFilterExpression": {"deleted_at": None}},
+    },
     {
         "collection": MEMORIES,
         "keys": [("enrichment_status", 1), ("created_at", 1)],
         "name": "ix_memories_enrichment_queue",
     },
+    {
+        # Local vector engine sync: documents changed since a watermark,
+        # soft-deleted ones included
+        "collection": MEMORIES,
+        "keys": [("updated_at", 1)],
+        "name": "ix_memories_updated",
+    },
     {
         "collection": MEMORIES,
         "keys": [("deleted_at", 1)],
@@ -111,6 +127,18 @@ STANDARD_INDEXES: list[dict] = [
         "name": "ix_decisions_user_key",
         "kwargs": {"unique": True},
     },
+    # -- job_runs --
+    {
+        "collection": JOB_RUNS,
+        "keys": [("job", 1), ("started_at", -1)],
+        "name": "ix_job_runs_job_started",
+    },
+    {
+        "collection": JOB_RUNS,
+        "keys": [("finished_at", 1)],
+        "name": "ix_job_runs_ttl",
+        "kwargs": {"expireAfterSeconds": 30 * 86400},  # 30 days
+    },
 ]
 
 # ─── Atlas Search / Vector Search Indexes ────────────────────────
@@ -121,6 +149,69 @@ STANDARD_INDEXES: list[dict] = [
 
 _DEFAULT_EMBEDDING_DIMENSION = 1536
 
+# $vectorSearch filters, per collection: the clauses every filter
+# carries, then the optional fields and the clauses a value becomes.
+# vector_filter() builds the services' filters from this table and the
+# vector index declares the same fields as filter paths, so a filter can
+# only use fields the ANN walk applies.  $vectorSearch has no $all, so a
+# tag list becomes one equality clause per tag under $and.
+_VECTOR_FILTERS: dict[str, tuple[dict, dict]] = {
+    MEMORIES: (
+        {"deleted_at": None},
+        {
+            "tier": lambda tiers: {"tier": {"$in": tiers}},
+            "memory_type": lambda value: {"memory_type": value},
+            "tags": lambda tags: {"$and": [{"tags": tag} for tag in tags]},
+            "conversation_id": lambda value: {"conversation_id": value},
+            "created_at": lambda window: {"created_at": window},
+        },
+    ),
+    SEMANTIC_CACHE: ({}, {}),
+}
+
+# Query operators $vectorSearch accepts in a filter.
+VECTOR_FILTER_OPERATORS = frozenset({
+    "$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin", "$not", "$nor", "$and", "$or",
+})
+
+VECTOR_FILTER_FIELDS: dict[str, tuple[str, ...]] = {
+    collection: ("user_id", *base, *optional)
+    for collection, (base, optional) in _VECTOR_FILTERS.items()
+}
+
+
+def vector_filter(collection: str, user_id: str, **clauses) -> dict:
+    """Return the ``$vectorSearch`` filter for ``user_id`` in ``collection``.
+
+    Empty ``clauses`` are left out.  A field the vector index does not
+    declare raises ``KeyError``.
+    """
+    base, optional = _VECTOR_FILTERS[collection]
+    vs_filter = {"user_id": user_id, **base}
+    for field, value in clauses.items():
+        if field not in optional:
+            raise KeyError(f"{field!r} is not a filter field of the {collection} vector index")
+        if not value:
+            continue
+        for key, clause in optional[field](value).items():
+            if key == "$and":
+                vs_filter.setdefault("$and", []).extend(clause)
+            else:
+                vs_filter[key] = clause
+    return vs_filter
+
+
+def _vector_index_fields(collection: str, embedding_dimension: int) -> list[dict]:
+    return [
+        {
+            "type": "vector",
+            "path": "embedding",
+            "numDimensions": embedding_dimension,
+            "similarity": "cosine",
+        },
+        *({"type": "filter", "path": path} for path in VECTOR_FILTER_FIELDS[collection]),
+    ]
+
 
 def get_search_indexes(embedding_dimension: int = _DEFAULT_EMBEDDING_DIMENSION) -> list[dict]:
     """Return Atlas Search / Vector Search index definitions.
@@ -134,19 +225,7 @@ def get_search_indexes(embedding_dimension: int = _DEFAULT_EMBEDDING_DIMENSION)
             "collection": MEMORIES,
             "name": "memories_vector_index",
             "type": "vectorSearch",
-            "definition": {
-                "fields": [
-                    {
-                        "type": "vector",
-                        "path": "embedding",
-                        "numDimensions": embedding_dimension,
-                        "similarity": "cosine",
-                    },
-                    {"type": "filter", "path": "user_id"},
-                    {"type": "filter", "path": "tier"},
-                    {"type": "filter", "path": "deleted_at"},
-                ]
-            },
+            "definition": {"fields": _vector_index_fields(MEMORIES, embedding_dimension)},
         },
         # Full-text search on memories
         {
@@ -171,17 +250,7 @@ def get_search_indexes(embedding_dimension: int = _DEFAULT_EMBEDDING_DIMENSION)
             "collection": SEMANTIC_CACHE,
             "name": "cache_vector_index",
             "type": "vectorSearch",
-            "definition": {
-                "fields": [
-                    {
-                        "type": "vector",
-                        "path": "embedding",
-                        "numDimensions": embedding_dimension,
-                        "similarity": "cosine",
-                    },
-                    {"type": "filter", "path": "user_id"},
-                ]
-            },
+            "definition": {"fields": _vector_index_fields(SEMANTIC_CACHE, embedding_dimension)},
         },
     ]
 
@@ -60,19 +60,77 @@ class MCPConfig(BaseSettings):
     ranking_alpha: float = 0.2
     ranking_beta: float = 0.3
     ranking_gamma: float = 0.5
+    # Compute dedup + calibrated ranking in the aggregation pipeline
+    server_side_ranking: bool = False
 
     # RRF Parameters
     rrf_k: int = 60
     rrf_vector_weight: float = 1.0
     rrf_text_weight: float = 0.7
+    # Rows each hybrid_search leg returns, as a multiple of offset + limit
+    hybrid_leg_depth_factor: float = 2.0
+    # Extra numCandidates for the vector leg when memory_type / tags filter it
+    hybrid_filtered_candidate_factor: float = 2.0
+    # hybrid_search fusion: auto (probe for $rankFusion) | server | client
+    hybrid_fusion: str = "auto"
 
     # Query Limits
     max_results_per_query: int = 100
     max_response_bytes: int = 16_777_216
+    # recall_memory_batch: queries per call, concurrent vector searches
+    recall_batch_max_queries: int = 20
+    recall_batch_concurrency: int = 4
+    # Deepest result reachable by following recall/hybrid_search cursors
+    pagination_max_depth: int = 1000
+    # Query embeddings kept for continuation pages (0 disables)
+    query_embedding_cache_size: int = 256
+    # Candidates the diversity (MMR) rerank picks from, as a multiple of
+    # the rows requested
+    diversity_candidate_factor: float = 4.0
+    # Seconds recall_memory / hybrid_search wait for a query embedding
+    # before serving full-text results marked degraded (0 waits indefinitely)
+    embedding_deadline_seconds: float = 0
+
+    # numCandidates tuning (measures ANN recall@k against exact search)
+    candidate_tuning_enabled: bool = False
+    candidate_tuning_interval_seconds: int = 3600
+    candidate_tuning_sample_size: int = 20
+    candidate_tuning_multipliers: list[float] = [2, 5, 10, 20, 50]
+    candidate_recall_target: float = 0.95
+    # Query planner: exact in-process scoring for users with at most this
+    # many live memories (0 always uses $vectorSearch)
+    exact_search_max_memories: int = 0
+    planner_count_ttl_seconds: int = 300
+    # Exact-plan users' embeddings kept in process between recalls (0 disables)
+    working_set_max_mb: int = 0
+    working_set_ttl_seconds: int = 300
+    # Read-your-writes: memories inserted by this process are merged into
+    # $vectorSearch results until the index returns them (0 disables)
+    fresh_overlay_ttl_seconds: int = 30
+    fresh_overlay_max_per_user: int = 100
+    # hybrid_search only merges fresh memories at least this similar
+    fresh_overlay_min_score: float = 0.8
+    # Vector search engine: auto (local when $vectorSearch is unavailable)
+    # | atlas | local
+    vector_engine: str = "auto"
+    # Local engine snapshots (memory-mapped on load); empty keeps them in memory
+    local_vector_dir: str = ""
+    local_vector_sync_seconds: int = 30
+    local_vector_ivf_min_rows: int = 4096
+    local_vector_nprobe: int = 8
 
     # Cache
     cache_ttl_seconds: int = 3600
     cache_similarity_threshold: float = 0.95
+    # In-process recall_memory / hybrid_search result cache
+    recall_cache_enabled: bool = True
+    recall_cache_max_entries: int = 1024
+    recall_cache_ttl_seconds: int = 30
+    # Speculative recall of each stored human message into the recall
+    # cache, for the follow-up recall_memory (needs the recall cache)
+    prefetch_enabled: bool = False
+    # Prefetches running at once; new ones are dropped past this
+    prefetch_max_inflight: int = 16
 
     # Consolidation (Phase 1)
     consolidation_interval_hours: int = 24
@@ -88,6 +146,30 @@ class MCPConfig(BaseSettings):
     enrichment_concurrency: int = 5
     enrichment_max_retries: int = 3
 
+    # Scheduler
+    enrichment_schedule: str | None = None
+    consolidation_schedule: str | None = None
+    enrichment_max_runtime_seconds: int = 300
+    consolidation_max_runtime_seconds: int = 3600
+    audit_flush_max_runtime_seconds: int = 30
+    scheduler_jitter_ratio: float = 0.1
+    scheduler_max_jitter_seconds: int = 300
+
+    # Deployment role: all | api (tools only) | worker (background jobs only)
+    role: str = "all"
+    # streamable-http server processes sharing one socket (0 = one per CPU)
+    http_workers: int = 1
+
+    # Worker isolation: none (request loop) | thread | process
+    worker_isolation: str = "none"
+    worker_control_timeout_seconds: int = 10
+    worker_shutdown_timeout_seconds: int = 30
+
+    # Access counters (write-behind)
+    access_write_behind_enabled: bool = True
+    access_flush_interval_seconds: int = 5
+    access_flush_max_pending: int = 10_000
+
     # Audit
     audit_buffer_size: int = 10
     audit_flush_interval_seconds: int = 60
@@ -0,0 +1,62 @@
+"""Opaque continuation tokens for paged search results.
+
+A cursor is the URL-safe base64 of a compact JSON object holding
+everything needed to fetch the next page without the client repeating
+itself: the search kind, the owning user, the query text (the key under
+which the query embedding is cached), the filters, the page size and the
+position reached so far.  Clients must treat it as opaque.
+
+Cursors are not signed, so ``check_page`` re-applies the server's page
+caps to a decoded cursor before it sizes a search.
+"""
+
+import base64
+import binascii
+import json
+
+CURSOR_VERSION = 1
+
+
+def encode_cursor(state: dict) -> str:
+    payload = json.dumps({"v": CURSOR_VERSION, **state}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, kind: str, user_id: str) -> dict:
+    """Decode ``token`` and check it was issued for this ``kind`` and user.
+
+    Raises ``ValueError`` for malformed, outdated or foreign cursors.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(state, dict) or state.get("v") != CURSOR_VERSION:
+        raise ValueError("Invalid cursor")
+    if state.get("kind") != kind or state.get("user_id") != user_id:
+        raise ValueError(f"Cursor was not issued for this {kind} request")
+    return state
+
+
+def check_page(state: dict, max_limit: int, max_depth: int) -> dict:
+    """Hold a decoded cursor's page to ``max_limit`` rows and ``max_depth`` served.
+
+    ``limit`` is clamped to ``max_limit``; a ``served`` count no issued
+    cursor reaches or a ``diversity`` outside [0, 1] raises ``ValueError``.
+    """
+    limit, served = state.get("limit"), state.get("served")
+    diversity = state.get("diversity", 0)
+    if (
+        not _is_int(limit) or limit < 1
+        or not _is_int(served) or not 0 <= served < max_depth
+        or not isinstance(diversity, (int, float)) or isinstance(diversity, bool)
+        or not 0 <= diversity <= 1
+    ):
+        raise ValueError("Invalid cursor")
+    state["limit"] = min(limit, max_limit)
+    return state
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
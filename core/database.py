@@ -36,26 +36,35 @@ class DatabaseManager:
             if cls._instance is not None:
                 return cls._instance
 
-            instance = cls()
-            instance._client = AsyncMongoClient(
-                config.mongodb_connection_string,
-                maxPoolSize=config.mongodb_max_pool_size,
-                minPoolSize=config.mongodb_min_pool_size,
-                serverSelectionTimeoutMS=5000,
-            )
-            instance._db = instance._client[config.mongodb_database_name]
-
-            # Connectivity probe
-            try:
-                await instance._client.admin.command("ping")
-            except Exception:
-                instance._client = None
-                instance._db = None
-                raise
-
+            instance = await cls.connect(config)
             cls._instance = instance
             return instance
 
+    @classmethod
+    async def connect(cls, config: MCPConfig) -> "DatabaseManager":
+        """Create a connected, *uncached* manager.
+
+        Used by isolated background workers, which need a client bound to
+        their own event loop rather than the request loop's singleton.
+        """
+        instance = cls()
+        instance._client = AsyncMongoClient(
+            config.mongodb_connection_string,
+            maxPoolSize=config.mongodb_max_pool_size,
+            minPoolSize=config.mongodb_min_pool_size,
+            serverSelectionTimeoutMS=5000,
+        )
+        instance._db = instance._client[config.mongodb_database_name]
+
+        # Connectivity probe
+        try:
+            await instance._client.admin.command("ping")
+        except Exception:
+            instance._client = None
+            instance._db = None
+            raise
+        return instance
+
     @classmethod
     async def get_instance(cls) -> "DatabaseManager":
         """Return the cached singleton.  Raises if initialize() not called."""
@@ -77,4 +86,5 @@ class DatabaseManager:
             await self._client.close()
         self._client = None
         self._db = None
-        type(self)._instance = None
+        if type(self)._instance is self:
+            type(self)._instance = None
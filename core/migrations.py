@@ -16,12 +16,13 @@ import logging
 from pymongo.errors import OperationFailure
 from pymongo.operations import SearchIndexModel
 
-from memory_mcp.core.collections import STANDARD_INDEXES, SEARCH_INDEXES, get_search_indexes
+from memory_mcp.core.collections import MEMORIES, STANDARD_INDEXES, SEARCH_INDEXES, get_search_indexes
 
 logger = logging.getLogger(__name__)
 
 _SEARCH_INDEX_POLL_INTERVAL = 5   # seconds between readiness checks
 _SEARCH_INDEX_POLL_TIMEOUT = 120  # max seconds to wait per index
+_UNRECOGNIZED_STAGE = 40324      # OperationFailure code for an unknown pipeline stage
 
 
 # ─── Stage 1: Standard Indexes ──────────────────────────────────
@@ -90,7 +91,9 @@ async def ensure_search_indexes(db, embedding_dimension: int = 1536) -> None:
     Gracefully detects non-Atlas deployments and skips.
 
     If the existing vector index has a different ``numDimensions`` than
-    ``embedding_dimension``, the index is dropped and recreated.
+    ``embedding_dimension``, the index is dropped and recreated.  If it
+    lacks filter fields the services now use, it is updated in place
+    (Atlas keeps serving the old definition while it rebuilds).
     """
     search_indexes = get_search_indexes(embedding_dimension)
 
@@ -109,6 +112,7 @@ async def ensure_search_indexes(db, embedding_dimension: int = 1536) -> None:
                 # Check for dimension mismatch on vector indexes
                 if index_type == "vectorSearch":
                     existing_dims = _get_existing_dims(existing[0])
+                    missing = _missing_filter_paths(existing[0], definition)
                     if existing_dims and existing_dims != embedding_dimension:
                         logger.info(
                             "Search index '%s' on '%s' has %d dimensions "
@@ -124,6 +128,15 @@ async def ensure_search_indexes(db, embedding_dimension: int = 1536) -> None:
                             collection, index_name, _SEARCH_INDEX_POLL_TIMEOUT
                         )
                         # Fall through to creation below
+                    elif missing:
+                        logger.info(
+                            "Search index '%s' on '%s' lacks filter fields %s — updating.",
+                            index_name,
+                            collection_name,
+                            ", ".join(missing),
+                        )
+                        await collection.update_search_index(index_name, definition)
+                        continue
                     else:
                         logger.debug(
                             "Search index '%s' on '%s' already exists — skipping.",
@@ -190,6 +203,29 @@ async def ensure_search_indexes(db, embedding_dimension: int = 1536) -> None:
     logger.info("Atlas Search index setup complete.")
 
 
+async def rank_fusion_available(db) -> bool:
+    """Whether the server knows the ``$rankFusion`` stage (MongoDB 8.1+)."""
+    try:
+        cursor = await db[MEMORIES].aggregate([
+            {"$rankFusion": {"input": {"pipelines": {"probe": [{"$sort": {"_id": 1}}]}}}},
+            {"$limit": 1},
+        ])
+        await cursor.to_list(None)
+    except OperationFailure as exc:
+        # Any other error means the stage parsed, so it exists.
+        return exc.code != _UNRECOGNIZED_STAGE
+    return True
+
+
+async def vector_search_available(db) -> bool:
+    """Whether this deployment supports Atlas Search (and ``$vectorSearch``)."""
+    try:
+        await _list_search_indexes(db[MEMORIES], "memories_vector_index")
+    except OperationFailure:
+        return False
+    return True
+
+
 # ─── Helpers ─────────────────────────────────────────────────────
 
 
@@ -210,6 +246,21 @@ def _get_existing_dims(index_info: dict) -> int | None:
     return None
 
 
+def _missing_filter_paths(index_info: dict, definition: dict) -> list[str]:
+    """Filter paths of ``definition`` that the existing vector index lacks.
+
+    Empty when the listing carries no definition to compare against.
+    """
+    defn = index_info.get("latestDefinition") or index_info.get("definition", {})
+    if not defn.get("fields"):
+        return []
+    existing = {f.get("path") for f in defn.get("fields", []) if f.get("type") == "filter"}
+    return [
+        f["path"] for f in definition["fields"]
+        if f["type"] == "filter" and f["path"] not in existing
+    ]
+
+
 async def _wait_for_search_index_dropped(
     collection, index_name: str, timeout: int
 ) -> None:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING, ClassVar
 
 if TYPE_CHECKING:
@@ -29,6 +30,17 @@ class ServiceRegistry:
         self.rate_limiter = None
         self.prompt_library = None
         self.decision_service = None
+        self.scheduler = None
+        self.recall_cache = None
+        self.query_embeddings = None
+        self.candidate_tuner = None
+        self.planner = None
+        self.working_set = None
+        self.fresh_overlay = None
+        self.vector_engine = None
+        self.prefetcher = None
+        # hybrid_search fuses its two legs in Python ($rankFusion unavailable)
+        self.client_fusion = False
 
     @classmethod
     def initialize(
@@ -59,8 +71,14 @@ class ServiceRegistry:
         "recall_memory", "hybrid_search", "search_web", "check_cache",
     })
 
-    async def check_access(self, user_id: str, operation: str, role: str | None = None) -> str | None:
-        """Check governance and rate limits. Returns error string or None if OK."""
+    async def check_access(
+        self, user_id: str, operation: str, role: str | None = None, cost: int = 1,
+    ) -> str | None:
+        """Check governance and rate limits. Returns error string or None if OK.
+
+        ``cost`` is the number of operations the request does (the queries
+        of a batch); each is charged against the rate limit.
+        """
         effective_role = role or (self.config.auth_default_role if self.config else "end_user")
 
         profile = None
@@ -77,11 +95,38 @@ class ServiceRegistry:
                 else:
                     max_requests = profile.get("max_memories_per_day")
                 within_limit = await self.rate_limiter.check_rate_limit(
-                    user_id, operation, max_requests=max_requests,
+                    user_id, operation, max_requests=max_requests, cost=cost,
                 )
             else:
-                within_limit = await self.rate_limiter.check_rate_limit(user_id, operation)
+                within_limit = await self.rate_limiter.check_rate_limit(
+                    user_id, operation, cost=cost,
+                )
             if not within_limit:
                 return f"Rate limit exceeded for '{operation}'"
 
         return None
+
+    async def check_access_and_embed(
+        self, user_id: str, operation: str, query: str | None, role: str | None = None,
+    ) -> str | None:
+        """``check_access`` with the embedding of ``query`` started alongside it.
+
+        For tools that embed ``query`` once allowed: the embedding goes
+        through the query embedding cache, so the tool's own call joins
+        the one started here and the access-check and provider latencies
+        overlap instead of adding up.  The embedding is cancelled when
+        access is denied.  Pass ``query=None`` when the tool will not
+        embed it (continuation pages, lookups).
+        """
+        if query is None or self.query_embeddings is None:
+            return await self.check_access(user_id, operation, role)
+        self.query_embeddings.start(query)
+        try:
+            await asyncio.sleep(0)  # let the provider request go out first
+            access_err = await self.check_access(user_id, operation, role)
+        except BaseException:
+            self.query_embeddings.abandon(query)
+            raise
+        if access_err:
+            self.query_embeddings.abandon(query)
+        return access_err
@@ -1,5 +1,6 @@
 """Abstract base classes for embedding and LLM providers."""
 
+import asyncio
 from abc import ABC, abstractmethod
 
 
@@ -12,6 +13,11 @@ class EmbeddingProvider(ABC):
     async def generate_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
         ...
 
+    async def generate_query_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed several search queries.  Providers that distinguish query
+        and document embeddings override this with a single batched call."""
+        return list(await asyncio.gather(*(self.generate_embedding(t) for t in texts)))
+
 
 class LLMProvider(ABC):
     @abstractmethod
@@ -42,6 +42,14 @@ class VoyageEmbeddingProvider(EmbeddingProvider):
             all_embeddings.extend(batch_embeddings)
         return all_embeddings
 
+    async def generate_query_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        """Batch counterpart of ``generate_embedding`` (input_type='query')."""
+        all_embeddings: list[list[float]] = []
+        for start in range(0, len(texts), _VOYAGE_BATCH_LIMIT):
+            batch = texts[start : start + _VOYAGE_BATCH_LIMIT]
+            all_embeddings.extend(await self._embed_batch(batch, input_type="query"))
+        return all_embeddings
+
     async def _embed_batch(
         self, inputs: list[str], input_type: str = "document"
     ) -> list[list[float]]:
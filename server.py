@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import signal
 from contextlib import asynccontextmanager
 
 from fastmcp import FastMCP
@@ -10,20 +11,31 @@ from memory_mcp.auth.api_keys import APIKeyManager
 from memory_mcp.auth.token_verifier import MemoryMCPTokenVerifier
 from memory_mcp.core.config import MCPConfig
 from memory_mcp.core.database import DatabaseManager
-from memory_mcp.core.migrations import ensure_indexes, ensure_search_indexes
+from memory_mcp.core.migrations import ensure_indexes, ensure_search_indexes, rank_fusion_available
 from memory_mcp.core.registry import ServiceRegistry
 from memory_mcp.providers.manager import ProviderManager
+from memory_mcp.services.access_tracker import AccessTracker
 from memory_mcp.services.audit import AuditService
 from memory_mcp.services.audit_flush_worker import AuditFlushWorker
 from memory_mcp.services.auto_capture import AutoCaptureMiddleware, wrap_tools
 from memory_mcp.services.cache import CacheService
+from memory_mcp.services.candidate_tuner import CandidateTuner
 from memory_mcp.services.consolidation import ConsolidationWorker
 from memory_mcp.services.decision import DecisionService
 from memory_mcp.services.enrichment import EnrichmentWorker
+from memory_mcp.services.fresh_overlay import FreshOverlay
 from memory_mcp.services.governance import GovernanceService
+from memory_mcp.services.local_vector import open_vector_engine
 from memory_mcp.services.memory import MemoryService
+from memory_mcp.services.prefetch import RecallPrefetcher
 from memory_mcp.services.prompt_library import PromptLibrary
+from memory_mcp.services.query_embeddings import QueryEmbeddingCache
+from memory_mcp.services.query_planner import QueryPlanner
 from memory_mcp.services.rate_limiter import RateLimiter
+from memory_mcp.services.recall_cache import RecallCache
+from memory_mcp.services.scheduler import JobScheduler, SchedulerGroup
+from memory_mcp.services.worker_host import WorkerRuntime, create_worker_host, register_worker_jobs
+from memory_mcp.services.working_set import WorkingSetCache
 from memory_mcp.tools.admin_tools import register_admin_tools
 from memory_mcp.tools.cache_tools import register_cache_tools
 from memory_mcp.tools.decision_tools import register_decision_tools
@@ -32,6 +44,31 @@ from memory_mcp.tools.search_tools import register_search_tools
 
 logger = logging.getLogger(__name__)
 
+ROLES = ("all", "api", "worker")
+HYBRID_FUSIONS = ("auto", "server", "client")
+
+
+def _check_role(config: MCPConfig) -> None:
+    if config.role not in ROLES:
+        raise ValueError(f"Unknown role: {config.role} (expected one of {', '.join(ROLES)})")
+
+
+async def _use_client_fusion(db, config: MCPConfig, vector_engine) -> bool:
+    """Whether hybrid_search must fuse its two legs in Python instead of ``$rankFusion``."""
+    if config.hybrid_fusion not in HYBRID_FUSIONS:
+        raise ValueError(
+            f"Unknown hybrid fusion: {config.hybrid_fusion} "
+            f"(expected one of {', '.join(HYBRID_FUSIONS)})"
+        )
+    if vector_engine is not None or config.hybrid_fusion == "server":
+        return False
+    if config.hybrid_fusion == "client":
+        return True
+    if await rank_fusion_available(db):
+        return False
+    logger.info("$rankFusion unavailable — hybrid_search will fuse results client-side.")
+    return True
+
 
 def _build_auth(config: MCPConfig) -> MemoryMCPTokenVerifier | None:
     """Return a token verifier when auth is enabled, else None."""
@@ -52,19 +89,66 @@ async def lifespan(app: FastMCP):
     """Initialize all services at startup, tear down on shutdown."""
     # Startup
     config = MCPConfig()
+    _check_role(config)
     db_manager = await DatabaseManager.initialize(config)
 
+    # API replicas leave schema, seed data and background workers to the
+    # worker fleet (ROLE=worker / all) so they boot fast and stay stateless.
+    owns_schema = config.role != "api"
+
     # Stage 1: Standard indexes (fast, blocking)
-    await ensure_indexes(db_manager.db)
-    logger.info("Standard indexes ensured.")
+    if owns_schema:
+        await ensure_indexes(db_manager.db)
+        logger.info("Standard indexes ensured.")
+    else:
+        logger.info("ROLE=api — skipping index migrations, seeding and background workers.")
 
     providers = ProviderManager(config)
+    # In-process vector search when $vectorSearch is unavailable (plain mongod).
+    vector_engine = await open_vector_engine(db_manager.db, config)
+    client_fusion = await _use_client_fusion(db_manager.db, config, vector_engine)
+
+    access_tracker = None
+    if config.access_write_behind_enabled:
+        access_tracker = AccessTracker(db_manager.db["memories"], config)
+
+    recall_cache = RecallCache(config) if config.recall_cache_enabled else None
+    query_embeddings = None
+    if config.query_embedding_cache_size > 0:
+        query_embeddings = QueryEmbeddingCache(providers.embedding, config)
+    candidate_tuner = None
+    if config.candidate_tuning_enabled and vector_engine is None:
+        candidate_tuner = CandidateTuner(
+            db_manager.db["memories"], db_manager.db["semantic_cache"], config,
+        )
+    planner = None
+    if config.exact_search_max_memories > 0:
+        planner = QueryPlanner(db_manager.db["memories"], config)
+    working_set = None
+    if planner is not None and config.working_set_max_mb > 0:
+        working_set = WorkingSetCache(config)
+    fresh_overlay = FreshOverlay(config) if config.fresh_overlay_ttl_seconds > 0 else None
+    prefetcher = None
+    if config.prefetch_enabled and recall_cache is not None:
+        prefetcher = RecallPrefetcher(config)
 
     memory_service = MemoryService(
         db_manager.db["memories"], config, providers,
+        access_tracker=access_tracker,
+        recall_cache=recall_cache,
+        query_embeddings=query_embeddings,
+        candidate_tuner=candidate_tuner,
+        planner=planner,
+        working_set=working_set,
+        fresh_overlay=fresh_overlay,
+        vector_engine=vector_engine,
+        prefetcher=prefetcher,
     )
     cache_service = CacheService(
         db_manager.db["semantic_cache"], config, providers.embedding,
+        candidate_tuner=candidate_tuner,
+        vector_engine=vector_engine,
+        query_embeddings=query_embeddings,
     )
     audit_service = AuditService(
         db_manager.db["audit_log"], config,
@@ -77,6 +161,15 @@ async def lifespan(app: FastMCP):
         audit_service=audit_service,
         providers=providers,
     )
+    registry.recall_cache = recall_cache
+    registry.query_embeddings = query_embeddings
+    registry.candidate_tuner = candidate_tuner
+    registry.planner = planner
+    registry.working_set = working_set
+    registry.fresh_overlay = fresh_overlay
+    registry.vector_engine = vector_engine
+    registry.prefetcher = prefetcher
+    registry.client_fusion = client_fusion
 
     # Conditionally create Phase 2 services
     if config.governance_enabled:
@@ -99,9 +192,113 @@ async def lifespan(app: FastMCP):
     registry.decision_service = decision_service
 
     # Stage 1b: Seed essential data (best-effort, non-fatal)
-    if config.governance_enabled and registry.governance_service is not None:
+    if owns_schema:
+        await _seed_essential_data(
+            prompt_library, decision_service,
+            registry.governance_service if config.governance_enabled else None,
+        )
+
+    # Background jobs: audit and access-counter flushes, candidate tuning and
+    # local vector sync always run here (they serve this process); enrichment
+    # and consolidation run here too unless WORKER_ISOLATION moves them to a
+    # dedicated thread or process.
+    scheduler = JobScheduler(db_manager.db["job_runs"], config)
+    scheduler.add_job(
+        "audit_flush", AuditFlushWorker(audit_service, config).run_once,
+        config.audit_flush_interval_seconds,
+        jitter_seconds=0,
+        max_runtime_seconds=config.audit_flush_max_runtime_seconds,
+    )
+    if access_tracker is not None:
+        scheduler.add_job(
+            "access_flush", access_tracker.run_once,
+            config.access_flush_interval_seconds,
+            jitter_seconds=0,
+        )
+    if candidate_tuner is not None:
+        # Tuned multipliers are per process, like the searches they size.
+        scheduler.add_job(
+            "candidate_tuning", candidate_tuner.run_once,
+            config.candidate_tuning_interval_seconds,
+        )
+    if vector_engine is not None:
+        scheduler.add_job(
+            "vector_sync", vector_engine.run_once,
+            config.local_vector_sync_seconds,
+            jitter_seconds=0,
+        )
+    worker_host = None
+    if config.role == "api":
+        registry.scheduler = scheduler
+    elif config.worker_isolation == "none":
+        register_worker_jobs(
+            scheduler, config,
+            EnrichmentWorker(
+                db_manager.db["memories"], config, providers, memory_service,
+                prompt_library=registry.prompt_library,
+            ),
+            ConsolidationWorker(
+                db_manager.db["memories"], config, providers,
+                access_tracker=access_tracker,
+                recall_cache=recall_cache,
+            ),
+        )
+        registry.scheduler = scheduler
+    else:
+        worker_host = create_worker_host(config, recall_cache)
+        worker_host.start()
+        registry.scheduler = SchedulerGroup(scheduler, worker_host)
+    scheduler.start()
+
+    # Stage 2: Atlas Search indexes (background, non-blocking)
+    search_index_task = None
+    if owns_schema:
+        search_index_task = asyncio.create_task(
+            _ensure_search_indexes_bg(db_manager.db, config.embedding_dimension)
+        )
+
+    # Auto-capture: wrap registered tools with memory capture
+    if config.auto_capture_enabled:
+        auto_capture = AutoCaptureMiddleware(memory_service, config)
+        wrap_tools(mcp, auto_capture)
+        logger.info("Auto-capture enabled for %d tool(s).", len(config.auto_capture_tools))
+
+    logger.info("Memory-MCP v%s started", config.app_version)
+
+    yield
+
+    # Shutdown
+    await scheduler.stop()
+    if worker_host is not None:
+        await worker_host.stop()
+    if access_tracker is not None:
+        try:
+            await access_tracker.flush()
+        except Exception:
+            logger.warning("Final access counter flush failed.", exc_info=True)
+    if search_index_task is not None and not search_index_task.done():
+        search_index_task.cancel()
+    if prefetcher is not None:
+        prefetcher.cancel_all()
+    await audit_service.flush()
+    if vector_engine is not None:
         try:
-            count = await registry.governance_service.seed_defaults()
+            vector_engine.save()
+        except Exception:
+            logger.warning("Saving the local vector snapshot failed.", exc_info=True)
+    await db_manager.close()
+    logger.info("Memory-MCP shut down")
+
+
+async def _seed_essential_data(prompt_library, decision_service, governance_service=None) -> None:
+    """Seed governance profiles, prompt templates and system decisions.
+
+    Each seed is idempotent and best-effort — failures are logged and
+    startup continues.
+    """
+    if governance_service is not None:
+        try:
+            count = await governance_service.seed_defaults()
             logger.info("Governance profiles seeded: %d new.", count)
         except Exception:
             logger.warning("Governance seed failed (non-fatal).", exc_info=True)
@@ -118,47 +315,57 @@ async def lifespan(app: FastMCP):
     except Exception:
         logger.warning("Decision seed failed (non-fatal).", exc_info=True)
 
-    # Start enrichment background task
-    enrichment_worker = EnrichmentWorker(
-        db_manager.db["memories"], config, providers, memory_service,
-        prompt_library=registry.prompt_library,
-    )
-    enrichment_task = asyncio.create_task(enrichment_worker.run())
 
-    # Start consolidation background task
-    consolidation_worker = ConsolidationWorker(
-        db_manager.db["memories"], config, providers,
-    )
-    consolidation_task = asyncio.create_task(consolidation_worker.run())
+async def run_worker(config: MCPConfig, stop_event: asyncio.Event | None = None) -> None:
+    """Run a headless ``ROLE=worker`` process until SIGINT/SIGTERM.
 
-    # Start audit flush background task
-    audit_flush_worker = AuditFlushWorker(audit_service, config)
-    audit_flush_task = asyncio.create_task(audit_flush_worker.run())
+    Owns what API replicas skip: index migrations, seed data, Atlas Search
+    index creation, and the enrichment/consolidation jobs.  No MCP endpoint
+    is served.  The process is already dedicated to background work, so
+    ``WORKER_ISOLATION`` does not apply.
+    """
+    _check_role(config)
+    db_manager = await DatabaseManager.initialize(config)
+    db = db_manager.db
 
-    # Stage 2: Atlas Search indexes (background, non-blocking)
-    search_index_task = asyncio.create_task(
-        _ensure_search_indexes_bg(db_manager.db, config.embedding_dimension)
-    )
+    await ensure_indexes(db)
+    logger.info("Standard indexes ensured.")
 
-    # Auto-capture: wrap registered tools with memory capture
-    if config.auto_capture_enabled:
-        auto_capture = AutoCaptureMiddleware(memory_service, config)
-        wrap_tools(mcp, auto_capture)
-        logger.info("Auto-capture enabled for %d tool(s).", len(config.auto_capture_tools))
+    governance_service = None
+    if config.governance_enabled:
+        governance_service = GovernanceService(db["governance_profiles"], config)
+    await _seed_essential_data(
+        PromptLibrary(db["prompts"], config),
+        DecisionService(db["decisions"], config),
+        governance_service,
+    )
 
-    logger.info("Memory-MCP v%s started", config.app_version)
+    runtime = WorkerRuntime.build(
+        db_manager, config,
+        vector_engine=await open_vector_engine(db, config, persist=False, lazy=True),
+    )
+    runtime.scheduler.start()
+    search_index_task = asyncio.create_task(
+        _ensure_search_indexes_bg(db, config.embedding_dimension)
+    )
 
-    yield
+    if stop_event is None:
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # e.g. non-main thread or Windows
 
-    # Shutdown
-    enrichment_task.cancel()
-    consolidation_task.cancel()
-    audit_flush_task.cancel()
-    if not search_index_task.done():
-        search_index_task.cancel()
-    await audit_service.flush()
-    await db_manager.close()
-    logger.info("Memory-MCP shut down")
+    logger.info("Memory-MCP v%s worker started", config.app_version)
+    try:
+        await stop_event.wait()
+    finally:
+        if not search_index_task.done():
+            search_index_task.cancel()
+        await runtime.close()
+        logger.info("Memory-MCP worker shut down")
 
 
 async def _ensure_search_indexes_bg(db, embedding_dimension: int = 1536) -> None:
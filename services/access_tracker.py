@@ -0,0 +1,88 @@
+"""Write-behind buffer for recall access counters.
+
+``recall`` used to await an ``update_many`` on every call to bump
+``access_count`` / ``last_accessed``, adding a write round trip to read
+latency and contending on hot documents.  ``AccessTracker`` instead
+coalesces increments per memory ``_id`` in process and writes them as one
+unordered ``bulk_write`` of ``$inc`` / ``$max`` updates — periodically as
+the ``access_flush`` job, when the buffer grows past
+``ACCESS_FLUSH_MAX_PENDING``, and on shutdown.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from memory_mcp.core.config import MCPConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AccessTracker:
+    """Coalesces per-memory access increments and flushes them in bulk."""
+
+    def __init__(self, memories_collection, config: MCPConfig) -> None:
+        self.memories = memories_collection
+        self.config = config
+        # _id -> [increment, latest access time]
+        self._pending: dict = {}
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record(self, memory_ids: list, at: datetime | None = None) -> None:
+        """Count one access for each id.  Never blocks on I/O."""
+        at = at or datetime.now(timezone.utc)
+        for memory_id in memory_ids:
+            entry = self._pending.get(memory_id)
+            if entry is None:
+                self._pending[memory_id] = [1, at]
+            else:
+                entry[0] += 1
+                if at > entry[1]:
+                    entry[1] = at
+        if len(self._pending) >= self.config.access_flush_max_pending and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> int:
+        """Write all pending increments.  Returns the number of memories updated.
+
+        On failure the increments are merged back into the buffer so the
+        next flush retries them.
+        """
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        ops = [
+            UpdateOne(
+                {"_id": memory_id},
+                {"$inc": {"access_count": count}, "$max": {"last_accessed": at}},
+            )
+            for memory_id, (count, at) in batch.items()
+        ]
+        try:
+            await self.memories.bulk_write(ops, ordered=False)
+        except Exception:
+            for memory_id, (count, at) in batch.items():
+                entry = self._pending.get(memory_id)
+                if entry is None:
+                    self._pending[memory_id] = [count, at]
+                else:
+                    entry[0] += count
+                    entry[1] = max(entry[1], at)
+            raise
+        return len(ops)
+
+    async def run_once(self) -> dict:
+        """Scheduler entry point for the ``access_flush`` job."""
+        try:
+            return {"items": await self.flush(), "errors": 0}
+        except Exception:
+            logger.warning("Access counter flush failed; will retry.", exc_info=True)
+            return {"items": 0, "errors": 1}
@@ -48,9 +48,10 @@ class AuditService:
         if should_flush:
             await self.flush()
 
-    async def flush(self) -> None:
+    async def flush(self) -> int:
+        """Write buffered entries to MongoDB.  Returns the number of entries flushed."""
         if not self._buffer:
-            return
+            return 0
         batch = self._buffer[:]
         self._buffer = []
         try:
@@ -59,6 +60,7 @@ class AuditService:
             logger.exception("Failed to flush audit entries to MongoDB")
             self._write_to_file(batch)
         self._last_flush = time.time()
+        return len(batch)
 
     def _write_to_file(self, entries: list[dict]) -> None:
         """Fallback: append entries to local audit file."""
@@ -1,10 +1,10 @@
-"""Periodic audit buffer flush background task.
+"""Periodic audit buffer flush background job.
 
 Ensures audit entries are flushed to MongoDB at regular intervals,
-preventing data loss on server crash.
+preventing data loss on server crash.  Scheduled by ``JobScheduler``
+as the ``audit_flush`` job.
 """
 
-import asyncio
 import logging
 
 from memory_mcp.core.config import MCPConfig
@@ -18,17 +18,12 @@ class AuditFlushWorker:
     def __init__(self, audit_service, config: MCPConfig) -> None:
         self.audit_service = audit_service
         self.config = config
-        self._running = True
-
-    async def run(self) -> None:
-        """Infinite loop flushing every audit_flush_interval_seconds."""
-        while self._running:
-            await asyncio.sleep(self.config.audit_flush_interval_seconds)
-            try:
-                await self.audit_service.flush()
-            except Exception:
-                logger.warning("Periodic audit flush failed.", exc_info=True)
-
-    def stop(self) -> None:
-        """Signal the worker to stop."""
-        self._running = False
+
+    async def run_once(self) -> dict:
+        """Flush the audit buffer once.  Failures are counted, never raised."""
+        try:
+            flushed = await self.audit_service.flush()
+        except Exception:
+            logger.warning("Periodic audit flush failed.", exc_info=True)
+            return {"items": 0, "errors": 1}
+        return {"items": flushed or 0, "errors": 0}
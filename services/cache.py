@@ -2,17 +2,27 @@
 
 from datetime import datetime, timezone
 
+from memory_mcp.core.collections import SEMANTIC_CACHE, vector_filter
 from memory_mcp.core.config import MCPConfig
 from memory_mcp.providers.base import EmbeddingProvider
+from memory_mcp.services.candidate_tuner import candidate_count
 
 
 class CacheService:
     """Replaces the HTTP proxy to the semantic-cache microservice."""
 
-    def __init__(self, cache_collection, config: MCPConfig, embedding_provider: EmbeddingProvider) -> None:
+    def __init__(
+        self, cache_collection, config: MCPConfig, embedding_provider: EmbeddingProvider,
+        candidate_tuner=None, vector_engine=None, query_embeddings=None,
+    ) -> None:
         self.cache = cache_collection
         self.config = config
         self.embedding = embedding_provider
+        self.candidate_tuner = candidate_tuner
+        # When set, lookups run on the in-process engine instead of $vectorSearch.
+        self.vector_engine = vector_engine
+        # When set, lookups share the query embedding cache with the searches.
+        self.query_embeddings = query_embeddings
 
     async def check(
         self,
@@ -22,33 +32,56 @@ class CacheService:
     ) -> dict | None:
         """Vector search for a semantically similar cached query."""
         threshold = similarity_threshold or self.config.cache_similarity_threshold
-        query_embedding = await self.embedding.generate_embedding(query)
+        if self.query_embeddings is not None:
+            query_embedding = await self.query_embeddings.embed(query)
+        else:
+            query_embedding = await self.embedding.generate_embedding(query)
+        if self.vector_engine is not None:
+            results = await self._local_search(user_id, query_embedding)
+        else:
+            results = await self._vector_search(user_id, query_embedding)
 
+        if results and results[0]["score"] >= threshold:
+            return {
+                "query": results[0]["query"],
+                "response": results[0]["response"],
+                "score": results[0]["score"],
+                "cache_hit": True,
+            }
+        return None
+
+    async def _vector_search(self, user_id: str, query_embedding: list[float]) -> list[dict]:
         pipeline = [
             {
                 "$vectorSearch": {
                     "index": "cache_vector_index",
                     "path": "embedding",
                     "queryVector": query_embedding,
-                    "numCandidates": 10,
+                    "numCandidates": candidate_count(self.candidate_tuner, "cache", 1),
                     "limit": 1,
-                    "filter": {"user_id": user_id},
+                    "filter": vector_filter(SEMANTIC_CACHE, user_id),
                 }
             },
             {"$addFields": {"score": {"$meta": "vectorSearchScore"}}},
         ]
 
         cursor = await self.cache.aggregate(pipeline)
-        results = await cursor.to_list(None)
+        return await cursor.to_list(None)
 
-        if results and results[0]["score"] >= threshold:
-            return {
-                "query": results[0]["query"],
-                "response": results[0]["response"],
-                "score": results[0]["score"],
-                "cache_hit": True,
-            }
-        return None
+    async def _local_search(self, user_id: str, query_embedding: list[float]) -> list[dict]:
+        ranked = await self.vector_engine.search(
+            "semantic_cache", query_embedding, {"user_id": user_id}, 1,
+        )
+        if not ranked:
+            return []
+        entry_id, score = ranked[0]
+        doc = await self.cache.find_one({"_id": entry_id}, {"embedding": 0})
+        if doc is None:
+            # Expired or invalidated since it was indexed.
+            self.vector_engine.remove("semantic_cache", user_id, [entry_id])
+            return []
+        doc["score"] = score
+        return [doc]
 
     async def store(self, user_id: str, query: str, response: str) -> str:
         """Cache a query-response pair with embedding for future similarity lookup."""
@@ -61,6 +94,8 @@ class CacheService:
             "created_at": datetime.now(timezone.utc),
         }
         result = await self.cache.insert_one(doc)
+        if self.vector_engine is not None:
+            self.vector_engine.add("semantic_cache", [{**doc, "_id": result.inserted_id}])
         return str(result.inserted_id)
 
     async def invalidate(
@@ -72,6 +107,8 @@ class CacheService:
         """Hard-delete cached entries. No soft-delete for cache."""
         if invalidate_all:
             result = await self.cache.delete_many({"user_id": user_id})
+            if self.vector_engine is not None:
+                self.vector_engine.drop_user("semantic_cache", user_id)
         elif pattern:
             result = await self.cache.delete_many(
                 {"user_id": user_id, "query": {"$regex": pattern}}
@@ -0,0 +1,211 @@
+"""Adaptive ``numCandidates`` for the ``$vectorSearch`` call sites.
+
+Each call site asks for ``limit * multiplier`` ANN candidates.  The
+defaults reproduce the historical hard-coded values (``limit * 10`` in
+``recall``, 50 for the 5 neighbours of ``evolve_memory``, 100 for the
+20-row ``hybrid_search`` vector input, 10 for the single
+``CacheService.check`` hit).
+
+With ``CANDIDATE_TUNING_ENABLED`` the ``candidate_tuning`` job
+periodically measures them.  It samples stored embeddings as queries,
+runs exact (ENN) search for the ground-truth top-k, and runs ANN at each
+multiplier in ``CANDIDATE_TUNING_MULTIPLIERS``.  For every site it keeps
+the fastest multiplier whose mean recall@k reaches
+``CANDIDATE_RECALL_TARGET``, or the largest one tried if none does.
+
+``memory-mcp-benchmark`` prints the same recall/latency curve without
+changing anything.
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import time
+
+from memory_mcp.core.config import MCPConfig
+
+logger = logging.getLogger(__name__)
+
+# Atlas Vector Search upper bound for numCandidates.
+MAX_NUM_CANDIDATES = 10_000
+
+DEFAULT_MULTIPLIERS = {"recall": 10.0, "evolve": 10.0, "hybrid": 5.0, "cache": 10.0}
+
+# site -> (collection, index, k measured, extra filter)
+_SITES = {
+    "recall": ("memories", "memories_vector_index", 10, {}),
+    "evolve": ("memories", "memories_vector_index", 5, {"tier": "ltm"}),
+    "hybrid": ("memories", "memories_vector_index", 20, {"tier": {"$in": ["stm", "ltm"]}}),
+    "cache": ("semantic_cache", "cache_vector_index", 1, None),
+}
+
+
+def candidate_count(tuner: "CandidateTuner | None", site: str, limit: int) -> int:
+    """``numCandidates`` for ``limit`` results at ``site``."""
+    multiplier = tuner.multipliers[site] if tuner is not None else DEFAULT_MULTIPLIERS[site]
+    return max(limit, min(math.ceil(limit * multiplier), MAX_NUM_CANDIDATES))
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class CandidateTuner:
+    """Measures ANN recall against exact search and picks per-site multipliers."""
+
+    def __init__(self, memories_collection, cache_collection, config: MCPConfig) -> None:
+        self.collections = {"memories": memories_collection, "semantic_cache": cache_collection}
+        self.config = config
+        self.multipliers: dict[str, float] = dict(DEFAULT_MULTIPLIERS)
+        self.last_report: dict = {}
+
+    async def _sample_queries(self, collection_name: str, size: int) -> list[dict]:
+        match: dict = {"embedding": {"$exists": True}}
+        if collection_name == "memories":
+            match["deleted_at"] = None
+        cursor = await self.collections[collection_name].aggregate([
+            {"$sample": {"size": size * 2}},
+            {"$match": match},
+            {"$limit": size},
+            {"$project": {"_id": 0, "embedding": 1, "user_id": 1}},
+        ])
+        return await cursor.to_list(None)
+
+    async def _search(self, collection_name, index, vector, vs_filter, k, num_candidates=None):
+        """Ids of the top ``k``; exact (ENN) search when ``num_candidates`` is None."""
+        stage = {"index": index, "path": "embedding", "queryVector": vector,
+                 "limit": k, "filter": vs_filter}
+        if num_candidates is None:
+            stage["exact"] = True
+        else:
+            stage["numCandidates"] = num_candidates
+        cursor = await self.collections[collection_name].aggregate([
+            {"$vectorSearch": stage}, {"$project": {"_id": 1}},
+        ])
+        return [doc["_id"] for doc in await cursor.to_list(None)]
+
+    async def _timed(self, *args) -> tuple[list, float]:
+        start = time.perf_counter()
+        ids = await self._search(*args)
+        return ids, (time.perf_counter() - start) * 1000
+
+    async def benchmark(
+        self, sample_size: int, multipliers: list[float] | None = None,
+        sites: list[str] | None = None,
+    ) -> dict:
+        """Recall@k / latency curve per site: ``{site: {"k", "exact_ms", "curve"}}``."""
+        multipliers = sorted(multipliers or self.config.candidate_tuning_multipliers)
+        samples: dict[str, list[dict]] = {}
+        report: dict = {}
+        for site in sites or list(_SITES):
+            collection_name, index, k, extra = _SITES[site]
+            if collection_name not in samples:
+                samples[collection_name] = await self._sample_queries(collection_name, sample_size)
+            queries = []
+            exact_ms = []
+            for doc in samples[collection_name]:
+                vs_filter = {"user_id": doc["user_id"]}
+                if extra is not None:
+                    vs_filter.update(deleted_at=None, **extra)
+                truth, ms = await self._timed(collection_name, index, doc["embedding"], vs_filter, k)
+                if truth:
+                    queries.append((doc["embedding"], vs_filter, set(truth)))
+                    exact_ms.append(ms)
+            if not queries:
+                continue
+
+            curve = []
+            for multiplier in multipliers:
+                num_candidates = max(k, min(math.ceil(k * multiplier), MAX_NUM_CANDIDATES))
+                recalls, latencies = [], []
+                for vector, vs_filter, truth in queries:
+                    ids, ms = await self._timed(
+                        collection_name, index, vector, vs_filter, k, num_candidates,
+                    )
+                    recalls.append(len(truth.intersection(ids)) / len(truth))
+                    latencies.append(ms)
+                curve.append({
+                    "multiplier": multiplier,
+                    "num_candidates": num_candidates,
+                    "recall": round(sum(recalls) / len(recalls), 4),
+                    "mean_ms": round(sum(latencies) / len(latencies), 2),
+                    "p95_ms": round(_percentile(latencies, 0.95), 2),
+                })
+            report[site] = {
+                "k": k,
+                "queries": len(queries),
+                "exact_ms": round(sum(exact_ms) / len(exact_ms), 2),
+                "curve": curve,
+            }
+        return report
+
+    def choose(self, curve: list[dict]) -> float:
+        """Fastest multiplier meeting the recall target, else the largest tried."""
+        passing = [p for p in curve if p["recall"] >= self.config.candidate_recall_target]
+        if not passing:
+            return max(p["multiplier"] for p in curve)
+        return min(passing, key=lambda p: (p["mean_ms"], p["multiplier"]))["multiplier"]
+
+    async def run_once(self) -> dict:
+        """Scheduler entry point for the ``candidate_tuning`` job."""
+        report = await self.benchmark(self.config.candidate_tuning_sample_size)
+        for site, result in report.items():
+            chosen = self.choose(result["curve"])
+            if chosen != self.multipliers[site]:
+                logger.info("numCandidates multiplier for %s: %s -> %s",
+                            site, self.multipliers[site], chosen)
+            self.multipliers[site] = chosen
+        self.last_report = report
+        return {"items": len(report), "errors": 0}
+
+
+def _format_report(report: dict, target: float) -> str:
+    lines = []
+    for site, result in report.items():
+        lines.append(
+            f"{site}  (k={result['k']}, {result['queries']} queries, "
+            f"exact {result['exact_ms']:.2f} ms)"
+        )
+        lines.append(f"  {'multiplier':>10}  {'numCandidates':>13}  {'recall@k':>8}  "
+                     f"{'mean ms':>8}  {'p95 ms':>8}")
+        for point in result["curve"]:
+            mark = "*" if point["recall"] >= target else " "
+            lines.append(
+                f"  {point['multiplier']:>10g}  {point['num_candidates']:>13}  "
+                f"{point['recall']:>8.4f}{mark} {point['mean_ms']:>8.2f}  {point['p95_ms']:>8.2f}"
+            )
+    return "\n".join(lines)
+
+
+async def _run_benchmark(config: MCPConfig, args) -> str:
+    from memory_mcp.core.database import DatabaseManager
+
+    db_manager = await DatabaseManager.connect(config)
+    try:
+        tuner = CandidateTuner(db_manager.db["memories"], db_manager.db["semantic_cache"], config)
+        report = await tuner.benchmark(args.samples, args.multipliers, args.sites)
+    finally:
+        await db_manager.close()
+    return _format_report(report, config.candidate_recall_target)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """``memory-mcp-benchmark``: print the numCandidates recall/latency curve."""
+    config = MCPConfig()
+    parser = argparse.ArgumentParser(
+        prog="memory-mcp-benchmark",
+        description="Measure $vectorSearch recall@k and latency against exact search "
+                    "for each numCandidates multiplier.",
+    )
+    parser.add_argument("--samples", type=int, default=config.candidate_tuning_sample_size,
+                        help="stored embeddings sampled as queries (default: %(default)s)")
+    parser.add_argument("--multipliers", type=lambda s: [float(m) for m in s.split(",")],
+                        default=config.candidate_tuning_multipliers,
+                        help="comma-separated candidate multipliers")
+    parser.add_argument("--site", dest="sites", action="append", choices=list(_SITES),
+                        help="call site to measure (repeatable; default: all)")
+    args = parser.parse_args(argv)
+    print(asyncio.run(_run_benchmark(config, args)))
+    print(f"* meets CANDIDATE_RECALL_TARGET={config.candidate_recall_target}")
@@ -1,10 +1,9 @@
 """Background consolidation worker for memory lifecycle management.
 
 Handles STM compression, low-importance forgetting, and STM→LTM promotion.
-Modeled after EnrichmentWorker — runs as an asyncio task within the server.
+Scheduled by ``JobScheduler`` as the ``consolidation`` job.
 """
 
-import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 
@@ -14,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 
 class ConsolidationWorker:
-    """Periodic background task that runs memory consolidation operations.
+    """Periodic background job that runs memory consolidation operations.
 
     Operations:
     1. Compress old STM — summarize & archive STM older than config threshold
@@ -22,26 +21,23 @@ class ConsolidationWorker:
     3. Promote to LTM — promote STM meeting importance/access/age criteria
     """
 
-    def __init__(self, memories_collection, config: MCPConfig, providers) -> None:
+    def __init__(
+        self, memories_collection, config: MCPConfig, providers,
+        access_tracker=None, recall_cache=None,
+    ) -> None:
         self.memories = memories_collection
         self.config = config
         self.providers = providers
-        self._running = False
+        self.access_tracker = access_tracker
+        self.recall_cache = recall_cache
 
-    async def run(self) -> None:
-        """Main loop — runs consolidation at configured interval."""
-        self._running = True
-        while self._running:
-            try:
-                await self.consolidate()
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                logger.exception("Consolidation worker error")
-            await asyncio.sleep(self.config.consolidation_interval_hours * 3600)
+    def _invalidate(self, user_id: str) -> None:
+        if self.recall_cache is not None:
+            self.recall_cache.bump(user_id)
 
-    def stop(self) -> None:
-        self._running = False
+    async def run_once(self) -> dict:
+        """Scheduler entry point — one consolidation cycle."""
+        return await self.consolidate()
 
     async def consolidate(self) -> dict:
         """Run all consolidation operations and return stats."""
@@ -88,6 +84,7 @@ class ConsolidationWorker:
                         }
                     },
                 )
+                self._invalidate(memory.get("user_id"))
                 count += 1
             except Exception:
                 logger.exception("Failed to compress STM %s", memory["_id"])
@@ -111,10 +108,20 @@ class ConsolidationWorker:
                 }
             },
         )
+        if result.modified_count and self.recall_cache is not None:
+            # Spans users: drop every cached result.
+            self.recall_cache.bump_all()
         return result.modified_count
 
     async def _promote_to_ltm(self) -> int:
         """Promote STM memories meeting importance/access/age thresholds to LTM."""
+        # Make buffered recall hits visible to the access_count threshold.
+        # Counters buffered in other processes land within one flush interval.
+        if self.access_tracker is not None:
+            try:
+                await self.access_tracker.flush()
+            except Exception:
+                logger.warning("Access counter flush before promotion failed.", exc_info=True)
         age_cutoff = datetime.now(timezone.utc) - timedelta(
             minutes=self.config.promotion_age_minutes
         )
@@ -148,6 +155,7 @@ class ConsolidationWorker:
                         }
                     },
                 )
+                self._invalidate(memory.get("user_id"))
                 count += 1
             except Exception:
                 logger.exception("Failed to promote STM %s", memory["_id"])
@@ -0,0 +1,70 @@
+"""Maximal marginal relevance (MMR) reranking for ``recall`` / ``hybrid_search``.
+
+STM copies, auto-capture repeats and merge leftovers often rank next to
+each other.  With ``diversity > 0`` the services rank a larger candidate
+pool (``DIVERSITY_CANDIDATE_FACTOR`` × the rows requested) and pick the
+page greedily: each pick maximizes
+
+    (1 - diversity) * relevance - diversity * max cosine to the rows picked
+
+One ``n × n`` similarity matrix is computed up front (a single float32
+matrix product); each pick is then an ``O(n)`` NumPy update.
+"""
+
+import math
+from itertools import chain
+
+import numpy as np
+
+
+def validate_diversity(diversity: float) -> None:
+    if not 0 <= diversity <= 1:
+        raise ValueError(f"diversity must be between 0 and 1 (got {diversity})")
+
+
+def pool_size(limit: int, diversity: float, factor: float) -> int:
+    """Candidates ranked for a ``limit``-row page at ``diversity``."""
+    return max(limit, math.ceil(limit * factor)) if diversity > 0 else limit
+
+
+def embedding_matrix(docs: list[dict], vectors: dict) -> np.ndarray:
+    """``float32`` rows of ``vectors[_id]`` in ``docs`` order; zeros when missing."""
+    dims = next((len(v) for v in vectors.values() if v is not None), 1)
+    zero = [0.0] * dims
+    rows = []
+    for doc in docs:
+        vector = vectors.get(doc["_id"])
+        rows.append(vector if vector is not None and len(vector) == dims else zero)
+    # One pass over all the floats rather than one conversion per row.
+    flat = np.fromiter(chain.from_iterable(rows), dtype=np.float32, count=len(docs) * dims)
+    return flat.reshape(len(docs), dims)
+
+
+def mmr(relevance: np.ndarray, embeddings: np.ndarray, k: int, diversity: float) -> list[int]:
+    """Row indices of the ``k`` MMR picks, in pick order.
+
+    ``relevance`` should be on the scale of cosine similarity ([0, 1]).
+    Rows with a zero embedding are never penalized as duplicates.
+    """
+    n = len(relevance)
+    k = min(k, n)
+    if k == 0:
+        return []
+    # Cosine from the Gram matrix: one BLAS call, normalized by its diagonal.
+    similarity = embeddings @ embeddings.T
+    norms = np.sqrt(np.diagonal(similarity))
+    norms = np.where(norms > 0, norms, 1)
+    similarity /= norms[:, None]
+    similarity /= norms[None, :]
+
+    score = (1 - diversity) * np.asarray(relevance, dtype=np.float32)
+    closest = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    picks = []
+    for _ in range(k):
+        gain = np.where(available, score - diversity * closest, -np.inf)
+        pick = int(np.argmax(gain))
+        picks.append(pick)
+        available[pick] = False
+        np.maximum(closest, similarity[pick], out=closest)
+    return picks
@@ -10,9 +10,9 @@ logger = logging.getLogger(__name__)
 
 
 class EnrichmentWorker:
-    """Background task polling for pending enrichments and processing via LLM.
+    """Background job processing pending enrichments via LLM.
 
-    Runs as an asyncio task within the FastMCP server process.
+    Scheduled by ``JobScheduler`` as the ``enrichment`` job.
     Uses a semaphore to limit concurrent LLM calls.
     """
 
@@ -23,22 +23,13 @@ class EnrichmentWorker:
         self.memory_service = memory_service
         self.prompt_library = prompt_library
         self._semaphore = asyncio.Semaphore(config.enrichment_concurrency)
-        self._running = False
+        self._failures = 0
 
-    async def run(self) -> None:
-        """Main loop — poll and process pending enrichments."""
-        self._running = True
-        while self._running:
-            try:
-                await self.process_batch()
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                logger.exception("Enrichment worker error")
-            await asyncio.sleep(self.config.enrichment_interval_seconds)
-
-    def stop(self) -> None:
-        self._running = False
+    async def run_once(self) -> dict:
+        """Scheduler entry point — process one batch and report item/error counts."""
+        self._failures = 0
+        processed = await self.process_batch()
+        return {"items": processed, "errors": self._failures}
 
     async def process_batch(self) -> int:
         """Find and process one batch of pending/merge_pending memories. Returns count processed."""
@@ -78,6 +69,7 @@ class EnrichmentWorker:
 
         except Exception:
             logger.exception("Failed to enrich memory %s", memory_id)
+            self._failures += 1
             new_retries = retries + 1
             original_status = memory.get("enrichment_status", "pending")
             if new_retries >= self.config.enrichment_max_retries:
@@ -94,6 +86,9 @@ class EnrichmentWorker:
                     }
                 },
             )
+        finally:
+            # Summary, importance, merges and status all show up in results.
+            self.memory_service.invalidate(memory.get("user_id"))
 
     async def _get_prompt(self, name: str) -> str | None:
         """Get a prompt template from the library, or None if unavailable."""
@@ -129,6 +124,7 @@ class EnrichmentWorker:
             memory["user_id"],
             memory["content"],
             memory["embedding"],
+            memory_id=memory_id,
         )
 
         await self.memories.update_one(
@@ -193,6 +189,11 @@ class EnrichmentWorker:
                         target.get("importance", 0.5),
                         memory.get("importance", 0.5),
                     ),
+                    # The merged memory takes over the target's neighbour links.
+                    "neighbors": [
+                        link for link in target.get("neighbors") or []
+                        if link["_id"] != memory_id
+                    ],
                     "updated_at": now,
                 }
             },
@@ -209,3 +210,6 @@ class EnrichmentWorker:
                 }
             },
         )
+        await self.memory_service.relink_neighbors(
+            memory["user_id"], merge_target_id, memory_id,
+        )
@@ -0,0 +1,104 @@
+"""Read-your-writes overlay for memories not yet visible to Atlas Search.
+
+``$vectorSearch`` and ``$search`` read eventually consistent indexes, so a
+memory stored by ``store_memory`` is often missing from a ``recall_memory``
+issued right after it.  ``FreshOverlay`` keeps the documents this process
+inserted, per user, and the search paths score them by brute force and
+merge them into the index results:
+
+- ``MemoryService`` merges them into ANN recall results after ranking (the
+  ``exact`` plan reads the primary and needs no overlay);
+- ``hybrid_search`` fuses those at least ``FRESH_OVERLAY_MIN_SCORE``
+  similar into the first page by RRF.
+
+A memory leaves the overlay as soon as an ANN search returns it (the
+index has caught up), when it is deleted, or after
+``FRESH_OVERLAY_TTL_SECONDS``.  The overlay is per process: a recall
+routed to another ``HTTP_WORKERS`` process does not see it.
+"""
+
+import time
+from collections import OrderedDict
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.working_set import UserVectors
+
+
+class FreshOverlay:
+    """Recently inserted memories per user, until the indexes return them."""
+
+    def __init__(self, config: MCPConfig) -> None:
+        self.ttl_seconds = config.fresh_overlay_ttl_seconds
+        self.max_per_user = config.fresh_overlay_max_per_user
+        # user_id -> OrderedDict[_id -> (inserted_at, doc)]
+        self._entries: dict[str, OrderedDict] = {}
+        self.merged = 0
+
+    def add(self, user_id: str, docs: list[dict]) -> None:
+        """Track inserted documents (``_id`` and ``embedding`` set)."""
+        entries = self._entries.setdefault(user_id, OrderedDict())
+        now = time.monotonic()
+        for doc in docs:
+            entries[doc["_id"]] = (now, doc)
+        while len(entries) > self.max_per_user:
+            entries.popitem(last=False)
+
+    def remove(self, user_id: str, memory_ids) -> None:
+        """Forget memories that were deleted or are now indexed."""
+        entries = self._entries.get(user_id)
+        if not entries:
+            return
+        for memory_id in memory_ids:
+            entries.pop(memory_id, None)
+        if not entries:
+            del self._entries[user_id]
+
+    def evict(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+    def _live(self, user_id: str) -> list[dict]:
+        entries = self._entries.get(user_id)
+        if not entries:
+            return []
+        cutoff = time.monotonic() - self.ttl_seconds
+        while entries and next(iter(entries.values()))[0] < cutoff:
+            entries.popitem(last=False)
+        if not entries:
+            del self._entries[user_id]
+            return []
+        return [doc for _, doc in entries.values()]
+
+    def candidates(
+        self, query_embedding: list[float], vs_filter: dict, k: int,
+        exclude=(), min_score: float = 0.0,
+    ) -> list[dict]:
+        """Up to ``k`` fresh documents matching ``vs_filter``, best first.
+
+        Each is a copy with ``vs_score`` set as ``$vectorSearch`` would,
+        without its embedding.  Ids in ``exclude`` (already returned by the
+        index) are dropped from the overlay and skipped.
+        """
+        user_id = vs_filter["user_id"]
+        self.remove(user_id, exclude)
+        docs = self._live(user_id)
+        if not docs:
+            return []
+        by_id = {doc["_id"]: doc for doc in docs}
+        results = []
+        for memory_id, score in UserVectors(docs, len(query_embedding)).top(
+            query_embedding, vs_filter, k,
+        ):
+            if score < min_score:
+                break
+            doc = {key: val for key, val in by_id[memory_id].items() if key != "embedding"}
+            doc["vs_score"] = score
+            results.append(doc)
+        self.merged += len(results)
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._entries),
+            "pending": sum(len(entries) for entries in self._entries.values()),
+            "merged": self.merged,
+        }
@@ -0,0 +1,340 @@
+"""In-process BM25 full-text index: the ``$search`` leg of ``hybrid_search`` without Atlas.
+
+``LocalVectorEngine`` owns one ``LocalTextIndex`` for the ``memories``
+collection and feeds it the same writes and watermark syncs as its
+vectors, so stores, deletes and enrichment summaries reach both.
+
+Each user has a ``TextPartition``: an inverted index over the tokens of
+``content`` and ``summary``, tokenized like Atlas' standard analyzer
+(lower-cased Unicode word characters).  A posting list is a pair of
+``array('I')`` buffers, rows and term frequencies, that NumPy scores
+in place.  A changed document is tombstoned and appended again, and the
+partition is compacted once tombstones outnumber live rows.
+
+Scores are Okapi BM25 with Lucene's defaults (``k1=1.2``, ``b=0.75``).
+"""
+
+import json
+import math
+import os
+import re
+import zlib
+from array import array
+from datetime import datetime, timezone
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Partitions smaller than this are never compacted.
+_COMPACT_MIN_ROWS = 64
+
+
+def timestamp(value: datetime | None) -> float:
+    """Epoch seconds of a BSON datetime (naive is UTC); NaN when missing."""
+    if value is None:
+        return math.nan
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def filter_tags(vs_filter: dict) -> set:
+    """Tags every match must carry: the ``$and`` equality clauses of ``vector_filter``."""
+    return {clause["tags"] for clause in vs_filter.get("$and", ()) if "tags" in clause}
+
+
+def filter_mask(
+    mask: np.ndarray, vs_filter: dict, tiers, memory_types, tags, conversations, created,
+) -> np.ndarray:
+    """Narrow ``mask`` to rows matching the clauses of ``MemoryService._vector_filter``.
+
+    ``created`` holds ``timestamp(created_at)`` per row; a row without one
+    never matches a time window, as in MongoDB.
+    """
+    size = len(mask)
+    tier = vs_filter.get("tier")
+    if tier is not None:
+        allowed = set(tier["$in"]) if isinstance(tier, dict) else {tier}
+        mask &= np.fromiter((t in allowed for t in tiers), bool, size)
+    if "memory_type" in vs_filter:
+        wanted = vs_filter["memory_type"]
+        mask &= np.fromiter((m == wanted for m in memory_types), bool, size)
+    wanted = filter_tags(vs_filter)
+    if wanted:
+        mask &= np.fromiter((wanted <= t for t in tags), bool, size)
+    if "conversation_id" in vs_filter:
+        wanted = vs_filter["conversation_id"]
+        mask &= np.fromiter((c == wanted for c in conversations), bool, size)
+    if "created_at" in vs_filter:
+        created = np.asarray(created, dtype=np.float64)
+        window = vs_filter["created_at"]
+        if "$gte" in window:
+            mask &= created >= timestamp(window["$gte"])
+        if "$lte" in window:
+            mask &= created <= timestamp(window["$lte"])
+    return mask
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _document_text(doc: dict) -> tuple[list[str], int]:
+    """Tokens of ``content`` + ``summary`` and a digest to detect changes."""
+    content, summary = doc.get("content") or "", doc.get("summary") or ""
+    digest = zlib.crc32(f"{content}\0{summary}".encode())
+    return tokenize(content) + tokenize(summary), digest
+
+
+class TextPartition:
+    """One user's inverted index."""
+
+    __slots__ = (
+        "ids", "row_of", "digests", "tiers", "memory_types", "tags", "conversations", "created",
+        "lengths", "alive", "total_length", "live", "postings",
+    )
+
+    def __init__(self) -> None:
+        self.ids: list = []
+        self.row_of: dict = {}
+        self.digests: list[int] = []
+        self.tiers: list = []
+        self.memory_types: list = []
+        self.tags: list = []
+        self.conversations: list = []
+        self.created = array("d")
+        self.lengths = array("I")
+        self.alive = bytearray()
+        self.total_length = 0
+        self.live = 0
+        # term -> (rows, term frequencies)
+        self.postings: dict[str, tuple[array, array]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def upsert(self, doc: dict) -> None:
+        tokens, digest = _document_text(doc)
+        row = self.row_of.get(doc["_id"])
+        if row is not None and self.alive[row] and self.digests[row] == digest:
+            # Same text: only the filter fields can have changed (promotion).
+            self.tiers[row] = doc.get("tier")
+            self.memory_types[row] = doc.get("memory_type")
+            self.tags[row] = frozenset(doc.get("tags") or ())
+            self.conversations[row] = doc.get("conversation_id")
+            self.created[row] = timestamp(doc.get("created_at"))
+            return
+        self.remove(doc["_id"])
+
+        row = self.size
+        self.row_of[doc["_id"]] = row
+        self.ids.append(doc["_id"])
+        self.digests.append(digest)
+        self.tiers.append(doc.get("tier"))
+        self.memory_types.append(doc.get("memory_type"))
+        self.tags.append(frozenset(doc.get("tags") or ()))
+        self.conversations.append(doc.get("conversation_id"))
+        self.created.append(timestamp(doc.get("created_at")))
+        self.lengths.append(len(tokens))
+        self.alive.append(1)
+        self.total_length += len(tokens)
+        self.live += 1
+        frequencies: dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        for term, tf in frequencies.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array("I"), array("I"))
+            posting[0].append(row)
+            posting[1].append(tf)
+
+    def remove(self, memory_id) -> bool:
+        row = self.row_of.get(memory_id)
+        if row is None or not self.alive[row]:
+            return False
+        self.alive[row] = 0
+        self.total_length -= self.lengths[row]
+        self.live -= 1
+        if self.size >= _COMPACT_MIN_ROWS and self.live * 2 < self.size:
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and renumber the postings."""
+        alive = np.frombuffer(self.alive, dtype=bool)
+        keep = np.flatnonzero(alive)
+        remap = np.full(self.size, -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+        postings = {}
+        for term, (rows, tfs) in self.postings.items():
+            rows = np.frombuffer(rows, dtype=np.uint32)
+            live = alive[rows]
+            if live.any():
+                postings[term] = (
+                    array("I", remap[rows[live]].astype(np.uint32).tobytes()),
+                    array("I", np.frombuffer(tfs, dtype=np.uint32)[live].tobytes()),
+                )
+        del alive
+        kept = keep.tolist()
+        self.ids = [self.ids[r] for r in kept]
+        self.row_of = {memory_id: row for row, memory_id in enumerate(self.ids)}
+        self.digests = [self.digests[r] for r in kept]
+        self.tiers = [self.tiers[r] for r in kept]
+        self.memory_types = [self.memory_types[r] for r in kept]
+        self.tags = [self.tags[r] for r in kept]
+        self.conversations = [self.conversations[r] for r in kept]
+        self.created = array("d", np.frombuffer(self.created, dtype=np.float64)[keep].tobytes())
+        self.lengths = array("I", np.frombuffer(self.lengths, dtype=np.uint32)[keep].tobytes())
+        self.alive = bytearray(b"\x01" * len(kept))
+        self.postings = postings
+
+    def search(self, terms: list[str], vs_filter: dict, k: int) -> list[tuple]:
+        """``(_id, bm25)`` of the ``k`` best live rows matching ``vs_filter``."""
+        if not self.live:
+            return []
+        lengths = np.frombuffer(self.lengths, dtype=np.uint32).astype(np.float32)
+        alive = np.frombuffer(self.alive, dtype=bool)
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (self.total_length / self.live or 1))
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in dict.fromkeys(terms):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            rows = np.frombuffer(posting[0], dtype=np.uint32)
+            df = int(np.count_nonzero(alive[rows]))
+            if not df:
+                continue
+            idf = np.log1p((self.live - df + 0.5) / (df + 0.5))
+            tfs = np.frombuffer(posting[1], dtype=np.uint32).astype(np.float32)
+            # One posting per row and term, so plain fancy-index addition is safe.
+            scores[rows] += idf * tfs * (BM25_K1 + 1) / (tfs + norms[rows])
+        mask = filter_mask(
+            alive.copy(), vs_filter, self.tiers, self.memory_types, self.tags,
+            self.conversations, self.created,
+        )
+        mask &= scores > 0
+        rows = np.flatnonzero(mask)
+        best = rows[np.argsort(-scores[rows], kind="stable")[:k]]
+        return [(self.ids[r], float(scores[r])) for r in best.tolist()]
+
+
+class LocalTextIndex:
+    """Per-user BM25 indexes over memory ``content`` and ``summary``."""
+
+    def __init__(self) -> None:
+        self.partitions: dict[str, TextPartition] = {}
+        self.searches = 0
+
+    def add(self, docs: list[dict]) -> None:
+        for doc in docs:
+            partition = self.partitions.get(doc["user_id"])
+            if partition is None:
+                partition = self.partitions[doc["user_id"]] = TextPartition()
+            partition.upsert(doc)
+
+    def remove(self, user_id: str, memory_ids) -> None:
+        partition = self.partitions.get(user_id)
+        if partition is not None:
+            for memory_id in memory_ids:
+                partition.remove(memory_id)
+
+    def drop_user(self, user_id: str) -> None:
+        self.partitions.pop(user_id, None)
+
+    def search(self, query: str, vs_filter: dict, k: int) -> list[tuple]:
+        self.searches += 1
+        partition = self.partitions.get(vs_filter["user_id"])
+        terms = tokenize(query)
+        if partition is None or not terms:
+            return []
+        return partition.search(terms, vs_filter, k)
+
+    def save(self, base: str) -> None:
+        """Write live rows as ``<base>.npz`` + ``<base>.json``."""
+        users, ids, digests, tiers, memory_types, tags, terms = {}, [], [], [], [], [], []
+        conversations, created, lengths, offsets, rows, tfs = [], [], [], [0], [], []
+        doc_start = term_start = 0
+        for user_id, partition in self.partitions.items():
+            if partition.live < partition.size:
+                partition.compact()
+            for term, (term_rows, term_tfs) in partition.postings.items():
+                terms.append(term)
+                rows.append(np.frombuffer(term_rows, dtype=np.uint32))
+                tfs.append(np.frombuffer(term_tfs, dtype=np.uint32))
+                offsets.append(offsets[-1] + len(term_rows))
+            users[user_id] = [doc_start, doc_start + partition.size,
+                              term_start, term_start + len(partition.postings)]
+            doc_start += partition.size
+            term_start += len(partition.postings)
+            ids.extend(str(memory_id) for memory_id in partition.ids)
+            digests.extend(partition.digests)
+            tiers.extend(partition.tiers)
+            memory_types.extend(partition.memory_types)
+            tags.extend(sorted(t) for t in partition.tags)
+            conversations.extend(partition.conversations)
+            created.append(np.frombuffer(partition.created, dtype=np.float64))
+            lengths.append(np.frombuffer(partition.lengths, dtype=np.uint32))
+
+        def joined(parts, dtype=np.uint32):
+            return np.concatenate(parts) if parts else np.empty(0, dtype)
+
+        np.savez(
+            base + ".tmp.npz", lengths=joined(lengths), rows=joined(rows), tfs=joined(tfs),
+            created=joined(created, np.float64), offsets=np.asarray(offsets, dtype=np.int64),
+        )
+        with open(base + ".tmp.json", "w") as f:
+            json.dump({"users": users, "ids": ids, "digests": digests, "tiers": tiers,
+                       "memory_types": memory_types, "tags": tags,
+                       "conversations": conversations, "terms": terms}, f)
+        os.replace(base + ".tmp.npz", base + ".npz")
+        os.replace(base + ".tmp.json", base + ".json")
+
+    def load(self, base: str, parse_id) -> bool:
+        """Rebuild the partitions from a snapshot.  ``parse_id`` restores ``_id`` values."""
+        try:
+            with open(base + ".json") as f:
+                meta = json.load(f)
+            arrays = np.load(base + ".npz")
+            lengths, rows, tfs, created, offsets = (
+                arrays["lengths"], arrays["rows"], arrays["tfs"], arrays["created"],
+                arrays["offsets"],
+            )
+            conversations = meta["conversations"]
+        except (OSError, ValueError, KeyError):
+            # Missing, or written before a filter column was added.
+            return False
+        for user_id, (doc_start, doc_end, term_start, term_end) in meta["users"].items():
+            partition = TextPartition()
+            partition.ids = [parse_id(i) for i in meta["ids"][doc_start:doc_end]]
+            partition.row_of = {memory_id: row for row, memory_id in enumerate(partition.ids)}
+            partition.digests = meta["digests"][doc_start:doc_end]
+            partition.tiers = meta["tiers"][doc_start:doc_end]
+            partition.memory_types = meta["memory_types"][doc_start:doc_end]
+            partition.tags = [frozenset(t) for t in meta["tags"][doc_start:doc_end]]
+            partition.conversations = conversations[doc_start:doc_end]
+            partition.created = array("d", created[doc_start:doc_end].tobytes())
+            partition.lengths = array("I", lengths[doc_start:doc_end].tobytes())
+            partition.alive = bytearray(b"\x01" * (doc_end - doc_start))
+            partition.total_length = int(lengths[doc_start:doc_end].sum())
+            partition.live = doc_end - doc_start
+            for t in range(term_start, term_end):
+                start, end = offsets[t], offsets[t + 1]
+                partition.postings[meta["terms"][t]] = (
+                    array("I", rows[start:end].tobytes()), array("I", tfs[start:end].tobytes()),
+                )
+            self.partitions[user_id] = partition
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.partitions),
+            "documents": sum(p.live for p in self.partitions.values()),
+            "terms": sum(len(p.postings) for p in self.partitions.values()),
+            "searches": self.searches,
+        }
@@ -0,0 +1,480 @@
+"""In-process vector search for deployments without Atlas Vector Search.
+
+On a plain ``mongod`` the ``$vectorSearch`` stage does not exist, so
+``recall``, ``evolve_memory``, ``hybrid_search`` and ``CacheService.check``
+would fail.  With ``VECTOR_ENGINE=auto`` (the default) startup probes for
+Atlas Search and, when it is missing, routes those searches to
+``LocalVectorEngine``; ``VECTOR_ENGINE=local`` forces it.
+
+The engine holds one ``Partition`` per ``(collection, user_id)``: a
+float32 matrix of normalized embeddings with the ``tier`` /
+``memory_type`` / ``tags`` / ``conversation_id`` / ``created_at`` needed
+to apply the search filters.  Small
+partitions are scanned exactly.  From ``LOCAL_VECTOR_IVF_MIN_ROWS`` rows
+a partition builds an IVF-flat index (k-means coarse quantizer, √n
+lists) and scans the ``LOCAL_VECTOR_NPROBE`` nearest lists.
+
+It also holds a ``LocalTextIndex`` (``services/local_text.py``): BM25
+over memory ``content`` and ``summary``, the text leg of ``hybrid_search``
+where ``$search`` is missing too.
+
+It stays current in two ways:
+
+- the services apply their own writes directly (``add`` / ``remove``);
+- ``sync`` catches up on everything else — other processes,
+  enrichment, consolidation — by reading documents changed since the
+  last watermark (``updated_at`` for memories, ``created_at`` for the
+  cache; both indexed).  A search runs it first when ``LOCAL_VECTOR_SYNC_SECONDS``
+  have passed.
+
+Callers fetch the winners by ``_id`` with the full filter and report
+ids that no longer match through ``remove``, which also covers hard
+deletes (TTL expiry, cache invalidation) that leave no watermark.
+
+Removed rows are tombstoned; a partition is compacted once tombstones
+outnumber its live rows.
+
+With ``LOCAL_VECTOR_DIR`` set the partitions are saved on shutdown as
+one ``.npy`` matrix plus JSON metadata per collection, and loaded
+memory-mapped on the next start.
+
+The worker runtimes (``WORKER_ISOLATION``, ``ROLE=worker``) only run
+memory evolution, for the users they enrich.  They open a *lazy* engine:
+no startup load, a user's partition is read on its first search, and
+``sync`` only applies changes to users already loaded.  Lazy engines do
+not keep the BM25 index.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from bson import ObjectId
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.local_text import LocalTextIndex, filter_mask, timestamp
+
+logger = logging.getLogger(__name__)
+
+VECTOR_ENGINES = ("auto", "atlas", "local")
+
+# collection -> watermark field
+_COLLECTIONS = {"memories": "updated_at", "semantic_cache": "created_at"}
+
+_PROJECTION = {
+    "embedding": 1, "user_id": 1, "tier": 1, "memory_type": 1, "tags": 1,
+    "conversation_id": 1, "content": 1, "summary": 1,
+    "deleted_at": 1, "updated_at": 1, "created_at": 1,
+}
+
+_KMEANS_ITERATIONS = 10
+
+# Partitions smaller than this are never compacted.
+_COMPACT_MIN_ROWS = 64
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class Partition:
+    """One user's vectors in one collection, with an optional IVF index."""
+
+    __slots__ = (
+        "ids", "row_of", "tiers", "memory_types", "tags", "conversations", "created",
+        "matrix", "size", "alive", "dead", "centroids", "assignment", "indexed_rows",
+    )
+
+    def __init__(self, dimensions: int, matrix: np.ndarray | None = None) -> None:
+        self.ids: list = []
+        self.row_of: dict = {}
+        self.tiers: list = []
+        self.memory_types: list = []
+        self.tags: list = []
+        self.conversations: list = []
+        self.created: list[float] = []
+        # May be a read-only memory-mapped view until the first write.
+        self.matrix = matrix if matrix is not None else np.empty((0, dimensions), np.float32)
+        self.size = 0
+        self.alive = np.zeros(len(self.matrix), dtype=bool)
+        self.dead = 0
+        self.centroids: np.ndarray | None = None
+        self.assignment: np.ndarray | None = None
+        self.indexed_rows = 0
+
+    @property
+    def live(self) -> int:
+        return int(self.alive[:self.size].sum())
+
+    def _reserve(self, rows: int) -> None:
+        needed = self.size + rows
+        if needed <= len(self.matrix) and self.matrix.flags.writeable:
+            return
+        capacity = max(needed, 2 * len(self.matrix), 16)
+        matrix = np.empty((capacity, self.matrix.shape[1]), np.float32)
+        matrix[:self.size] = self.matrix[:self.size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.size] = self.alive[:self.size]
+        self.matrix, self.alive = matrix, alive
+        if self.assignment is not None:
+            assignment = np.full(capacity, -1, dtype=np.int32)
+            assignment[:self.size] = self.assignment[:self.size]
+            self.assignment = assignment
+
+    def upsert(self, doc: dict) -> None:
+        vector = _normalize(np.asarray(doc["embedding"], dtype=np.float32))
+        row = self.row_of.get(doc["_id"])
+        if row is None:
+            self._reserve(1)
+            row = self.size
+            self.size += 1
+            self.row_of[doc["_id"]] = row
+            self.ids.append(doc["_id"])
+            self.tiers.append(doc.get("tier"))
+            self.memory_types.append(doc.get("memory_type"))
+            self.tags.append(frozenset(doc.get("tags") or ()))
+            self.conversations.append(doc.get("conversation_id"))
+            self.created.append(timestamp(doc.get("created_at")))
+        else:
+            self._reserve(0)
+            if not self.alive[row]:
+                self.dead -= 1
+            self.tiers[row] = doc.get("tier")
+            self.memory_types[row] = doc.get("memory_type")
+            self.tags[row] = frozenset(doc.get("tags") or ())
+            self.conversations[row] = doc.get("conversation_id")
+            self.created[row] = timestamp(doc.get("created_at"))
+        self.matrix[row] = vector
+        self.alive[row] = True
+        if self.centroids is not None:
+            self.assignment[row] = int(np.argmax(self.centroids @ vector))
+
+    def remove(self, memory_id) -> bool:
+        row = self.row_of.get(memory_id)
+        if row is None or not self.alive[row]:
+            return False
+        self.alive[row] = False
+        self.dead += 1
+        if self.size >= _COMPACT_MIN_ROWS and self.dead * 2 > self.size:
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Drop tombstoned rows; the IVF centroids are kept."""
+        keep = np.flatnonzero(self.alive[:self.size])
+        kept = keep.tolist()
+        self.matrix = self.matrix[keep]
+        self.alive = np.ones(len(kept), dtype=bool)
+        if self.assignment is not None:
+            self.assignment = self.assignment[keep]
+        self.ids = [self.ids[r] for r in kept]
+        self.row_of = {memory_id: row for row, memory_id in enumerate(self.ids)}
+        self.tiers = [self.tiers[r] for r in kept]
+        self.memory_types = [self.memory_types[r] for r in kept]
+        self.tags = [self.tags[r] for r in kept]
+        self.conversations = [self.conversations[r] for r in kept]
+        self.created = [self.created[r] for r in kept]
+        self.size = len(kept)
+        self.dead = 0
+
+    def maybe_index(self, min_rows: int) -> None:
+        """Build (or rebuild after doubling) the IVF lists once large enough."""
+        live = self.live
+        if live < min_rows or (self.centroids is not None and live < 2 * self.indexed_rows):
+            return
+        rows = np.flatnonzero(self.alive[:self.size])
+        vectors = self.matrix[rows]
+        nlist = max(1, int(math.sqrt(live)))
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            nearest = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = vectors[nearest == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+        self._reserve(0)
+        self.centroids = centroids
+        self.assignment = np.full(len(self.matrix), -1, dtype=np.int32)
+        self.assignment[:self.size] = np.argmax(self.matrix[:self.size] @ centroids.T, axis=1)
+        self.indexed_rows = live
+
+    def search(self, query: np.ndarray, vs_filter: dict, k: int, nprobe: int) -> list[tuple]:
+        mask = filter_mask(
+            self.alive[:self.size].copy(), vs_filter, self.tiers, self.memory_types, self.tags,
+            self.conversations, self.created,
+        )
+        if self.centroids is not None:
+            probes = np.argsort(-(self.centroids @ query))[:nprobe]
+            mask &= np.isin(self.assignment[:self.size], probes)
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+        scores = (1 + self.matrix[rows] @ query) / 2
+        best = np.argsort(-scores, kind="stable")[:k]
+        return [(self.ids[rows[i]], float(scores[i])) for i in best.tolist()]
+
+
+class LocalVectorEngine:
+    """Per-user in-process ANN over the ``memories`` and ``semantic_cache`` embeddings."""
+
+    def __init__(self, db, config: MCPConfig, persist: bool = True, lazy: bool = False) -> None:
+        self.db = db
+        self.config = config
+        self.dimensions = config.embedding_dimension
+        self.directory = config.local_vector_dir if persist else ""
+        # Lazy engines read a user's partition on its first search.
+        self.lazy = lazy
+        self.loaded_users: dict[str, set] = {name: set() for name in _COLLECTIONS}
+        self.partitions: dict[str, dict[str, Partition]] = {name: {} for name in _COLLECTIONS}
+        self.watermarks: dict[str, datetime | None] = dict.fromkeys(_COLLECTIONS)
+        self._synced_at = 0.0
+        self._sync_lock = asyncio.Lock()
+        self.searches = 0
+        # BM25 over memory content/summary: the text leg of hybrid_search.
+        self.text = LocalTextIndex()
+
+    # ─── Writes ──────────────────────────────────────────────────
+
+    def add(self, collection: str, docs: list[dict]) -> None:
+        """Index inserted or updated documents (``_id`` and ``embedding`` set)."""
+        if collection == "memories" and not self.lazy:
+            self.text.add(docs)
+        for doc in docs:
+            embedding = doc.get("embedding")
+            if not embedding or len(embedding) != self.dimensions:
+                continue
+            partitions = self.partitions[collection]
+            partition = partitions.get(doc["user_id"])
+            if partition is None:
+                partition = partitions[doc["user_id"]] = Partition(self.dimensions)
+            partition.upsert(doc)
+
+    def remove(self, collection: str, user_id: str, memory_ids) -> None:
+        if collection == "memories":
+            self.text.remove(user_id, memory_ids)
+        partition = self.partitions[collection].get(user_id)
+        if partition is not None:
+            for memory_id in memory_ids:
+                partition.remove(memory_id)
+
+    def drop_user(self, collection: str, user_id: str) -> None:
+        if collection == "memories":
+            self.text.drop_user(user_id)
+        self.partitions[collection].pop(user_id, None)
+
+    # ─── Search ──────────────────────────────────────────────────
+
+    async def search(
+        self, collection: str, query_embedding: list[float], vs_filter: dict, k: int,
+    ) -> list[tuple]:
+        """``(_id, score)`` of the ``k`` nearest documents matching ``vs_filter``.
+
+        Scores follow the Atlas cosine convention, ``(1 + cosine) / 2``.
+        """
+        await self._maybe_sync()
+        if self.lazy and vs_filter["user_id"] not in self.loaded_users[collection]:
+            await self._load_user(collection, vs_filter["user_id"])
+        self.searches += 1
+        partition = self.partitions[collection].get(vs_filter["user_id"])
+        if partition is None or len(query_embedding) != self.dimensions:
+            return []
+        partition.maybe_index(self.config.local_vector_ivf_min_rows)
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+        return partition.search(query, vs_filter, k, self.config.local_vector_nprobe)
+
+    async def search_text(self, query: str, vs_filter: dict, k: int) -> list[tuple]:
+        """``(_id, bm25)`` of the ``k`` best memories for ``query`` matching ``vs_filter``."""
+        await self._maybe_sync()
+        return self.text.search(query, vs_filter, k)
+
+    async def _load_user(self, collection: str, user_id: str) -> None:
+        """Read one user's live documents (lazy engines)."""
+        async with self._sync_lock:  # a concurrent sync must not skip the user
+            if user_id in self.loaded_users[collection]:
+                return
+            query = {"user_id": user_id}
+            if collection == "memories":
+                query["deleted_at"] = None
+            cursor = self.db[collection].find(query, _PROJECTION)
+            self.add(collection, await cursor.to_list(None))
+            self.loaded_users[collection].add(user_id)
+
+    async def _maybe_sync(self) -> None:
+        if time.monotonic() - self._synced_at >= self.config.local_vector_sync_seconds:
+            await self.sync()
+
+    # ─── Sync and persistence ────────────────────────────────────
+
+    async def sync(self) -> int:
+        """Apply documents changed since the last watermark.  Returns the count."""
+        async with self._sync_lock:
+            if time.monotonic() - self._synced_at < self.config.local_vector_sync_seconds:
+                return 0  # another search just synced
+            applied = 0
+            for collection, field in _COLLECTIONS.items():
+                watermark = self.watermarks[collection]
+                if watermark is None:
+                    query = {"deleted_at": None} if collection == "memories" else {}
+                else:
+                    query = {field: {"$gte": watermark}}
+                if self.lazy:
+                    # Other users are read in full on their first search.
+                    if not self.loaded_users[collection]:
+                        continue
+                    query["user_id"] = {"$in": sorted(self.loaded_users[collection])}
+                cursor = self.db[collection].find(query, _PROJECTION)
+                for doc in await cursor.to_list(None):
+                    if doc.get("deleted_at") is not None:
+                        self.remove(collection, doc["user_id"], [doc["_id"]])
+                    else:
+                        self.add(collection, [doc])
+                    changed = doc.get(field)
+                    if changed is not None and (watermark is None or changed > watermark):
+                        watermark = changed
+                    applied += 1
+                self.watermarks[collection] = watermark
+            self._synced_at = time.monotonic()
+            return applied
+
+    async def run_once(self) -> dict:
+        """Scheduler entry point for the ``vector_sync`` job."""
+        self._synced_at = 0.0
+        try:
+            return {"items": await self.sync(), "errors": 0}
+        except Exception:
+            logger.warning("Local vector sync failed; will retry.", exc_info=True)
+            return {"items": 0, "errors": 1}
+
+    def save(self) -> None:
+        """Write each collection as ``<name>.npy`` + ``<name>.json`` under LOCAL_VECTOR_DIR.
+
+        The BM25 index goes to ``memories_text.npz`` + ``memories_text.json``.
+        """
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        for collection, partitions in self.partitions.items():
+            blocks, users, ids, tiers, memory_types, tags = [], {}, [], [], [], []
+            conversations, created = [], []
+            start = 0
+            for user_id, partition in partitions.items():
+                rows = np.flatnonzero(partition.alive[:partition.size])
+                blocks.append(partition.matrix[rows])
+                users[user_id] = [start, start + len(rows)]
+                start += len(rows)
+                for row in rows.tolist():
+                    ids.append(str(partition.ids[row]))
+                    tiers.append(partition.tiers[row])
+                    memory_types.append(partition.memory_types[row])
+                    tags.append(sorted(partition.tags[row]))
+                    conversations.append(partition.conversations[row])
+                    created.append(partition.created[row])
+            matrix = np.concatenate(blocks) if blocks else np.empty((0, self.dimensions), np.float32)
+            watermark = self.watermarks[collection]
+            meta = {
+                "dimensions": self.dimensions,
+                "watermark": watermark.isoformat() if watermark else None,
+                "users": users, "ids": ids, "tiers": tiers,
+                "memory_types": memory_types, "tags": tags,
+                "conversations": conversations, "created": created,
+            }
+            base = os.path.join(self.directory, collection)
+            np.save(base + ".tmp.npy", matrix)
+            with open(base + ".tmp.json", "w") as f:
+                json.dump(meta, f)
+            os.replace(base + ".tmp.npy", base + ".npy")
+            os.replace(base + ".tmp.json", base + ".json")
+        self.text.save(os.path.join(self.directory, "memories_text"))
+
+    def load(self) -> bool:
+        """Memory-map a saved snapshot.  Returns False when there is none to use."""
+        if not self.directory:
+            return False
+        loaded = False
+        for collection in _COLLECTIONS:
+            base = os.path.join(self.directory, collection)
+            try:
+                with open(base + ".json") as f:
+                    meta = json.load(f)
+                matrix = np.load(base + ".npy", mmap_mode="r")
+            except (OSError, ValueError):
+                continue
+            if meta["dimensions"] != self.dimensions:
+                logger.info("Ignoring local vector snapshot for %s: dimension changed.", collection)
+                continue
+            if "created" not in meta:
+                logger.info("Ignoring local vector snapshot for %s: filter fields changed.", collection)
+                continue
+            for user_id, (start, end) in meta["users"].items():
+                partition = Partition(self.dimensions, matrix[start:end])
+                partition.size = end - start
+                partition.alive = np.ones(end - start, dtype=bool)
+                for offset, row in enumerate(range(start, end)):
+                    memory_id = ObjectId(meta["ids"][row])
+                    partition.ids.append(memory_id)
+                    partition.row_of[memory_id] = offset
+                    partition.tiers.append(meta["tiers"][row])
+                    partition.memory_types.append(meta["memory_types"][row])
+                    partition.tags.append(frozenset(meta["tags"][row]))
+                    partition.conversations.append(meta["conversations"][row])
+                    partition.created.append(meta["created"][row])
+                self.partitions[collection][user_id] = partition
+            watermark = meta["watermark"]
+            self.watermarks[collection] = datetime.fromisoformat(watermark) if watermark else None
+            loaded = True
+        if self.watermarks["memories"] is not None and not self.text.load(
+            os.path.join(self.directory, "memories_text"), ObjectId,
+        ):
+            # Vectors without their text index: re-read all memories once.
+            self.watermarks["memories"] = None
+        return loaded
+
+    def stats(self) -> dict:
+        return {
+            collection: {
+                "users": len(partitions),
+                "vectors": sum(p.live for p in partitions.values()),
+                "ivf_partitions": sum(1 for p in partitions.values() if p.centroids is not None),
+            }
+            for collection, partitions in self.partitions.items()
+        } | {"searches": self.searches, "text": self.text.stats()}
+
+
+async def open_vector_engine(
+    db, config: MCPConfig, persist: bool = True, lazy: bool = False,
+) -> LocalVectorEngine | None:
+    """The local engine when ``VECTOR_ENGINE`` selects it, else ``None`` (Atlas).
+
+    A ``lazy`` engine starts empty, with its watermarks at the newest
+    document, instead of loading every user.
+    """
+    from memory_mcp.core.migrations import vector_search_available
+
+    if config.vector_engine not in VECTOR_ENGINES:
+        raise ValueError(
+            f"Unknown vector engine: {config.vector_engine} "
+            f"(expected one of {', '.join(VECTOR_ENGINES)})"
+        )
+    if config.vector_engine == "atlas":
+        return None
+    if config.vector_engine == "auto" and await vector_search_available(db):
+        return None
+    logger.info("Atlas Vector Search unavailable or disabled — using the local vector engine.")
+    engine = LocalVectorEngine(db, config, persist=persist, lazy=lazy)
+    if lazy:
+        for collection, field in _COLLECTIONS.items():
+            newest = await db[collection].find_one({}, {field: 1}, sort=[(field, -1)])
+            engine.watermarks[collection] = newest.get(field) if newest else None
+        engine._synced_at = time.monotonic()
+        return engine
+    engine.load()
+    await engine.sync()
+    return engine
@@ -1,15 +1,41 @@
 """Core memory service — store, recall, delete, evolve."""
 
+import asyncio
 import logging
-import math
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
 from bson import ObjectId
+from pymongo import UpdateMany, UpdateOne
+from pymongo.errors import OperationFailure
 
+from memory_mcp.core.collections import MEMORIES, vector_filter
 from memory_mcp.core.config import MCPConfig
+from memory_mcp.core.cursors import check_page, decode_cursor, encode_cursor
+from memory_mcp.services.candidate_tuner import candidate_count
+from memory_mcp.services.diversity import embedding_matrix, mmr, pool_size, validate_diversity
+from memory_mcp.services.local_text import tokenize
+from memory_mcp.services.query_embeddings import embed_within
+from memory_mcp.services.query_planner import ANN, EXACT
+from memory_mcp.services.working_set import WORKING_SET_PROJECTION, UserVectors
 
 logger = logging.getLogger(__name__)
 
+# Plans of recall pages served without a query embedding.
+TEXT = "text"
+RECENT = "recent"
+DEGRADED_PLANS = (TEXT, RECENT)
+
+# Nearest LTM neighbours kept per memory (the evolve_memory search depth),
+# and how many links related_memories follows from the seed at most.
+NEIGHBOR_LINKS = 5
+MAX_RELATED_DEPTH = 3
+
+# Fields a conversation context turn is built from.
+CONVERSATION_PROJECTION = {
+    "tier": 1, "content": 1, "summary": 1, "message_type": 1, "created_at": 1,
+}
+
 
 def _sanitize_doc(doc: dict) -> None:
     """Convert BSON types (ObjectId, datetime) to JSON-safe strings in place."""
@@ -20,6 +46,36 @@ def _sanitize_doc(doc: dict) -> None:
             doc[key] = val.isoformat()
         elif isinstance(val, dict):
             _sanitize_doc(val)
+        elif isinstance(val, list):
+            # e.g. neighbors: [{"_id": ObjectId, "score": float}]
+            for item in val:
+                if isinstance(item, dict):
+                    _sanitize_doc(item)
+            doc[key] = [str(item) if isinstance(item, ObjectId) else item for item in val]
+
+
+def _utc_timestamp(value: datetime | None, default: float) -> float:
+    """Epoch seconds for ``value``; naive datetimes are taken as UTC."""
+    if value is None:
+        return default
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _time_window(time_range: dict | None) -> dict | None:
+    """``created_at`` bounds from ``{"start", "end"}`` ISO 8601 values (naive is UTC)."""
+    window = {}
+    for key, op in (("start", "$gte"), ("end", "$lte")):
+        value = (time_range or {}).get(key)
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        window[op] = value
+    return window or None
 
 
 class MemoryService:
@@ -29,10 +85,56 @@ class MemoryService:
     via ``_base_filter()``.
     """
 
-    def __init__(self, memories_collection, config: MCPConfig, providers) -> None:
+    def __init__(
+        self, memories_collection, config: MCPConfig, providers,
+        access_tracker=None, recall_cache=None, query_embeddings=None,
+        candidate_tuner=None, planner=None, working_set=None, fresh_overlay=None,
+        vector_engine=None, prefetcher=None,
+    ) -> None:
         self.memories = memories_collection
         self.config = config
         self.providers = providers
+        # When set, access counters are buffered write-behind instead of
+        # updated inline on every recall.
+        self.access_tracker = access_tracker
+        # When set, recall results are cached until the user's next write.
+        self.recall_cache = recall_cache
+        # When set, query embeddings are cached (continuation pages reuse them).
+        self.query_embeddings = query_embeddings
+        # When set, numCandidates follows the tuned per-site multipliers.
+        self.candidate_tuner = candidate_tuner
+        # When set, small users are scored exactly in process instead of
+        # through $vectorSearch.
+        self.planner = planner
+        # When set (with a planner), exact-plan users keep their embeddings
+        # in process between recalls.
+        self.working_set = working_set
+        # When set, this process's own inserts are merged into ANN results
+        # until the vector index returns them.
+        self.fresh_overlay = fresh_overlay
+        # When set, searches run on the in-process engine instead of
+        # $vectorSearch (deployments without Atlas Search).
+        self.vector_engine = vector_engine
+        # When set (with a recall cache), store_stm recalls the last human
+        # message in the background for the follow-up recall_memory.
+        self.prefetcher = prefetcher
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop cached search results after a write to ``user_id``'s memories."""
+        if self.recall_cache is not None:
+            self.recall_cache.bump(user_id)
+
+    def _track_inserts(self, user_id: str, docs: list[dict], inserted_ids: list) -> None:
+        """Make freshly inserted memories visible to this process's searches."""
+        if self.working_set is None and self.fresh_overlay is None and self.vector_engine is None:
+            return
+        docs = [{**doc, "_id": _id} for doc, _id in zip(docs, inserted_ids)]
+        if self.vector_engine is not None:
+            self.vector_engine.add("memories", docs)
+        if self.working_set is not None:
+            self.working_set.add(user_id, docs)
+        if self.fresh_overlay is not None:
+            self.fresh_overlay.add(user_id, docs)
 
     def _retention_ttl(self, retention_tier: str) -> timedelta:
         """Return TTL for a given retention tier."""
@@ -94,6 +196,10 @@ class MemoryService:
 
         result = await self.memories.insert_many(docs)
         stm_ids = result.inserted_ids
+        self.invalidate(user_id)
+        if self.planner is not None:
+            self.planner.adjust(user_id, len(stm_ids))
+        self._track_inserts(user_id, docs, stm_ids)
 
         # Create LTM candidates for significant human messages
         ltm_docs = []
@@ -127,11 +233,22 @@ class MemoryService:
 
         if ltm_docs:
             try:
-                await self.memories.insert_many(ltm_docs)
+                ltm_result = await self.memories.insert_many(ltm_docs)
+                if self.planner is not None:
+                    self.planner.adjust(user_id, len(ltm_docs))
+                self._track_inserts(user_id, ltm_docs, ltm_result.inserted_ids)
             except Exception:
                 # Partial failure acceptable — STM persisted, LTM creation retryable
                 logger.exception("Failed to insert LTM candidates")
 
+        if self.prefetcher is not None and self.recall_cache is not None:
+            human = [i for i, m in enumerate(messages) if m["message_type"] == "human"]
+            if human:
+                i = human[-1]
+                self.prefetcher.schedule(
+                    user_id, self._prefetch_recall(user_id, messages[i]["content"], embeddings[i]),
+                )
+
         # Returns only STM document IDs.  LTM candidates are internal
         # implementation details not exposed to MCP clients.
         return [str(id_) for id_ in stm_ids]
@@ -144,19 +261,430 @@ class MemoryService:
         memory_type: str | None = None,
         tags: list[str] | None = None,
         limit: int | None = None,
+        diversity: float = 0,
+        conversation_id: str | None = None,
+        time_range: dict | None = None,
     ) -> list[dict]:
         """Semantic search with calibrated ranking and STM/LTM dedup."""
+        validate_diversity(diversity)
         limit = min(limit or 10, self.config.max_results_per_query)
-        query_embedding = await self.providers.embedding.generate_embedding(query)
-
-        # Build vector search filter
-        vs_filter: dict = {"user_id": user_id, "deleted_at": None}
-        if tier:
-            vs_filter["tier"] = {"$in": tier}
-        if memory_type:
-            vs_filter["memory_type"] = memory_type
-        if tags:
-            vs_filter["tags"] = {"$all": tags}
+        results, _, _ = await self._recall_first_page(
+            user_id, query, tier, memory_type, tags, limit, diversity,
+            conversation_id=conversation_id, time_range=time_range,
+        )
+        return results
+
+    async def recall_page(
+        self,
+        user_id: str,
+        query: str,
+        tier: list[str] | None = None,
+        memory_type: str | None = None,
+        tags: list[str] | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        diversity: float = 0,
+        conversation_id: str | None = None,
+        time_range: dict | None = None,
+    ) -> dict:
+        """``recall`` plus an opaque ``next_cursor`` for the following page.
+
+        With ``cursor``, the query, filters and page size come from the
+        cursor.  The next page reuses the cached query embedding and the
+        ranking time of the first page, re-runs the search ``n + limit``
+        deep and keeps results ranked after the last one served (by
+        ``final_score``, then ``_id``).
+
+        ``plan`` reports how the page was produced: ``ann``
+        (``$vectorSearch``), ``exact`` (in-process scoring) or ``cache``.
+        When the query embedding misses ``embedding_deadline_seconds`` it
+        is ``text`` (full-text search) or ``recent`` (newest memories),
+        ``degraded`` is set and the page has no cursor.
+
+        With ``diversity`` the page is an MMR pick from a larger candidate
+        pool; a continuation re-picks ``n + limit`` rows and serves the
+        ones after the first ``n``.
+        """
+        if cursor is None:
+            validate_diversity(diversity)
+            limit = min(limit or 10, self.config.max_results_per_query)
+            results, now, plan = await self._recall_first_page(
+                user_id, query, tier, memory_type, tags, limit, diversity,
+                conversation_id=conversation_id, time_range=time_range,
+            )
+            degraded = plan in DEGRADED_PLANS
+            state = {
+                "kind": "recall", "user_id": user_id, "query": query,
+                "tier": tier, "memory_type": memory_type, "tags": tags,
+                "conversation_id": conversation_id, "time_range": time_range,
+                "limit": limit, "now": now.timestamp(), "served": 0,
+                "diversity": diversity,
+            }
+            return {
+                "results": results,
+                # Later pages would be ranked by vector score.
+                "next_cursor": None if degraded else self._next_cursor(state, results),
+                "plan": plan,
+                "degraded": degraded,
+            }
+
+        state = self._decode_cursor(cursor, "recall", user_id)
+        limit = state["limit"]
+        now = datetime.fromtimestamp(state["now"], timezone.utc)
+        query_embedding = await self.embed_query(state["query"])
+        vs_filter = self._vector_filter(
+            user_id, state["tier"], state["memory_type"], state["tags"],
+            state.get("conversation_id"), state.get("time_range"),
+        )
+        depth = state["served"] + limit
+        diversity = state.get("diversity", 0)
+        ranked, plan = await self._search(
+            query_embedding, vs_filter,
+            pool_size(depth, diversity, self.config.diversity_candidate_factor), now,
+            keep_embeddings=bool(diversity),
+        )
+
+        if diversity:
+            # MMR picks depend on the rows picked before them: replay them.
+            results = (await self._diversify(ranked, depth, diversity))[state["served"]:]
+        else:
+            last_score, last_id = state["last_score"], state["last_id"]
+            results = [
+                r for r in ranked
+                if r["final_score"] < last_score
+                or (r["final_score"] == last_score and str(r["_id"]) > last_id)
+            ][:limit]
+        await self._record_access([r["_id"] for r in results])
+        self._finalize(results)
+        return {
+            "results": results,
+            "next_cursor": self._next_cursor(state, results),
+            "plan": plan,
+            "degraded": False,
+        }
+
+    def recall_cached(
+        self,
+        user_id: str,
+        query: str,
+        tier: list[str] | None = None,
+        memory_type: str | None = None,
+        tags: list[str] | None = None,
+        limit: int | None = None,
+        diversity: float = 0,
+        conversation_id: str | None = None,
+        time_range: dict | None = None,
+    ) -> bool:
+        """Whether ``recall`` with these arguments would be a cache hit.
+
+        Includes pages stored by the prefetcher.  Tools ask before starting
+        a speculative query embedding, which a hit would not use.
+        """
+        if self.recall_cache is None:
+            return False
+        return self.recall_cache.peek(self.recall_cache.key(
+            "recall", user_id, query,
+            tier=tier, memory_type=memory_type, tags=tags,
+            limit=min(limit or 10, self.config.max_results_per_query),
+            diversity=diversity, conversation_id=conversation_id, time_range=time_range,
+        ))
+
+    def _decode_cursor(self, cursor: str, kind: str, user_id: str) -> dict:
+        """Decode ``cursor`` and hold it to this server's page caps."""
+        return check_page(
+            decode_cursor(cursor, kind, user_id),
+            self.config.max_results_per_query, self.config.pagination_max_depth,
+        )
+
+    def _next_cursor(self, state: dict, results: list[dict]) -> str | None:
+        """Cursor continuing after ``results``, or ``None`` when exhausted."""
+        served = state["served"] + len(results)
+        if len(results) < state["limit"] or served >= self.config.pagination_max_depth:
+            return None
+        return encode_cursor({
+            **state,
+            "served": served,
+            "last_score": results[-1]["final_score"],
+            "last_id": str(results[-1]["_id"]),
+        })
+
+    async def embed_query(self, query: str) -> list[float]:
+        """Embed a search query, through the query embedding cache if set."""
+        if self.query_embeddings is not None:
+            return await self.query_embeddings.embed(query)
+        return await self.providers.embedding.generate_embedding(query)
+
+    async def _recall_first_page(
+        self,
+        user_id: str,
+        query: str,
+        tier: list[str] | None,
+        memory_type: str | None,
+        tags: list[str] | None,
+        limit: int,
+        diversity: float = 0,
+        conversation_id: str | None = None,
+        time_range: dict | None = None,
+    ) -> tuple[list[dict], datetime, str]:
+        """First ``limit`` results, the time they were ranked at and the plan."""
+        cache_key = generation = None
+        if self.recall_cache is not None:
+            cache_key = self.recall_cache.key(
+                "recall", user_id, query,
+                tier=tier, memory_type=memory_type, tags=tags, limit=limit,
+                diversity=diversity, conversation_id=conversation_id, time_range=time_range,
+            )
+            cached = self.recall_cache.get(cache_key)
+            if cached is not None:
+                result_ids, cached_results, now = cached
+                await self._record_access(result_ids)
+                return [dict(r) for r in cached_results], now, "cache"
+            generation = self.recall_cache.generation(user_id)
+        if self.prefetcher is not None:
+            self.prefetcher.cancel(user_id)
+
+        query_embedding = await embed_within(
+            self.embed_query, query, self.config.embedding_deadline_seconds,
+        )
+        vs_filter = self._vector_filter(
+            user_id, tier, memory_type, tags, conversation_id, time_range,
+        )
+        now = datetime.now(timezone.utc)
+        pool = pool_size(limit, diversity, self.config.diversity_candidate_factor)
+        if query_embedding is None:
+            results, plan = await self._degraded_search(query, vs_filter, pool, now)
+        else:
+            results, plan = await self._search(
+                query_embedding, vs_filter, pool, now, keep_embeddings=bool(diversity),
+            )
+        if diversity:
+            results = await self._diversify(results, limit, diversity)
+
+        # Increment access_count on returned results
+        result_ids = [r["_id"] for r in results]
+        await self._record_access(result_ids)
+        self._finalize(results)
+
+        if cache_key is not None and plan not in DEGRADED_PLANS:
+            self.recall_cache.put(
+                cache_key, (result_ids, [dict(r) for r in results], now), generation,
+            )
+        return results, now, plan
+
+    async def _prefetch_recall(self, user_id: str, query: str, embedding: list[float]) -> None:
+        """Cache the first page of ``recall(user_id, query)`` ranked from ``embedding``.
+
+        No access is counted; a cache hit counts it when the page is served.
+        """
+        limit = min(10, self.config.max_results_per_query)
+        cache_key = self.recall_cache.key("recall", user_id, query, limit=limit)
+        generation = self.recall_cache.generation(user_id)
+        now = datetime.now(timezone.utc)
+        results, _ = await self._search(
+            embedding, self._vector_filter(user_id, None, None, None), limit, now,
+        )
+        result_ids = [r["_id"] for r in results]
+        self._finalize(results)
+        self.recall_cache.put(cache_key, (result_ids, results, now), generation)
+
+    async def recall_many(
+        self,
+        user_id: str,
+        queries: list[str],
+        tier: list[str] | None = None,
+        memory_type: str | None = None,
+        tags: list[str] | None = None,
+        limit: int | None = None,
+    ) -> dict:
+        """Run several recalls in one call.
+
+        All queries are embedded with one ``generate_query_embeddings_batch``
+        call and searched concurrently (at most
+        ``recall_batch_concurrency`` at a time).  A memory matched by
+        several queries is returned once in ``memories``; each entry of
+        ``results`` lists the ids ranked for its query.
+        """
+        if len(queries) > self.config.recall_batch_max_queries:
+            raise ValueError(
+                f"At most {self.config.recall_batch_max_queries} queries per batch "
+                f"(got {len(queries)})"
+            )
+        limit = min(limit or 10, self.config.max_results_per_query)
+        vs_filter = self._vector_filter(user_id, tier, memory_type, tags)
+
+        # (raw ids, sanitized docs) per query; cache hits are filled in first
+        found: list = [None] * len(queries)
+        cache_keys: list = [None] * len(queries)
+        generation = None
+        if self.recall_cache is not None:
+            generation = self.recall_cache.generation(user_id)
+            for i, query in enumerate(queries):
+                cache_keys[i] = self.recall_cache.key(
+                    "recall", user_id, query,
+                    tier=tier, memory_type=memory_type, tags=tags, limit=limit,
+                )
+                found[i] = self.recall_cache.get(cache_keys[i])
+
+        misses = [i for i, entry in enumerate(found) if entry is None]
+        if misses:
+            embeddings = await self.providers.embedding.generate_query_embeddings_batch(
+                [queries[i] for i in misses]
+            )
+            semaphore = asyncio.Semaphore(self.config.recall_batch_concurrency)
+            now = datetime.now(timezone.utc)
+
+            async def search(embedding):
+                async with semaphore:
+                    results, _ = await self._search(embedding, vs_filter, limit, now)
+                    return results
+
+            pages = await asyncio.gather(*(search(e) for e in embeddings))
+            for i, results in zip(misses, pages):
+                result_ids = [r["_id"] for r in results]
+                self._finalize(results)
+                found[i] = (result_ids, results, now)
+                if cache_keys[i] is not None:
+                    self.recall_cache.put(
+                        cache_keys[i], (result_ids, [dict(r) for r in results], now), generation,
+                    )
+
+        memories: list[dict] = []
+        unique_ids: list = []
+        seen: set = set()
+        per_query = []
+        for query, (result_ids, results, _) in zip(queries, found):
+            for memory_id, doc in zip(result_ids, results):
+                if memory_id not in seen:
+                    seen.add(memory_id)
+                    unique_ids.append(memory_id)
+                    memories.append(dict(doc))
+            per_query.append({"query": query, "memory_ids": [str(m) for m in result_ids]})
+
+        # One access per memory, however many queries matched it
+        await self._record_access(unique_ids)
+        return {"results": per_query, "memories": memories}
+
+    async def conversation_context(
+        self,
+        user_id: str,
+        conversation_id: str,
+        limit: int | None = None,
+        cursor: str | None = None,
+        full_turns: int | None = None,
+    ) -> dict:
+        """The latest turns of a conversation, newest page first.
+
+        One ``find`` on ``ix_memories_conversation`` sorted by
+        ``(created_at, _id)`` descending: no embedding, no vector search.
+        A page is returned oldest first; ``next_cursor`` continues with
+        the turns before it (keyset on the last ``created_at`` / ``_id``).
+
+        Turns are the STM messages while they live.  The LTM copy of a
+        message (``source_stm_id`` set) is only returned once its STM row
+        has expired, so each message appears once.  With ``full_turns``,
+        turns older than the ``full_turns`` most recent are returned as
+        their summary when enrichment has written one.
+        """
+        if cursor is None:
+            limit = min(limit or 20, self.config.max_results_per_query)
+            state = {
+                "kind": "conversation", "user_id": user_id,
+                "conversation_id": conversation_id, "limit": limit,
+                "full_turns": full_turns,
+                "now": datetime.now(timezone.utc).timestamp(), "served": 0,
+            }
+        else:
+            state = self._decode_cursor(cursor, "conversation", user_id)
+            limit = state["limit"]
+        now = datetime.fromtimestamp(state["now"], timezone.utc)
+        stm_expired = now - timedelta(hours=self.config.stm_ttl_hours)
+
+        query = self._base_filter(user_id, conversation_id=state["conversation_id"])
+        clauses = [{"$or": [
+            {"tier": "stm", "expires_at": {"$gt": now}},
+            {"tier": {"$ne": "stm"}, "source_stm_id": None},
+            {"tier": {"$ne": "stm"}, "created_at": {"$lte": stm_expired}},
+        ]}]
+        if "last_created" in state:
+            last_created = datetime.fromisoformat(state["last_created"])
+            last_id = ObjectId(state["last_id"])
+            clauses.append({"$or": [
+                {"created_at": {"$lt": last_created}},
+                {"created_at": last_created, "_id": {"$lt": last_id}},
+            ]})
+        query["$and"] = clauses
+
+        rows = await self.memories.find(
+            query, CONVERSATION_PROJECTION,
+            sort=[("created_at", -1), ("_id", -1)], limit=limit,
+        ).to_list(None)
+
+        next_cursor = None
+        served = state["served"] + len(rows)
+        if len(rows) == limit and served < self.config.pagination_max_depth:
+            next_cursor = encode_cursor({
+                **state, "served": served,
+                "last_created": rows[-1]["created_at"].isoformat(),
+                "last_id": str(rows[-1]["_id"]),
+            })
+
+        turns = []
+        for position, row in enumerate(rows, start=state["served"]):
+            summarize = state["full_turns"] is not None and position >= state["full_turns"]
+            summarized = summarize and bool(row.get("summary"))
+            turns.append({
+                "_id": row["_id"],
+                "tier": row.get("tier"),
+                "message_type": row.get("message_type"),
+                "content": row["summary"] if summarized else row.get("content"),
+                "summarized": summarized,
+                "created_at": row.get("created_at"),
+            })
+        turns.reverse()
+        for turn in turns:
+            _sanitize_doc(turn)
+        return {"turns": turns, "next_cursor": next_cursor}
+
+    def _vector_filter(
+        self,
+        user_id: str,
+        tier: list[str] | None,
+        memory_type: str | None,
+        tags: list[str] | None,
+        conversation_id: str | None = None,
+        time_range: dict | None = None,
+    ) -> dict:
+        """``$vectorSearch`` filter built from the vector index's filter fields."""
+        return vector_filter(
+            MEMORIES, user_id, tier=tier, memory_type=memory_type, tags=tags,
+            conversation_id=conversation_id, created_at=_time_window(time_range),
+        )
+
+    async def _search(
+        self, query_embedding: list[float], vs_filter: dict, limit: int, now: datetime,
+        keep_embeddings: bool = False,
+    ) -> tuple[list[dict], str]:
+        """Vector search, dedup and calibrated ranking.
+
+        Returns the raw documents and the plan used (``ann`` or ``exact``).
+        With ``keep_embeddings`` (for ``_diversify``) the documents are read
+        with their embeddings.
+        """
+        if self.planner is not None and await self.planner.choose(vs_filter["user_id"]) == EXACT:
+            candidates = await self._exact_candidates(
+                query_embedding, vs_filter, limit * 2, keep_embeddings,
+            )
+            if candidates is not None:
+                results = self._calibrated_rank(self._deduplicate(candidates), now)
+                return results[:limit], EXACT
+            self.planner.fell_back(vs_filter["user_id"])
+
+        if self.vector_engine is not None:
+            indexed = await self._local_search(
+                query_embedding, vs_filter, limit * 2, keep_embeddings=keep_embeddings,
+            )
+            results = self._calibrated_rank(self._deduplicate(indexed), now)[:limit]
+            return self._merge_fresh(results, indexed, query_embedding, vs_filter, limit, now), ANN
 
         pipeline = [
             {
@@ -164,7 +692,7 @@ class MemoryService:
                     "index": "memories_vector_index",
                     "path": "embedding",
                     "queryVector": query_embedding,
-                    "numCandidates": limit * 10,
+                    "numCandidates": candidate_count(self.candidate_tuner, "recall", limit),
                     "limit": limit * 2,  # Over-fetch for dedup
                     "filter": vs_filter,
                 }
@@ -172,40 +700,235 @@ class MemoryService:
             {"$addFields": {"vs_score": {"$meta": "vectorSearchScore"}}},
         ]
 
-        cursor = await self.memories.aggregate(pipeline)
-        results = await cursor.to_list(None)
+        if self.config.server_side_ranking:
+            # Dedup, score, sort and trim in the pipeline: only the final
+            # page — without embeddings — crosses the wire.
+            pipeline.extend(self._ranking_stages(limit, now, keep_embeddings))
+            cursor = await self.memories.aggregate(pipeline)
+            results = await cursor.to_list(None)
+            return self._merge_fresh(results, results, query_embedding, vs_filter, limit, now), ANN
 
-        if not results:
-            return []
+        cursor = await self.memories.aggregate(pipeline)
+        indexed = await cursor.to_list(None)
 
         # Deduplicate STM/LTM pairs by source_stm_id
-        results = self._deduplicate(results)
+        results = self._deduplicate(indexed)
 
         # Apply calibrated 3-component ranking (Section 4.2 of design spec)
-        now = datetime.now(timezone.utc)
         results = self._calibrated_rank(results, now)
 
         # Trim to limit
         results = results[:limit]
+        return self._merge_fresh(results, indexed, query_embedding, vs_filter, limit, now), ANN
 
-        # Increment access_count on returned results
-        if results:
-            result_ids = [r["_id"] for r in results]
-            await self.memories.update_many(
-                {"_id": {"$in": result_ids}},
-                {
-                    "$inc": {"access_count": 1},
-                    "$set": {"last_accessed": datetime.now(timezone.utc)},
-                },
-            )
+    async def _diversify(self, ranked: list[dict], limit: int, diversity: float) -> list[dict]:
+        """MMR pick of ``limit`` rows from ``ranked``, relevance being ``final_score``.
+
+        Embeddings still on the documents (``_search`` with
+        ``keep_embeddings``) are used as is; the others are read in one
+        query.
+        """
+        vectors = {r["_id"]: r["embedding"] for r in ranked if "embedding" in r}
+        missing = [r["_id"] for r in ranked if r["_id"] not in vectors]
+        if missing:
+            cursor = self.memories.find({"_id": {"$in": missing}}, {"embedding": 1})
+            vectors.update((d["_id"], d.get("embedding")) for d in await cursor.to_list(None))
+        relevance = np.fromiter(
+            (r["final_score"] for r in ranked), dtype=np.float32, count=len(ranked),
+        )
+        picks = mmr(relevance, embedding_matrix(ranked, vectors), limit, diversity)
+        return [ranked[i] for i in picks]
+
+    async def _degraded_search(
+        self, query: str, vs_filter: dict, limit: int, now: datetime,
+    ) -> tuple[list[dict], str]:
+        """Recall without a query embedding: full-text, else the newest memories.
+
+        BM25 / ``searchScore`` is scaled to [0, 1] by the best match and
+        stands in for ``vs_score`` in the calibrated ranking.  Without a
+        text index (no Atlas Search, no local engine) or query terms, the
+        most recent matching memories are ranked on recency and
+        importance alone.
+        """
+        if tokenize(query):
+            try:
+                matches = await self._text_candidates(query, vs_filter, limit * 2)
+            except OperationFailure as e:
+                logger.warning("Full-text fallback unavailable: %s", e)
+            else:
+                best = max((r["vs_score"] for r in matches), default=0) or 1
+                for r in matches:
+                    r["vs_score"] /= best
+                results = self._calibrated_rank(self._deduplicate(matches), now)
+                return results[:limit], TEXT
+
+        cursor = self.memories.find(
+            vs_filter, {"embedding": 0}, sort=[("created_at", -1)], limit=limit * 2,
+        )
+        recent = await cursor.to_list(None)
+        results = self._calibrated_rank(self._deduplicate(recent), now)
+        return results[:limit], RECENT
+
+    async def _text_candidates(self, query: str, vs_filter: dict, k: int) -> list[dict]:
+        """Top ``k`` full-text matches with their score in ``vs_score``."""
+        if self.vector_engine is not None:
+            ranked = await self.vector_engine.search_text(query, vs_filter, k)
+            results, missing = await self._fetch_ranked(vs_filter, ranked)
+            if missing:
+                self.vector_engine.remove("memories", vs_filter["user_id"], missing)
+            return results
+        cursor = await self.memories.aggregate([
+            {
+                "$search": {
+                    "index": "memories_fts_index",
+                    "compound": {
+                        "must": [{"text": {"query": query, "path": ["content", "summary"]}}],
+                        "filter": [{"equals": {"path": "user_id", "value": vs_filter["user_id"]}}],
+                    },
+                }
+            },
+            # tier / memory_type / tags are not in the search index.
+            {"$match": vs_filter},
+            {"$limit": k},
+            {"$addFields": {"vs_score": {"$meta": "searchScore"}}},
+            {"$project": {"embedding": 0}},
+        ])
+        return await cursor.to_list(None)
+
+    def _merge_fresh(
+        self, results: list[dict], indexed: list[dict], query_embedding: list[float],
+        vs_filter: dict, limit: int, now: datetime,
+    ) -> list[dict]:
+        """Merge not-yet-indexed inserts from the fresh overlay into ranked ANN results.
+
+        ``indexed`` is everything the index returned; those ids have caught
+        up and leave the overlay.  Fresh documents are ranked the same way
+        and merged by ``final_score``, keeping one of each STM/LTM pair.
+        """
+        if self.fresh_overlay is None:
+            return results
+        fresh = self.fresh_overlay.candidates(
+            query_embedding, vs_filter, limit * 2, exclude=[r["_id"] for r in indexed],
+        )
+        if not fresh:
+            return results
+        fresh = self._calibrated_rank(self._deduplicate(fresh), now)
+        merged = []
+        seen: set = set()
+        for r in sorted(results + fresh, key=lambda r: -r["final_score"]):
+            key = r.get("source_stm_id") or r["_id"]
+            if key not in seen:
+                seen.add(key)
+                merged.append(r)
+        return merged[:limit]
+
+    async def _exact_candidates(
+        self, query_embedding: list[float], vs_filter: dict, top: int,
+        keep_embeddings: bool = False,
+    ) -> list[dict] | None:
+        """Top ``top`` matches by exact cosine, scored like ``$vectorSearch``.
 
-        # Strip internal scores, sanitize BSON types for JSON serialization
+        Scores the user's working set when one is cached; otherwise reads
+        only the embeddings (and, to build a working set, the filter
+        fields) of the user's memories.  The winners are then fetched
+        without their embeddings, re-checked against ``vs_filter``.
+        Returns ``None`` when the user has more than
+        ``exact_search_max_memories`` matching memories.
+        """
+        user_id = vs_filter["user_id"]
+        scope = vs_filter
+        vectors = self.working_set.get(user_id) if self.working_set is not None else None
+        if vectors is None:
+            if self.working_set is not None:
+                version = self.working_set.version(user_id)
+                docs = await self._read_vectors(self._base_filter(user_id), WORKING_SET_PROJECTION)
+                if docs is None:
+                    return None
+                vectors = self.working_set.put(user_id, docs, version)
+            else:
+                docs = await self._read_vectors(vs_filter, {"embedding": 1})
+                if docs is None:
+                    return None
+                vectors = UserVectors(docs, len(query_embedding))
+                # Read with the full filter, and without the filter fields.
+                scope = {"user_id": user_id}
+
+        results, missing = await self._fetch_ranked(
+            vs_filter, vectors.top(query_embedding, scope, top),
+            keep_embeddings=keep_embeddings,
+        )
+        if self.working_set is not None and missing:
+            # Deleted or re-tiered since the working set was loaded.
+            self.working_set.discard(user_id, missing)
+        return results
+
+    async def _fetch_ranked(
+        self, vs_filter: dict, ranked: list[tuple], score_field: str = "vs_score",
+        keep_embeddings: bool = False,
+    ) -> tuple[list[dict], list]:
+        """Fetch ``(_id, score)`` winners in rank order.
+
+        Each is re-checked against ``vs_filter``; returns the documents
+        (score in ``score_field``, embeddings left out unless
+        ``keep_embeddings``) and the ids that no longer match.
+        """
+        if not ranked:
+            return [], []
+        cursor = self.memories.find(
+            {**vs_filter, "_id": {"$in": [memory_id for memory_id, _ in ranked]}},
+            None if keep_embeddings else {"embedding": 0},
+        )
+        by_id = {d["_id"]: d for d in await cursor.to_list(None)}
+        results = []
+        for memory_id, score in ranked:
+            doc = by_id.get(memory_id)
+            if doc is not None:
+                doc[score_field] = score
+                results.append(doc)
+        return results, [m for m, _ in ranked if m not in by_id]
+
+    async def _local_search(
+        self, query_embedding: list[float], vs_filter: dict, k: int,
+        score_field: str = "vs_score", keep_embeddings: bool = False,
+    ) -> list[dict]:
+        """``$vectorSearch`` equivalent on the local engine."""
+        ranked = await self.vector_engine.search("memories", query_embedding, vs_filter, k)
+        results, missing = await self._fetch_ranked(
+            vs_filter, ranked, score_field, keep_embeddings,
+        )
+        if missing:
+            self.vector_engine.remove("memories", vs_filter["user_id"], missing)
+        return results
+
+    async def _read_vectors(self, query: dict, projection: dict) -> list[dict] | None:
+        """Matching documents, or ``None`` past ``exact_search_max_memories``."""
+        max_exact = self.planner.max_exact
+        cursor = self.memories.find(query, projection, limit=max_exact + 1)
+        docs = await cursor.to_list(None)
+        return None if len(docs) > max_exact else docs
+
+    @staticmethod
+    def _finalize(results: list[dict]) -> None:
+        """Strip internal scores, sanitize BSON types for JSON serialization."""
         for r in results:
             r.pop("embedding", None)
             r.pop("vs_score", None)
             _sanitize_doc(r)
 
-        return results
+    async def _record_access(self, result_ids: list) -> None:
+        """Count one access for each recalled memory."""
+        if not result_ids:
+            return
+        if self.access_tracker is not None:
+            self.access_tracker.record(result_ids)
+            return
+        await self.memories.update_many(
+            {"_id": {"$in": result_ids}},
+            {
+                "$inc": {"access_count": 1},
+                "$set": {"last_accessed": datetime.now(timezone.utc)},
+            },
+        )
 
     def _calibrated_rank(self, results: list[dict], now: datetime) -> list[dict]:
         """Apply calibrated 3-component scoring and re-sort.
@@ -216,66 +939,114 @@ class MemoryService:
           recency    = exp(-age_days / 30)                                  [0, 1]
           importance = importance * min(1 + ln(access_count + 1), 3.0) / 3  [0, 1]
           relevance  = vs_score (cosine similarity)                         [0, 1]
+
+        The inputs are pulled into NumPy columns and scored in one
+        vectorized pass.  The stable argsort on ``-score`` keeps the
+        tie-breaking of ``list.sort(reverse=True)``: equal scores stay in
+        input order.
         """
+        if not results:
+            return results
         alpha = self.config.ranking_alpha
         beta = self.config.ranking_beta
         gamma = self.config.ranking_gamma
 
-        for r in results:
-            created_at = r.get("created_at", now)
-            if created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=timezone.utc)
-            age_days = max((now - created_at).total_seconds() / 86400, 0)
-            recency = math.exp(-age_days / 30)
+        now_ts = now.timestamp()
+        created_ts = np.fromiter(
+            (_utc_timestamp(r.get("created_at"), now_ts) for r in results),
+            dtype=np.float64, count=len(results),
+        )
+        importance = np.fromiter(
+            (r.get("importance", 0.5) for r in results), dtype=np.float64, count=len(results),
+        )
+        access_count = np.fromiter(
+            (r.get("access_count", 0) for r in results), dtype=np.float64, count=len(results),
+        )
+        relevance = np.fromiter(
+            (r.get("vs_score", 0) for r in results), dtype=np.float64, count=len(results),
+        )
 
-            importance = r.get("importance", 0.5)
-            access_count = r.get("access_count", 0)
-            importance_score = importance * min(1 + math.log(access_count + 1), 3.0) / 3.0
+        age_days = np.maximum((now_ts - created_ts) / 86400, 0)
+        recency = np.exp(-age_days / 30)
+        importance_score = importance * np.minimum(1 + np.log(access_count + 1), 3.0) / 3.0
+        scores = alpha * recency + beta * importance_score + gamma * relevance
 
-            relevance = r.get("vs_score", 0)
+        for r, score in zip(results, scores.tolist()):
+            r["final_score"] = score
+        order = np.argsort(-scores, kind="stable")
+        return [results[i] for i in order.tolist()]
 
-            r["final_score"] = alpha * recency + beta * importance_score + gamma * relevance
+    def _ranking_stages(
+        self, limit: int, now: datetime, keep_embeddings: bool = False,
+    ) -> list[dict]:
+        """Aggregation equivalent of ``_deduplicate`` + ``_calibrated_rank``.
 
-        results.sort(key=lambda r: r["final_score"], reverse=True)
-        return results
+        Appended after ``$vectorSearch``.  STM/LTM pairs are grouped on
+        ``source_stm_id`` (falling back to ``_id``) keeping the best
+        ``vs_score``; ties between equal scores may resolve differently
+        from the client-side path.
+        """
+        age_days = {"$max": [
+            {"$divide": [
+                {"$subtract": [now, {"$ifNull": ["$created_at", now]}]},
+                86_400_000,
+            ]},
+            0,
+        ]}
+        recency = {"$exp": {"$divide": [{"$multiply": [age_days, -1]}, 30]}}
+        importance_score = {"$divide": [
+            {"$multiply": [
+                {"$ifNull": ["$importance", 0.5]},
+                {"$min": [
+                    {"$add": [1, {"$ln": {"$add": [{"$ifNull": ["$access_count", 0]}, 1]}}]},
+                    3.0,
+                ]},
+            ]},
+            3.0,
+        ]}
+        relevance = {"$ifNull": ["$vs_score", 0]}
+
+        return [
+            *([] if keep_embeddings else [{"$project": {"embedding": 0}}]),
+            {"$sort": {"vs_score": -1}},
+            {"$group": {
+                "_id": {"$ifNull": ["$source_stm_id", "$_id"]},
+                "doc": {"$first": "$$ROOT"},
+            }},
+            {"$replaceRoot": {"newRoot": "$doc"}},
+            {"$addFields": {"final_score": {"$add": [
+                {"$multiply": [self.config.ranking_alpha, recency]},
+                {"$multiply": [self.config.ranking_beta, importance_score]},
+                {"$multiply": [self.config.ranking_gamma, relevance]},
+            ]}}},
+            {"$sort": {"final_score": -1, "_id": 1}},
+            {"$limit": limit},
+            {"$project": {"vs_score": 0}},
+        ]
 
     def _deduplicate(self, results: list[dict]) -> list[dict]:
         """Deduplicate STM/LTM pairs linked by source_stm_id.
 
         When both an STM document and its LTM candidate appear, keep the
-        higher-scoring one and suppress the other.
+        higher-scoring one and suppress the other.  A replacement moves to
+        the end of the output (as if removed and re-appended); emptied
+        slots are dropped in one pass at the end, so this stays O(n).
         """
-        seen_stm_ids: dict[ObjectId, dict] = {}
-        deduped = []
+        slots: list[dict | None] = []
+        slot_of: dict = {}  # STM id -> index in ``slots``
 
         for r in results:
-            source_stm_id = r.get("source_stm_id")
-            if source_stm_id:
-                # This is an LTM candidate — check if we already have its STM
-                if source_stm_id in seen_stm_ids:
-                    existing = seen_stm_ids[source_stm_id]
-                    if r.get("vs_score", 0) > existing.get("vs_score", 0):
-                        # Replace STM with this LTM
-                        deduped.remove(existing)
-                        deduped.append(r)
-                        seen_stm_ids[source_stm_id] = r
-                    # else: keep existing, skip this one
-                else:
-                    seen_stm_ids[source_stm_id] = r
-                    deduped.append(r)
-            else:
-                stm_id = r.get("_id")
-                if stm_id in seen_stm_ids:
-                    existing = seen_stm_ids[stm_id]
-                    if r.get("vs_score", 0) > existing.get("vs_score", 0):
-                        deduped.remove(existing)
-                        deduped.append(r)
-                        seen_stm_ids[stm_id] = r
-                else:
-                    seen_stm_ids[stm_id] = r
-                    deduped.append(r)
-
-        return deduped
+            key = r.get("source_stm_id") or r.get("_id")
+            index = slot_of.get(key)
+            if index is None:
+                slot_of[key] = len(slots)
+                slots.append(r)
+            elif r.get("vs_score", 0) > slots[index].get("vs_score", 0):
+                slots[index] = None
+                slot_of[key] = len(slots)
+                slots.append(r)
+
+        return [r for r in slots if r is not None]
 
     async def delete(
         self,
@@ -318,25 +1089,173 @@ class MemoryService:
             query_filter,
             {"$set": {"deleted_at": now, "is_deleted": True, "updated_at": now}},
         )
+        self.invalidate(user_id)
+        if self.planner is not None:
+            self.planner.adjust(user_id, -result.modified_count)
+        if self.working_set is not None:
+            if is_bulk:
+                self.working_set.evict(user_id)
+            else:
+                self.working_set.discard(user_id, [query_filter["_id"]])
+        if self.fresh_overlay is not None:
+            if is_bulk:
+                self.fresh_overlay.evict(user_id)
+            else:
+                self.fresh_overlay.remove(user_id, [query_filter["_id"]])
+        if self.vector_engine is not None and not is_bulk:
+            # Bulk-deleted rows drop out when the next search re-checks them.
+            self.vector_engine.remove("memories", user_id, [query_filter["_id"]])
+        if not is_bulk and result.modified_count:
+            # Links to bulk-deleted rows are pruned when related() meets them.
+            await self.unlink_neighbors(user_id, [query_filter["_id"]])
         return {"deleted_count": result.modified_count}
 
+    async def related(
+        self, user_id: str, memory_id: str, depth: int = 1, limit: int | None = None,
+    ) -> list[dict]:
+        """Memories reached from ``memory_id`` through stored neighbour links.
+
+        One ``$graphLookup`` over ``neighbors._id`` / ``_id`` walks up to
+        ``depth`` links; there is no embedding or vector search.  Results
+        carry ``related_score``, the product of the link scores along the
+        best path, and ``hops``, the links on that path after the first (0
+        for direct neighbours); they are ranked by ``related_score``.  Links
+        from the seed to deleted memories are pruned.
+        """
+        if not 1 <= depth <= MAX_RELATED_DEPTH:
+            raise ValueError(f"depth must be between 1 and {MAX_RELATED_DEPTH} (got {depth})")
+        limit = min(limit or 10, self.config.max_results_per_query)
+        seed_id = ObjectId(memory_id)
+        live = self._base_filter(user_id)
+        pipeline = [
+            {"$match": {**live, "_id": seed_id}},
+            {"$project": {"neighbors": 1}},
+            {"$graphLookup": {
+                "from": self.memories.name,
+                "startWith": "$neighbors._id",
+                "connectFromField": "neighbors._id",
+                "connectToField": "_id",
+                "as": "related",
+                "maxDepth": depth - 1,
+                "depthField": "hops",
+                "restrictSearchWithMatch": live,
+            }},
+            {"$project": {"related.embedding": 0}},
+        ]
+        cursor = await self.memories.aggregate(pipeline)
+        found = await cursor.to_list(None)
+        if not found:
+            return []
+        seed_links = found[0].get("neighbors") or []
+        by_id = {d["_id"]: d for d in found[0]["related"] if d["_id"] != seed_id}
+
+        dead = [link["_id"] for link in seed_links if link["_id"] not in by_id]
+        if dead:
+            await self.memories.update_one(
+                {"_id": seed_id}, {"$pull": {"neighbors": {"_id": {"$in": dead}}}},
+            )
+
+        # Best path score per memory, and that path's hops, relaxed one
+        # hop at a time.  The $graphLookup depth is the shortest path's.
+        scores: dict = {}
+        hops: dict = {}
+        frontier = {seed_id: 1.0}
+        for hop in range(depth):
+            reached = {}
+            for source, source_score in frontier.items():
+                links = seed_links if source == seed_id else by_id[source].get("neighbors") or []
+                for link in links:
+                    target = link["_id"]
+                    score = source_score * link["score"]
+                    if target in by_id and score > scores.get(target, 0):
+                        scores[target] = reached[target] = score
+                        hops[target] = hop
+            frontier = reached
+
+        results = sorted(
+            (by_id[memory] for memory in scores),
+            key=lambda d: (-scores[d["_id"]], str(d["_id"])),
+        )[:limit]
+        for doc in results:
+            doc["related_score"] = scores[doc["_id"]]
+            doc["hops"] = hops[doc["_id"]]
+        self._finalize(results)
+        return results
+
+    async def _link_neighbors(self, memory_id, similar: list[dict]) -> None:
+        """Store ``similar`` as ``memory_id``'s neighbours and link back to it.
+
+        Each neighbour keeps its own ``NEIGHBOR_LINKS`` best links, so the
+        back link only stays if it is among them.
+        """
+        links = [
+            {"_id": doc["_id"], "score": doc.get("score", 0)}
+            for doc in similar if doc["_id"] != memory_id
+        ][:NEIGHBOR_LINKS]
+        ops = [UpdateOne({"_id": memory_id}, {"$set": {"neighbors": links}})]
+        ops += [
+            UpdateOne(
+                {"_id": link["_id"], "neighbors._id": {"$ne": memory_id}},
+                {"$push": {"neighbors": {
+                    "$each": [{"_id": memory_id, "score": link["score"]}],
+                    "$sort": {"score": -1},
+                    "$slice": NEIGHBOR_LINKS,
+                }}},
+            )
+            for link in links
+        ]
+        await self.memories.bulk_write(ops, ordered=False)
+
+    async def unlink_neighbors(self, user_id: str, memory_ids: list) -> None:
+        """Drop links to deleted ``memory_ids`` from the user's memories."""
+        await self.memories.update_many(
+            {"user_id": user_id, "neighbors._id": {"$in": memory_ids}, "deleted_at": None},
+            {"$pull": {"neighbors": {"_id": {"$in": memory_ids}}}},
+        )
+
+    async def relink_neighbors(self, user_id: str, old_id, new_id) -> None:
+        """Point links to a merged-away memory at the memory replacing it.
+
+        Memories already linked to both just drop the old link.
+        """
+        await self.memories.bulk_write([
+            UpdateMany(
+                {"user_id": user_id, "neighbors._id": {"$all": [old_id, new_id]}, "deleted_at": None},
+                {"$pull": {"neighbors": {"_id": old_id}}},
+            ),
+            UpdateMany(
+                {"user_id": user_id, "neighbors._id": old_id, "deleted_at": None},
+                {"$set": {"neighbors.$[link]._id": new_id}},
+                array_filters=[{"link._id": old_id}],
+            ),
+        ])
+
     async def evolve_memory(
-        self, user_id: str, content: str, embedding: list[float]
+        self, user_id: str, content: str, embedding: list[float], memory_id=None,
     ) -> str:
-        """Check for similar memories and reinforce/merge/create."""
+        """Check for similar memories and reinforce/merge/create.
+
+        With ``memory_id`` (the memory being enriched), the similar LTM
+        memories found are also stored as its neighbour links.
+        """
+        if self.vector_engine is not None:
+            similar = await self._local_search(
+                embedding, vector_filter(MEMORIES, user_id, tier=["ltm"]), 5,
+                score_field="score",
+            )
+            if memory_id is not None:
+                await self._link_neighbors(memory_id, similar)
+            return await self._evolve(user_id, content, embedding, similar)
+
         pipeline = [
             {
                 "$vectorSearch": {
                     "index": "memories_vector_index",
                     "path": "embedding",
                     "queryVector": embedding,
-                    "numCandidates": 50,
+                    "numCandidates": candidate_count(self.candidate_tuner, "evolve", 5),
                     "limit": 5,
-                    "filter": {
-                        "user_id": user_id,
-                        "tier": "ltm",
-                        "deleted_at": None,
-                    },
+                    "filter": vector_filter(MEMORIES, user_id, tier=["ltm"]),
                 }
             },
             {"$addFields": {"score": {"$meta": "vectorSearchScore"}}},
@@ -344,7 +1263,14 @@ class MemoryService:
 
         cursor = await self.memories.aggregate(pipeline)
         similar = await cursor.to_list(None)
+        if memory_id is not None:
+            await self._link_neighbors(memory_id, similar)
+        return await self._evolve(user_id, content, embedding, similar)
 
+    async def _evolve(
+        self, user_id: str, content: str, embedding: list[float], similar: list[dict],
+    ) -> str:
+        """Reinforce, queue a merge or create, given the nearest LTM memories."""
         if not similar:
             return "created"
 
@@ -362,6 +1288,7 @@ class MemoryService:
                     "$inc": {"access_count": 1},
                 },
             )
+            self.invalidate(user_id)
             return "reinforced"
 
         if similarity > self.config.merge_threshold:
@@ -392,7 +1319,9 @@ class MemoryService:
                 "deleted_at": None,
                 "is_deleted": False,
             }
-            await self.memories.insert_one(merge_doc)
+            inserted = await self.memories.insert_one(merge_doc)
+            self.invalidate(user_id)
+            self._track_inserts(user_id, [merge_doc], [inserted.inserted_id])
             return "merge_queued"
 
         return "created"
@@ -0,0 +1,94 @@
+"""Speculative recall after ``store_memory``.
+
+The agent action after storing a human message is usually a
+``recall_memory`` about that message.  With ``PREFETCH_ENABLED``,
+``store_stm`` hands the last human message and the embedding it already
+computed for it to a ``RecallPrefetcher``.  The prefetcher ranks that
+recall (default ``limit``, no filters) in the background and stores the
+page in the ``RecallCache``, so a follow-up ``recall_memory`` with the
+message as its query is a cache hit: no embedding call, no vector search.
+Access counts are recorded when the cached page is served, not when it
+is prefetched.
+
+The work is speculative and bounded:
+
+- one prefetch per user: a newer message cancels the user's running one
+  (the write invalidates its page anyway);
+- a foreground recall that misses the cache cancels the user's prefetch
+  rather than competing with it;
+- at most ``PREFETCH_MAX_INFLIGHT`` prefetches run at once, and new ones
+  are dropped past that.
+
+The message is embedded as a document, not as a query.  Providers that
+embed the two differently (Voyage) rank the prefetched page from a
+slightly different vector than a fresh recall would.
+"""
+
+import asyncio
+import logging
+
+from memory_mcp.core.config import MCPConfig
+
+logger = logging.getLogger(__name__)
+
+
+class RecallPrefetcher:
+    """At most one background recall per user, at most ``max_inflight`` overall."""
+
+    def __init__(self, config: MCPConfig) -> None:
+        self.max_inflight = config.prefetch_max_inflight
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def schedule(self, user_id: str, work) -> bool:
+        """Run the coroutine ``work`` as ``user_id``'s prefetch.
+
+        Returns ``False`` (and closes ``work``) when the global bound is
+        reached.
+        """
+        self.cancel(user_id)
+        if len(self._tasks) >= self.max_inflight:
+            work.close()
+            self.dropped += 1
+            return False
+        task = asyncio.create_task(work)
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda t: self._done(user_id, t))
+        self.started += 1
+        return True
+
+    def cancel(self, user_id: str) -> None:
+        """Cancel ``user_id``'s running prefetch, if any."""
+        task = self._tasks.pop(user_id, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self) -> None:
+        for user_id in list(self._tasks):
+            self.cancel(user_id)
+
+    def _done(self, user_id: str, task: asyncio.Task) -> None:
+        if self._tasks.get(user_id) is task:
+            del self._tasks[user_id]
+        if task.cancelled():
+            self.cancelled += 1
+        elif task.exception() is not None:
+            self.failed += 1
+            logger.debug("Recall prefetch failed: %s", task.exception())
+        else:
+            self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._tasks),
+            "max_inflight": self.max_inflight,
+            "started": self.started,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
@@ -0,0 +1,119 @@
+"""Bounded in-process cache of query embeddings.
+
+Continuation pages of ``recall_memory`` / ``hybrid_search`` carry the
+query text in their cursor; looking its embedding up here means a page
+costs a search but no embedding call.  Vectors are kept as float64 NumPy
+arrays (about a quarter of the memory of a list of Python floats) and
+returned as exact ``list[float]`` copies.
+
+Concurrent ``embed`` calls for the same text share one provider call.
+``ServiceRegistry.check_access_and_embed`` relies on that: it ``start``s
+the embedding while the access checks run and ``abandon``s it when access
+is denied.
+
+``embed_within`` bounds an embedding call by ``EMBEDDING_DEADLINE_SECONDS``
+so searches can degrade to full-text results while a throttled provider
+catches up.
+"""
+
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from memory_mcp.core.config import MCPConfig
+
+logger = logging.getLogger(__name__)
+
+# Embeddings still running past their deadline, referenced until they finish.
+_late: set[asyncio.Task] = set()
+
+
+class QueryEmbeddingCache:
+    """LRU of query text -> embedding in front of an ``EmbeddingProvider``."""
+
+    def __init__(self, embedding_provider, config: MCPConfig) -> None:
+        self.embedding = embedding_provider
+        self.max_entries = config.query_embedding_cache_size
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        # Provider calls in flight, and how many ``embed`` calls await each.
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._waiting: Counter = Counter()
+
+    async def embed(self, query: str) -> list[float]:
+        cached = self._entries.get(query)
+        if cached is not None:
+            self._entries.move_to_end(query)
+            return cached.tolist()
+        task = self.start(query)
+        self._waiting[query] += 1
+        try:
+            # Shielded: one caller giving up must not cancel the others' call.
+            return list(await asyncio.shield(task))
+        finally:
+            self._waiting[query] -= 1
+            if not self._waiting[query]:
+                del self._waiting[query]
+
+    def clear(self) -> None:
+        """Drop every cached embedding; calls in flight still complete."""
+        self._entries.clear()
+
+    def start(self, query: str) -> asyncio.Task | None:
+        """Begin embedding ``query`` in the background; ``None`` if cached."""
+        if query in self._entries:
+            return None
+        task = self._inflight.get(query)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(query))
+            self._inflight[query] = task
+            task.add_done_callback(lambda t: self._fetched(query, t))
+        return task
+
+    def abandon(self, query: str) -> None:
+        """Cancel the call ``start`` began for ``query`` unless ``embed`` awaits it."""
+        task = self._inflight.get(query)
+        if task is not None and not self._waiting[query]:
+            task.cancel()
+
+    async def _fetch(self, query: str) -> list[float]:
+        vector = await self.embedding.generate_embedding(query)
+        self._entries[query] = np.asarray(vector, dtype=np.float64)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return vector
+
+    def _fetched(self, query: str, task: asyncio.Task) -> None:
+        if self._inflight.get(query) is task:
+            del self._inflight[query]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Query embedding failed: %s", task.exception())
+
+
+async def embed_within(embed, query: str, deadline: float) -> list[float] | None:
+    """``await embed(query)``, or ``None`` if it misses ``deadline`` or fails.
+
+    A late embedding keeps running in the background: with
+    ``QueryEmbeddingCache.embed`` as ``embed`` the next search for the
+    same query finds it cached.  ``deadline <= 0`` waits as long as the
+    provider takes and lets its errors propagate.
+    """
+    if deadline <= 0:
+        return await embed(query)
+    task = asyncio.ensure_future(embed(query))
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), deadline)
+    except asyncio.TimeoutError:
+        logger.warning("Query embedding exceeded %ss; serving degraded results", deadline)
+        _late.add(task)
+        task.add_done_callback(_late_done)
+    except Exception:
+        logger.warning("Query embedding failed; serving degraded results", exc_info=True)
+    return None
+
+
+def _late_done(task: asyncio.Task) -> None:
+    _late.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Late query embedding failed: %s", task.exception())
@@ -0,0 +1,78 @@
+"""Per-user choice between Atlas ANN and exact in-process vector scoring.
+
+``$vectorSearch`` with a ``user_id`` pre-filter costs a search-node round
+trip even when the user owns a handful of memories.  For small corpora
+it is cheaper to fetch the user's embeddings through the
+``ix_memories_user_tier_created`` index and score them with NumPy, and
+the result is exact rather than approximate.
+
+``QueryPlanner`` keeps a live-memory count per user.  A count is read
+with ``count_documents`` on first use (covered by the same partial
+index), adjusted in process by ``store_stm`` and ``delete``, and re-read
+after ``PLANNER_COUNT_TTL_SECONDS`` so that writes by other processes,
+consolidation and TTL expiry are picked up.  The count only selects a
+plan: the exact path reads at most ``EXACT_SEARCH_MAX_MEMORIES + 1``
+documents and falls back to ANN if the user turns out to be larger.
+"""
+
+import time
+
+from memory_mcp.core.config import MCPConfig
+
+ANN = "ann"
+EXACT = "exact"
+
+
+class QueryPlanner:
+    """Chooses ``ann`` or ``exact`` per user from maintained memory counts."""
+
+    def __init__(self, memories_collection, config: MCPConfig) -> None:
+        self.memories = memories_collection
+        self.max_exact = config.exact_search_max_memories
+        self.count_ttl_seconds = config.planner_count_ttl_seconds
+        # user_id -> [count, read_at]
+        self._counts: dict[str, list] = {}
+        self.plans = {ANN: 0, EXACT: 0}
+        self.fallbacks = 0
+
+    async def count(self, user_id: str) -> int:
+        """Live memories owned by ``user_id`` (cached)."""
+        entry = self._counts.get(user_id)
+        if entry is not None and time.monotonic() - entry[1] < self.count_ttl_seconds:
+            return entry[0]
+        count = await self.memories.count_documents({"user_id": user_id, "deleted_at": None})
+        self._counts[user_id] = [count, time.monotonic()]
+        return count
+
+    def adjust(self, user_id: str, delta: int) -> None:
+        """Apply a known insert (+) or delete (-) to a cached count."""
+        entry = self._counts.get(user_id)
+        if entry is not None:
+            entry[0] = max(entry[0] + delta, 0)
+
+    def forget(self, user_id: str) -> None:
+        """Drop the cached count so the next plan re-reads it."""
+        self._counts.pop(user_id, None)
+
+    async def choose(self, user_id: str) -> str:
+        if self.max_exact > 0 and await self.count(user_id) <= self.max_exact:
+            plan = EXACT
+        else:
+            plan = ANN
+        self.plans[plan] += 1
+        return plan
+
+    def fell_back(self, user_id: str) -> None:
+        """The exact plan found more than ``max_exact`` memories."""
+        self.fallbacks += 1
+        self.plans[EXACT] -= 1
+        self.plans[ANN] += 1
+        self.forget(user_id)
+
+    def stats(self) -> dict:
+        return {
+            "max_exact_memories": self.max_exact,
+            "users_tracked": len(self._counts),
+            "plans": dict(self.plans),
+            "fallbacks": self.fallbacks,
+        }
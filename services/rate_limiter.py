@@ -19,13 +19,14 @@ class RateLimiter:
         self.config = config
 
     async def check_rate_limit(
-        self, user_id: str, operation: str, max_requests: int | None = None,
+        self, user_id: str, operation: str, max_requests: int | None = None, cost: int = 1,
     ) -> bool:
         """Return True if within rate limit, False if exceeded.
 
         Records the operation attempt and checks against the rate limit window.
         When ``max_requests`` is provided (e.g. from a governance profile),
-        it overrides the global ``config.rate_limit_max_requests``.
+        it overrides the global ``config.rate_limit_max_requests``.  A request
+        doing ``cost`` operations (a batch) needs and records ``cost`` units.
         """
         if not self.config.rate_limit_enabled:
             return True
@@ -42,7 +43,7 @@ class RateLimiter:
             "timestamp": {"$gte": window_start},
         })
 
-        if count >= effective_max:
+        if count + cost > effective_max:
             logger.warning(
                 "Rate limit exceeded for user %s on %s: %d/%d",
                 user_id, operation, count, self.config.rate_limit_max_requests,
@@ -50,10 +51,16 @@ class RateLimiter:
             return False
 
         # Record this operation
-        await self.collection.insert_one({
-            "user_id": user_id,
-            "operation": operation,
-            "timestamp": now,
-        })
+        if cost == 1:
+            await self.collection.insert_one({
+                "user_id": user_id,
+                "operation": operation,
+                "timestamp": now,
+            })
+        else:
+            await self.collection.insert_many([
+                {"user_id": user_id, "operation": operation, "timestamp": now}
+                for _ in range(cost)
+            ])
 
         return True
@@ -0,0 +1,147 @@
+"""In-process result cache for ``recall_memory`` and ``hybrid_search``.
+
+Agents often repeat the same search within seconds.  ``RecallCache`` keeps
+recent result pages keyed by ``(kind, user_id, normalized query, filters,
+limit)`` so a repeat skips the embedding call and the vector search.
+
+Validity is tied to a per-user *generation* counter.  Every write path that
+can change a user's results — ``store_stm``, ``delete``, memory evolution,
+enrichment and consolidation — calls ``bump(user_id)``; entries stored
+under an older generation are never served again.  A value is stored under
+the generation read *before* its query started, so a write racing with
+the query leaves it stale rather than cached.
+
+Generations are per process.  Writes made by another process (other
+``HTTP_WORKERS``, a ``ROLE=worker`` fleet, ``WORKER_ISOLATION=process``)
+cannot bump them, so every entry also expires after
+``RECALL_CACHE_TTL_SECONDS``, which bounds staleness in those deployments.
+
+With ``WORKER_ISOLATION=thread`` the worker thread bumps generations of
+the request side's cache, so every access holds a lock.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from memory_mcp.core.config import MCPConfig
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivial variants share an entry."""
+    return " ".join(query.casefold().split())
+
+
+class RecallCache:
+    """Bounded LRU of search results with per-user generation invalidation."""
+
+    def __init__(self, config: MCPConfig) -> None:
+        self.config = config
+        self.max_entries = config.recall_cache_max_entries
+        self.ttl_seconds = config.recall_cache_ttl_seconds
+        # key -> (generation, stored_at, value)
+        self._entries: OrderedDict = OrderedDict()
+        self._generations: dict[str, int] = {}
+        # Bumped by writes that span users (e.g. consolidation forgetting).
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        kind: str,
+        user_id: str,
+        query: str,
+        *,
+        tier: list[str] | None = None,
+        memory_type: str | None = None,
+        tags: list[str] | None = None,
+        limit: int | None = None,
+        diversity: float = 0,
+        conversation_id: str | None = None,
+        time_range: dict | None = None,
+    ) -> tuple:
+        """Cache key for one search.  Tier and tag order does not matter."""
+        return (
+            kind,
+            user_id,
+            normalize_query(query),
+            tuple(sorted(tier)) if tier else None,
+            memory_type,
+            tuple(sorted(tags)) if tags else None,
+            limit,
+            diversity,
+            conversation_id,
+            tuple(sorted(time_range.items())) if time_range else None,
+        )
+
+    def generation(self, user_id: str) -> tuple[int, int]:
+        """Current generation for ``user_id`` — read this before querying."""
+        return (self._epoch, self._generations.get(user_id, 0))
+
+    def get(self, key: tuple):
+        """Return the cached value for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, stored_at, value = entry
+                if (
+                    generation == self.generation(key[1])
+                    and time.monotonic() - stored_at < self.ttl_seconds
+                ):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def peek(self, key: tuple) -> bool:
+        """Whether ``get(key)`` would hit, without counting or reordering."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return (
+                entry is not None
+                and entry[0] == self.generation(key[1])
+                and time.monotonic() - entry[1] < self.ttl_seconds
+            )
+
+    def put(self, key: tuple, value, generation: tuple[int, int]) -> None:
+        """Store ``value`` as computed under ``generation``."""
+        with self._lock:
+            if generation != self.generation(key[1]):
+                return  # a write landed while the query ran
+            self._entries[key] = (generation, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self, user_id: str) -> None:
+        """Invalidate every cached result for ``user_id``."""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def evict(self, user_id: str) -> None:
+        """Invalidate ``user_id``'s results and drop them from memory."""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in [k for k in self._entries if k[1] == user_id]:
+                del self._entries[key]
+
+    def bump_all(self) -> None:
+        """Invalidate every cached result."""
+        with self._lock:
+            self._epoch += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
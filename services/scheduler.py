@@ -0,0 +1,443 @@
+"""Background job scheduler — interval/cron schedules, jitter, runtime budgets.
+
+Hosts the periodic background work (enrichment, consolidation, audit flush)
+in one place instead of a hand-rolled ``while`` loop per worker.  Each job
+gets its own asyncio task that:
+
+- waits for the next fire time of its schedule (fixed interval or a
+  5-field cron expression, evaluated in UTC) plus random jitter,
+- never overlaps with itself (one runner per job),
+- is cancelled when it exceeds its ``max_runtime_seconds`` budget,
+- records per-run stats (duration, items, errors) to the ``job_runs``
+  collection,
+- can be paused, resumed, or triggered immediately via ``manage_job``.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from memory_mcp.core.config import MCPConfig
+
+logger = logging.getLogger(__name__)
+
+JobFunc = Callable[[], Awaitable[int | dict | None]]
+
+
+# ─── Schedules ───────────────────────────────────────────────────
+
+
+class IntervalSchedule:
+    """Fire every ``seconds`` seconds."""
+
+    def __init__(self, seconds: float) -> None:
+        if seconds < 0:
+            raise ValueError("Interval must be non-negative")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def describe(self) -> str:
+        return f"every {self.seconds:g}s"
+
+
+class CronSchedule:
+    """Minimal 5-field cron expression: ``minute hour day-of-month month day-of-week``.
+
+    Supports ``*``, single values, ranges (``1-5``), lists (``1,15``) and
+    steps (``*/15``, ``0-30/10``).  Day-of-week uses 0-6 with 0 = Sunday
+    (7 is accepted as Sunday).  As in classic cron, when both day-of-month
+    and day-of-week are restricted a day matches if *either* does.
+    """
+
+    _RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str) -> None:
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(
+                f"Cron expression must have 5 fields, got {len(parts)}: {expression!r}"
+            )
+        self.expression = expression
+        fields = [
+            self._parse_field(part, lo, hi)
+            for part, (lo, hi) in zip(parts, self._RANGES)
+        ]
+        self.minutes, self.hours, self.days, self.months, dows = fields
+        self.weekdays = {d % 7 for d in dows}
+        self._dom_restricted = parts[2] != "*"
+        self._dow_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(field: str, lo: int, hi: int) -> set[int]:
+        values: set[int] = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_str = item.split("/", 1)
+                step = int(step_str)
+                if step <= 0:
+                    raise ValueError(f"Invalid cron step: {step_str!r}")
+            if item == "*":
+                start, end = lo, hi
+            elif "-" in item:
+                start_str, end_str = item.split("-", 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(item)
+                end = hi if step > 1 else start
+            if start < lo or end > hi or start > end:
+                raise ValueError(f"Cron field {field!r} out of range {lo}-{hi}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        dom_ok = moment.day in self.days
+        dow_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self._dom_restricted and self._dow_restricted:
+            return dom_ok or dow_ok
+        return dom_ok and dow_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first matching minute strictly after ``moment``."""
+        candidate = moment.astimezone(timezone.utc).replace(second=0, microsecond=0)
+        candidate += timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+    def describe(self) -> str:
+        return f"cron '{self.expression}'"
+
+
+def parse_schedule(spec: str | float | int) -> IntervalSchedule | CronSchedule:
+    """Build a schedule from a number of seconds or a cron expression string."""
+    if isinstance(spec, (int, float)):
+        return IntervalSchedule(spec)
+    spec = spec.strip()
+    try:
+        return IntervalSchedule(float(spec))
+    except ValueError:
+        return CronSchedule(spec)
+
+
+# ─── Jobs ────────────────────────────────────────────────────────
+
+
+class ScheduledJob:
+    """A named unit of background work plus its runtime state."""
+
+    def __init__(
+        self,
+        name: str,
+        func: JobFunc,
+        schedule: IntervalSchedule | CronSchedule,
+        jitter_seconds: float = 0.0,
+        max_runtime_seconds: float | None = None,
+        run_on_start: bool = False,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.schedule = schedule
+        self.jitter_seconds = jitter_seconds
+        self.max_runtime_seconds = max_runtime_seconds
+        self.run_on_start = run_on_start
+        self.paused = False
+        self.running = False
+        self.next_run_at: datetime | None = None
+        self.last_run: dict | None = None
+        self.run_count = 0
+        self._wake = asyncio.Event()
+        self._manual = False
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "schedule": self.schedule.describe(),
+            "paused": self.paused,
+            "running": self.running,
+            "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+            "run_count": self.run_count,
+            "last_run": _public_stats(self.last_run),
+        }
+
+
+def _public_stats(stats: dict | None) -> dict | None:
+    """Return a JSON-safe copy of a run-stats document."""
+    if stats is None:
+        return None
+    return {
+        k: v.isoformat() if isinstance(v, datetime) else v
+        for k, v in stats.items()
+        if k != "_id"
+    }
+
+
+def _summarize_result(result: int | dict | None) -> tuple[int, int, dict]:
+    """Normalize a job's return value into (items, errors, details)."""
+    if result is None:
+        return 0, 0, {}
+    if isinstance(result, bool):
+        return int(result), 0, {}
+    if isinstance(result, int):
+        return result, 0, {}
+    details = dict(result)
+    errors = int(details.pop("errors", 0) or 0)
+    if "items" in details:
+        items = int(details.pop("items") or 0)
+    else:
+        items = sum(v for v in details.values() if isinstance(v, int) and not isinstance(v, bool))
+    return items, errors, details
+
+
+# ─── Scheduler ───────────────────────────────────────────────────
+
+
+class JobScheduler:
+    """Runs registered jobs on their schedules until stopped.
+
+    ``job_runs_collection`` may be None, in which case run stats are kept
+    in memory only (``status()`` still reports the last run).
+    """
+
+    def __init__(self, job_runs_collection, config: MCPConfig) -> None:
+        self.job_runs = job_runs_collection
+        self.config = config
+        self._jobs: dict[str, ScheduledJob] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @property
+    def jobs(self) -> dict[str, ScheduledJob]:
+        return self._jobs
+
+    def add_job(
+        self,
+        name: str,
+        func: JobFunc,
+        schedule: str | float | int | IntervalSchedule | CronSchedule,
+        *,
+        jitter_seconds: float | None = None,
+        max_runtime_seconds: float | None = None,
+        run_on_start: bool = False,
+    ) -> ScheduledJob:
+        """Register a job.  Must be called before ``start()``."""
+        if name in self._jobs:
+            raise ValueError(f"Job '{name}' is already registered")
+        if not isinstance(schedule, (IntervalSchedule, CronSchedule)):
+            schedule = parse_schedule(schedule)
+        if jitter_seconds is None:
+            jitter_seconds = self._default_jitter(schedule)
+        job = ScheduledJob(
+            name, func, schedule,
+            jitter_seconds=jitter_seconds,
+            max_runtime_seconds=max_runtime_seconds,
+            run_on_start=run_on_start,
+        )
+        self._jobs[name] = job
+        return job
+
+    def _default_jitter(self, schedule: IntervalSchedule | CronSchedule) -> float:
+        """Jitter proportional to the interval, capped at scheduler_max_jitter_seconds."""
+        if isinstance(schedule, IntervalSchedule):
+            period = schedule.seconds
+        else:
+            now = datetime.now(timezone.utc)
+            first = schedule.next_after(now)
+            period = (schedule.next_after(first) - first).total_seconds()
+        return min(
+            period * self.config.scheduler_jitter_ratio,
+            self.config.scheduler_max_jitter_seconds,
+        )
+
+    def start(self) -> None:
+        """Launch one runner task per registered job."""
+        for name, job in self._jobs.items():
+            if name not in self._tasks:
+                self._tasks[name] = asyncio.create_task(self._job_loop(job), name=f"job:{name}")
+        logger.info("Scheduler started with %d job(s): %s", len(self._jobs), ", ".join(self._jobs))
+
+    async def stop(self) -> None:
+        """Cancel all runner tasks and wait for them to exit."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    # ── Control ──────────────────────────────────────────────────
+
+    def _get(self, name: str) -> ScheduledJob:
+        job = self._jobs.get(name)
+        if job is None:
+            raise KeyError(f"Unknown job '{name}'. Known jobs: {sorted(self._jobs)}")
+        return job
+
+    def trigger(self, name: str) -> str:
+        """Request an immediate run.  Returns 'triggered' or 'already_running'."""
+        job = self._get(name)
+        if job.running:
+            return "already_running"
+        job._manual = True
+        job._wake.set()
+        return "triggered"
+
+    def pause(self, name: str) -> None:
+        """Skip scheduled runs until resumed.  Manual triggers still run."""
+        self._get(name).paused = True
+
+    def resume(self, name: str) -> None:
+        self._get(name).paused = False
+
+    def status(self, name: str | None = None) -> list[dict]:
+        if name is not None:
+            return [self._get(name).status()]
+        return [job.status() for job in self._jobs.values()]
+
+    def job_names(self) -> list[str]:
+        return list(self._jobs)
+
+    async def control(self, action: str, name: str | None = None) -> dict:
+        """Apply a control action and return ``{"result"?, "jobs"}``.
+
+        This is the interface shared with ``SchedulerGroup`` and the
+        isolated worker hosts, so callers need not know where a job runs.
+        """
+        result: dict = {}
+        if action == "run":
+            result["result"] = self.trigger(name)
+        elif action == "pause":
+            self.pause(name)
+        elif action == "resume":
+            self.resume(name)
+        elif action != "status":
+            raise ValueError(f"Unknown job action '{action}'")
+        result["jobs"] = self.status(name)
+        return result
+
+    # ── Execution ────────────────────────────────────────────────
+
+    async def _job_loop(self, job: ScheduledJob) -> None:
+        if job.run_on_start:
+            await self.run_job(job.name, trigger="startup")
+        while True:
+            now = datetime.now(timezone.utc)
+            jitter = random.uniform(0, job.jitter_seconds) if job.jitter_seconds > 0 else 0.0
+            job.next_run_at = job.schedule.next_after(now) + timedelta(seconds=jitter)
+            delay = max((job.next_run_at - now).total_seconds(), 0.0)
+            try:
+                await asyncio.wait_for(job._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            job._wake.clear()
+            manual, job._manual = job._manual, False
+            if job.paused and not manual:
+                continue
+            await self.run_job(job.name, trigger="manual" if manual else "schedule")
+
+    async def run_job(self, name: str, trigger: str = "manual") -> dict:
+        """Execute a job once under its runtime budget and record the run.
+
+        Never raises (other than cancellation); failures are captured in
+        the returned stats document.
+        """
+        job = self._get(name)
+        if job.running:
+            return {"job": name, "status": "skipped", "reason": "already_running"}
+
+        job.running = True
+        started_at = datetime.now(timezone.utc)
+        start = time.monotonic()
+        items, errors, details, error = 0, 0, {}, None
+        try:
+            if job.max_runtime_seconds:
+                result = await asyncio.wait_for(job.func(), timeout=job.max_runtime_seconds)
+            else:
+                result = await job.func()
+            items, errors, details = _summarize_result(result)
+            status = "success"
+        except asyncio.TimeoutError:
+            status = "timeout"
+            error = f"exceeded max runtime of {job.max_runtime_seconds:g}s"
+            logger.warning("Job '%s' %s — cancelled.", name, error)
+        except asyncio.CancelledError:
+            job.running = False
+            raise
+        except Exception as exc:
+            status = "error"
+            error = str(exc)
+            errors += 1
+            logger.exception("Job '%s' failed", name)
+        finally:
+            job.running = False
+
+        stats = {
+            "job": name,
+            "trigger": trigger,
+            "status": status,
+            "started_at": started_at,
+            "finished_at": datetime.now(timezone.utc),
+            "duration_ms": int((time.monotonic() - start) * 1000),
+            "items": items,
+            "errors": errors,
+            "details": details,
+            "error": error,
+        }
+        job.last_run = stats
+        job.run_count += 1
+        await self._record(stats)
+        return _public_stats(stats)
+
+    async def _record(self, stats: dict) -> None:
+        if self.job_runs is None:
+            return
+        try:
+            await self.job_runs.insert_one(dict(stats))
+        except Exception:
+            logger.warning("Failed to persist stats for job '%s'.", stats["job"], exc_info=True)
+
+
+class SchedulerGroup:
+    """Routes control actions to whichever scheduler owns the job.
+
+    Members are ``JobScheduler`` instances or worker hosts exposing the
+    same ``job_names()`` / ``control()`` pair.
+    """
+
+    def __init__(self, *members) -> None:
+        self.members = members
+
+    def job_names(self) -> list[str]:
+        return [name for member in self.members for name in member.job_names()]
+
+    async def control(self, action: str, name: str | None = None) -> dict:
+        if name is not None:
+            for member in self.members:
+                if name in member.job_names():
+                    return await member.control(action, name)
+            raise KeyError(f"Unknown job '{name}'. Known jobs: {sorted(self.job_names())}")
+        if action != "status":
+            raise ValueError(f"job name is required for action '{action}'")
+        jobs: list[dict] = []
+        for member in self.members:
+            jobs.extend((await member.control("status"))["jobs"])
+        return {"jobs": jobs}
@@ -0,0 +1,325 @@
+"""Isolated hosting for the heavy background jobs (enrichment, consolidation).
+
+With ``WORKER_ISOLATION=none`` (the default) these jobs share the request
+event loop, as registered by ``register_worker_jobs``.  Their JSON parsing,
+document building and large ``to_list`` materializations then show up as
+loop lag on interactive tool calls.  The isolated modes move them off the
+request loop entirely:
+
+- ``thread`` — a dedicated thread running its own event loop,
+  ``AsyncMongoClient``, providers and ``JobScheduler``.
+- ``process`` — a worker process spawned by ``memory-mcp`` with the same
+  runtime; control messages travel over a ``multiprocessing`` pipe.
+
+Both hosts expose ``job_names()`` / ``control()`` so ``manage_job`` reaches
+them through a ``SchedulerGroup`` exactly like an in-loop scheduler.  The
+audit flush job is always per-process and stays on the request loop.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.core.database import DatabaseManager
+from memory_mcp.providers.manager import ProviderManager
+from memory_mcp.services.consolidation import ConsolidationWorker
+from memory_mcp.services.enrichment import EnrichmentWorker
+from memory_mcp.services.local_vector import open_vector_engine
+from memory_mcp.services.memory import MemoryService
+from memory_mcp.services.prompt_library import PromptLibrary
+from memory_mcp.services.scheduler import JobScheduler
+
+logger = logging.getLogger(__name__)
+
+WORKER_JOBS = ("enrichment", "consolidation")
+ISOLATION_MODES = ("none", "thread", "process")
+
+
+def register_worker_jobs(
+    scheduler: JobScheduler,
+    config: MCPConfig,
+    enrichment_worker: EnrichmentWorker,
+    consolidation_worker: ConsolidationWorker,
+) -> None:
+    """Register the enrichment and consolidation jobs on ``scheduler``.
+
+    Cron schedules (``ENRICHMENT_SCHEDULE`` / ``CONSOLIDATION_SCHEDULE``)
+    take precedence over the interval settings.  Interval-scheduled jobs
+    run once at startup, as before.
+    """
+    scheduler.add_job(
+        "enrichment", enrichment_worker.run_once,
+        config.enrichment_schedule or config.enrichment_interval_seconds,
+        max_runtime_seconds=config.enrichment_max_runtime_seconds,
+        run_on_start=config.enrichment_schedule is None,
+    )
+    scheduler.add_job(
+        "consolidation", consolidation_worker.run_once,
+        config.consolidation_schedule or config.consolidation_interval_hours * 3600,
+        max_runtime_seconds=config.consolidation_max_runtime_seconds,
+        run_on_start=config.consolidation_schedule is None,
+    )
+
+
+class WorkerRuntime:
+    """Everything the worker jobs need, bound to the *current* event loop."""
+
+    def __init__(self, db_manager: DatabaseManager, scheduler: JobScheduler) -> None:
+        self.db_manager = db_manager
+        self.scheduler = scheduler
+
+    @classmethod
+    async def open(cls, config: MCPConfig, recall_cache=None) -> "WorkerRuntime":
+        """Connect a private Mongo client and build the worker services."""
+        db_manager = await DatabaseManager.connect(config)
+        vector_engine = await open_vector_engine(db_manager.db, config, persist=False, lazy=True)
+        return cls.build(db_manager, config, recall_cache, vector_engine)
+
+    @classmethod
+    def build(
+        cls, db_manager: DatabaseManager, config: MCPConfig, recall_cache=None,
+        vector_engine=None,
+    ) -> "WorkerRuntime":
+        """Build the worker services on an already connected manager.
+
+        ``recall_cache`` is the request side's ``RecallCache`` when it lives
+        in the same process, so worker writes invalidate it directly.
+        ``vector_engine`` is a private, lazy ``LocalVectorEngine`` for
+        memory evolution on deployments without Atlas Vector Search.
+        """
+        db = db_manager.db
+        providers = ProviderManager(config)
+        memory_service = MemoryService(
+            db["memories"], config, providers, recall_cache=recall_cache,
+            vector_engine=vector_engine,
+        )
+        prompt_library = PromptLibrary(db["prompts"], config)
+
+        scheduler = JobScheduler(db["job_runs"], config)
+        register_worker_jobs(
+            scheduler, config,
+            EnrichmentWorker(
+                db["memories"], config, providers, memory_service,
+                prompt_library=prompt_library,
+            ),
+            ConsolidationWorker(
+                db["memories"], config, providers, recall_cache=recall_cache,
+            ),
+        )
+        return cls(db_manager, scheduler)
+
+    async def close(self) -> None:
+        await self.scheduler.stop()
+        await self.db_manager.close()
+
+
+# ─── Thread host ─────────────────────────────────────────────────
+
+
+class ThreadWorkerHost:
+    """Runs the worker jobs on a dedicated thread with its own event loop."""
+
+    def __init__(self, config: MCPConfig, recall_cache=None) -> None:
+        self.config = config
+        # Shared with the request loop; RecallCache locks its state.
+        self.recall_cache = recall_cache
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_event: asyncio.Event | None = None
+        self._scheduler: JobScheduler | None = None
+        self._ready = threading.Event()
+
+    def job_names(self) -> list[str]:
+        return list(WORKER_JOBS)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._thread_main, name="memory-mcp-workers", daemon=True,
+        )
+        self._thread.start()
+        logger.info("Background workers started on isolated thread.")
+
+    def _thread_main(self) -> None:
+        try:
+            asyncio.run(self._main())
+        except Exception:
+            logger.exception("Background worker thread crashed")
+        finally:
+            self._ready.set()
+
+    async def _main(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        runtime = await WorkerRuntime.open(self.config, self.recall_cache)
+        try:
+            runtime.scheduler.start()
+            self._scheduler = runtime.scheduler
+            self._ready.set()
+            await self._stop_event.wait()
+        finally:
+            self._scheduler = None
+            await runtime.close()
+
+    async def control(self, action: str, name: str | None = None) -> dict:
+        if self._scheduler is None or self._loop is None:
+            raise RuntimeError("Background worker thread is not running")
+        future = asyncio.run_coroutine_threadsafe(
+            self._scheduler.control(action, name), self._loop,
+        )
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=self.config.worker_control_timeout_seconds,
+        )
+
+    async def stop(self) -> None:
+        if self._thread is None:
+            return
+        timeout = self.config.worker_shutdown_timeout_seconds
+        await asyncio.to_thread(self._ready.wait, timeout)
+        if self._loop is not None and self._stop_event is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass  # loop already finished
+        await asyncio.to_thread(self._thread.join, timeout)
+        if self._thread.is_alive():
+            logger.warning("Background worker thread did not stop within %ss.", timeout)
+        self._thread = None
+
+
+# ─── Process host ────────────────────────────────────────────────
+
+
+class ProcessWorkerHost:
+    """Runs the worker jobs in a spawned child process.
+
+    Requests are ``(seq, command, *args)`` tuples; replies are
+    ``(seq, kind, payload)``.  The sequence number lets a late reply to a
+    timed-out request be discarded instead of answering the next one.
+    """
+
+    def __init__(self, config: MCPConfig) -> None:
+        self.config = config
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+
+    def job_names(self) -> list[str]:
+        return list(WORKER_JOBS)
+
+    def start(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_process_main, args=(self.config, child_conn),
+            name="memory-mcp-workers", daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        logger.info("Background workers started in process %s.", self._process.pid)
+
+    def _request(self, command: str, *args) -> tuple[str, object]:
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                raise RuntimeError("Background worker process is not running")
+            seq = next(self._seq)
+            self._conn.send((seq, command, *args))
+            deadline = time.monotonic() + self.config.worker_control_timeout_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._conn.poll(remaining):
+                    raise TimeoutError("Background worker process did not respond")
+                reply_seq, kind, payload = self._conn.recv()
+                if reply_seq == seq:
+                    return kind, payload
+
+    async def control(self, action: str, name: str | None = None) -> dict:
+        kind, payload = await asyncio.to_thread(self._request, "control", action, name)
+        if kind == "ok":
+            return payload
+        if kind == "key_error":
+            raise KeyError(payload)
+        if kind == "value_error":
+            raise ValueError(payload)
+        raise RuntimeError(payload)
+
+    async def stop(self) -> None:
+        if self._process is None:
+            return
+        with self._lock:
+            try:
+                self._conn.send((0, "stop"))
+            except (OSError, EOFError):
+                pass
+        timeout = self.config.worker_shutdown_timeout_seconds
+        await asyncio.to_thread(self._process.join, timeout)
+        if self._process.is_alive():
+            logger.warning("Background worker process did not stop within %ss — terminating.", timeout)
+            self._process.terminate()
+            await asyncio.to_thread(self._process.join, 5)
+        self._conn.close()
+        self._process = None
+
+
+def _process_main(config: MCPConfig, conn) -> None:
+    """Entry point of the spawned worker process."""
+    # Shutdown is coordinated by the parent over the pipe; a terminal ^C
+    # reaches the whole process group and must not kill jobs mid-write.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(processName)s %(name)s %(levelname)s %(message)s",
+    )
+    asyncio.run(_serve_worker_process(config, conn))
+
+
+async def _serve_worker_process(config: MCPConfig, conn) -> None:
+    runtime = await WorkerRuntime.open(config)
+    runtime.scheduler.start()
+    try:
+        while True:
+            try:
+                seq, command, *args = await asyncio.to_thread(conn.recv)
+            except EOFError:
+                logger.info("Parent process went away — stopping workers.")
+                break
+            if command == "stop":
+                break
+            try:
+                reply = ("ok", await runtime.scheduler.control(*args))
+            except KeyError as exc:
+                reply = ("key_error", exc.args[0] if exc.args else str(exc))
+            except ValueError as exc:
+                reply = ("value_error", str(exc))
+            except Exception as exc:
+                reply = ("error", str(exc))
+            conn.send((seq, *reply))
+    finally:
+        await runtime.close()
+        conn.close()
+
+
+def create_worker_host(
+    config: MCPConfig, recall_cache=None,
+) -> ThreadWorkerHost | ProcessWorkerHost:
+    """Return the host for ``config.worker_isolation`` (``thread`` or ``process``).
+
+    Only the thread host can invalidate ``recall_cache``; a worker process
+    relies on the cache TTL instead.
+    """
+    match config.worker_isolation:
+        case "thread":
+            return ThreadWorkerHost(config, recall_cache)
+        case "process":
+            return ProcessWorkerHost(config)
+        case _:
+            raise ValueError(
+                f"Unknown worker isolation mode: {config.worker_isolation} "
+                f"(expected one of {', '.join(ISOLATION_MODES)})"
+            )
@@ -0,0 +1,212 @@
+"""Per-user vector working sets for exact recall without a database scan.
+
+On the ``exact`` plan (see ``services/query_planner.py``) a user's
+embeddings are read in full on every recall.  ``WorkingSetCache`` keeps
+them after the first read, one ``UserVectors`` per user: a contiguous
+float32 matrix of L2-normalized rows plus the ``tier`` / ``memory_type``
+/ ``tags`` / ``conversation_id`` / ``created_at`` needed to apply recall
+filters locally.  Later recalls score
+the matrix in process and only fetch the winning documents by ``_id``.
+
+The entry stays coherent with the user's own writes in this process:
+``store_stm`` and queued merges append rows, deleting one memory drops
+its row, and a bulk delete or ``wipe_user_data`` evicts the user.  Other
+changes (consolidation, other processes) are bounded by
+``WORKING_SET_TTL_SECONDS``.  Winners are re-read with the full recall
+filter, so a stale row can drop out of a page but never add a wrong
+result.  Rows that no longer match are discarded on sight.
+
+Entries are evicted least recently used first to keep the total under
+``WORKING_SET_MAX_MB``.
+"""
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.local_text import filter_tags, timestamp
+
+# Fields read when loading a working set.
+WORKING_SET_PROJECTION = {
+    "embedding": 1, "source_stm_id": 1, "tier": 1, "memory_type": 1, "tags": 1,
+    "conversation_id": 1, "created_at": 1,
+}
+
+# Rough per-row cost of the Python-side metadata.
+_ROW_OVERHEAD_BYTES = 200
+
+
+class UserVectors:
+    """One user's memory embeddings as a normalized float32 matrix."""
+
+    __slots__ = (
+        "ids", "tiers", "memory_types", "tags", "conversations", "created", "matrix", "loaded_at",
+    )
+
+    def __init__(self, docs: list[dict], dimensions: int | None = None) -> None:
+        if dimensions is None and docs:
+            dimensions = len(docs[0].get("embedding") or [])
+        docs = [d for d in docs if d.get("embedding") and len(d["embedding"]) == dimensions]
+        self.ids = [d["_id"] for d in docs]
+        self.tiers = np.array([d.get("tier") or "" for d in docs], dtype=object)
+        self.memory_types = np.array([d.get("memory_type") or "" for d in docs], dtype=object)
+        self.tags = [frozenset(d.get("tags") or ()) for d in docs]
+        self.conversations = np.array([d.get("conversation_id") for d in docs], dtype=object)
+        self.created = np.array([timestamp(d.get("created_at")) for d in docs], dtype=np.float64)
+        matrix = np.asarray(
+            [d["embedding"] for d in docs], dtype=np.float32,
+        ).reshape(len(docs), dimensions or 0)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = np.ascontiguousarray(matrix / np.where(norms == 0, 1.0, norms))
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + len(self.ids) * _ROW_OVERHEAD_BYTES
+
+    def extend(self, docs: list[dict]) -> None:
+        """Append rows for newly inserted memories."""
+        added = UserVectors(docs, self.matrix.shape[1])
+        self.ids.extend(added.ids)
+        self.tiers = np.concatenate([self.tiers, added.tiers])
+        self.memory_types = np.concatenate([self.memory_types, added.memory_types])
+        self.tags.extend(added.tags)
+        self.conversations = np.concatenate([self.conversations, added.conversations])
+        self.created = np.concatenate([self.created, added.created])
+        self.matrix = np.concatenate([self.matrix, added.matrix])
+
+    def remove(self, ids: set) -> None:
+        keep = [i for i, memory_id in enumerate(self.ids) if memory_id not in ids]
+        if len(keep) == len(self.ids):
+            return
+        self.ids = [self.ids[i] for i in keep]
+        self.tiers = self.tiers[keep]
+        self.memory_types = self.memory_types[keep]
+        self.tags = [self.tags[i] for i in keep]
+        self.conversations = self.conversations[keep]
+        self.created = self.created[keep]
+        self.matrix = np.ascontiguousarray(self.matrix[keep])
+
+    def _mask(self, vs_filter: dict) -> np.ndarray:
+        """Rows matching the clauses built by ``MemoryService._vector_filter``."""
+        mask = np.ones(len(self.ids), dtype=bool)
+        if "tier" in vs_filter:
+            mask &= np.isin(self.tiers, vs_filter["tier"]["$in"])
+        if "memory_type" in vs_filter:
+            mask &= self.memory_types == vs_filter["memory_type"]
+        wanted = filter_tags(vs_filter)
+        if wanted:
+            mask &= np.fromiter((wanted <= t for t in self.tags), dtype=bool, count=len(self.tags))
+        if "conversation_id" in vs_filter:
+            mask &= self.conversations == vs_filter["conversation_id"]
+        if "created_at" in vs_filter:
+            window = vs_filter["created_at"]
+            if "$gte" in window:
+                mask &= self.created >= timestamp(window["$gte"])
+            if "$lte" in window:
+                mask &= self.created <= timestamp(window["$lte"])
+        return mask
+
+    def top(self, query_embedding: list[float], vs_filter: dict, k: int) -> list[tuple]:
+        """``(memory_id, vs_score)`` for the ``k`` best rows matching ``vs_filter``.
+
+        ``vs_score`` is ``(1 + cosine) / 2``, the Atlas score for a cosine index.
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if not self.ids or query.shape[0] != self.matrix.shape[1]:
+            return []
+        norm = np.linalg.norm(query)
+        scores = (1 + self.matrix @ (query / (norm or 1.0))) / 2
+        rows = np.flatnonzero(self._mask(vs_filter))
+        order = rows[np.argsort(-scores[rows], kind="stable")[:k]]
+        return [(self.ids[i], float(scores[i])) for i in order.tolist()]
+
+
+class WorkingSetCache:
+    """LRU of ``UserVectors`` bounded by a total memory budget."""
+
+    def __init__(self, config: MCPConfig) -> None:
+        self.max_bytes = config.working_set_max_mb * 1024 * 1024
+        self.ttl_seconds = config.working_set_ttl_seconds
+        self._entries: OrderedDict[str, UserVectors] = OrderedDict()
+        self._bytes = 0
+        # Bumped by every change to a user's entry; a load only lands if
+        # no write happened while it was reading.
+        self._versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, user_id: str) -> int:
+        """Current version for ``user_id`` — read this before loading."""
+        return self._versions.get(user_id, 0)
+
+    def _changed(self, user_id: str) -> None:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def get(self, user_id: str) -> UserVectors | None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            if time.monotonic() - entry.loaded_at < self.ttl_seconds:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry
+            self._drop(user_id)
+        self.misses += 1
+        return None
+
+    def put(self, user_id: str, docs: list[dict], version: int) -> UserVectors:
+        """Build the user's working set from ``docs``; cache it if it fits
+        and nothing changed since ``version`` was read."""
+        vectors = UserVectors(docs)
+        if version != self.version(user_id) or vectors.nbytes > self.max_bytes:
+            return vectors
+        self._drop(user_id)
+        self._entries[user_id] = vectors
+        self._bytes += vectors.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+        return vectors
+
+    def add(self, user_id: str, docs: list[dict]) -> None:
+        """Apply inserted memories (with ``_id`` set) to a cached entry."""
+        self._changed(user_id)
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+            entry.extend(docs)
+            self._bytes += entry.nbytes
+
+    def discard(self, user_id: str, memory_ids) -> None:
+        """Drop rows for memories that were deleted or no longer match."""
+        self._changed(user_id)
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+            entry.remove(set(memory_ids))
+            self._bytes += entry.nbytes
+
+    def evict(self, user_id: str) -> None:
+        self._changed(user_id)
+        self._drop(user_id)
+
+    def _drop(self, user_id: str) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,152 @@
+"""Pre-fork supervisor for multi-process streamable-http serving.
+
+With ``HTTP_WORKERS`` other than 1, ``memory-mcp`` binds the listening
+socket once and spawns that many server processes sharing it; the kernel
+spreads accepted connections across them, so request handling (pydantic
+validation, BSON decoding, ``_sanitize_doc``, JSON encoding) uses every
+core.
+
+Each process runs the normal FastMCP lifespan, so ``DatabaseManager``,
+providers and the ``ServiceRegistry`` singleton are naturally per-process.
+Only process 0 keeps the configured ``ROLE``; the others start as
+``ROLE=api`` so migrations, seeding and enrichment/consolidation run in
+exactly one place.  MCP sessions cannot follow a client across processes,
+so HTTP serving is stateless in this mode.  Processes that exit
+unexpectedly are restarted.
+"""
+
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
+import time
+
+from memory_mcp.core.config import MCPConfig
+
+logger = logging.getLogger(__name__)
+
+HTTP_HOST = "0.0.0.0"
+_LISTEN_BACKLOG = 2048
+# A process that dies sooner than this after starting is restarted with a
+# delay instead of immediately, so a crash loop does not spin the CPU.
+_MIN_UPTIME_SECONDS = 5.0
+_RESTART_DELAY_SECONDS = 1.0
+
+
+def resolve_worker_count(http_workers: int) -> int:
+    """``HTTP_WORKERS=0`` means one process per CPU."""
+    if http_workers < 0:
+        raise ValueError("HTTP_WORKERS must be >= 0")
+    return http_workers or os.cpu_count() or 1
+
+
+def worker_role(configured_role: str, index: int) -> str:
+    """Role for server process ``index``: only process 0 runs background work."""
+    if index == 0 or configured_role == "api":
+        return configured_role
+    return "api"
+
+
+def _serve(index: int, sock: socket.socket, role: str) -> None:
+    """Entry point of one spawned server process."""
+    # ROLE must be in the environment before memory_mcp.server is imported:
+    # the lifespan reads its settings via MCPConfig().
+    os.environ["ROLE"] = role
+    from memory_mcp.server import mcp
+
+    mcp.run(
+        transport="streamable-http",
+        host=HTTP_HOST,
+        port=sock.getsockname()[1],
+        sockets=[sock],
+        stateless_http=True,
+        show_banner=index == 0,
+    )
+
+
+class Supervisor:
+    """Owns the shared socket and keeps ``workers`` server processes alive."""
+
+    def __init__(self, config: MCPConfig) -> None:
+        self.config = config
+        self.workers = resolve_worker_count(config.http_workers)
+        self._ctx = multiprocessing.get_context("spawn")
+        self._procs: list = [None] * self.workers
+        self._started_at: list[float] = [0.0] * self.workers
+        self._sock: socket.socket | None = None
+        self._stopping = False
+
+    def bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((HTTP_HOST, self.config.port))
+        sock.listen(_LISTEN_BACKLOG)
+        sock.set_inheritable(True)
+        self._sock = sock
+        return sock
+
+    def _spawn(self, index: int) -> None:
+        role = worker_role(self.config.role, index)
+        # Not daemonic: process 0 may itself spawn a WORKER_ISOLATION=process child.
+        proc = self._ctx.Process(
+            target=_serve, args=(index, self._sock, role),
+            name=f"memory-mcp-http-{index}",
+        )
+        proc.start()
+        self._procs[index] = proc
+        self._started_at[index] = time.monotonic()
+        logger.info("Started server process %d (pid %s, role=%s).", index, proc.pid, role)
+
+    def _restart_dead(self) -> int:
+        """Restart every process that has exited.  Returns how many were restarted."""
+        restarted = 0
+        for index, proc in enumerate(self._procs):
+            if proc is None or proc.is_alive() or self._stopping:
+                continue
+            logger.warning("Server process %d (pid %s) exited with code %s — restarting.",
+                           index, proc.pid, proc.exitcode)
+            if time.monotonic() - self._started_at[index] < _MIN_UPTIME_SECONDS:
+                time.sleep(_RESTART_DELAY_SECONDS)
+            self._spawn(index)
+            restarted += 1
+        return restarted
+
+    def _request_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        """Bind, spawn all server processes, and supervise until SIGINT/SIGTERM."""
+        self.bind()
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        logger.info("Serving on %s:%d with %d processes.", HTTP_HOST, self.config.port, self.workers)
+        for index in range(self.workers):
+            self._spawn(index)
+        try:
+            while not self._stopping:
+                multiprocessing.connection.wait(
+                    [p.sentinel for p in self._procs if p is not None], timeout=1.0,
+                )
+                self._restart_dead()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._stopping = True
+        for proc in self._procs:
+            if proc is not None and proc.is_alive():
+                proc.terminate()
+        deadline = time.monotonic() + self.config.worker_shutdown_timeout_seconds
+        for proc in self._procs:
+            if proc is None:
+                continue
+            proc.join(max(deadline - time.monotonic(), 0))
+            if proc.is_alive():
+                logger.warning("Server process %s did not exit in time — killing.", proc.pid)
+                proc.kill()
+                proc.join()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
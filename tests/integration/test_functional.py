@@ -142,9 +142,9 @@ def test_list_tools():
     tools = result.get("tools", [])
     tool_names = {t["name"] for t in tools}
     expected = {
-        "store_memory", "recall_memory", "delete_memory",
-        "check_cache", "store_cache", "hybrid_search", "search_web",
-        "memory_health", "wipe_user_data", "cache_invalidate",
+        "store_memory", "recall_memory", "recall_memory_batch", "delete_memory",
+        "get_conversation_context", "related_memories", "check_cache", "store_cache", "hybrid_search", "search_web",
+        "memory_health", "wipe_user_data", "cache_invalidate", "manage_job",
         "store_decision", "recall_decision",
     }
     assert expected == tool_names, f"Tool mismatch.\n  Expected: {expected}\n  Got:      {tool_names}"
@@ -0,0 +1,85 @@
+"""Tests for the write-behind AccessTracker."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.access_tracker import AccessTracker
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _make_collection():
+    col = MagicMock()
+    col.bulk_write = AsyncMock()
+    return col
+
+
+class TestRecordAndFlush:
+    """Increments coalesce per _id and flush as one unordered bulk_write."""
+
+    async def test_coalesces_increments(self):
+        col = _make_collection()
+        tracker = AccessTracker(col, _make_config())
+        a, b = ObjectId(), ObjectId()
+        t0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        t1 = t0 + timedelta(seconds=5)
+
+        tracker.record([a, b], at=t1)
+        tracker.record([a], at=t0)
+        assert tracker.pending == 2
+
+        assert await tracker.flush() == 2
+        ops, = col.bulk_write.call_args[0]
+        assert col.bulk_write.call_args[1] == {"ordered": False}
+        docs = {op._filter["_id"]: op._doc for op in ops}
+        assert docs[a] == {"$inc": {"access_count": 2}, "$max": {"last_accessed": t1}}
+        assert docs[b] == {"$inc": {"access_count": 1}, "$max": {"last_accessed": t1}}
+        assert tracker.pending == 0
+
+    async def test_empty_flush_skips_write(self):
+        col = _make_collection()
+        assert await AccessTracker(col, _make_config()).flush() == 0
+        col.bulk_write.assert_not_called()
+
+    async def test_failed_flush_keeps_increments(self):
+        col = _make_collection()
+        col.bulk_write = AsyncMock(side_effect=Exception("down"))
+        tracker = AccessTracker(col, _make_config())
+        memory_id = ObjectId()
+        tracker.record([memory_id])
+
+        with pytest.raises(Exception):
+            await tracker.flush()
+        tracker.record([memory_id])
+
+        col.bulk_write = AsyncMock()
+        await tracker.flush()
+        ops, = col.bulk_write.call_args[0]
+        assert ops[0]._doc["$inc"] == {"access_count": 2}
+
+    async def test_run_once_reports_errors(self):
+        col = _make_collection()
+        col.bulk_write = AsyncMock(side_effect=Exception("down"))
+        tracker = AccessTracker(col, _make_config())
+        tracker.record([ObjectId()])
+        assert await tracker.run_once() == {"items": 0, "errors": 1}
+
+    async def test_full_buffer_triggers_background_flush(self):
+        col = _make_collection()
+        tracker = AccessTracker(col, _make_config(access_flush_max_pending=3))
+        tracker.record([ObjectId(), ObjectId()])
+        col.bulk_write.assert_not_called()
+
+        tracker.record([ObjectId()])
+        await asyncio.sleep(0)
+        col.bulk_write.assert_awaited_once()
+        assert tracker.pending == 0
@@ -23,6 +23,15 @@ def _make_registry(config=None):
     reg.audit_service.log = AsyncMock()
     reg.providers = MagicMock()
     reg.check_access = AsyncMock(return_value=None)
+    reg.recall_cache = None
+    reg.query_embeddings = None
+    reg.candidate_tuner = None
+    reg.planner = None
+    reg.working_set = None
+    reg.fresh_overlay = None
+    reg.vector_engine = None
+    reg.prefetcher = None
+    reg.client_fusion = False
     return reg
 
 
@@ -184,6 +193,35 @@ class TestWipeUserData:
         reg.audit_service.log.assert_called_once()
 
 
+    async def test_wipe_evicts_in_process_state(self):
+        reg = _make_registry()
+        reg.prefetcher = MagicMock()
+        reg.recall_cache = MagicMock()
+        reg.query_embeddings = MagicMock()
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+
+        from memory_mcp.tools.admin_tools import register_admin_tools
+        register_admin_tools(mcp_mock)
+
+        mock_col = MagicMock()
+        mock_col.delete_many = AsyncMock(return_value=MagicMock(deleted_count=0))
+        mock_db = MagicMock()
+        mock_db.__getitem__ = MagicMock(return_value=mock_col)
+
+        mock_db_manager = MagicMock()
+        mock_db_manager.db = mock_db
+
+        with patch.object(ServiceRegistry, "get", return_value=reg), \
+             patch("memory_mcp.core.database.DatabaseManager") as mock_dm:
+            mock_dm.get_instance = AsyncMock(return_value=mock_db_manager)
+
+            await tools["wipe_user_data"](user_id="user1", confirm=True)
+
+        reg.prefetcher.cancel.assert_called_once_with("user1")
+        reg.recall_cache.evict.assert_called_once_with("user1")
+        reg.query_embeddings.clear.assert_called_once_with()
+
 class TestCacheInvalidate:
     """cache_invalidate wraps CacheService.invalidate."""
 
@@ -287,3 +325,86 @@ class TestAdminAccessControl:
             result = await tools["wipe_user_data"](user_id="user1", confirm=True)
 
         assert result == {"error": "not allowed"}
+
+
+class TestManageJob:
+    """manage_job inspects and controls scheduler jobs."""
+
+    def _setup(self):
+        from memory_mcp.services.scheduler import JobScheduler
+
+        reg = _make_registry()
+        reg.scheduler = JobScheduler(None, reg.config)
+        reg.scheduler.add_job("consolidation", AsyncMock(return_value=0), 3600)
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+        from memory_mcp.tools.admin_tools import register_admin_tools
+        register_admin_tools(mcp_mock)
+        return reg, tools
+
+    async def test_status_lists_jobs(self):
+        reg, tools = self._setup()
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["manage_job"](user_id="admin")
+        assert result["action"] == "status"
+        assert [j["name"] for j in result["jobs"]] == ["consolidation"]
+
+    async def test_pause_and_resume(self):
+        reg, tools = self._setup()
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            paused = await tools["manage_job"](user_id="admin", action="pause", job_name="consolidation")
+            assert paused["jobs"][0]["paused"] is True
+            resumed = await tools["manage_job"](user_id="admin", action="resume", job_name="consolidation")
+            assert resumed["jobs"][0]["paused"] is False
+        assert reg.audit_service.log.call_args[0][3] == "success"
+
+    async def test_run_triggers_job(self):
+        reg, tools = self._setup()
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["manage_job"](user_id="admin", action="run", job_name="consolidation")
+        assert result["result"] == "triggered"
+
+    async def test_unknown_job_returns_error(self):
+        reg, tools = self._setup()
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["manage_job"](user_id="admin", action="pause", job_name="nope")
+        assert "Unknown job" in result["error"]
+
+    async def test_invalid_action(self):
+        reg, tools = self._setup()
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["manage_job"](user_id="admin", action="explode", job_name="consolidation")
+        assert "Unknown action" in result["error"]
+
+    async def test_job_name_required_for_control(self):
+        reg, tools = self._setup()
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["manage_job"](user_id="admin", action="run")
+        assert "job_name is required" in result["error"]
+
+    async def test_no_scheduler(self):
+        reg, tools = self._setup()
+        reg.scheduler = None
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["manage_job"](user_id="admin")
+        assert result == {"error": "Job scheduler is not running"}
+
+    async def test_blocked_by_access_check(self):
+        reg, tools = self._setup()
+        reg.check_access = AsyncMock(return_value="not allowed")
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["manage_job"](user_id="user1")
+        assert result == {"error": "not allowed"}
+
+    async def test_routes_through_scheduler_group(self):
+        from memory_mcp.services.scheduler import SchedulerGroup
+
+        reg, tools = self._setup()
+        remote = MagicMock()
+        remote.job_names.return_value = ["enrichment"]
+        remote.control = AsyncMock(return_value={"result": "triggered", "jobs": []})
+        reg.scheduler = SchedulerGroup(reg.scheduler, remote)
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["manage_job"](user_id="admin", action="run", job_name="enrichment")
+        assert result == {"action": "run", "result": "triggered", "jobs": []}
+        remote.control.assert_awaited_once_with("run", "enrichment")
@@ -1,7 +1,6 @@
 """Tests for AuditFlushWorker."""
 
-import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -15,97 +14,45 @@ def _make_config(**overrides) -> MCPConfig:
     return MCPConfig(**defaults, _env_file=None)
 
 
-class TestAuditFlushWorkerRun:
-    """TC-E-023/025: Worker calls flush periodically."""
+class TestAuditFlushWorkerRunOnce:
+    """TC-E-023: Worker flushes the audit buffer when scheduled."""
 
-    async def test_worker_calls_flush(self):
-        """TC-E-023: Worker calls flush after interval."""
+    async def test_run_once_calls_flush(self):
+        """TC-E-023: run_once flushes and reports the flushed count."""
         mock_audit = MagicMock()
-        mock_audit.flush = AsyncMock()
-        config = _make_config(audit_flush_interval_seconds=0)
-        worker = AuditFlushWorker(mock_audit, config)
+        mock_audit.flush = AsyncMock(return_value=4)
+        worker = AuditFlushWorker(mock_audit, _make_config())
 
-        async def stop_after_flush():
-            # Wait for at least one flush
-            while mock_audit.flush.call_count < 1:
-                await asyncio.sleep(0.01)
-            worker.stop()
+        stats = await worker.run_once()
 
-        task = asyncio.create_task(worker.run())
-        stopper = asyncio.create_task(stop_after_flush())
+        mock_audit.flush.assert_called_once()
+        assert stats == {"items": 4, "errors": 0}
 
-        await asyncio.wait([task, stopper], timeout=2.0)
-
-        assert mock_audit.flush.call_count >= 1
-
-    async def test_worker_respects_interval(self):
-        """TC-E-025: Worker flushes at configured interval."""
-        mock_audit = MagicMock()
-        mock_audit.flush = AsyncMock()
-        # Use a very short interval for testing
-        config = _make_config(audit_flush_interval_seconds=0)
-        worker = AuditFlushWorker(mock_audit, config)
-
-        async def stop_after_flushes():
-            while mock_audit.flush.call_count < 3:
-                await asyncio.sleep(0.01)
-            worker.stop()
-
-        task = asyncio.create_task(worker.run())
-        stopper = asyncio.create_task(stop_after_flushes())
-
-        await asyncio.wait([task, stopper], timeout=2.0)
-
-        assert mock_audit.flush.call_count >= 3
-
-
-class TestAuditFlushWorkerStop:
-    """TC-E-024: Worker can be stopped."""
-
-    async def test_stop_ends_loop(self):
-        """TC-E-024: stop() causes the run loop to exit."""
+    async def test_run_once_empty_buffer(self):
         mock_audit = MagicMock()
-        mock_audit.flush = AsyncMock()
-        config = _make_config(audit_flush_interval_seconds=0)
-        worker = AuditFlushWorker(mock_audit, config)
-
-        worker.stop()
+        mock_audit.flush = AsyncMock(return_value=0)
+        worker = AuditFlushWorker(mock_audit, _make_config())
 
-        # run() should exit quickly since _running is False
-        task = asyncio.create_task(worker.run())
-        # It will still do one sleep+flush cycle due to while check order
-        await asyncio.wait([task], timeout=1.0)
-        assert task.done()
+        assert await worker.run_once() == {"items": 0, "errors": 0}
 
 
 class TestAuditFlushWorkerErrorHandling:
-    """TC-E-027: Worker continues after flush failure."""
+    """TC-E-027: Flush failures are counted, not raised."""
 
-    async def test_continues_after_flush_error(self):
-        """TC-E-027: Flush failure does not stop the worker."""
+    async def test_flush_error_is_counted(self):
+        """TC-E-027: Flush failure does not propagate to the scheduler."""
         mock_audit = MagicMock()
-        call_count = 0
+        mock_audit.flush = AsyncMock(side_effect=Exception("DB down"))
+        worker = AuditFlushWorker(mock_audit, _make_config())
 
-        async def flush_with_error():
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise Exception("DB down")
-            # Second call succeeds
+        stats = await worker.run_once()
 
-        mock_audit.flush = AsyncMock(side_effect=flush_with_error)
-        config = _make_config(audit_flush_interval_seconds=0)
-        worker = AuditFlushWorker(mock_audit, config)
+        assert stats == {"items": 0, "errors": 1}
 
-        async def stop_after_recovery():
-            while call_count < 2:
-                await asyncio.sleep(0.01)
-            worker.stop()
-
-        task = asyncio.create_task(worker.run())
-        stopper = asyncio.create_task(stop_after_recovery())
-
-        await asyncio.wait([task, stopper], timeout=2.0)
+    async def test_recovers_on_next_run(self):
+        mock_audit = MagicMock()
+        mock_audit.flush = AsyncMock(side_effect=[Exception("DB down"), 2])
+        worker = AuditFlushWorker(mock_audit, _make_config())
 
-        # Worker called flush at least twice (survived the error)
-        assert call_count >= 2
+        assert (await worker.run_once())["errors"] == 1
+        assert await worker.run_once() == {"items": 2, "errors": 0}
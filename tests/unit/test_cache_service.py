@@ -72,6 +72,63 @@ class TestCacheServiceCheck:
         result = await service.check("user1", "test query")
         assert result is None
 
+    async def test_check_shares_query_embedding_cache(self):
+        from memory_mcp.services.query_embeddings import QueryEmbeddingCache
+
+        col = AsyncMock()
+        config = _make_config()
+        embedding = _make_embedding_provider()
+        query_embeddings = QueryEmbeddingCache(embedding, config)
+        await query_embeddings.embed("test query")
+        service = CacheService(col, config, embedding, query_embeddings=query_embeddings)
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        col.aggregate = AsyncMock(return_value=mock_cursor)
+
+        await service.check("user1", "test query")
+
+        embedding.generate_embedding.assert_awaited_once_with("test query")
+
+
+class TestCacheServiceLocalEngine:
+    """Without Atlas Vector Search the cache is searched in process."""
+
+    def _service(self):
+        from memory_mcp.services.local_vector import LocalVectorEngine
+
+        col = AsyncMock()
+        col.aggregate = AsyncMock()
+        config = _make_config(embedding_dimension=2, cache_similarity_threshold=0.95)
+        engine = LocalVectorEngine(MagicMock(), config)
+        engine._synced_at = float("inf")
+        embedding = AsyncMock()
+        embedding.generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+        return CacheService(col, config, embedding, vector_engine=engine), col
+
+    async def test_stored_entry_hits(self):
+        service, col = self._service()
+        entry_id = ObjectId()
+        col.insert_one = AsyncMock(return_value=MagicMock(inserted_id=entry_id))
+        await service.store("user1", "test query", "cached response")
+        col.find_one = AsyncMock(return_value={
+            "_id": entry_id, "query": "test query", "response": "cached response",
+        })
+
+        result = await service.check("user1", "test query")
+
+        col.aggregate.assert_not_called()
+        assert result["response"] == "cached response"
+        assert result["score"] == pytest.approx(1.0)
+
+    async def test_expired_entry_removed(self):
+        service, col = self._service()
+        col.insert_one = AsyncMock(return_value=MagicMock(inserted_id=ObjectId()))
+        await service.store("user1", "test query", "cached response")
+        col.find_one = AsyncMock(return_value=None)  # TTL index removed it
+
+        assert await service.check("user1", "test query") is None
+        assert service.vector_engine.stats()["semantic_cache"]["vectors"] == 0
+
 
 class TestCacheServiceStore:
     """TC-036: Cache store."""
@@ -0,0 +1,139 @@
+"""Tests for numCandidates sizing and the candidate tuner."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.candidate_tuner import (
+    MAX_NUM_CANDIDATES,
+    CandidateTuner,
+    _format_report,
+    candidate_count,
+    main,
+)
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _cursor(docs):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=docs)
+    return cursor
+
+
+def _fake_memories(exact_ids, ann_ids_by_candidates):
+    """Collection whose $vectorSearch answers depend on exact / numCandidates."""
+    async def aggregate(pipeline):
+        first = pipeline[0]
+        if "$sample" in first:
+            return _cursor([{"embedding": [0.1, 0.2], "user_id": "u1"}])
+        stage = first["$vectorSearch"]
+        if stage.get("exact"):
+            ids = exact_ids
+        else:
+            ids = ann_ids_by_candidates.get(stage["numCandidates"], exact_ids)
+        return _cursor([{"_id": i} for i in ids[:stage["limit"]]])
+
+    col = MagicMock()
+    col.aggregate = AsyncMock(side_effect=aggregate)
+    return col
+
+
+class TestCandidateCount:
+
+    def test_defaults_match_previous_values(self):
+        assert candidate_count(None, "recall", 5) == 50
+        assert candidate_count(None, "evolve", 5) == 50
+        assert candidate_count(None, "hybrid", 20) == 100
+        assert candidate_count(None, "cache", 1) == 10
+
+    def test_capped_and_never_below_limit(self):
+        assert candidate_count(None, "recall", 5000) == MAX_NUM_CANDIDATES
+        tuner = CandidateTuner(MagicMock(), MagicMock(), _make_config())
+        tuner.multipliers["recall"] = 0.5
+        assert candidate_count(tuner, "recall", 10) == 10
+
+
+class TestChoose:
+
+    def test_fastest_passing_multiplier(self):
+        tuner = CandidateTuner(MagicMock(), MagicMock(), _make_config(candidate_recall_target=0.9))
+        curve = [
+            {"multiplier": 2, "recall": 0.7, "mean_ms": 1.0},
+            {"multiplier": 5, "recall": 0.95, "mean_ms": 2.0},
+            {"multiplier": 10, "recall": 1.0, "mean_ms": 4.0},
+        ]
+        assert tuner.choose(curve) == 5
+
+    def test_largest_when_none_pass(self):
+        tuner = CandidateTuner(MagicMock(), MagicMock(), _make_config(candidate_recall_target=0.99))
+        curve = [
+            {"multiplier": 2, "recall": 0.5, "mean_ms": 1.0},
+            {"multiplier": 5, "recall": 0.8, "mean_ms": 2.0},
+        ]
+        assert tuner.choose(curve) == 5
+
+
+class TestBenchmark:
+
+    async def test_recall_measured_against_exact_search(self):
+        truth = [f"m{i}" for i in range(10)]
+        memories = _fake_memories(truth, {
+            20: truth[:5] + ["x"] * 5,
+            50: truth,
+        })
+        tuner = CandidateTuner(memories, MagicMock(), _make_config())
+
+        report = await tuner.benchmark(1, [2, 5], sites=["recall"])
+
+        curve = report["recall"]["curve"]
+        assert [p["num_candidates"] for p in curve] == [20, 50]
+        assert [p["recall"] for p in curve] == [0.5, 1.0]
+        assert report["recall"]["queries"] == 1
+
+    async def test_run_once_updates_multipliers(self):
+        truth = [f"m{i}" for i in range(10)]
+        memories = _fake_memories(truth, {})
+        cache = MagicMock()
+        cache.aggregate = AsyncMock(return_value=_cursor([]))
+        tuner = CandidateTuner(
+            memories, cache, _make_config(candidate_tuning_multipliers=[2, 5]),
+        )
+
+        # Every search "takes" the same time, so the smaller multiplier wins.
+        ticks = iter(range(1000))
+        with patch("memory_mcp.services.candidate_tuner.time.perf_counter",
+                   side_effect=lambda: next(ticks)):
+            result = await tuner.run_once()
+
+        assert tuner.multipliers["recall"] == 2
+        assert tuner.multipliers["evolve"] == 2
+        assert tuner.multipliers["cache"] == 10  # no cache samples: untouched
+        assert result == {"items": 3, "errors": 0}
+        assert set(tuner.last_report) == {"recall", "evolve", "hybrid"}
+
+
+class TestBenchmarkCli:
+
+    def test_format_report_marks_passing_points(self):
+        report = {"recall": {"k": 10, "queries": 3, "exact_ms": 4.0, "curve": [
+            {"multiplier": 2, "num_candidates": 20, "recall": 0.5, "mean_ms": 1.0, "p95_ms": 1.5},
+            {"multiplier": 5, "num_candidates": 50, "recall": 1.0, "mean_ms": 2.0, "p95_ms": 2.5},
+        ]}}
+        lines = _format_report(report, 0.95).splitlines()
+        assert lines[0].startswith("recall  (k=10, 3 queries")
+        assert "0.5000 " in lines[2]
+        assert "1.0000*" in lines[3]
+
+    def test_main_parses_options(self, capsys, monkeypatch):
+        monkeypatch.setenv("MONGODB_CONNECTION_STRING", "mongodb://localhost:27017")
+        run = AsyncMock(return_value="REPORT")
+        with patch("memory_mcp.services.candidate_tuner._run_benchmark", run):
+            main(["--samples", "3", "--multipliers", "2,5", "--site", "cache"])
+
+        args = run.call_args[0][1]
+        assert (args.samples, args.multipliers, args.sites) == (3, [2.0, 5.0], ["cache"])
+        assert "REPORT" in capsys.readouterr().out
@@ -6,6 +6,7 @@ from memory_mcp.core.collections import (
     MEMORIES,
     SEMANTIC_CACHE,
     AUDIT_LOG,
+    JOB_RUNS,
     STANDARD_INDEXES,
     SEARCH_INDEXES,
 )
@@ -44,6 +45,11 @@ class TestStandardIndexes:
         assert len(ttl_idx) == 1
         assert "expireAfterSeconds" in ttl_idx[0].get("kwargs", {})
 
+    def test_job_runs_has_ttl_and_lookup_indexes(self):
+        """job_runs history expires and is queryable per job."""
+        names = {i["name"] for i in STANDARD_INDEXES if i["collection"] == JOB_RUNS}
+        assert names == {"ix_job_runs_job_started", "ix_job_runs_ttl"}
+
     def test_memories_has_enrichment_queue_index(self):
         """memories enrichment_status + created_at compound index."""
         idx = [i for i in STANDARD_INDEXES
@@ -51,6 +57,15 @@ class TestStandardIndexes:
                and i["name"] == "ix_memories_enrichment_queue"]
         assert len(idx) == 1
 
+    def test_memories_has_updated_at_index(self):
+        """memories updated_at index for the local vector engine's sync."""
+        idx = [i for i in STANDARD_INDEXES
+               if i["collection"] == MEMORIES
+               and i["name"] == "ix_memories_updated"]
+        assert len(idx) == 1
+        assert idx[0]["keys"] == [("updated_at", 1)]
+        assert "partialFilterExpression" not in idx[0].get("kwargs", {})
+
     def test_memories_has_user_tier_created_index(self):
         """memories user_id + tier + created_at compound with partial filter."""
         idx = [i for i in STANDARD_INDEXES
@@ -61,11 +76,22 @@ class TestStandardIndexes:
         assert "partialFilterExpression" in kwargs
 
     def test_memories_has_conversation_index(self):
-        """memories user_id + conversation_id index."""
+        """memories user_id + conversation_id index, ordered for paging turns."""
         idx = [i for i in STANDARD_INDEXES
                if i["collection"] == MEMORIES
                and i["name"] == "ix_memories_conversation"]
         assert len(idx) == 1
+        assert idx[0]["keys"] == [
+            ("user_id", 1), ("conversation_id", 1), ("created_at", -1), ("_id", -1),
+        ]
+
+    def test_memories_has_neighbors_index(self):
+        """memories user_id + neighbors._id index, for unlinking deleted memories."""
+        idx = [i for i in STANDARD_INDEXES
+               if i["collection"] == MEMORIES
+               and i["name"] == "ix_memories_neighbors"]
+        assert len(idx) == 1
+        assert idx[0]["keys"] == [("user_id", 1), ("neighbors._id", 1)]
 
     def test_memories_has_deleted_at_ttl(self):
         """memories.deleted_at TTL index for soft-delete purge."""
@@ -116,6 +142,55 @@ class TestSearchIndexes:
         assert idx[0]["type"] == "vectorSearch"
         assert idx[0]["collection"] == MEMORIES
 
+    def test_vector_filter_fields_declared(self):
+        from memory_mcp.core.collections import VECTOR_FILTER_FIELDS
+
+        for idx in SEARCH_INDEXES:
+            if idx["type"] != "vectorSearch":
+                continue
+            paths = [f["path"] for f in idx["definition"]["fields"] if f["type"] == "filter"]
+            assert paths == list(VECTOR_FILTER_FIELDS[idx["collection"]])
+
+    def test_vector_filter_uses_declared_fields(self):
+        from memory_mcp.core.collections import VECTOR_FILTER_FIELDS, vector_filter
+
+        vs_filter = vector_filter(
+            MEMORIES, "u1", tier=["ltm"], memory_type="fact", tags=["a"],
+            conversation_id="c1", created_at={"$gte": 0},
+        )
+        paths = {key for key in vs_filter if key != "$and"}
+        paths |= {key for clause in vs_filter["$and"] for key in clause}
+        assert paths == set(VECTOR_FILTER_FIELDS[MEMORIES])
+        assert vs_filter["tier"] == {"$in": ["ltm"]}
+        assert vs_filter["$and"] == [{"tags": "a"}]
+        assert vector_filter(MEMORIES, "u1", tags=None) == {"user_id": "u1", "deleted_at": None}
+
+    def test_vector_filter_uses_supported_operators(self):
+        from memory_mcp.core.collections import VECTOR_FILTER_OPERATORS, vector_filter
+
+        def operators(value):
+            if isinstance(value, dict):
+                for key, inner in value.items():
+                    if key.startswith("$"):
+                        yield key
+                    yield from operators(inner)
+            elif isinstance(value, list):
+                for inner in value:
+                    yield from operators(inner)
+
+        vs_filter = vector_filter(
+            MEMORIES, "u1", tier=["stm", "ltm"], memory_type="fact", tags=["a", "b"],
+            conversation_id="c1", created_at={"$gte": 0, "$lte": 1},
+        )
+        assert set(operators(vs_filter)) <= VECTOR_FILTER_OPERATORS
+        assert vs_filter["$and"] == [{"tags": "a"}, {"tags": "b"}]
+
+    def test_vector_filter_rejects_undeclared_field(self):
+        from memory_mcp.core.collections import vector_filter
+
+        with pytest.raises(KeyError):
+            vector_filter(MEMORIES, "u1", importance=0.5)
+
     def test_memories_fts_index_exists(self):
         idx = [i for i in SEARCH_INDEXES if i["name"] == "memories_fts_index"]
         assert len(idx) == 1
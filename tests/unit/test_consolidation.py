@@ -120,6 +120,19 @@ class TestForgetLowImportance:
         count = await worker._forget_low_importance()
         assert count == 0
 
+    async def test_forget_invalidates_all_cached_results(self):
+        col = _make_collection()
+        cache = MagicMock()
+        worker = ConsolidationWorker(col, _make_config(), _make_providers(), recall_cache=cache)
+
+        col.update_many = AsyncMock(return_value=MagicMock(modified_count=0))
+        await worker._forget_low_importance()
+        cache.bump_all.assert_not_called()
+
+        col.update_many = AsyncMock(return_value=MagicMock(modified_count=2))
+        await worker._forget_low_importance()
+        cache.bump_all.assert_called_once()
+
 
 class TestPromoteToLTM:
     """_promote_to_ltm promotes qualifying STM to LTM."""
@@ -190,6 +203,35 @@ class TestPromoteToLTM:
         assert "$lt" in find_query["created_at"]
 
 
+    async def test_flushes_access_counters_before_querying(self):
+        col = _make_collection()
+        order = []
+        tracker = MagicMock()
+        tracker.flush = AsyncMock(side_effect=lambda: order.append("flush"))
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+
+        def find(*args, **kwargs):
+            order.append("find")
+            return mock_cursor
+
+        col.find = MagicMock(side_effect=find)
+        worker = ConsolidationWorker(col, _make_config(), _make_providers(), access_tracker=tracker)
+
+        await worker._promote_to_ltm()
+        assert order == ["flush", "find"]
+
+    async def test_flush_failure_does_not_block_promotion(self):
+        col = _make_collection()
+        tracker = MagicMock(flush=AsyncMock(side_effect=Exception("down")))
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        col.find = MagicMock(return_value=mock_cursor)
+        worker = ConsolidationWorker(col, _make_config(), _make_providers(), access_tracker=tracker)
+
+        assert await worker._promote_to_ltm() == 0
+
+
 class TestConsolidateStats:
     """consolidate() returns stats from all operations."""
 
@@ -211,48 +253,31 @@ class TestConsolidateStats:
         assert "promoted" in stats
 
 
-class TestConsolidationWorkerLifecycle:
-    """Worker run/stop lifecycle."""
+class TestConsolidationWorkerRunOnce:
+    """Scheduler entry point runs a full consolidation cycle."""
 
-    async def test_run_and_stop(self):
+    async def test_run_once_returns_stats(self):
         col = _make_collection()
-        config = _make_config(consolidation_interval_hours=24)
+        config = _make_config()
         providers = _make_providers()
         worker = ConsolidationWorker(col, config, providers)
 
         mock_cursor = AsyncMock()
         mock_cursor.to_list = AsyncMock(return_value=[])
         col.find = MagicMock(return_value=mock_cursor)
-        col.update_many = AsyncMock(return_value=MagicMock(modified_count=0))
+        col.update_many = AsyncMock(return_value=MagicMock(modified_count=3))
 
-        task = asyncio.create_task(worker.run())
-        # Let the first consolidation cycle complete
-        await asyncio.sleep(0.05)
-        worker.stop()
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
+        stats = await worker.run_once()
 
-        assert worker._running is False
+        assert stats == {"compressed": 0, "forgotten": 3, "promoted": 0}
 
-    async def test_run_handles_exception_gracefully(self):
+    async def test_run_once_propagates_errors(self):
+        """Errors surface to the scheduler, which records the failed run."""
         col = _make_collection()
-        config = _make_config(consolidation_interval_hours=24)
+        config = _make_config()
         providers = _make_providers()
         worker = ConsolidationWorker(col, config, providers)
-
-        # Make consolidate raise an error
         col.find = MagicMock(side_effect=RuntimeError("db error"))
 
-        task = asyncio.create_task(worker.run())
-        await asyncio.sleep(0.05)
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
-
-        # Worker should have survived the error
-        assert worker._running is True
+        with pytest.raises(RuntimeError):
+            await worker.run_once()
@@ -0,0 +1,47 @@
+"""Tests for opaque pagination cursors."""
+
+import pytest
+
+from memory_mcp.core.cursors import check_page, decode_cursor, encode_cursor
+
+
+class TestCursors:
+
+    def test_round_trip(self):
+        state = {"kind": "recall", "user_id": "u1", "query": "q ü", "served": 10, "tags": None}
+        token = encode_cursor(state)
+        assert "=" not in token
+        assert decode_cursor(token, "recall", "u1") == {"v": 1, **state}
+
+    def test_garbage_rejected(self):
+        for token in ("", "not-a-cursor!", encode_cursor({"kind": "recall"})[:-3]):
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                decode_cursor(token, "recall", "u1")
+
+    def test_foreign_user_or_kind_rejected(self):
+        token = encode_cursor({"kind": "recall", "user_id": "u1"})
+        with pytest.raises(ValueError, match="not issued"):
+            decode_cursor(token, "recall", "u2")
+        with pytest.raises(ValueError, match="not issued"):
+            decode_cursor(token, "hybrid", "u1")
+
+
+class TestCheckPage:
+
+    def test_limit_clamped_to_max_results(self):
+        state = {"limit": 10_000, "served": 10, "diversity": 0.5}
+        assert check_page(state, 100, 1000)["limit"] == 100
+        assert check_page({"limit": 5, "served": 0}, 100, 1000)["limit"] == 5
+
+    @pytest.mark.parametrize("state", [
+        {"limit": 0, "served": 0},
+        {"limit": "10", "served": 0},
+        {"limit": 10, "served": -1},
+        {"limit": 10, "served": 1000},
+        {"limit": 10, "served": 0, "diversity": 5},
+        {"limit": 10, "served": 0, "diversity": True},
+        {"served": 0},
+    ])
+    def test_tampered_page_rejected(self, state):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            check_page(state, 100, 1000)
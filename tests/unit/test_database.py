@@ -132,3 +132,24 @@ class TestDatabaseManagerClose:
 
             with pytest.raises(RuntimeError, match="not connected"):
                 _ = instance.db
+
+
+class TestDatabaseManagerConnect:
+    """connect() builds an uncached manager for isolated workers."""
+
+    async def test_connect_does_not_touch_singleton(self):
+        config = _make_config()
+        with patch("memory_mcp.core.database.AsyncMongoClient") as mock_client_cls:
+            mock_client = AsyncMock()
+            mock_client.__getitem__ = MagicMock(return_value=MagicMock())
+            mock_client.admin = MagicMock()
+            mock_client.admin.command = AsyncMock(return_value={"ok": 1})
+            mock_client.close = AsyncMock()
+            mock_client_cls.return_value = mock_client
+
+            shared = await DatabaseManager.initialize(config)
+            private = await DatabaseManager.connect(config)
+            assert private is not shared
+
+            await private.close()
+            assert await DatabaseManager.get_instance() is shared
@@ -0,0 +1,48 @@
+"""Tests for the MMR diversity rerank."""
+
+import numpy as np
+import pytest
+
+from memory_mcp.services.diversity import embedding_matrix, mmr, pool_size, validate_diversity
+
+
+class TestMMR:
+
+    def test_zero_diversity_keeps_relevance_order(self):
+        relevance = np.array([0.2, 0.9, 0.5])
+        embeddings = np.eye(3, dtype=np.float32)
+        assert mmr(relevance, embeddings, 3, 0.0) == [1, 2, 0]
+
+    def test_near_duplicate_pushed_down(self):
+        relevance = np.array([0.9, 0.89, 0.6])
+        embeddings = np.array([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]], dtype=np.float32)
+        assert mmr(relevance, embeddings, 2, 0.5) == [0, 2]
+        assert mmr(relevance, embeddings, 2, 0.05) == [0, 1]
+
+    def test_missing_embeddings_not_treated_as_duplicates(self):
+        relevance = np.array([0.9, 0.8, 0.7])
+        embeddings = np.array([[1.0, 0.0], [0.0, 0.0], [1.0, 0.0]], dtype=np.float32)
+        assert mmr(relevance, embeddings, 2, 0.5) == [0, 1]
+
+    def test_k_larger_than_pool(self):
+        assert mmr(np.array([0.5]), np.ones((1, 2), dtype=np.float32), 5, 0.5) == [0]
+        assert mmr(np.array([]), np.zeros((0, 2), dtype=np.float32), 5, 0.5) == []
+
+
+class TestHelpers:
+
+    def test_pool_size(self):
+        assert pool_size(10, 0, 4.0) == 10
+        assert pool_size(10, 0.3, 4.0) == 40
+        assert pool_size(10, 0.3, 0.5) == 10
+
+    def test_embedding_matrix_fills_missing_with_zeros(self):
+        docs = [{"_id": "a"}, {"_id": "b"}]
+        matrix = embedding_matrix(docs, {"a": [1.0, 2.0], "b": None})
+        assert matrix.dtype == np.float32
+        assert matrix.tolist() == [[1.0, 2.0], [0.0, 0.0]]
+
+    @pytest.mark.parametrize("diversity", [-0.1, 1.5])
+    def test_out_of_range_rejected(self, diversity):
+        with pytest.raises(ValueError):
+            validate_diversity(diversity)
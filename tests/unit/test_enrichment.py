@@ -30,6 +30,7 @@ def _make_providers():
 def _make_memory_service():
     svc = AsyncMock()
     svc.evolve_memory = AsyncMock(return_value="created")
+    svc.invalidate = MagicMock()
     return svc
 
 
@@ -69,6 +70,7 @@ class TestEnrichmentWorkerProcessBatch:
         assert update_set["enrichment_status"] == "complete"
         assert update_set["importance"] == 0.7
         assert update_set["summary"] == "A test summary"
+        memory_svc.invalidate.assert_called_once_with("user1")
 
 
 def _make_col_with_cursor(memories: list[dict]):
@@ -147,6 +149,7 @@ class TestEnrichmentWorkerEvolution:
             "user1",
             memory["content"],
             memory["embedding"],
+            memory_id=memory["_id"],
         )
 
 
@@ -262,86 +265,84 @@ class TestEnrichmentWorkerMergePending:
                     break
         assert target_delete_found, "Merge target should be soft-deleted after merge"
 
+    async def test_merge_takes_over_target_neighbor_links(self):
+        """The merged memory inherits the target's links; links to the target move to it."""
+        memory_id, merge_target_id, other = ObjectId(), ObjectId(), ObjectId()
+        merge_memory = {
+            "_id": memory_id,
+            "user_id": "user1",
+            "content": "new content",
+            "enrichment_status": "merge_pending",
+            "enrichment_retries": 0,
+            "embedding": [0.1] * 1536,
+            "merge_target_id": merge_target_id,
+        }
 
-class TestEnrichmentWorkerRunLoop:
-    """run() loop and stop() control."""
+        col = MagicMock()
+        col.update_one = AsyncMock()
+        mock_cursor = MagicMock()
+        mock_cursor.to_list = AsyncMock(return_value=[merge_memory])
+        col.find.return_value = mock_cursor
+        col.find_one = AsyncMock(return_value={
+            "_id": merge_target_id,
+            "content": "existing content",
+            "importance": 0.6,
+            "neighbors": [{"_id": other, "score": 0.8}, {"_id": memory_id, "score": 0.75}],
+        })
 
-    async def test_run_processes_and_stops(self):
-        col = _make_col_with_cursor([])
-        config = _make_config(enrichment_interval_seconds=0)
         providers = _make_providers()
+        providers.llm.chat = AsyncMock(return_value="merged content")
         memory_svc = _make_memory_service()
 
-        worker = EnrichmentWorker(col, config, providers, memory_svc)
-        # Stop after first iteration
-        async def run_and_stop():
-            await asyncio.sleep(0.05)
-            worker.stop()
-        asyncio.get_event_loop().create_task(run_and_stop())
-        await worker.run()
-        assert worker._running is False
-
-    async def test_run_handles_cancelled_error(self):
-        col = _make_col_with_cursor([])
-        config = _make_config(enrichment_interval_seconds=0)
-        providers = _make_providers()
-        memory_svc = _make_memory_service()
+        worker = EnrichmentWorker(col, _make_config(), providers, memory_svc)
+        await worker.process_batch()
 
-        worker = EnrichmentWorker(col, config, providers, memory_svc)
+        merged = col.update_one.call_args_list[0][0]
+        assert merged[0] == {"_id": memory_id}
+        assert merged[1]["$set"]["neighbors"] == [{"_id": other, "score": 0.8}]
+        memory_svc.relink_neighbors.assert_awaited_once_with("user1", merge_target_id, memory_id)
 
-        async def cancel_soon():
-            await asyncio.sleep(0.05)
-            task.cancel()
 
-        task = asyncio.get_event_loop().create_task(worker.run())
-        asyncio.get_event_loop().create_task(cancel_soon())
+class TestEnrichmentWorkerRunOnce:
+    """run_once() is the scheduler entry point."""
 
-        with pytest.raises(asyncio.CancelledError):
-            await task
+    async def test_run_once_empty_queue(self):
+        col = _make_col_with_cursor([])
+        config = _make_config()
+        providers = _make_providers()
+        memory_svc = _make_memory_service()
 
-    async def test_run_breaks_on_cancelled_error_from_process_batch(self):
-        """CancelledError raised inside process_batch triggers the break path."""
-        col = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.to_list = AsyncMock(side_effect=asyncio.CancelledError)
-        col.find.return_value = mock_cursor
-        config = _make_config(enrichment_interval_seconds=0)
+        worker = EnrichmentWorker(col, config, providers, memory_svc)
+        assert await worker.run_once() == {"items": 0, "errors": 0}
+
+    async def test_run_once_counts_failures(self):
+        memories = [
+            {"_id": ObjectId(), "user_id": "user1", "content": f"memory {i}",
+             "enrichment_status": "pending", "enrichment_retries": 0,
+             "embedding": [0.1] * 1536}
+            for i in range(2)
+        ]
+        col = _make_col_with_cursor(memories)
+        col.update_one = AsyncMock()
+        config = _make_config()
         providers = _make_providers()
+        providers.llm.assess_importance = AsyncMock(side_effect=[Exception("LLM down"), 0.7])
         memory_svc = _make_memory_service()
 
         worker = EnrichmentWorker(col, config, providers, memory_svc)
-        await worker.run()
-        # run() exited cleanly via the CancelledError break path
-        # _running remains True because stop() was not called — the break
-        # only exits the while loop without toggling the flag.
-        assert worker._running is True
+        stats = await worker.run_once()
 
-    async def test_run_handles_exception_in_batch(self):
+        assert stats == {"items": 2, "errors": 1}
+
+    async def test_run_once_propagates_query_errors(self):
         col = MagicMock()
         mock_cursor = MagicMock()
         mock_cursor.to_list = AsyncMock(side_effect=Exception("db error"))
         col.find.return_value = mock_cursor
-        config = _make_config(enrichment_interval_seconds=0)
-        providers = _make_providers()
-        memory_svc = _make_memory_service()
+        worker = EnrichmentWorker(col, _make_config(), _make_providers(), _make_memory_service())
 
-        worker = EnrichmentWorker(col, config, providers, memory_svc)
-        async def stop_soon():
-            await asyncio.sleep(0.05)
-            worker.stop()
-        asyncio.get_event_loop().create_task(stop_soon())
-        await worker.run()  # Should not raise
-
-    async def test_stop_sets_running_false(self):
-        col = _make_col_with_cursor([])
-        config = _make_config()
-        providers = _make_providers()
-        memory_svc = _make_memory_service()
-
-        worker = EnrichmentWorker(col, config, providers, memory_svc)
-        worker._running = True
-        worker.stop()
-        assert worker._running is False
+        with pytest.raises(Exception, match="db error"):
+            await worker.run_once()
 
 
 class TestEnrichmentWorkerMergeTargetNotFound:
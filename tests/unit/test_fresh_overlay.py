@@ -0,0 +1,63 @@
+"""Tests for the read-your-writes overlay of not-yet-indexed memories."""
+
+from unittest.mock import patch
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.fresh_overlay import FreshOverlay
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _doc(memory_id, embedding, **fields):
+    return {"_id": memory_id, "user_id": "u1", "embedding": embedding, **fields}
+
+
+_FILTER = {"user_id": "u1", "deleted_at": None}
+
+
+class TestFreshOverlay:
+
+    def test_candidates_scored_and_filtered(self):
+        overlay = FreshOverlay(_make_config())
+        overlay.add("u1", [
+            _doc("a", [1.0, 0.0], tier="stm"),
+            _doc("b", [0.0, 1.0], tier="ltm"),
+        ])
+
+        found = overlay.candidates([1.0, 0.0], _FILTER, 10)
+        assert [(d["_id"], round(d["vs_score"], 6)) for d in found] == [("a", 1.0), ("b", 0.5)]
+        assert "embedding" not in found[0]
+
+        ltm_only = overlay.candidates([1.0, 0.0], {**_FILTER, "tier": {"$in": ["ltm"]}}, 10)
+        assert [d["_id"] for d in ltm_only] == ["b"]
+
+    def test_min_score(self):
+        overlay = FreshOverlay(_make_config())
+        overlay.add("u1", [_doc("a", [1.0, 0.0]), _doc("b", [0.0, 1.0])])
+        found = overlay.candidates([1.0, 0.0], _FILTER, 10, min_score=0.8)
+        assert [d["_id"] for d in found] == ["a"]
+
+    def test_indexed_ids_leave_overlay(self):
+        overlay = FreshOverlay(_make_config())
+        overlay.add("u1", [_doc("a", [1.0, 0.0]), _doc("b", [0.0, 1.0])])
+        found = overlay.candidates([1.0, 0.0], _FILTER, 10, exclude=["a"])
+        assert [d["_id"] for d in found] == ["b"]
+        assert overlay.stats()["pending"] == 1
+
+    def test_other_users_not_visible(self):
+        overlay = FreshOverlay(_make_config())
+        overlay.add("u2", [_doc("a", [1.0, 0.0])])
+        assert overlay.candidates([1.0, 0.0], _FILTER, 10) == []
+
+    def test_ttl_and_size_bound(self):
+        overlay = FreshOverlay(_make_config(fresh_overlay_ttl_seconds=30, fresh_overlay_max_per_user=2))
+        with patch("memory_mcp.services.fresh_overlay.time.monotonic", return_value=100.0):
+            overlay.add("u1", [_doc("a", [1.0, 0.0]), _doc("b", [1.0, 0.0]), _doc("c", [1.0, 0.0])])
+        assert overlay.stats()["pending"] == 2
+        with patch("memory_mcp.services.fresh_overlay.time.monotonic", return_value=131.0):
+            assert overlay.candidates([1.0, 0.0], _FILTER, 10) == []
+        assert overlay.stats()["users"] == 0
@@ -0,0 +1,147 @@
+"""Tests for the in-process BM25 index behind hybrid_search without Atlas Search."""
+
+import math
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+from memory_mcp.services.local_text import LocalTextIndex, TextPartition, tokenize
+
+
+def _doc(content, user_id="u1", **fields):
+    return {"_id": ObjectId(), "user_id": user_id, "content": content, **fields}
+
+
+def _ids(ranked):
+    return [memory_id for memory_id, _ in ranked]
+
+
+class TestTokenize:
+
+    def test_standard_analyzer_like(self):
+        assert tokenize("MongoDB's  Atlas-Search, v8.0!") == ["mongodb", "s", "atlas", "search", "v8", "0"]
+        assert tokenize(None) == []
+
+
+class TestTextPartition:
+
+    def test_bm25_matches_reference_formula(self):
+        partition = TextPartition()
+        a = _doc("mongodb vector search")
+        b = _doc("mongodb mongodb")
+        c = _doc("unrelated words here today")
+        for doc in (a, b, c):
+            partition.upsert(doc)
+
+        ranked = partition.search(["vector"], {"user_id": "u1"}, 10)
+
+        # N=3, df=1, avgdl=3, |a|=3: idf * (k1+1) / (1 + k1)
+        idf = math.log(1 + (3 - 1 + 0.5) / (1 + 0.5))
+        assert _ids(ranked) == [a["_id"]]
+        assert math.isclose(ranked[0][1], idf, rel_tol=1e-5)
+
+    def test_term_frequency_and_length_normalization(self):
+        partition = TextPartition()
+        once = _doc("mongodb driver notes for the python client")
+        twice = _doc("mongodb mongodb")
+        for doc in (once, twice, _doc("other"), _doc("text")):
+            partition.upsert(doc)
+        assert _ids(partition.search(["mongodb"], {"user_id": "u1"}, 10)) == [twice["_id"], once["_id"]]
+
+    def test_summary_indexed_and_filters_applied(self):
+        partition = TextPartition()
+        stm = _doc("alpha", tier="stm")
+        ltm = _doc("beta", tier="ltm", summary="alpha summary", tags=["x"])
+        for doc in (stm, ltm):
+            partition.upsert(doc)
+
+        assert set(_ids(partition.search(["alpha"], {"user_id": "u1"}, 10))) == {stm["_id"], ltm["_id"]}
+        assert _ids(partition.search(["alpha"], {"user_id": "u1", "tier": {"$in": ["ltm"]}}, 10)) == [ltm["_id"]]
+        assert _ids(partition.search(["alpha"], {"user_id": "u1", "$and": [{"tags": "x"}]}, 10)) == [ltm["_id"]]
+
+    def test_conversation_and_time_window(self):
+        partition = TextPartition()
+        old = _doc("alpha", conversation_id="c1", created_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+        new = _doc("alpha", conversation_id="c2", created_at=datetime(2026, 3, 1, tzinfo=timezone.utc))
+        for doc in (old, new):
+            partition.upsert(doc)
+
+        def ids(**clauses):
+            return _ids(partition.search(["alpha"], {"user_id": "u1", **clauses}, 10))
+
+        assert ids(conversation_id="c2") == [new["_id"]]
+        assert ids(created_at={"$gte": datetime(2026, 2, 1, tzinfo=timezone.utc)}) == [new["_id"]]
+        # Promotion keeps the text but may move the row to another conversation.
+        partition.upsert({**old, "conversation_id": "c2"})
+        assert set(ids(conversation_id="c2")) == {old["_id"], new["_id"]}
+
+    def test_changed_text_reindexed_unchanged_text_kept(self):
+        partition = TextPartition()
+        doc = _doc("alpha", tier="stm")
+        partition.upsert(doc)
+        partition.upsert({**doc, "tier": "ltm"})
+        assert partition.size == 1
+        assert partition.tiers == ["ltm"]
+
+        partition.upsert({**doc, "summary": "enriched gamma"})
+        assert partition.size == 2 and partition.live == 1
+        assert _ids(partition.search(["gamma"], {"user_id": "u1"}, 10)) == [doc["_id"]]
+        assert _ids(partition.search(["alpha"], {"user_id": "u1"}, 10)) == [doc["_id"]]
+
+    def test_removed_rows_not_returned_and_compacted(self):
+        partition = TextPartition()
+        docs = [_doc(f"common word{i}") for i in range(100)]
+        for doc in docs:
+            partition.upsert(doc)
+        for doc in docs[:60]:
+            assert partition.remove(doc["_id"]) is True
+        assert partition.remove(docs[0]["_id"]) is False
+
+        # Compacted when tombstones first outnumbered live rows (51 of 100).
+        assert (partition.size, partition.live) == (49, 40)
+        ranked = partition.search(["common"], {"user_id": "u1"}, 100)
+        assert set(_ids(ranked)) == {d["_id"] for d in docs[60:]}
+        assert _ids(partition.search(["word70"], {"user_id": "u1"}, 5)) == [docs[70]["_id"]]
+        assert "word10" not in partition.postings
+
+
+class TestLocalTextIndex:
+
+    def test_per_user(self):
+        index = LocalTextIndex()
+        mine, theirs = _doc("alpha"), _doc("alpha", user_id="u2")
+        index.add([mine, theirs])
+        assert _ids(index.search("alpha", {"user_id": "u1"}, 5)) == [mine["_id"]]
+        assert index.search("", {"user_id": "u1"}, 5) == []
+
+        index.drop_user("u2")
+        assert index.search("alpha", {"user_id": "u2"}, 5) == []
+        assert index.stats() == {"users": 1, "documents": 1, "terms": 1, "searches": 3}
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        index = LocalTextIndex()
+        kept = _doc("alpha beta", tier="ltm", tags=["b", "a"], conversation_id="c1",
+                    created_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+        gone = _doc("alpha")
+        other = _doc("gamma", user_id="u2")
+        index.add([kept, gone, other])
+        index.remove("u1", [gone["_id"]])
+        base = str(tmp_path / "memories_text")
+        index.save(base)
+
+        restored = LocalTextIndex()
+        assert restored.load(base, ObjectId) is True
+        assert _ids(restored.search("alpha", {"user_id": "u1", "tier": "ltm"}, 5)) == [kept["_id"]]
+        assert _ids(restored.search("gamma", {"user_id": "u2"}, 5)) == [other["_id"]]
+        assert restored.partitions["u1"].tags == [frozenset({"a", "b"})]
+        scoped = {"user_id": "u1", "conversation_id": "c1",
+                  "created_at": {"$lte": datetime(2026, 1, 2, tzinfo=timezone.utc)}}
+        assert _ids(restored.search("alpha", scoped, 5)) == [kept["_id"]]
+
+        # Appends after a load extend the restored postings.
+        late = _doc("alpha", user_id="u1")
+        restored.add([late])
+        assert set(_ids(restored.search("alpha", {"user_id": "u1"}, 5))) == {kept["_id"], late["_id"]}
+
+    def test_load_without_snapshot(self, tmp_path):
+        assert LocalTextIndex().load(str(tmp_path / "missing"), ObjectId) is False
@@ -0,0 +1,370 @@
+"""Tests for the in-process vector engine used without Atlas Vector Search."""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from bson import ObjectId
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.local_vector import LocalVectorEngine, Partition, open_vector_engine
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017", "embedding_dimension": 2}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _doc(embedding, user_id="u1", **fields):
+    return {"_id": ObjectId(), "user_id": user_id, "embedding": embedding, **fields}
+
+
+def _make_db(memories=(), cache=()):
+    """A db whose collections return ``memories`` / ``cache`` from ``find``."""
+    collections = {}
+    for name, docs in (("memories", memories), ("semantic_cache", cache)):
+        col = MagicMock()
+        col.find.return_value.to_list = AsyncMock(return_value=list(docs))
+        collections[name] = col
+    db = MagicMock()
+    db.__getitem__ = MagicMock(side_effect=collections.__getitem__)
+    return db, collections
+
+
+def _angle(theta):
+    return [float(np.cos(theta)), float(np.sin(theta))]
+
+
+class TestPartition:
+
+    def test_search_scores_like_cosine_index(self):
+        partition = Partition(2)
+        a, b, c = _doc([1.0, 0.0]), _doc([0.0, 3.0]), _doc([-1.0, 0.0])
+        for doc in (a, b, c):
+            partition.upsert(doc)
+        ranked = partition.search(np.array([1.0, 0.0], np.float32), {"user_id": "u1"}, 2, 8)
+        assert [memory_id for memory_id, _ in ranked] == [a["_id"], b["_id"]]
+        assert [round(score, 6) for _, score in ranked] == [1.0, 0.5]
+
+    def test_filters_and_removal(self):
+        partition = Partition(2)
+        stm = _doc([1.0, 0.0], tier="stm", tags=["x"])
+        ltm = _doc([0.9, 0.1], tier="ltm", memory_type="fact", tags=["x", "y"])
+        other = _doc([0.8, 0.2], tier="ltm", memory_type="preference", tags=["y"])
+        for doc in (stm, ltm, other):
+            partition.upsert(doc)
+
+        def ids(vs_filter):
+            query = np.array([1.0, 0.0], np.float32)
+            return [m for m, _ in partition.search(query, {"user_id": "u1", **vs_filter}, 10, 8)]
+
+        assert ids({"tier": {"$in": ["ltm"]}}) == [ltm["_id"], other["_id"]]
+        assert ids({"tier": "stm"}) == [stm["_id"]]
+        assert ids({"memory_type": "fact"}) == [ltm["_id"]]
+        assert ids({"$and": [{"tags": "x"}, {"tags": "y"}]}) == [ltm["_id"]]
+
+        assert partition.remove(ltm["_id"]) is True
+        assert partition.remove(ltm["_id"]) is False
+        assert ids({}) == [stm["_id"], other["_id"]]
+
+    def test_conversation_and_time_window(self):
+        partition = Partition(2)
+        old = _doc([1.0, 0.0], conversation_id="c1", created_at=datetime(2026, 1, 1))
+        new = _doc([0.9, 0.1], conversation_id="c2", created_at=datetime(2026, 3, 1))
+        for doc in (old, new):
+            partition.upsert(doc)
+
+        def ids(vs_filter):
+            query = np.array([1.0, 0.0], np.float32)
+            return [m for m, _ in partition.search(query, {"user_id": "u1", **vs_filter}, 10, 8)]
+
+        assert ids({"conversation_id": "c1"}) == [old["_id"]]
+        since = datetime(2026, 2, 1, tzinfo=timezone.utc)
+        assert ids({"created_at": {"$gte": since}}) == [new["_id"]]
+        assert ids({"created_at": {"$gte": since}, "conversation_id": "c1"}) == []
+
+    def test_upsert_replaces_vector_and_metadata(self):
+        partition = Partition(2)
+        doc = _doc([1.0, 0.0], tier="stm")
+        partition.upsert(doc)
+        partition.upsert({**doc, "embedding": [0.0, 1.0], "tier": "ltm"})
+        assert partition.size == 1
+        assert partition.tiers == ["ltm"]
+        ranked = partition.search(np.array([0.0, 1.0], np.float32), {"user_id": "u1"}, 1, 8)
+        assert round(ranked[0][1], 6) == 1.0
+
+    def test_ivf_index_finds_nearest_neighbours(self):
+        partition = Partition(2)
+        docs = [_doc(_angle(i * 2 * np.pi / 400)) for i in range(400)]
+        for doc in docs:
+            partition.upsert(doc)
+        partition.maybe_index(100)
+        assert partition.centroids is not None
+        assert len(partition.centroids) == 20
+
+        ranked = partition.search(np.array(_angle(0.0), np.float32), {"user_id": "u1"}, 3, 2)
+        assert ranked[0][0] == docs[0]["_id"]
+        assert {m for m, _ in ranked} <= {docs[i]["_id"] for i in (0, 1, 2, 398, 399)}
+
+        # New rows are assigned to a list without a rebuild.
+        late = _doc(_angle(np.pi))
+        partition.upsert(late)
+        ranked = partition.search(np.array(_angle(np.pi), np.float32), {"user_id": "u1"}, 1, 2)
+        assert ranked[0][0] in {late["_id"], docs[200]["_id"]}
+
+    def test_small_partitions_are_not_indexed(self):
+        partition = Partition(2)
+        partition.upsert(_doc([1.0, 0.0]))
+        partition.maybe_index(100)
+        assert partition.centroids is None
+
+    def test_compacted_once_tombstones_outnumber_live_rows(self):
+        partition = Partition(2)
+        docs = [_doc(_angle(i * 2 * np.pi / 100), tier="ltm") for i in range(100)]
+        for doc in docs:
+            partition.upsert(doc)
+        partition.maybe_index(50)
+        for doc in docs[:50]:
+            partition.remove(doc["_id"])
+        assert (partition.size, partition.dead) == (100, 50)
+
+        partition.remove(docs[50]["_id"])
+        assert (partition.size, partition.live, partition.dead) == (49, 49, 0)
+        assert partition.row_of[docs[99]["_id"]] == 48
+        assert partition.tiers == ["ltm"] * 49
+        ranked = partition.search(np.array(_angle(0.0), np.float32), {"user_id": "u1"}, 100, 64)
+        assert {m for m, _ in ranked} == {d["_id"] for d in docs[51:]}
+        # Revived rows are no longer tombstones; later writes reuse the arrays.
+        partition.upsert(docs[0])
+        assert partition.live == 50 and partition.dead == 0
+
+
+class TestLocalVectorEngine:
+
+    async def test_search_is_per_user(self):
+        db, _ = _make_db()
+        engine = LocalVectorEngine(db, _make_config())
+        await engine.sync()
+        mine, theirs = _doc([1.0, 0.0]), _doc([1.0, 0.0], user_id="u2")
+        engine.add("memories", [mine, theirs, _doc([1.0, 0.0, 0.0])])  # wrong dimension skipped
+
+        ranked = await engine.search("memories", [1.0, 0.0], {"user_id": "u1"}, 5)
+        assert [m for m, _ in ranked] == [mine["_id"]]
+        assert await engine.search("semantic_cache", [1.0, 0.0], {"user_id": "u1"}, 5) == []
+
+        engine.remove("memories", "u1", [mine["_id"]])
+        assert await engine.search("memories", [1.0, 0.0], {"user_id": "u1"}, 5) == []
+        engine.drop_user("memories", "u2")
+        assert engine.stats()["memories"] == {"users": 1, "vectors": 0, "ivf_partitions": 0}
+
+    async def test_sync_applies_changes_after_watermark(self):
+        first = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        later = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        kept = _doc([1.0, 0.0], updated_at=first)
+        db, collections = _make_db(memories=[kept])
+        engine = LocalVectorEngine(db, _make_config())
+
+        assert await engine.sync() == 1
+        query, _ = collections["memories"].find.call_args[0]
+        assert query == {"deleted_at": None}
+        assert engine.watermarks["memories"] == first
+
+        # Soft delete picked up on the next pass.
+        collections["memories"].find.return_value.to_list = AsyncMock(
+            return_value=[{**kept, "deleted_at": later, "updated_at": later}],
+        )
+        engine._synced_at = 0.0
+        await engine.sync()
+        query, _ = collections["memories"].find.call_args[0]
+        assert query == {"updated_at": {"$gte": first}}
+        assert engine.watermarks["memories"] == later
+        assert await engine.search("memories", [1.0, 0.0], {"user_id": "u1"}, 5) == []
+
+    async def test_search_syncs_when_stale(self):
+        doc = _doc([1.0, 0.0], updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+        db, collections = _make_db(memories=[doc])
+        engine = LocalVectorEngine(db, _make_config(local_vector_sync_seconds=30))
+
+        with patch("memory_mcp.services.local_vector.time.monotonic", return_value=1000.0):
+            ranked = await engine.search("memories", [1.0, 0.0], {"user_id": "u1"}, 1)
+            await engine.search("memories", [1.0, 0.0], {"user_id": "u1"}, 1)
+        assert ranked[0][0] == doc["_id"]
+        assert collections["memories"].find.call_count == 1
+
+    async def test_run_once_reports_failures(self):
+        db, collections = _make_db()
+        collections["memories"].find.side_effect = RuntimeError("down")
+        engine = LocalVectorEngine(db, _make_config())
+        assert await engine.run_once() == {"items": 0, "errors": 1}
+
+    async def test_save_and_load_round_trip(self, tmp_path):
+        db, _ = _make_db()
+        config = _make_config(local_vector_dir=str(tmp_path))
+        engine = LocalVectorEngine(db, config)
+        kept = _doc([1.0, 0.0], tier="ltm", memory_type="fact", tags=["b", "a"], content="alpha",
+                    conversation_id="c1", created_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+        removed = _doc([0.0, 1.0])
+        engine.add("memories", [kept, removed, _doc([0.0, 1.0], user_id="u2")])
+        engine.remove("memories", "u1", [removed["_id"]])
+        engine.watermarks["memories"] = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        engine.save()
+
+        restored = LocalVectorEngine(db, config)
+        assert restored.load() is True
+        partition = restored.partitions["memories"]["u1"]
+        assert isinstance(partition.matrix, np.memmap)
+        assert partition.ids == [kept["_id"]]
+        assert partition.tags == [frozenset({"a", "b"})]
+        assert partition.conversations == ["c1"]
+        assert partition.created == [kept["created_at"].timestamp()]
+        assert restored.watermarks["memories"] == engine.watermarks["memories"]
+        assert [m for m, _ in restored.text.search("alpha", {"user_id": "u1"}, 5)] == [kept["_id"]]
+
+        # Writes copy the memory-mapped rows instead of touching the file.
+        late = _doc([0.0, 1.0], tier="ltm")
+        restored.add("memories", [late])
+        restored._synced_at = float("inf")
+        ranked = await restored.search("memories", [1.0, 0.0], {"user_id": "u1", "tier": "ltm"}, 5)
+        assert [m for m, _ in ranked] == [kept["_id"], late["_id"]]
+
+    def test_missing_text_snapshot_forces_full_resync(self, tmp_path):
+        db, _ = _make_db()
+        config = _make_config(local_vector_dir=str(tmp_path))
+        engine = LocalVectorEngine(db, config)
+        engine.add("memories", [_doc([1.0, 0.0], content="alpha")])
+        engine.watermarks["memories"] = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        engine.save()
+        (tmp_path / "memories_text.npz").unlink()
+
+        restored = LocalVectorEngine(db, config)
+        assert restored.load() is True
+        assert restored.watermarks["memories"] is None
+
+    async def test_text_search_follows_writes(self):
+        db, _ = _make_db()
+        engine = LocalVectorEngine(db, _make_config())
+        engine._synced_at = float("inf")
+        doc = _doc([1.0, 0.0], content="alpha beta")
+        engine.add("memories", [doc])
+        engine.add("semantic_cache", [_doc([1.0, 0.0], content="alpha")])
+
+        assert [m for m, _ in await engine.search_text("alpha", {"user_id": "u1"}, 5)] == [doc["_id"]]
+        engine.remove("memories", "u1", [doc["_id"]])
+        assert await engine.search_text("alpha", {"user_id": "u1"}, 5) == []
+        assert engine.stats()["text"]["documents"] == 0
+
+    def test_load_ignores_snapshot_without_filter_columns(self, tmp_path):
+        import json
+
+        db, _ = _make_db()
+        config = _make_config(local_vector_dir=str(tmp_path))
+        engine = LocalVectorEngine(db, config)
+        engine.add("memories", [_doc([1.0, 0.0])])
+        engine.save()
+        meta = json.loads((tmp_path / "memories.json").read_text())
+        del meta["conversations"], meta["created"]
+        (tmp_path / "memories.json").write_text(json.dumps(meta))
+
+        restored = LocalVectorEngine(db, config)
+        restored.load()
+        assert "u1" not in restored.partitions["memories"]
+        assert restored.watermarks["memories"] is None
+
+    def test_load_ignores_other_dimension(self, tmp_path):
+        db, _ = _make_db()
+        engine = LocalVectorEngine(db, _make_config(local_vector_dir=str(tmp_path)))
+        engine.add("memories", [_doc([1.0, 0.0])])
+        engine.save()
+        other = LocalVectorEngine(
+            db, _make_config(local_vector_dir=str(tmp_path), embedding_dimension=3),
+        )
+        assert other.load() is False
+        assert other.partitions["memories"] == {}
+
+    def test_without_persistence_nothing_is_written(self, tmp_path):
+        db, _ = _make_db()
+        engine = LocalVectorEngine(db, _make_config(local_vector_dir=str(tmp_path)), persist=False)
+        engine.add("memories", [_doc([1.0, 0.0])])
+        engine.save()
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestLazyEngine:
+    """Worker runtimes read a user's vectors on first search only."""
+
+    async def test_user_loaded_on_first_search(self):
+        mine = _doc([1.0, 0.0])
+        db, collections = _make_db(memories=[mine])
+        engine = LocalVectorEngine(db, _make_config(), persist=False, lazy=True)
+        engine._synced_at = float("inf")
+
+        ranked = await engine.search("memories", [1.0, 0.0], {"user_id": "u1"}, 5)
+        await engine.search("memories", [1.0, 0.0], {"user_id": "u1"}, 5)
+
+        assert [m for m, _ in ranked] == [mine["_id"]]
+        collections["memories"].find.assert_called_once()
+        assert collections["memories"].find.call_args[0][0] == {"user_id": "u1", "deleted_at": None}
+        assert engine.text.stats()["documents"] == 0
+
+    async def test_sync_reads_only_loaded_users(self):
+        first = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        db, collections = _make_db()
+        engine = LocalVectorEngine(db, _make_config(), persist=False, lazy=True)
+        engine.watermarks["memories"] = first
+
+        assert await engine.sync() == 0
+        collections["memories"].find.assert_not_called()
+
+        engine.loaded_users["memories"].add("u1")
+        engine._synced_at = 0.0
+        await engine.sync()
+        query, _ = collections["memories"].find.call_args[0]
+        assert query == {"updated_at": {"$gte": first}, "user_id": {"$in": ["u1"]}}
+
+    async def test_open_starts_at_newest_document(self):
+        newest = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        db, collections = _make_db()
+        collections["memories"].find_one = AsyncMock(return_value={"updated_at": newest})
+        collections["semantic_cache"].find_one = AsyncMock(return_value=None)
+
+        engine = await open_vector_engine(
+            db, _make_config(vector_engine="local"), persist=False, lazy=True,
+        )
+
+        assert engine.lazy and engine.watermarks == {"memories": newest, "semantic_cache": None}
+        collections["memories"].find.assert_not_called()
+        assert collections["memories"].find_one.call_args.kwargs["sort"] == [("updated_at", -1)]
+
+
+class TestOpenVectorEngine:
+
+    async def test_atlas_never_probes(self):
+        db, _ = _make_db()
+        with patch("memory_mcp.core.migrations.vector_search_available",
+                   new_callable=AsyncMock) as mock_probe:
+            assert await open_vector_engine(db, _make_config(vector_engine="atlas")) is None
+        mock_probe.assert_not_called()
+
+    @pytest.mark.parametrize("available, expect_local", [(True, False), (False, True)])
+    async def test_auto_follows_probe(self, available, expect_local):
+        db, _ = _make_db(memories=[_doc([1.0, 0.0])])
+        with patch("memory_mcp.core.migrations.vector_search_available",
+                   new_callable=AsyncMock, return_value=available):
+            engine = await open_vector_engine(db, _make_config())
+        assert (engine is not None) is expect_local
+        if engine is not None:
+            assert engine.stats()["memories"]["vectors"] == 1
+
+    async def test_local_forced(self):
+        db, _ = _make_db()
+        with patch("memory_mcp.core.migrations.vector_search_available",
+                   new_callable=AsyncMock, return_value=True):
+            engine = await open_vector_engine(db, _make_config(vector_engine="local"))
+        assert isinstance(engine, LocalVectorEngine)
+
+    async def test_unknown_engine_rejected(self):
+        db, _ = _make_db()
+        with pytest.raises(ValueError, match="Unknown vector engine"):
+            await open_vector_engine(db, _make_config(vector_engine="faiss"))
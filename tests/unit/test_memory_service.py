@@ -1,5 +1,6 @@
 """Tests for MemoryService (store_stm, recall, delete, evolve)."""
 
+import asyncio
 import math
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -165,7 +166,10 @@ class TestMemoryServiceDelete:
 
         result = await service.delete("user1", memory_id=memory_id)
         assert result["deleted_count"] == 1
-        col.update_many.assert_called_once()
+        # Soft delete, then drop the neighbor links pointing at the memory.
+        assert col.update_many.await_count == 2
+        unlink = col.update_many.call_args_list[1][0][1]
+        assert unlink == {"$pull": {"neighbors": {"_id": {"$in": [ObjectId(memory_id)]}}}}
 
     async def test_delete_dry_run(self):
         """REQ-012: dry_run returns count without modifying."""
@@ -215,7 +219,7 @@ class TestMemoryServiceDelete:
         col.update_many = AsyncMock(return_value=MagicMock(modified_count=1))
 
         await service.delete("user1", memory_id=str(ObjectId()))
-        update_arg = col.update_many.call_args[0][1]
+        update_arg = col.update_many.call_args_list[0][0][1]
         assert "is_deleted" in update_arg["$set"]
         assert update_arg["$set"]["is_deleted"] is True
         assert "deleted_at" in update_arg["$set"]
@@ -538,6 +542,13 @@ class TestSanitizeDoc:
         _sanitize_doc(doc)
         assert doc["nested"]["_id"] == str(oid)
 
+    def test_converts_lists(self):
+        from memory_mcp.services.memory import _sanitize_doc
+        oid = ObjectId()
+        doc = {"neighbors": [{"_id": oid, "score": 0.5}], "ids": [oid]}
+        _sanitize_doc(doc)
+        assert doc == {"neighbors": [{"_id": str(oid), "score": 0.5}], "ids": [str(oid)]}
+
 
 class TestStoreStmLtmFailure:
     """LTM insert failure is caught and logged."""
@@ -609,7 +620,58 @@ class TestRecallFilters:
         await service.recall("user1", "query", tags=["topic:test"])
         pipeline = col.aggregate.call_args[0][0]
         vs_filter = pipeline[0]["$vectorSearch"]["filter"]
-        assert vs_filter["tags"] == {"$all": ["topic:test"]}
+        assert vs_filter["$and"] == [{"tags": "topic:test"}]
+
+
+class TestRecallScope:
+    """conversation_id and time_range narrow recall inside $vectorSearch."""
+
+    async def test_scope_in_vector_filter(self):
+        col = _make_collection()
+        service = MemoryService(col, _make_config(), _make_providers())
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        col.aggregate = AsyncMock(return_value=mock_cursor)
+
+        await service.recall(
+            "user1", "query", conversation_id="c1",
+            time_range={"start": "2026-01-01T00:00:00", "end": "2026-02-01T00:00:00+00:00"},
+        )
+
+        vs_filter = col.aggregate.call_args[0][0][0]["$vectorSearch"]["filter"]
+        assert vs_filter["conversation_id"] == "c1"
+        assert vs_filter["created_at"] == {
+            "$gte": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "$lte": datetime(2026, 2, 1, tzinfo=timezone.utc),
+        }
+
+    def test_filter_fields_are_indexed(self):
+        from memory_mcp.core.collections import VECTOR_FILTER_FIELDS
+
+        service = MemoryService(_make_collection(), _make_config(), _make_providers())
+        vs_filter = service._vector_filter(
+            "user1", ["ltm"], "fact", ["x"], "c1", {"start": "2026-01-01T00:00:00"},
+        )
+        paths = {key for key in vs_filter if key != "$and"}
+        paths |= {key for clause in vs_filter["$and"] for key in clause}
+        assert paths == set(VECTOR_FILTER_FIELDS["memories"])
+
+    async def test_scope_carried_by_cursor(self):
+        col = _make_collection()
+        created = datetime.now(timezone.utc) - timedelta(hours=1)
+        docs = [{"_id": ObjectId(), "content": f"m{i}", "vs_score": 1 - i / 10,
+                 "importance": 0.5, "created_at": created} for i in range(3)]
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(side_effect=lambda _: [dict(d) for d in docs])
+        col.aggregate = AsyncMock(return_value=mock_cursor)
+        col.update_many = AsyncMock()
+        service = MemoryService(col, _make_config(), _make_providers())
+
+        first = await service.recall_page("user1", "q", limit=1, conversation_id="c1")
+        await service.recall_page("user1", "q", cursor=first["next_cursor"])
+
+        vs_filter = col.aggregate.call_args[0][0][0]["$vectorSearch"]["filter"]
+        assert vs_filter["conversation_id"] == "c1"
 
 
 class TestDeduplication:
@@ -693,6 +755,208 @@ class TestDeduplication:
         assert deduped[0]["content"] == "stm"
 
 
+class TestRecallAccessTracking:
+    """With an AccessTracker, recall buffers access counts instead of writing."""
+
+    async def test_recall_records_access_write_behind(self):
+        col = _make_collection()
+        tracker = MagicMock()
+        service = MemoryService(col, _make_config(), _make_providers(), access_tracker=tracker)
+        memory_id = ObjectId()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[{
+            "_id": memory_id, "content": "m", "vs_score": 0.9,
+            "created_at": datetime.now(timezone.utc),
+        }])
+        col.aggregate = AsyncMock(return_value=mock_cursor)
+        col.update_many = AsyncMock()
+
+        await service.recall("user1", "query")
+
+        tracker.record.assert_called_once_with([memory_id])
+        col.update_many.assert_not_called()
+
+
+class TestVectorizedRanking:
+    """Columnar _calibrated_rank / linear _deduplicate match the per-dict reference."""
+
+    @staticmethod
+    def _reference_rank(config, results, now):
+        for r in results:
+            created_at = r.get("created_at", now)
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            age_days = max((now - created_at).total_seconds() / 86400, 0)
+            importance = r.get("importance", 0.5)
+            access_count = r.get("access_count", 0)
+            r["final_score"] = (
+                config.ranking_alpha * math.exp(-age_days / 30)
+                + config.ranking_beta * importance * min(1 + math.log(access_count + 1), 3.0) / 3.0
+                + config.ranking_gamma * r.get("vs_score", 0)
+            )
+        return sorted(results, key=lambda r: r["final_score"], reverse=True)
+
+    @staticmethod
+    def _reference_dedup(results):
+        seen, deduped = {}, []
+        for r in results:
+            key = r.get("source_stm_id") or r.get("_id")
+            if key in seen:
+                if r.get("vs_score", 0) > seen[key].get("vs_score", 0):
+                    deduped.remove(seen[key])
+                    deduped.append(r)
+                    seen[key] = r
+            else:
+                seen[key] = r
+                deduped.append(r)
+        return deduped
+
+    def _random_results(self, rng, now, n=200):
+        stm_ids = [ObjectId() for _ in range(n // 2)]
+        results = []
+        for i in range(n):
+            is_ltm = rng.random() < 0.4
+            results.append({
+                "_id": rng.choice(stm_ids) if not is_ltm else ObjectId(),
+                "source_stm_id": rng.choice(stm_ids) if is_ltm else None,
+                "n": i,
+                "vs_score": rng.random(),
+                "importance": rng.random(),
+                "access_count": rng.randint(0, 30),
+                "created_at": now - timedelta(seconds=rng.randint(0, 90 * 86400)),
+            })
+        return results
+
+    def test_matches_reference_on_random_input(self):
+        import random
+
+        rng = random.Random(42)
+        config = _make_config()
+        service = MemoryService(_make_collection(), config, _make_providers())
+        now = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+        for _ in range(20):
+            results = self._random_results(rng, now)
+            expected = self._reference_rank(
+                config, self._reference_dedup([dict(r) for r in results]), now,
+            )
+            actual = service._calibrated_rank(service._deduplicate(results), now)
+            assert [r["n"] for r in actual] == [r["n"] for r in expected]
+            assert [r["final_score"] for r in actual] == pytest.approx(
+                [r["final_score"] for r in expected]
+            )
+
+    def test_equal_scores_keep_input_order(self):
+        service = MemoryService(_make_collection(), _make_config(), _make_providers())
+        now = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        results = [{"n": i, "vs_score": 0.5, "created_at": now} for i in range(5)]
+        ranked = service._calibrated_rank(results, now)
+        assert [r["n"] for r in ranked] == [0, 1, 2, 3, 4]
+        assert all(isinstance(r["final_score"], float) for r in ranked)
+
+    def test_replacement_moves_to_end(self):
+        service = MemoryService(_make_collection(), _make_config(), _make_providers())
+        stm_id = ObjectId()
+        results = [
+            {"_id": stm_id, "n": 0, "vs_score": 0.5},
+            {"_id": ObjectId(), "n": 1, "vs_score": 0.6},
+            {"_id": ObjectId(), "n": 2, "vs_score": 0.9, "source_stm_id": stm_id},
+            {"_id": ObjectId(), "n": 3, "vs_score": 0.4},
+        ]
+        assert [r["n"] for r in service._deduplicate(results)] == [1, 2, 3]
+
+    def test_empty_input(self):
+        service = MemoryService(_make_collection(), _make_config(), _make_providers())
+        assert service._calibrated_rank([], datetime.now(timezone.utc)) == []
+        assert service._deduplicate([]) == []
+
+
+def _eval_expr(expr, doc):
+    """Evaluate the small aggregation-expression subset used by _ranking_stages."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if not isinstance(expr, dict):
+        return expr
+    (op, args), = expr.items()
+    if op == "$ifNull":
+        value = _eval_expr(args[0], doc)
+        return _eval_expr(args[1], doc) if value is None else value
+    if op in ("$exp", "$ln"):
+        return (math.exp if op == "$exp" else math.log)(_eval_expr(args, doc))
+    vals = [_eval_expr(a, doc) for a in args]
+    if op == "$subtract":
+        diff = vals[0] - vals[1]
+        return diff.total_seconds() * 1000 if isinstance(diff, timedelta) else diff
+    return {
+        "$add": lambda v: sum(v),
+        "$multiply": lambda v: math.prod(v),
+        "$divide": lambda v: v[0] / v[1],
+        "$max": max,
+        "$min": min,
+    }[op](vals)
+
+
+class TestServerSideRanking:
+    """server_side_ranking pushes dedup + calibrated ranking into the pipeline."""
+
+    def _service(self, **overrides):
+        col = _make_collection()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[
+            {"_id": ObjectId(), "content": "ranked", "final_score": 0.8,
+             "created_at": datetime.now(timezone.utc)},
+        ])
+        col.aggregate = AsyncMock(return_value=mock_cursor)
+        col.update_many = AsyncMock()
+        service = MemoryService(col, _make_config(server_side_ranking=True, **overrides), _make_providers())
+        return service, col
+
+    async def test_pipeline_ranks_and_limits_server_side(self):
+        service, col = self._service()
+        with patch.object(service, "_calibrated_rank") as mock_rank, \
+             patch.object(service, "_deduplicate") as mock_dedup:
+            results = await service.recall("user1", "query", limit=5)
+
+        mock_rank.assert_not_called()
+        mock_dedup.assert_not_called()
+        pipeline = col.aggregate.call_args[0][0]
+        stages = [next(iter(stage)) for stage in pipeline]
+        assert stages[0] == "$vectorSearch"
+        assert stages.index("$group") < stages.index("$addFields", 2) < stages.index("$limit")
+        assert {"$project": {"embedding": 0}} in pipeline
+        assert {"$limit": 5} in pipeline
+        group = next(s["$group"] for s in pipeline if "$group" in s)
+        assert group["_id"] == {"$ifNull": ["$source_stm_id", "$_id"]}
+        assert results[0]["content"] == "ranked"
+        col.update_many.assert_called_once()
+
+    async def test_empty_results(self):
+        service, col = self._service()
+        col.aggregate.return_value.to_list = AsyncMock(return_value=[])
+        assert await service.recall("user1", "query") == []
+        col.update_many.assert_not_called()
+
+    def test_formula_matches_client_side_ranking(self):
+        config = _make_config(ranking_alpha=0.25, ranking_beta=0.35, ranking_gamma=0.4)
+        service = MemoryService(_make_collection(), config, _make_providers())
+        now = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        stages = service._ranking_stages(10, now)
+        expr = next(
+            s["$addFields"]["final_score"] for s in stages
+            if "$addFields" in s and "final_score" in s["$addFields"]
+        )
+        docs = [
+            {"created_at": now - timedelta(days=3, hours=5), "importance": 0.8,
+             "access_count": 4, "vs_score": 0.91},
+            {"created_at": now - timedelta(days=40), "vs_score": 0.5},
+            {"created_at": now + timedelta(hours=1), "importance": 0.2,
+             "access_count": 100, "vs_score": 0.33},
+        ]
+        expected = service._calibrated_rank([dict(d) for d in docs], now)
+        by_score = {round(d["final_score"], 12) for d in expected}
+        assert {round(_eval_expr(expr, d), 12) for d in docs} == by_score
+
+
 class TestDeleteTimeRange:
     """delete() with time_range filter."""
 
@@ -811,3 +1075,993 @@ class TestRetentionTTL:
     def test_unknown_tier_falls_back_to_standard(self):
         service = self._make_service(ltm_retention_standard_days=90)
         assert service._retention_ttl("unknown_tier") == timedelta(days=90)
+
+
+class TestRecallResultCache:
+    """A RecallCache hit skips embedding and search until the user's next write."""
+
+    def _service(self):
+        from memory_mcp.services.recall_cache import RecallCache
+
+        col = _make_collection()
+        config = _make_config()
+        providers = _make_providers()
+        memory_id = ObjectId()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(side_effect=lambda _: [{
+            "_id": memory_id, "content": "m", "vs_score": 0.9,
+            "created_at": datetime.now(timezone.utc),
+        }])
+        col.aggregate = AsyncMock(return_value=mock_cursor)
+        col.update_many = AsyncMock(return_value=MagicMock(modified_count=1))
+        col.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=[ObjectId()]))
+        tracker = MagicMock()
+        service = MemoryService(
+            col, config, providers, access_tracker=tracker, recall_cache=RecallCache(config),
+        )
+        return service, col, providers, tracker, memory_id
+
+    async def test_repeat_recall_served_from_cache(self):
+        service, col, providers, tracker, memory_id = self._service()
+
+        first = await service.recall("user1", "What is X?")
+        second = await service.recall("user1", "what is  x?")
+
+        assert second == first
+        assert second is not first
+        providers.embedding.generate_embedding.assert_awaited_once()
+        col.aggregate.assert_awaited_once()
+        # Hits still count as accesses.
+        assert tracker.record.call_count == 2
+        tracker.record.assert_called_with([memory_id])
+
+    async def test_store_and_delete_invalidate(self):
+        service, col, providers, _, _ = self._service()
+
+        await service.recall("user1", "q")
+        await service.store_stm("user1", "c1", [{"content": "hi", "message_type": "ai"}])
+        await service.recall("user1", "q")
+        await service.delete("user1", memory_id=str(ObjectId()))
+        await service.recall("user1", "q")
+
+        assert providers.embedding.generate_embedding.await_count == 3
+
+    async def test_other_users_writes_keep_entry(self):
+        service, col, providers, _, _ = self._service()
+
+        await service.recall("user1", "q")
+        await service.store_stm("user2", "c1", [{"content": "hi", "message_type": "ai"}])
+        await service.recall("user1", "q")
+
+        providers.embedding.generate_embedding.assert_awaited_once()
+
+
+class TestRecallPrefetch:
+    """store_stm prefetches the follow-up recall of the last human message."""
+
+    def _service(self):
+        from memory_mcp.services.prefetch import RecallPrefetcher
+        from memory_mcp.services.recall_cache import RecallCache
+
+        col = _make_collection()
+        config = _make_config(prefetch_enabled=True)
+        providers = _make_providers()
+        providers.embedding.generate_embeddings_batch = AsyncMock(
+            side_effect=lambda texts: [[float(i)] * 4 for i in range(len(texts))]
+        )
+        memory_id = ObjectId()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(side_effect=lambda _: [{
+            "_id": memory_id, "content": "m", "vs_score": 0.9,
+            "created_at": datetime.now(timezone.utc),
+        }])
+        col.aggregate = AsyncMock(return_value=mock_cursor)
+        col.insert_many = AsyncMock(side_effect=lambda docs: MagicMock(
+            inserted_ids=[ObjectId() for _ in docs]))
+        tracker = MagicMock()
+        prefetcher = RecallPrefetcher(config)
+        service = MemoryService(
+            col, config, providers, access_tracker=tracker,
+            recall_cache=RecallCache(config), prefetcher=prefetcher,
+        )
+        return service, col, providers, tracker, prefetcher, memory_id
+
+    async def test_follow_up_recall_served_from_cache(self):
+        service, col, providers, tracker, prefetcher, memory_id = self._service()
+
+        await service.store_stm("user1", "c1", [
+            {"content": "Earlier question about deployment targets", "message_type": "human"},
+            {"content": "Which region should the Atlas cluster run in?", "message_type": "human"},
+            {"content": "Let me check.", "message_type": "ai"},
+        ])
+        await asyncio.sleep(0.01)
+
+        # Ranked from the stored embedding of the last human message.
+        vector = col.aggregate.call_args[0][0][0]["$vectorSearch"]["queryVector"]
+        assert vector == [1.0] * 4
+        tracker.record.assert_not_called()
+        assert prefetcher.stats()["completed"] == 1
+
+        page = await service.recall_page("user1", "which region should the Atlas cluster run in?")
+        assert page["plan"] == "cache"
+        assert page["results"][0]["_id"] == str(memory_id)
+        providers.embedding.generate_embedding.assert_not_awaited()
+        tracker.record.assert_called_once_with([memory_id])
+
+    async def test_no_prefetch_without_human_message(self):
+        service, col, _, _, prefetcher, _ = self._service()
+
+        await service.store_stm("user1", "c1", [{"content": "tool output", "message_type": "system"}])
+        await asyncio.sleep(0.01)
+
+        assert prefetcher.stats()["started"] == 0
+        col.aggregate.assert_not_awaited()
+
+    async def test_foreground_miss_cancels_running_prefetch(self):
+        service, col, _, _, prefetcher, _ = self._service()
+        gate = asyncio.Event()
+
+        async def blocked(user_id, query, embedding):
+            await gate.wait()
+
+        service._prefetch_recall = blocked
+        await service.store_stm("user1", "c1", [{"content": "a human message here", "message_type": "human"}])
+        await asyncio.sleep(0)
+        await service.recall_page("user1", "something else")
+        await asyncio.sleep(0.01)
+
+        assert prefetcher.stats()["cancelled"] == 1
+
+
+class TestRecallMany:
+    """recall_many embeds once, searches concurrently and dedupes across queries."""
+
+    def _service(self, pages, recall_cache=None, **overrides):
+        """``pages`` maps a query's first embedding component to its search results."""
+        import asyncio
+
+        col = _make_collection()
+        config = _make_config(**overrides)
+        providers = _make_providers()
+        providers.embedding.generate_query_embeddings_batch = AsyncMock(
+            side_effect=lambda texts: [[float(len(t))] for t in texts]
+        )
+        state = {"active": 0, "peak": 0}
+
+        async def aggregate(pipeline):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            vector = pipeline[0]["$vectorSearch"]["queryVector"]
+            cursor = AsyncMock()
+            cursor.to_list = AsyncMock(return_value=[dict(d) for d in pages[vector[0]]])
+            return cursor
+
+        col.aggregate = aggregate
+        tracker = MagicMock()
+        service = MemoryService(
+            col, config, providers, access_tracker=tracker, recall_cache=recall_cache,
+        )
+        return service, providers, tracker, state
+
+    @staticmethod
+    def _doc(memory_id, score):
+        return {
+            "_id": memory_id, "content": str(memory_id), "vs_score": score,
+            "importance": 0.5, "created_at": datetime.now(timezone.utc),
+        }
+
+    async def test_single_batch_embedding_and_cross_query_dedup(self):
+        shared, only_a, only_b = ObjectId(), ObjectId(), ObjectId()
+        pages = {
+            1.0: [self._doc(shared, 0.9), self._doc(only_a, 0.8)],
+            2.0: [self._doc(only_b, 0.95), self._doc(shared, 0.7)],
+        }
+        service, providers, tracker, _ = self._service(pages)
+
+        result = await service.recall_many("user1", ["a", "bb"], limit=5)
+
+        providers.embedding.generate_query_embeddings_batch.assert_awaited_once_with(["a", "bb"])
+        providers.embedding.generate_embedding.assert_not_called()
+        assert [r["query"] for r in result["results"]] == ["a", "bb"]
+        assert result["results"][0]["memory_ids"] == [str(shared), str(only_a)]
+        assert result["results"][1]["memory_ids"][0] == str(only_b)
+        assert [m["_id"] for m in result["memories"]] == [str(shared), str(only_a), str(only_b)]
+        assert all("vs_score" not in m for m in result["memories"])
+        tracker.record.assert_called_once_with([shared, only_a, only_b])
+
+    async def test_concurrency_is_bounded(self):
+        pages = {float(n): [] for n in range(1, 9)}
+        service, _, _, state = self._service(pages, recall_batch_concurrency=2)
+
+        await service.recall_many("user1", ["x" * n for n in range(1, 9)])
+
+        assert state["peak"] == 2
+
+    async def test_cached_queries_are_not_embedded(self):
+        from memory_mcp.services.recall_cache import RecallCache
+
+        memory_id = ObjectId()
+        pages = {1.0: [self._doc(memory_id, 0.9)], 2.0: []}
+        cache = RecallCache(_make_config())
+        service, providers, _, _ = self._service(pages, recall_cache=cache)
+
+        await service.recall_many("user1", ["a"])
+        result = await service.recall_many("user1", ["A", "bb"])
+
+        assert providers.embedding.generate_query_embeddings_batch.await_args_list[-1][0][0] == ["bb"]
+        assert result["results"][0]["memory_ids"] == [str(memory_id)]
+
+    async def test_too_many_queries_rejected(self):
+        service, providers, _, _ = self._service({}, recall_batch_max_queries=2)
+        with pytest.raises(ValueError, match="At most 2"):
+            await service.recall_many("user1", ["a", "b", "c"])
+        providers.embedding.generate_query_embeddings_batch.assert_not_called()
+
+
+class TestRecallPagination:
+    """recall_page continues after the last served result without re-embedding."""
+
+    def _service(self, docs, **overrides):
+        from memory_mcp.services.query_embeddings import QueryEmbeddingCache
+
+        col = _make_collection()
+        config = _make_config(**overrides)
+        providers = _make_providers()
+        seen_limits = []
+
+        async def aggregate(pipeline):
+            seen_limits.append(pipeline[0]["$vectorSearch"]["limit"])
+            cursor = AsyncMock()
+            cursor.to_list = AsyncMock(return_value=[dict(d) for d in docs])
+            return cursor
+
+        col.aggregate = aggregate
+        col.update_many = AsyncMock()
+        service = MemoryService(
+            col, config, providers,
+            query_embeddings=QueryEmbeddingCache(providers.embedding, config),
+        )
+        return service, providers, seen_limits
+
+    @staticmethod
+    def _docs(n):
+        created = datetime.now(timezone.utc) - timedelta(hours=1)
+        return [
+            {"_id": ObjectId(), "content": f"m{i}", "vs_score": 1.0 - i / 100,
+             "importance": 0.5, "created_at": created}
+            for i in range(n)
+        ]
+
+    async def test_pages_cover_results_once(self):
+        docs = self._docs(5)
+        service, providers, seen_limits = self._service(docs)
+
+        first = await service.recall_page("user1", "q", limit=2)
+        second = await service.recall_page("user1", "ignored", cursor=first["next_cursor"])
+        third = await service.recall_page("user1", "ignored", cursor=second["next_cursor"])
+
+        ids = [r["_id"] for page in (first, second, third) for r in page["results"]]
+        assert ids == [str(d["_id"]) for d in docs]
+        assert third["next_cursor"] is None
+        providers.embedding.generate_embedding.assert_awaited_once_with("q")
+        # Each page searches deep enough to reach past what was served.
+        assert seen_limits == [4, 8, 12]
+
+    async def test_max_depth_ends_pagination(self):
+        service, _, _ = self._service(self._docs(6), pagination_max_depth=4)
+
+        first = await service.recall_page("user1", "q", limit=2)
+        second = await service.recall_page("user1", "q", cursor=first["next_cursor"])
+
+        assert len(second["results"]) == 2
+        assert second["next_cursor"] is None
+
+    async def test_cursor_bound_to_user(self):
+        service, _, _ = self._service(self._docs(3))
+        first = await service.recall_page("user1", "q", limit=1)
+
+        with pytest.raises(ValueError):
+            await service.recall_page("user2", "q", cursor=first["next_cursor"])
+
+    async def test_edited_cursor_held_to_page_caps(self):
+        from memory_mcp.core.cursors import decode_cursor, encode_cursor
+
+        service, _, seen_limits = self._service(self._docs(6), max_results_per_query=3)
+        first = await service.recall_page("user1", "q", limit=2)
+        state = decode_cursor(first["next_cursor"], "recall", "user1")
+
+        await service.recall_page("user1", "q", cursor=encode_cursor({**state, "limit": 10_000}))
+        # served (2) + the clamped limit (3), doubled for dedup headroom.
+        assert seen_limits[-1] == 10
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await service.recall_page(
+                "user1", "q", cursor=encode_cursor({**state, "diversity": 50}),
+            )
+
+
+class TestExactPlan:
+    """Small users are scored exactly in process instead of via $vectorSearch."""
+
+    def _service(self, docs, count=None, working_set=False, **overrides):
+        from memory_mcp.services.query_planner import QueryPlanner
+        from memory_mcp.services.working_set import WorkingSetCache
+
+        col = MagicMock()
+        col.count_documents = AsyncMock(return_value=len(docs) if count is None else count)
+        col.update_many = AsyncMock()
+        col.aggregate = AsyncMock()
+        finds = []
+
+        def find(query, projection=None, limit=0):
+            finds.append((query, projection, limit))
+            if "_id" in query:
+                wanted = set(query["_id"]["$in"])
+                found = [{k: v for k, v in d.items() if k != "embedding"}
+                         for d in docs if d["_id"] in wanted]
+            else:
+                found = [{"_id": d["_id"], "embedding": d["embedding"]} for d in docs]
+                found = found[:limit] if limit else found
+            cursor = MagicMock()
+            cursor.to_list = AsyncMock(return_value=found)
+            return cursor
+
+        col.find = MagicMock(side_effect=find)
+        config = _make_config(**{"exact_search_max_memories": 500, **overrides})
+        providers = _make_providers()
+        providers.embedding.generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+        providers.embedding.generate_embeddings_batch = AsyncMock(
+            side_effect=lambda texts: [[0.5, 0.5] for _ in texts]
+        )
+        service = MemoryService(
+            col, config, providers, planner=QueryPlanner(col, config),
+            working_set=WorkingSetCache(config) if working_set else None,
+        )
+        return service, col, finds
+
+    @staticmethod
+    def _docs():
+        created = datetime.now(timezone.utc) - timedelta(hours=1)
+        vectors = [[0.0, 1.0], [1.0, 0.0], [1.0, 1.0]]
+        return [
+            {"_id": ObjectId(), "content": f"m{i}", "embedding": v,
+             "importance": 0.5, "created_at": created}
+            for i, v in enumerate(vectors)
+        ]
+
+    async def test_exact_scores_by_cosine(self):
+        docs = self._docs()
+        service, col, finds = self._service(docs)
+
+        page = await service.recall_page("user1", "q", limit=2)
+
+        col.aggregate.assert_not_called()
+        assert page["plan"] == "exact"
+        assert [r["content"] for r in page["results"]] == ["m1", "m2"]
+        assert "embedding" not in page["results"][0]
+        query, projection, limit = finds[0]
+        assert query == {"user_id": "user1", "deleted_at": None}
+        assert projection == {"embedding": 1}
+        assert limit == service.config.exact_search_max_memories + 1
+
+    async def test_filtered_read_not_refiltered_without_working_set(self):
+        docs = self._docs()
+        service, _, finds = self._service(docs)
+
+        page = await service.recall_page("user1", "q", limit=2, tier=["ltm"])
+
+        # The rows were read with the tier filter; their tier is not projected.
+        assert finds[0][0]["tier"] == {"$in": ["ltm"]}
+        assert [r["content"] for r in page["results"]] == ["m1", "m2"]
+
+    async def test_large_user_uses_vector_search(self):
+        service, col, _ = self._service(self._docs(), count=10_000)
+        cursor = AsyncMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        col.aggregate = AsyncMock(return_value=cursor)
+
+        page = await service.recall_page("user1", "q")
+
+        col.aggregate.assert_awaited_once()
+        col.find.assert_not_called()
+        assert page["plan"] == "ann"
+
+    async def test_underestimated_count_falls_back(self):
+        service, col, _ = self._service(self._docs(), count=1, exact_search_max_memories=2)
+        cursor = AsyncMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        col.aggregate = AsyncMock(return_value=cursor)
+
+        page = await service.recall_page("user1", "q")
+
+        assert page["plan"] == "ann"
+        col.aggregate.assert_awaited_once()
+        assert service.planner.fallbacks == 1
+
+    async def test_store_adjusts_count(self):
+        service, col, _ = self._service(self._docs())
+        col.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=[ObjectId()]))
+        await service.planner.count("user1")
+
+        await service.store_stm("user1", "c1", [{"content": "hi", "message_type": "ai"}])
+
+        assert await service.planner.count("user1") == 4
+        col.count_documents.assert_awaited_once()
+
+    async def test_working_set_serves_later_recalls(self):
+        docs = self._docs()
+        service, col, finds = self._service(docs, working_set=True, working_set_max_mb=1)
+
+        await service.recall_page("user1", "q", limit=2)
+        page = await service.recall_page("user1", "other", limit=2)
+
+        vector_reads = [f for f in finds if "_id" not in f[0]]
+        assert len(vector_reads) == 1
+        assert "tier" in vector_reads[0][1]
+        assert [r["content"] for r in page["results"]] == ["m1", "m2"]
+        assert service.working_set.stats()["hits"] == 1
+
+    async def test_working_set_applies_own_writes(self):
+        docs = self._docs()
+        service, col, _ = self._service(docs, working_set=True, working_set_max_mb=1)
+        await service.recall_page("user1", "q")
+
+        new_id = ObjectId()
+        col.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=[new_id]))
+        await service.store_stm("user1", "c1", [{"content": "hi", "message_type": "ai"}])
+        assert service.working_set.get("user1").ids[-1] == new_id
+
+        col.update_many = AsyncMock(return_value=MagicMock(modified_count=1))
+        await service.delete("user1", memory_id=str(new_id))
+        assert new_id not in service.working_set.get("user1").ids
+
+        await service.delete("user1", tags=["x"], confirm=True)
+        assert service.working_set.get("user1") is None
+
+    async def test_stale_rows_discarded(self):
+        docs = self._docs()
+        service, _, _ = self._service(docs, working_set=True, working_set_max_mb=1)
+        await service.recall_page("user1", "q")
+        gone = docs.pop(1)  # deleted by another process
+
+        page = await service.recall_page("user1", "q")
+
+        assert [r["content"] for r in page["results"]] == ["m2", "m0"]
+        assert gone["_id"] not in service.working_set.get("user1").ids
+
+
+class TestFreshOverlay:
+    """Inserts from this process appear in ANN recall before the index has them."""
+
+    def _service(self, indexed, **overrides):
+        from memory_mcp.services.fresh_overlay import FreshOverlay
+
+        col = _make_collection()
+        config = _make_config(**overrides)
+        providers = _make_providers()
+        providers.embedding.generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+        providers.embedding.generate_embeddings_batch = AsyncMock(
+            side_effect=lambda texts: [[1.0, 0.0] for _ in texts]
+        )
+        cursor = AsyncMock()
+        cursor.to_list = AsyncMock(side_effect=lambda _: [dict(d) for d in indexed])
+        col.aggregate = AsyncMock(return_value=cursor)
+        col.update_many = AsyncMock(return_value=MagicMock(modified_count=1))
+        service = MemoryService(col, config, providers, fresh_overlay=FreshOverlay(config))
+        return service, col
+
+    @staticmethod
+    def _indexed():
+        created = datetime.now(timezone.utc) - timedelta(days=30)
+        return [{"_id": ObjectId(), "content": "old", "vs_score": 0.6,
+                 "importance": 0.5, "created_at": created}]
+
+    @pytest.mark.parametrize("server_side", [False, True])
+    async def test_stored_memory_recalled_before_indexing(self, server_side):
+        indexed = self._indexed()
+        if server_side:
+            indexed[0]["final_score"] = 0.4
+        service, col = self._service(indexed, server_side_ranking=server_side)
+        stm_id = ObjectId()
+        col.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=[stm_id]))
+
+        await service.store_stm("user1", "c1", [{"content": "new", "message_type": "ai"}])
+        results = await service.recall("user1", "q")
+
+        assert [r["content"] for r in results] == ["new", "old"]
+        assert results[0]["_id"] == str(stm_id)
+        assert "embedding" not in results[0]
+
+    async def test_leaves_overlay_once_indexed(self):
+        indexed = self._indexed()
+        service, col = self._service(indexed)
+        stm_id = ObjectId()
+        col.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=[stm_id]))
+        await service.store_stm("user1", "c1", [{"content": "new", "message_type": "ai"}])
+
+        indexed.append({**indexed[0], "_id": stm_id, "content": "new", "vs_score": 1.0})
+        results = await service.recall("user1", "q")
+
+        assert [r["content"] for r in results] == ["new", "old"]
+        assert service.fresh_overlay.stats()["pending"] == 0
+
+    async def test_deleted_memory_not_recalled(self):
+        service, col = self._service(self._indexed())
+        stm_id = ObjectId()
+        col.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=[stm_id]))
+        await service.store_stm("user1", "c1", [{"content": "new", "message_type": "ai"}])
+
+        await service.delete("user1", memory_id=str(stm_id))
+        results = await service.recall("user1", "q")
+
+        assert [r["content"] for r in results] == ["old"]
+
+
+class TestLocalVectorEngine:
+    """Without Atlas Vector Search, recall and evolve run on the local engine."""
+
+    def _service(self, docs):
+        from memory_mcp.services.local_vector import LocalVectorEngine
+
+        col = _make_collection()
+        col.aggregate = AsyncMock()
+
+        def find(query, projection=None):
+            wanted = set(query["_id"]["$in"])
+            found = [{k: v for k, v in d.items() if k != "embedding"}
+                     for d in docs if d["_id"] in wanted]
+            cursor = MagicMock()
+            cursor.to_list = AsyncMock(return_value=found)
+            return cursor
+
+        col.find = MagicMock(side_effect=find)
+        config = _make_config(embedding_dimension=2)
+        engine = LocalVectorEngine(MagicMock(), config)
+        engine._synced_at = float("inf")  # no background reads in these tests
+        engine.add("memories", [{**d, "user_id": "user1"} for d in docs])
+        providers = _make_providers()
+        providers.embedding.generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+        return MemoryService(col, config, providers, vector_engine=engine), col
+
+    @staticmethod
+    def _docs():
+        created = datetime.now(timezone.utc) - timedelta(hours=1)
+        return [
+            {"_id": ObjectId(), "content": f"m{i}", "embedding": v, "tier": "ltm",
+             "importance": 0.5, "created_at": created}
+            for i, v in enumerate([[0.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+        ]
+
+    async def test_recall_without_vector_search(self):
+        docs = self._docs()
+        service, col = self._service(docs)
+
+        results = await service.recall("user1", "q", limit=2)
+
+        col.aggregate.assert_not_called()
+        assert [r["content"] for r in results] == ["m1", "m2"]
+        assert "embedding" not in results[0]
+
+    async def test_deleted_elsewhere_dropped_from_engine(self):
+        docs = self._docs()
+        service, _ = self._service(docs)
+        gone = docs.pop(1)
+
+        results = await service.recall("user1", "q", limit=2)
+
+        assert [r["content"] for r in results] == ["m2", "m0"]
+        partition = service.vector_engine.partitions["memories"]["user1"]
+        assert not partition.alive[partition.row_of[gone["_id"]]]
+
+    async def test_evolve_reinforces_local_neighbour(self):
+        docs = self._docs()
+        service, col = self._service(docs)
+        col.update_one = AsyncMock()
+
+        action = await service.evolve_memory("user1", "same", [1.0, 0.0])
+
+        assert action == "reinforced"
+        col.aggregate.assert_not_called()
+        assert col.update_one.call_args[0][0] == {"_id": docs[1]["_id"]}
+
+
+class TestDegradedRecall:
+    """Past EMBEDDING_DEADLINE_SECONDS recall serves full-text or recent memories."""
+
+    def _service(self, text_docs=None, recent_docs=None, recall_cache=None):
+        from pymongo.errors import OperationFailure
+
+        col = _make_collection()
+
+        async def aggregate(pipeline):
+            if text_docs is None:
+                raise OperationFailure("$search stage is only allowed on Atlas", code=40324)
+            cursor = AsyncMock()
+            cursor.to_list = AsyncMock(return_value=[dict(d) for d in text_docs])
+            return cursor
+
+        col.aggregate = AsyncMock(side_effect=aggregate)
+        find_cursor = MagicMock()
+        find_cursor.to_list = AsyncMock(return_value=[dict(d) for d in recent_docs or []])
+        col.find = MagicMock(return_value=find_cursor)
+        col.update_many = AsyncMock()
+        providers = _make_providers()
+        providers.embedding.generate_embedding = AsyncMock(side_effect=RuntimeError("throttled"))
+        config = _make_config(embedding_deadline_seconds=0.5)
+        return MemoryService(col, config, providers, recall_cache=recall_cache), col
+
+    @staticmethod
+    def _doc(content, score=None, hours=1):
+        doc = {"_id": ObjectId(), "content": content, "importance": 0.5,
+               "created_at": datetime.now(timezone.utc) - timedelta(hours=hours)}
+        if score is not None:
+            doc["vs_score"] = score
+        return doc
+
+    async def test_full_text_page_marked_degraded(self):
+        from memory_mcp.services.recall_cache import RecallCache
+
+        docs = [self._doc("weak", 2.0), self._doc("strong", 8.0)]
+        cache = RecallCache(_make_config())
+        service, col = self._service(text_docs=docs, recall_cache=cache)
+
+        page = await service.recall_page("user1", "deploy notes", tier=["ltm"], limit=1)
+
+        assert [r["content"] for r in page["results"]] == ["strong"]
+        assert (page["plan"], page["degraded"], page["next_cursor"]) == ("text", True, None)
+        pipeline = col.aggregate.call_args[0][0]
+        assert pipeline[0]["$search"]["index"] == "memories_fts_index"
+        assert pipeline[1] == {"$match": {"user_id": "user1", "deleted_at": None,
+                                          "tier": {"$in": ["ltm"]}}}
+        # Degraded pages are not cached: the next recall retries the embedding.
+        await service.recall_page("user1", "deploy notes", tier=["ltm"], limit=1)
+        assert col.aggregate.await_count == 2
+
+    async def test_recent_scan_without_text_index(self):
+        docs = [self._doc("new", hours=1), self._doc("old", hours=24 * 90)]
+        service, col = self._service(recent_docs=docs)
+
+        page = await service.recall_page("user1", "deploy notes", limit=2)
+
+        assert [r["content"] for r in page["results"]] == ["new", "old"]
+        assert (page["plan"], page["degraded"]) == ("recent", True)
+        assert col.find.call_args.kwargs == {"sort": [("created_at", -1)], "limit": 4}
+
+    async def test_local_engine_text_index(self):
+        from memory_mcp.services.local_vector import LocalVectorEngine
+
+        doc = self._doc("deploy notes for friday")
+        service, col = self._service()
+        engine = LocalVectorEngine(MagicMock(), _make_config(embedding_dimension=2))
+        engine._synced_at = float("inf")
+        engine.add("memories", [{**doc, "user_id": "user1", "embedding": [1.0, 0.0]}])
+        service.vector_engine = engine
+        col.find.return_value.to_list = AsyncMock(return_value=[dict(doc)])
+
+        page = await service.recall_page("user1", "friday deploy")
+
+        col.aggregate.assert_not_called()
+        assert [r["content"] for r in page["results"]] == ["deploy notes for friday"]
+        assert page["plan"] == "text"
+
+
+class TestRecallDiversity:
+    """diversity > 0 picks the page by MMR from a larger candidate pool."""
+
+    def _service(self, docs):
+        col = _make_collection()
+        seen = []
+
+        async def aggregate(pipeline):
+            seen.append(pipeline[0]["$vectorSearch"]["limit"])
+            cursor = AsyncMock()
+            cursor.to_list = AsyncMock(return_value=[dict(d) for d in docs])
+            return cursor
+
+        col.aggregate = aggregate
+        col.update_many = AsyncMock()
+        providers = _make_providers()
+        providers.embedding.generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+        return MemoryService(col, _make_config(), providers), seen
+
+    @staticmethod
+    def _docs():
+        created = datetime.now(timezone.utc) - timedelta(hours=1)
+        vectors = [[1.0, 0.0], [1.0, 0.001], [0.999, 0.0], [0.6, 0.8]]
+        scores = [1.0, 0.99, 0.98, 0.8]
+        return [
+            {"_id": ObjectId(), "content": f"m{i}", "embedding": v, "vs_score": s,
+             "importance": 0.5, "created_at": created}
+            for i, (v, s) in enumerate(zip(vectors, scores))
+        ]
+
+    async def test_near_duplicates_skipped(self):
+        service, seen = self._service(self._docs())
+
+        plain = await service.recall("user1", "q", limit=2)
+        diverse = await service.recall("user1", "q", limit=2, diversity=0.7)
+
+        assert [r["content"] for r in plain] == ["m0", "m1"]
+        assert [r["content"] for r in diverse] == ["m0", "m3"]
+        assert "embedding" not in diverse[0]
+        # The pool is DIVERSITY_CANDIDATE_FACTOR x limit, over-fetched 2x for dedup.
+        assert seen == [4, 16]
+
+    async def test_pages_replay_picks(self):
+        service, _ = self._service(self._docs())
+
+        first = await service.recall_page("user1", "q", limit=2, diversity=0.7)
+        second = await service.recall_page("user1", "q", cursor=first["next_cursor"])
+
+        served = [r["content"] for page in (first, second) for r in page["results"]]
+        assert served[:2] == ["m0", "m3"]
+        assert sorted(served) == ["m0", "m1", "m2", "m3"]
+
+    async def test_server_ranked_pool_keeps_embeddings(self):
+        col = _make_collection()
+        cursor = AsyncMock()
+        docs = [{**d, "final_score": d["vs_score"]} for d in self._docs()]
+        cursor.to_list = AsyncMock(side_effect=lambda _: [dict(d) for d in docs])
+        col.aggregate = AsyncMock(return_value=cursor)
+        col.update_many = AsyncMock()
+        providers = _make_providers()
+        providers.embedding.generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+        service = MemoryService(col, _make_config(server_side_ranking=True), providers)
+
+        await service.recall("user1", "q", limit=2)
+        assert {"$project": {"embedding": 0}} in col.aggregate.call_args[0][0]
+
+        diverse = await service.recall("user1", "q", limit=2, diversity=0.7)
+        # MMR reads the pool's embeddings from the search, not a second query.
+        assert {"$project": {"embedding": 0}} not in col.aggregate.call_args[0][0]
+        col.find.assert_not_called()
+        assert "embedding" not in diverse[0]
+
+    async def test_invalid_diversity(self):
+        service, _ = self._service(self._docs())
+        with pytest.raises(ValueError):
+            await service.recall("user1", "q", diversity=2)
+
+
+def _matches(doc, query):
+    """Evaluate the find filters conversation_context builds against ``doc``."""
+    for field, cond in query.items():
+        if field == "$and":
+            if not all(_matches(doc, q) for q in cond):
+                return False
+        elif field == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+        elif isinstance(cond, dict):
+            value = doc.get(field)
+            ops = {"$lt": lambda a, b: a < b, "$lte": lambda a, b: a <= b,
+                   "$gt": lambda a, b: a > b, "$ne": lambda a, b: a != b}
+            if not all(ops[op](value, arg) for op, arg in cond.items()):
+                return False
+        elif doc.get(field) != cond:
+            return False
+    return True
+
+
+class TestConversationContext:
+    """get_conversation_context: one indexed find per page, no embedding."""
+
+    def _service(self, docs, **overrides):
+        col = MagicMock()
+        finds = []
+
+        def find(query, projection=None, sort=None, limit=0):
+            finds.append((query, projection, sort, limit))
+            rows = sorted(
+                (d for d in docs if _matches(d, query)),
+                key=lambda d: (d["created_at"], d["_id"]), reverse=True,
+            )[:limit]
+            cursor = MagicMock()
+            cursor.to_list = AsyncMock(return_value=[
+                {k: v for k, v in d.items() if k == "_id" or k in projection} for d in rows
+            ])
+            return cursor
+
+        col.find = MagicMock(side_effect=find)
+        providers = _make_providers()
+        return MemoryService(col, _make_config(**overrides), providers), providers, finds
+
+    @staticmethod
+    def _turn(minutes_ago, tier="stm", **fields):
+        created = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+        doc = {
+            "_id": ObjectId(), "user_id": "user1", "conversation_id": "c1",
+            "tier": tier, "content": f"turn {minutes_ago}", "summary": None,
+            "message_type": "human", "created_at": created, "deleted_at": None,
+            "source_stm_id": None, "embedding": [0.1],
+            "expires_at": created + timedelta(hours=24),
+        }
+        doc.update(fields)
+        return doc
+
+    async def test_latest_turns_in_order_without_embedding(self):
+        docs = [self._turn(m) for m in (5, 4, 3, 2, 1)]
+        docs.append(self._turn(0, conversation_id="other"))
+        docs.append(self._turn(0, deleted_at=datetime.now(timezone.utc)))
+        service, providers, finds = self._service(docs)
+
+        page = await service.conversation_context("user1", "c1", limit=3)
+
+        assert [t["content"] for t in page["turns"]] == ["turn 3", "turn 2", "turn 1"]
+        assert "embedding" not in page["turns"][0]
+        assert isinstance(page["turns"][0]["_id"], str)
+        query, projection, sort, limit = finds[0]
+        assert (query["user_id"], query["conversation_id"]) == ("user1", "c1")
+        assert "embedding" not in projection
+        assert sort == [("created_at", -1), ("_id", -1)] and limit == 3
+        providers.embedding.generate_embedding.assert_not_called()
+
+        older = await service.conversation_context("user1", "c1", cursor=page["next_cursor"])
+        assert [t["content"] for t in older["turns"]] == ["turn 5", "turn 4"]
+        assert older["next_cursor"] is None
+
+    async def test_keyset_breaks_created_at_ties_by_id(self):
+        created = datetime.now(timezone.utc) - timedelta(minutes=1)
+        docs = [self._turn(1, created_at=created, content=f"m{i}") for i in range(3)]
+        service, _, _ = self._service(docs)
+
+        first = await service.conversation_context("user1", "c1", limit=2)
+        second = await service.conversation_context("user1", "c1", cursor=first["next_cursor"])
+
+        assert [t["content"] for t in first["turns"]] == ["m1", "m2"]
+        assert [t["content"] for t in second["turns"]] == ["m0"]
+
+    async def test_ltm_copy_shown_once_its_stm_expired(self):
+        live_stm = self._turn(10)
+        live_copy = self._turn(10, tier="ltm", source_stm_id=live_stm["_id"])
+        old_copy = self._turn(60 * 30, tier="ltm", source_stm_id=ObjectId(), content="old")
+        expired_stm = self._turn(60 * 25, expires_at=datetime.now(timezone.utc) - timedelta(hours=1))
+        service, _, _ = self._service([live_stm, live_copy, old_copy, expired_stm])
+
+        page = await service.conversation_context("user1", "c1")
+
+        assert [t["_id"] for t in page["turns"]] == [str(old_copy["_id"]), str(live_stm["_id"])]
+
+    async def test_older_turns_summarized_in_place(self):
+        docs = [self._turn(m, summary=f"summary {m}") for m in (4, 3, 2)]
+        docs.append(self._turn(1))
+        service, _, _ = self._service(docs)
+
+        first = await service.conversation_context("user1", "c1", limit=2, full_turns=2)
+        second = await service.conversation_context("user1", "c1", cursor=first["next_cursor"])
+
+        assert [t["content"] for t in first["turns"]] == ["turn 2", "turn 1"]
+        assert [t["content"] for t in second["turns"]] == ["summary 4", "summary 3"]
+        assert all(t["summarized"] for t in second["turns"])
+
+    async def test_cursor_bound_to_kind(self):
+        service, _, _ = self._service([self._turn(1), self._turn(2)])
+        page = await service.conversation_context("user1", "c1", limit=1)
+        with pytest.raises(ValueError):
+            await service.recall_page("user1", "q", cursor=page["next_cursor"])
+
+
+class TestNeighborLinks:
+    """Enrichment stores the evolve candidates as neighbour links."""
+
+    async def test_evolve_with_memory_id_links_both_ways(self):
+        col = _make_collection()
+        service = MemoryService(col, _make_config(), _make_providers())
+        memory_id, near, far = ObjectId(), ObjectId(), ObjectId()
+        cursor = AsyncMock()
+        cursor.to_list = AsyncMock(return_value=[
+            {"_id": memory_id, "score": 1.0},
+            {"_id": near, "score": 0.6},
+            {"_id": far, "score": 0.4},
+        ])
+        col.aggregate = AsyncMock(return_value=cursor)
+
+        await service.evolve_memory("user1", "content", [0.1] * 1536, memory_id=memory_id)
+
+        ops = col.bulk_write.call_args[0][0]
+        assert ops[0]._filter == {"_id": memory_id}
+        assert ops[0]._doc == {"$set": {"neighbors": [
+            {"_id": near, "score": 0.6}, {"_id": far, "score": 0.4},
+        ]}}
+        assert [op._filter for op in ops[1:]] == [
+            {"_id": near, "neighbors._id": {"$ne": memory_id}},
+            {"_id": far, "neighbors._id": {"$ne": memory_id}},
+        ]
+        push = ops[1]._doc["$push"]["neighbors"]
+        assert push["$each"] == [{"_id": memory_id, "score": 0.6}]
+        assert push["$sort"] == {"score": -1} and push["$slice"] == 5
+
+    async def test_evolve_without_memory_id_stores_no_links(self):
+        col = _make_collection()
+        service = MemoryService(col, _make_config(), _make_providers())
+        cursor = AsyncMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        col.aggregate = AsyncMock(return_value=cursor)
+
+        await service.evolve_memory("user1", "content", [0.1] * 1536)
+
+        col.bulk_write.assert_not_called()
+
+    async def test_relink_points_links_at_merged_memory(self):
+        col = _make_collection()
+        service = MemoryService(col, _make_config(), _make_providers())
+        old_id, new_id = ObjectId(), ObjectId()
+
+        await service.relink_neighbors("user1", old_id, new_id)
+
+        dedupe, relink = col.bulk_write.call_args[0][0]
+        assert dedupe._filter["neighbors._id"] == {"$all": [old_id, new_id]}
+        assert dedupe._doc == {"$pull": {"neighbors": {"_id": old_id}}}
+        assert relink._doc == {"$set": {"neighbors.$[link]._id": new_id}}
+        assert relink._array_filters == [{"link._id": old_id}]
+        # Matches the partial ix_memories_neighbors index.
+        assert dedupe._filter["deleted_at"] is None and relink._filter["deleted_at"] is None
+
+
+class TestRelatedMemories:
+    """related(): one $graphLookup over stored links, no vector search."""
+
+    def _service(self, seed):
+        col = _make_collection()
+        col.name = "memories"
+        cursor = AsyncMock()
+        cursor.to_list = AsyncMock(return_value=[seed] if seed else [])
+        col.aggregate = AsyncMock(return_value=cursor)
+        providers = _make_providers()
+        return MemoryService(col, _make_config(), providers), col, providers
+
+    async def test_ranks_by_best_path_and_prunes_dead_links(self):
+        seed_id, a, b, c, dead = (ObjectId() for _ in range(5))
+        seed = {
+            "_id": seed_id,
+            "neighbors": [
+                {"_id": a, "score": 0.9}, {"_id": b, "score": 0.8}, {"_id": dead, "score": 0.7},
+            ],
+            "related": [
+                {"_id": a, "content": "a", "hops": 0, "neighbors": [
+                    {"_id": b, "score": 0.95}, {"_id": c, "score": 0.5},
+                ]},
+                {"_id": b, "content": "b", "hops": 0, "neighbors": [{"_id": seed_id, "score": 0.8}]},
+                {"_id": c, "content": "c", "hops": 1, "neighbors": []},
+            ],
+        }
+        service, col, providers = self._service(seed)
+
+        results = await service.related("user1", str(seed_id), depth=2)
+
+        # b is reached more strongly through a (0.9 * 0.95) than directly (0.8).
+        assert [r["content"] for r in results] == ["a", "b", "c"]
+        assert [round(r["related_score"], 3) for r in results] == [0.9, 0.855, 0.45]
+        # hops follows the best path, not the $graphLookup (shortest path) depth.
+        assert [r["hops"] for r in results] == [0, 1, 1]
+        assert isinstance(results[0]["_id"], str)
+        col.update_one.assert_awaited_once_with(
+            {"_id": seed_id}, {"$pull": {"neighbors": {"_id": {"$in": [dead]}}}},
+        )
+        lookup = col.aggregate.call_args[0][0][2]["$graphLookup"]
+        assert lookup["from"] == "memories" and lookup["maxDepth"] == 1
+        assert lookup["restrictSearchWithMatch"]["user_id"] == "user1"
+        providers.embedding.generate_embedding.assert_not_called()
+
+    async def test_depth_one_ignores_links_of_links(self):
+        seed_id, a, c = ObjectId(), ObjectId(), ObjectId()
+        seed = {
+            "_id": seed_id,
+            "neighbors": [{"_id": a, "score": 0.9}],
+            "related": [{"_id": a, "content": "a", "hops": 0, "neighbors": [{"_id": c, "score": 0.9}]}],
+        }
+        service, col, _ = self._service(seed)
+
+        results = await service.related("user1", str(seed_id), limit=5)
+
+        assert [r["content"] for r in results] == ["a"]
+        assert col.aggregate.call_args[0][0][2]["$graphLookup"]["maxDepth"] == 0
+        col.update_one.assert_not_called()
+
+    async def test_missing_seed_and_invalid_depth(self):
+        service, _, _ = self._service(None)
+        assert await service.related("user1", str(ObjectId())) == []
+        with pytest.raises(ValueError, match="depth"):
+            await service.related("user1", str(ObjectId()), depth=4)
@@ -238,6 +238,45 @@ class TestEnsureSearchIndexes:
         assert col.drop_search_index.call_count >= 1
         assert col.create_search_index.call_count >= 1
 
+    async def test_missing_filter_fields_update_index_in_place(self):
+        """A vector index without the filter fields the services use is updated."""
+        from memory_mcp.core.collections import VECTOR_FILTER_FIELDS
+        from memory_mcp.core.migrations import ensure_search_indexes
+
+        mock_db = MagicMock()
+        col = MagicMock()
+
+        def make_existing_iter(index_name):
+            return _async_iter_of([{
+                "name": index_name,
+                "queryable": True,
+                "latestDefinition": {
+                    "fields": [
+                        {"type": "vector", "path": "embedding", "numDimensions": 1536},
+                        {"type": "filter", "path": "user_id"},
+                        {"type": "filter", "path": "tier"},
+                        {"type": "filter", "path": "deleted_at"},
+                    ]
+                },
+            }])
+
+        col.list_search_indexes = AsyncMock(side_effect=make_existing_iter)
+        col.update_search_index = AsyncMock()
+        col.drop_search_index = AsyncMock()
+        col.create_search_index = AsyncMock()
+        mock_db.__getitem__ = MagicMock(return_value=col)
+
+        await ensure_search_indexes(mock_db)
+
+        col.drop_search_index.assert_not_called()
+        col.create_search_index.assert_not_called()
+        # Only memories_vector_index lacks fields; the cache index is complete.
+        col.update_search_index.assert_awaited_once()
+        name, definition = col.update_search_index.call_args[0]
+        assert name == "memories_vector_index"
+        paths = [f["path"] for f in definition["fields"] if f["type"] == "filter"]
+        assert paths == list(VECTOR_FILTER_FIELDS["memories"])
+
     async def test_search_index_not_queryable_within_timeout(self):
         """Logs warning when index doesn't become queryable."""
         from memory_mcp.core.migrations import ensure_search_indexes
@@ -287,6 +326,68 @@ class TestEnsureSearchIndexes:
         await ensure_search_indexes(mock_db)  # Should not raise
 
 
+class TestVectorSearchAvailable:
+    """vector_search_available probes for Atlas Search."""
+
+    async def test_true_on_atlas(self):
+        from memory_mcp.core.migrations import vector_search_available
+
+        mock_db = MagicMock()
+        col = MagicMock()
+        col.list_search_indexes = AsyncMock(return_value=_empty_async_iter())
+        mock_db.__getitem__ = MagicMock(return_value=col)
+
+        assert await vector_search_available(mock_db) is True
+
+    async def test_false_on_plain_mongod(self):
+        from memory_mcp.core.migrations import vector_search_available
+        from pymongo.errors import OperationFailure
+
+        mock_db = MagicMock()
+        col = MagicMock()
+        col.list_search_indexes = AsyncMock(
+            side_effect=OperationFailure("not supported", code=None)
+        )
+        mock_db.__getitem__ = MagicMock(return_value=col)
+
+        assert await vector_search_available(mock_db) is False
+
+
+class TestRankFusionAvailable:
+    """rank_fusion_available probes for the $rankFusion stage."""
+
+    @staticmethod
+    def _db(aggregate):
+        mock_db = MagicMock()
+        col = MagicMock()
+        col.aggregate = aggregate
+        mock_db.__getitem__ = MagicMock(return_value=col)
+        return mock_db
+
+    async def test_true_when_stage_runs(self):
+        from memory_mcp.core.migrations import rank_fusion_available
+
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        assert await rank_fusion_available(self._db(AsyncMock(return_value=cursor))) is True
+
+    async def test_false_for_unrecognized_stage(self):
+        from memory_mcp.core.migrations import rank_fusion_available
+        from pymongo.errors import OperationFailure
+
+        aggregate = AsyncMock(side_effect=OperationFailure(
+            "Unrecognized pipeline stage name: '$rankFusion'", code=40324,
+        ))
+        assert await rank_fusion_available(self._db(aggregate)) is False
+
+    async def test_other_errors_mean_the_stage_exists(self):
+        from memory_mcp.core.migrations import rank_fusion_available
+        from pymongo.errors import OperationFailure
+
+        aggregate = AsyncMock(side_effect=OperationFailure("bad input pipeline", code=9))
+        assert await rank_fusion_available(self._db(aggregate)) is True
+
+
 class TestGetExistingDims:
     """_get_existing_dims extracts numDimensions from index info."""
 
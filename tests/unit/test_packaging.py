@@ -62,6 +62,7 @@ class TestPyprojectToml:
             "memory_mcp/__init__.py",
             "memory_mcp/__main__.py",
             "memory_mcp/server.py",
+            "memory_mcp/supervisor.py",
             "memory_mcp/core",
             "memory_mcp/providers",
             "memory_mcp/services",
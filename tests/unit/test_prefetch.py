@@ -0,0 +1,74 @@
+"""Tests for the bounded background recall prefetcher."""
+
+import asyncio
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.prefetch import RecallPrefetcher
+
+
+def _make_prefetcher(**overrides) -> RecallPrefetcher:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return RecallPrefetcher(MCPConfig(**defaults, _env_file=None))
+
+
+class TestRecallPrefetcher:
+
+    async def test_runs_to_completion(self):
+        prefetcher = _make_prefetcher()
+        ran = []
+
+        async def work():
+            ran.append(True)
+
+        assert prefetcher.schedule("u1", work()) is True
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert ran == [True]
+        assert prefetcher.stats()["completed"] == 1
+        assert prefetcher.stats()["inflight"] == 0
+
+    async def test_newer_prefetch_supersedes_users_running_one(self):
+        prefetcher = _make_prefetcher()
+        gate = asyncio.Event()
+        finished = []
+
+        async def work(name):
+            await gate.wait()
+            finished.append(name)
+
+        prefetcher.schedule("u1", work("old"))
+        await asyncio.sleep(0)
+        prefetcher.schedule("u1", work("new"))
+        gate.set()
+        await asyncio.sleep(0.01)
+
+        assert finished == ["new"]
+        stats = prefetcher.stats()
+        assert (stats["cancelled"], stats["completed"], stats["inflight"]) == (1, 1, 0)
+
+    async def test_global_bound_drops_new_work(self):
+        prefetcher = _make_prefetcher(prefetch_max_inflight=1)
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+
+        assert prefetcher.schedule("u1", work()) is True
+        assert prefetcher.schedule("u2", work()) is False
+        assert prefetcher.stats()["dropped"] == 1
+
+        prefetcher.cancel_all()
+        await asyncio.sleep(0.01)
+        assert prefetcher.stats()["inflight"] == 0
+        assert prefetcher.stats()["cancelled"] == 1
+
+    async def test_failure_counted(self):
+        prefetcher = _make_prefetcher()
+
+        async def work():
+            raise RuntimeError("search down")
+
+        prefetcher.schedule("u1", work())
+        await asyncio.sleep(0.01)
+        assert prefetcher.stats()["failed"] == 1
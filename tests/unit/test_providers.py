@@ -276,6 +276,29 @@ class TestVoyageEmbeddingProvider:
         payload = call_kwargs.kwargs.get("json") or call_kwargs[1].get("json")
         assert payload["input_type"] == "document"
 
+    async def test_query_batch_uses_query_input_type(self):
+        """Batched search queries are embedded as queries, in one call."""
+        config = _make_config(
+            voyage_api_key="test-key",
+            voyage_model="voyage-3",
+            embedding_dimension=1024,
+        )
+        provider = VoyageEmbeddingProvider(config)
+        fake_embs = [[0.1] * 1024, [0.2] * 1024]
+
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.json.return_value = _voyage_response(fake_embs)
+        mock_response.raise_for_status = MagicMock()
+
+        mock_post = AsyncMock(return_value=mock_response)
+        with patch.object(provider._client, "post", mock_post):
+            results = await provider.generate_query_embeddings_batch(["q1", "q2"])
+
+        assert results == fake_embs
+        mock_post.assert_awaited_once()
+        assert mock_post.call_args.kwargs["json"]["input_type"] == "query"
+
     async def test_uses_query_input_type_for_single(self):
         """Single embedding uses input_type='query'."""
         config = _make_config(
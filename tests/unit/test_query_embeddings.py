@@ -0,0 +1,117 @@
+"""Tests for the query embedding cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.query_embeddings import QueryEmbeddingCache, embed_within
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+class TestQueryEmbeddingCache:
+
+    async def test_repeat_query_not_re_embedded(self):
+        provider = MagicMock()
+        provider.generate_embedding = AsyncMock(return_value=[0.1, 0.2, 0.3])
+        cache = QueryEmbeddingCache(provider, _make_config())
+
+        first = await cache.embed("q")
+        second = await cache.embed("q")
+
+        assert first == second == [0.1, 0.2, 0.3]
+        assert isinstance(second, list)
+        provider.generate_embedding.assert_awaited_once_with("q")
+
+    async def test_lru_bound(self):
+        provider = MagicMock()
+        provider.generate_embedding = AsyncMock(side_effect=lambda q: [float(len(q))])
+        cache = QueryEmbeddingCache(provider, _make_config(query_embedding_cache_size=2))
+
+        for query in ("a", "bb", "a", "ccc", "bb"):
+            await cache.embed(query)
+
+        # "bb" was evicted by "ccc" (least recently used after "a" was re-read).
+        assert provider.generate_embedding.await_count == 4
+
+    async def test_concurrent_embeds_share_one_call(self):
+        release = asyncio.Event()
+        provider = MagicMock()
+
+        async def slow(query):
+            await release.wait()
+            return [0.5]
+
+        provider.generate_embedding = AsyncMock(side_effect=slow)
+        cache = QueryEmbeddingCache(provider, _make_config())
+
+        cache.start("q")
+        waiters = [asyncio.ensure_future(cache.embed("q")) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+
+        first, second = await asyncio.gather(*waiters)
+        assert first == second == [0.5]
+        assert first is not second
+        provider.generate_embedding.assert_awaited_once_with("q")
+        assert cache.start("q") is None
+
+    async def test_abandon_cancels_only_unawaited_calls(self):
+        release = asyncio.Event()
+        provider = MagicMock()
+
+        async def slow(query):
+            await release.wait()
+            return [0.5]
+
+        provider.generate_embedding = AsyncMock(side_effect=slow)
+        cache = QueryEmbeddingCache(provider, _make_config())
+
+        task = cache.start("denied")
+        cache.abandon("denied")
+        await asyncio.sleep(0)
+        assert task.cancelled()
+
+        cache.start("shared")
+        waiter = asyncio.ensure_future(cache.embed("shared"))
+        await asyncio.sleep(0)
+        cache.abandon("shared")
+        release.set()
+        assert await waiter == [0.5]
+
+
+class TestEmbedWithin:
+
+    async def test_late_embedding_warms_cache(self):
+        release = asyncio.Event()
+        provider = MagicMock()
+
+        async def slow(query):
+            await release.wait()
+            return [0.5]
+
+        provider.generate_embedding = AsyncMock(side_effect=slow)
+        cache = QueryEmbeddingCache(provider, _make_config())
+
+        assert await embed_within(cache.embed, "q", 0.01) is None
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert await embed_within(cache.embed, "q", 0.01) == [0.5]
+        provider.generate_embedding.assert_awaited_once_with("q")
+
+    async def test_provider_error_within_deadline(self):
+        embed = AsyncMock(side_effect=RuntimeError("throttled"))
+        assert await embed_within(embed, "q", 1) is None
+
+    async def test_no_deadline_waits_and_raises(self):
+        assert await embed_within(AsyncMock(return_value=[1.0]), "q", 0) == [1.0]
+        with pytest.raises(RuntimeError):
+            await embed_within(AsyncMock(side_effect=RuntimeError("down")), "q", 0)
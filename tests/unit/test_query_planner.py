@@ -0,0 +1,66 @@
+"""Tests for the per-user ANN / exact query planner."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.query_planner import ANN, EXACT, QueryPlanner
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _planner(count, **overrides):
+    col = MagicMock()
+    col.count_documents = AsyncMock(return_value=count)
+    overrides.setdefault("exact_search_max_memories", 500)
+    return QueryPlanner(col, _make_config(**overrides)), col
+
+
+class TestQueryPlanner:
+
+    async def test_small_user_gets_exact(self):
+        planner, col = _planner(10, exact_search_max_memories=100)
+        assert await planner.choose("u1") == EXACT
+        col.count_documents.assert_awaited_once_with({"user_id": "u1", "deleted_at": None})
+
+    async def test_large_user_gets_ann(self):
+        planner, _ = _planner(101, exact_search_max_memories=100)
+        assert await planner.choose("u1") == ANN
+
+    async def test_zero_threshold_always_ann(self):
+        planner, col = _planner(0, exact_search_max_memories=0)
+        assert await planner.choose("u1") == ANN
+        col.count_documents.assert_not_awaited()
+
+    async def test_count_cached_and_adjusted(self):
+        planner, col = _planner(99, exact_search_max_memories=100)
+        assert await planner.choose("u1") == EXACT
+        planner.adjust("u1", 2)
+        assert await planner.choose("u1") == ANN
+        planner.adjust("u1", -5)
+        assert await planner.choose("u1") == EXACT
+        col.count_documents.assert_awaited_once()
+        assert planner.stats()["plans"] == {ANN: 1, EXACT: 2}
+
+    async def test_count_reread_after_ttl(self):
+        planner, col = _planner(5, planner_count_ttl_seconds=60)
+        with patch("memory_mcp.services.query_planner.time.monotonic", return_value=100.0):
+            await planner.count("u1")
+        with patch("memory_mcp.services.query_planner.time.monotonic", return_value=159.0):
+            await planner.count("u1")
+        assert col.count_documents.await_count == 1
+        with patch("memory_mcp.services.query_planner.time.monotonic", return_value=161.0):
+            await planner.count("u1")
+        assert col.count_documents.await_count == 2
+
+    async def test_fallback_recounted_as_ann(self):
+        planner, col = _planner(5)
+        await planner.choose("u1")
+        planner.fell_back("u1")
+        assert planner.stats()["plans"] == {ANN: 1, EXACT: 0}
+        assert planner.stats()["fallbacks"] == 1
+        await planner.count("u1")
+        assert col.count_documents.await_count == 2
@@ -115,6 +115,20 @@ class TestRateLimiterBoundary:
         result = await limiter.check_rate_limit("user1", "store_memory")
         assert result is True
 
+    async def test_cost_needs_that_many_units(self):
+        """A batch is denied unless every one of its operations fits."""
+        col = _make_collection()
+        col.insert_many = AsyncMock()
+        config = _make_config(rate_limit_enabled=True, rate_limit_max_requests=50)
+        limiter = RateLimiter(col, config)
+
+        col.count_documents = AsyncMock(return_value=45)
+
+        assert await limiter.check_rate_limit("user1", "recall_memory", cost=6) is False
+        col.insert_many.assert_not_called()
+        assert await limiter.check_rate_limit("user1", "recall_memory", cost=5) is True
+        assert len(col.insert_many.call_args[0][0]) == 5
+
 
 class TestRateLimiterGovernanceOverride:
     """TC-E-028: Rate limiter reads limits from governance profile."""
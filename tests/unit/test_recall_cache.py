@@ -0,0 +1,147 @@
+"""Tests for the in-process recall/hybrid_search result cache."""
+
+import threading
+from unittest.mock import patch
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.recall_cache import RecallCache, normalize_query
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _put(cache, key, value):
+    cache.put(key, value, cache.generation(key[1]))
+
+
+class TestKey:
+
+    def test_query_normalized(self):
+        assert normalize_query("  What   is\tMongoDB? ") == "what is mongodb?"
+        assert RecallCache.key("recall", "u1", "Foo  Bar") == RecallCache.key("recall", "u1", "foo bar")
+
+    def test_filter_order_ignored(self):
+        a = RecallCache.key("recall", "u1", "q", tier=["stm", "ltm"], tags=["b", "a"], limit=5)
+        b = RecallCache.key("recall", "u1", "q", tier=["ltm", "stm"], tags=["a", "b"], limit=5)
+        assert a == b
+
+    def test_kind_user_and_limit_distinguish(self):
+        base = RecallCache.key("recall", "u1", "q", limit=5)
+        assert base != RecallCache.key("hybrid", "u1", "q", limit=5)
+        assert base != RecallCache.key("recall", "u2", "q", limit=5)
+        assert base != RecallCache.key("recall", "u1", "q", limit=10)
+
+
+class TestRecallCache:
+
+    def test_hit_and_miss_counted(self):
+        cache = RecallCache(_make_config())
+        key = cache.key("recall", "u1", "q")
+        assert cache.get(key) is None
+        _put(cache, key, ["r"])
+        assert cache.get(key) == ["r"]
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+    def test_peek_neither_counts_nor_reorders(self):
+        cache = RecallCache(_make_config(recall_cache_max_entries=2))
+        k1, k2, k3 = (cache.key("recall", "u1", q) for q in ("a", "b", "c"))
+        assert cache.peek(k1) is False
+        _put(cache, k1, [1])
+        _put(cache, k2, [2])
+        assert cache.peek(k1) is True
+        _put(cache, k3, [3])  # k1 stays least recently used
+
+        assert cache.peek(k1) is False
+        cache.bump("u1")
+        assert cache.peek(k2) is False
+        assert (cache.hits, cache.misses) == (0, 0)
+
+    def test_bump_invalidates_only_that_user(self):
+        cache = RecallCache(_make_config())
+        mine, theirs = cache.key("recall", "u1", "q"), cache.key("recall", "u2", "q")
+        _put(cache, mine, ["a"])
+        _put(cache, theirs, ["b"])
+
+        cache.bump("u1")
+
+        assert cache.get(mine) is None
+        assert cache.get(theirs) == ["b"]
+
+    def test_evict_drops_only_that_users_entries(self):
+        cache = RecallCache(_make_config())
+        mine, theirs = cache.key("recall", "u1", "q"), cache.key("recall", "u2", "q")
+        _put(cache, mine, ["a"])
+        _put(cache, theirs, ["b"])
+
+        cache.evict("u1")
+
+        assert cache.stats()["entries"] == 1
+        assert cache.get(mine) is None
+        assert cache.get(theirs) == ["b"]
+
+    def test_bump_all_invalidates_everyone(self):
+        cache = RecallCache(_make_config())
+        key = cache.key("recall", "u1", "q")
+        _put(cache, key, ["a"])
+        cache.bump_all()
+        assert cache.get(key) is None
+
+    def test_write_during_query_is_not_cached(self):
+        cache = RecallCache(_make_config())
+        key = cache.key("recall", "u1", "q")
+        generation = cache.generation("u1")
+        cache.bump("u1")  # store_stm lands while the search runs
+        cache.put(key, ["stale"], generation)
+        assert cache.get(key) is None
+
+    def test_lru_eviction(self):
+        cache = RecallCache(_make_config(recall_cache_max_entries=2))
+        k1, k2, k3 = (cache.key("recall", "u1", q) for q in ("a", "b", "c"))
+        _put(cache, k1, [1])
+        _put(cache, k2, [2])
+        cache.get(k1)  # k2 is now least recently used
+        _put(cache, k3, [3])
+
+        assert cache.get(k2) is None
+        assert cache.get(k1) == [1]
+        assert cache.get(k3) == [3]
+        assert cache.stats()["entries"] == 2
+
+    def test_ttl_expiry(self):
+        cache = RecallCache(_make_config(recall_cache_ttl_seconds=30))
+        key = cache.key("recall", "u1", "q")
+        with patch("memory_mcp.services.recall_cache.time.monotonic", return_value=100.0):
+            _put(cache, key, ["a"])
+        with patch("memory_mcp.services.recall_cache.time.monotonic", return_value=129.0):
+            assert cache.get(key) == ["a"]
+        with patch("memory_mcp.services.recall_cache.time.monotonic", return_value=131.0):
+            assert cache.get(key) is None
+
+    def test_concurrent_threads(self):
+        """The worker thread bumps while the request loop reads and writes."""
+        cache = RecallCache(_make_config(recall_cache_max_entries=8))
+        errors = []
+
+        def hammer(offset):
+            try:
+                for i in range(2000):
+                    key = cache.key("recall", f"u{i % 3}", f"q{(i + offset) % 20}")
+                    _put(cache, key, [i])
+                    cache.get(key)
+                    cache.bump(f"u{i % 3}")
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=hammer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert cache.stats()["entries"] <= 8
@@ -1,5 +1,7 @@
 """Tests for ServiceRegistry singleton."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
@@ -140,6 +142,68 @@ class TestCheckAccess:
         assert "Rate limit" in result
 
 
+class TestCheckAccessAndEmbed:
+    """The query embedding runs while governance and rate limits are checked."""
+
+    def _registry(self, allowed=True):
+        from memory_mcp.services.query_embeddings import QueryEmbeddingCache
+
+        config = MCPConfig(
+            mongodb_connection_string="mongodb://localhost:27017",
+            _env_file=None,
+        )
+        reg = ServiceRegistry.initialize(
+            config=config,
+            memory_service=MagicMock(),
+            cache_service=MagicMock(),
+            audit_service=MagicMock(),
+            providers=MagicMock(),
+        )
+        self.calls = []
+        self.release = asyncio.Event()
+
+        async def embed(query):
+            self.calls.append("embed")
+            await self.release.wait()
+            return [0.5]
+
+        async def check_rate_limit(user_id, operation, **kwargs):
+            self.calls.append("rate_limit")
+            return allowed
+
+        provider = MagicMock()
+        provider.generate_embedding = AsyncMock(side_effect=embed)
+        reg.query_embeddings = QueryEmbeddingCache(provider, config)
+        reg.rate_limiter = AsyncMock()
+        reg.rate_limiter.check_rate_limit = AsyncMock(side_effect=check_rate_limit)
+        return reg, provider
+
+    async def test_embedding_started_before_access_checked(self):
+        reg, provider = self._registry()
+
+        assert await reg.check_access_and_embed("user1", "recall_memory", "q") is None
+        assert self.calls == ["embed", "rate_limit"]
+
+        # The tool's own embed joins the call already in flight.
+        self.release.set()
+        assert await reg.query_embeddings.embed("q") == [0.5]
+        provider.generate_embedding.assert_awaited_once_with("q")
+
+    async def test_denied_access_cancels_embedding(self):
+        reg, provider = self._registry(allowed=False)
+
+        assert "Rate limit" in await reg.check_access_and_embed("user1", "recall_memory", "q")
+        await asyncio.sleep(0.01)
+        assert reg.query_embeddings._inflight == {}
+        assert "q" not in reg.query_embeddings._entries
+
+    async def test_without_query_only_checks_access(self):
+        reg, provider = self._registry()
+
+        assert await reg.check_access_and_embed("user1", "recall_memory", None) is None
+        provider.generate_embedding.assert_not_called()
+
+
 class TestCheckAccessGovernanceAware:
     """TC-E-029/030: check_access passes governance limits to rate limiter."""
 
@@ -172,7 +236,7 @@ class TestCheckAccessGovernanceAware:
 
         # Rate limiter should have been called with max_requests from profile
         reg.rate_limiter.check_rate_limit.assert_called_once_with(
-            "user1", "store_memory", max_requests=1000,
+            "user1", "store_memory", max_requests=1000, cost=1,
         )
 
     async def test_check_access_search_uses_search_limit(self):
@@ -203,7 +267,7 @@ class TestCheckAccessGovernanceAware:
         assert result is None
 
         reg.rate_limiter.check_rate_limit.assert_called_once_with(
-            "user1", "hybrid_search", max_requests=500,
+            "user1", "hybrid_search", max_requests=500, cost=1,
         )
 
     async def test_check_access_fallback_when_no_governance(self):
@@ -228,5 +292,5 @@ class TestCheckAccessGovernanceAware:
 
         # Called without max_requests override (uses config default)
         reg.rate_limiter.check_rate_limit.assert_called_once_with(
-            "user1", "store_memory",
+            "user1", "store_memory", cost=1,
         )
@@ -0,0 +1,242 @@
+"""Tests for JobScheduler, schedules, and run stats."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.scheduler import (
+    CronSchedule,
+    IntervalSchedule,
+    JobScheduler,
+    parse_schedule,
+)
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _make_collection():
+    col = MagicMock()
+    col.insert_one = AsyncMock()
+    return col
+
+
+class TestSchedules:
+    """Interval and cron schedule arithmetic."""
+
+    def test_interval_next_after(self):
+        now = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+        assert IntervalSchedule(30).next_after(now) == datetime(2025, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+    def test_parse_schedule_number_and_numeric_string(self):
+        assert isinstance(parse_schedule(60), IntervalSchedule)
+        assert parse_schedule("45").seconds == 45
+
+    def test_parse_schedule_cron(self):
+        assert isinstance(parse_schedule("0 3 * * *"), CronSchedule)
+
+    def test_cron_daily_off_peak(self):
+        cron = CronSchedule("0 3 * * *")
+        now = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+        assert cron.next_after(now) == datetime(2025, 1, 2, 3, 0, tzinfo=timezone.utc)
+
+    def test_cron_steps_and_lists(self):
+        cron = CronSchedule("*/15 1,13 * * *")
+        now = datetime(2025, 1, 1, 1, 50, tzinfo=timezone.utc)
+        assert cron.next_after(now) == datetime(2025, 1, 1, 13, 0, tzinfo=timezone.utc)
+
+    def test_cron_day_of_week(self):
+        # 2025-01-01 is a Wednesday; next Sunday is the 5th.
+        cron = CronSchedule("30 2 * * 0")
+        now = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+        assert cron.next_after(now) == datetime(2025, 1, 5, 2, 30, tzinfo=timezone.utc)
+
+    def test_cron_month_rollover(self):
+        cron = CronSchedule("0 0 1 * *")
+        now = datetime(2025, 12, 15, tzinfo=timezone.utc)
+        assert cron.next_after(now) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def test_cron_is_strictly_after(self):
+        cron = CronSchedule("0 3 * * *")
+        now = datetime(2025, 1, 1, 3, 0, tzinfo=timezone.utc)
+        assert cron.next_after(now) == datetime(2025, 1, 2, 3, 0, tzinfo=timezone.utc)
+
+    @pytest.mark.parametrize("expr", ["* * *", "61 * * * *", "*/0 * * * *", "5-1 * * * *"])
+    def test_cron_invalid(self, expr):
+        with pytest.raises(ValueError):
+            CronSchedule(expr)
+
+
+class TestRunJob:
+    """run_job executes once, records stats, never raises."""
+
+    async def test_success_records_stats(self):
+        col = _make_collection()
+        scheduler = JobScheduler(col, _make_config())
+        scheduler.add_job("enrichment", AsyncMock(return_value={"items": 5, "errors": 1}), 30)
+
+        stats = await scheduler.run_job("enrichment")
+
+        assert stats["status"] == "success"
+        assert stats["items"] == 5
+        assert stats["errors"] == 1
+        assert stats["trigger"] == "manual"
+        assert isinstance(stats["started_at"], str)
+        doc = col.insert_one.call_args[0][0]
+        assert doc["job"] == "enrichment"
+        assert isinstance(doc["started_at"], datetime)
+        assert "duration_ms" in doc
+
+    async def test_dict_result_sums_counts(self):
+        scheduler = JobScheduler(_make_collection(), _make_config())
+        scheduler.add_job(
+            "consolidation",
+            AsyncMock(return_value={"compressed": 2, "forgotten": 1, "promoted": 3}),
+            3600,
+        )
+        stats = await scheduler.run_job("consolidation")
+        assert stats["items"] == 6
+        assert stats["details"] == {"compressed": 2, "forgotten": 1, "promoted": 3}
+
+    async def test_error_is_captured(self):
+        scheduler = JobScheduler(_make_collection(), _make_config())
+        scheduler.add_job("broken", AsyncMock(side_effect=RuntimeError("boom")), 30)
+
+        stats = await scheduler.run_job("broken")
+
+        assert stats["status"] == "error"
+        assert stats["error"] == "boom"
+        assert stats["errors"] == 1
+        assert scheduler.jobs["broken"].running is False
+
+    async def test_runtime_budget_cancels_job(self):
+        async def slow():
+            await asyncio.sleep(5)
+
+        scheduler = JobScheduler(_make_collection(), _make_config())
+        scheduler.add_job("slow", slow, 30, max_runtime_seconds=0.05)
+
+        stats = await scheduler.run_job("slow")
+
+        assert stats["status"] == "timeout"
+
+    async def test_overlapping_run_is_skipped(self):
+        release = asyncio.Event()
+
+        async def blocking():
+            await release.wait()
+            return 1
+
+        scheduler = JobScheduler(_make_collection(), _make_config())
+        scheduler.add_job("blocking", blocking, 30)
+
+        first = asyncio.create_task(scheduler.run_job("blocking"))
+        await asyncio.sleep(0.01)
+        second = await scheduler.run_job("blocking")
+        release.set()
+        await first
+
+        assert second["status"] == "skipped"
+        assert scheduler.jobs["blocking"].run_count == 1
+
+    async def test_persist_failure_is_non_fatal(self):
+        col = _make_collection()
+        col.insert_one = AsyncMock(side_effect=Exception("db down"))
+        scheduler = JobScheduler(col, _make_config())
+        scheduler.add_job("job", AsyncMock(return_value=1), 30)
+
+        stats = await scheduler.run_job("job")
+        assert stats["status"] == "success"
+
+    async def test_no_collection_keeps_stats_in_memory(self):
+        scheduler = JobScheduler(None, _make_config())
+        scheduler.add_job("job", AsyncMock(return_value=3), 30)
+        await scheduler.run_job("job")
+        assert scheduler.status("job")[0]["last_run"]["items"] == 3
+
+
+class TestSchedulerLoop:
+    """Runner tasks, triggers, pause/resume."""
+
+    async def test_interval_job_runs_repeatedly(self):
+        func = AsyncMock(return_value=0)
+        scheduler = JobScheduler(_make_collection(), _make_config())
+        scheduler.add_job("fast", func, 0.01, jitter_seconds=0)
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        assert func.call_count >= 2
+
+    async def test_run_on_start(self):
+        func = AsyncMock(return_value=0)
+        scheduler = JobScheduler(_make_collection(), _make_config())
+        scheduler.add_job("daily", func, "0 3 * * *", run_on_start=True)
+        scheduler.start()
+        await asyncio.sleep(0.02)
+        await scheduler.stop()
+        func.assert_called_once()
+        assert scheduler.jobs["daily"].last_run["trigger"] == "startup"
+
+    async def test_trigger_runs_immediately(self):
+        func = AsyncMock(return_value=0)
+        scheduler = JobScheduler(_make_collection(), _make_config())
+        scheduler.add_job("hourly", func, 3600)
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        assert scheduler.trigger("hourly") == "triggered"
+        await asyncio.sleep(0.02)
+        await scheduler.stop()
+        func.assert_called_once()
+        assert scheduler.jobs["hourly"].last_run["trigger"] == "manual"
+
+    async def test_paused_job_skips_scheduled_runs(self):
+        func = AsyncMock(return_value=0)
+        scheduler = JobScheduler(_make_collection(), _make_config())
+        scheduler.add_job("fast", func, 0.01, jitter_seconds=0)
+        scheduler.pause("fast")
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        func.assert_not_called()
+
+        # Manual trigger overrides pause
+        scheduler.trigger("fast")
+        await asyncio.sleep(0.02)
+        assert func.call_count == 1
+
+        scheduler.resume("fast")
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        assert func.call_count >= 2
+
+    async def test_unknown_job_raises_key_error(self):
+        scheduler = JobScheduler(None, _make_config())
+        with pytest.raises(KeyError):
+            scheduler.trigger("nope")
+
+    async def test_duplicate_job_rejected(self):
+        scheduler = JobScheduler(None, _make_config())
+        scheduler.add_job("a", AsyncMock(), 1)
+        with pytest.raises(ValueError):
+            scheduler.add_job("a", AsyncMock(), 1)
+
+    def test_default_jitter_is_capped(self):
+        config = _make_config(scheduler_jitter_ratio=0.1, scheduler_max_jitter_seconds=300)
+        scheduler = JobScheduler(None, config)
+        assert scheduler.add_job("short", AsyncMock(), 30).jitter_seconds == pytest.approx(3.0)
+        assert scheduler.add_job("long", AsyncMock(), 86400).jitter_seconds == 300
+        assert scheduler.add_job("cron", AsyncMock(), "0 * * * *").jitter_seconds == 300
+
+    def test_status_shape(self):
+        scheduler = JobScheduler(None, _make_config())
+        scheduler.add_job("a", AsyncMock(), 60)
+        status = scheduler.status()[0]
+        assert status["name"] == "a"
+        assert status["schedule"] == "every 60s"
+        assert status["paused"] is False
+        assert status["last_run"] is None
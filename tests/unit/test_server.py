@@ -50,11 +50,17 @@ class TestLifespan:
              patch("memory_mcp.server.ConsolidationWorker") as mock_consol_cls, \
              patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
              patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
+             patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
              patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+                   return_value=True) as mock_rfa, \
              patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock) as mock_ei, \
              patch("memory_mcp.server.asyncio") as mock_asyncio:
 
             mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_sched_cls.return_value.stop = AsyncMock()
             mock_audit_cls.return_value = MagicMock()
             mock_audit_cls.return_value.flush = AsyncMock()
 
@@ -68,18 +74,9 @@ class TestLifespan:
             mock_reg_instance = MagicMock()
             mock_reg_cls.initialize.return_value = mock_reg_instance
 
-            mock_enrichment_task = MagicMock()
-            mock_consolidation_task = MagicMock()
-            mock_audit_flush_task = MagicMock()
             mock_search_task = MagicMock()
             mock_search_task.done = MagicMock(return_value=False)
-            mock_asyncio.create_task.side_effect = [
-                mock_enrichment_task, mock_consolidation_task,
-                mock_audit_flush_task, mock_search_task,
-            ]
-            mock_enrichment_task.cancel = MagicMock()
-            mock_consolidation_task.cancel = MagicMock()
-            mock_audit_flush_task.cancel = MagicMock()
+            mock_asyncio.create_task.side_effect = [mock_search_task]
 
             from memory_mcp.server import lifespan
 
@@ -95,14 +92,14 @@ class TestLifespan:
             mock_cache_cls.assert_called_once()
             mock_audit_cls.assert_called_once()
             mock_reg_cls.initialize.assert_called_once()
-            assert mock_asyncio.create_task.call_count == 4
+            assert mock_asyncio.create_task.call_count == 1
+            mock_sched_cls.return_value.start.assert_called_once()
+            assert mock_reg_instance.scheduler is mock_sched_cls.return_value
 
             # Shutdown
             await ctx.__aexit__(None, None, None)
 
-            mock_enrichment_task.cancel.assert_called_once()
-            mock_consolidation_task.cancel.assert_called_once()
-            mock_audit_flush_task.cancel.assert_called_once()
+            mock_sched_cls.return_value.stop.assert_called_once()
             mock_search_task.cancel.assert_called_once()
             mock_audit_cls.return_value.flush.assert_called_once()
             mock_db_manager.close.assert_called_once()
@@ -123,11 +120,17 @@ class TestLifespan:
              patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
              patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
              patch("memory_mcp.server.AuditFlushWorker") as mock_afw_cls, \
+             patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
              patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+                   return_value=True) as mock_rfa, \
              patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock), \
              patch("memory_mcp.server.asyncio") as mock_asyncio:
 
             mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_sched_cls.return_value.stop = AsyncMock()
             mock_audit_cls.return_value = MagicMock()
             mock_audit_cls.return_value.flush = AsyncMock()
 
@@ -147,7 +150,7 @@ class TestLifespan:
 
             mock_search_task = MagicMock()
             mock_search_task.done = MagicMock(return_value=True)
-            mock_asyncio.create_task.side_effect = [MagicMock(), MagicMock(), MagicMock(), mock_search_task]
+            mock_asyncio.create_task.side_effect = [mock_search_task]
 
             from memory_mcp.server import lifespan
 
@@ -197,11 +200,17 @@ class TestEnrichmentWorkerLifecycle:
              patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
              patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
              patch("memory_mcp.server.AuditFlushWorker") as mock_afw_cls, \
+             patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
              patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+                   return_value=True) as mock_rfa, \
              patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock), \
              patch("memory_mcp.server.asyncio") as mock_asyncio:
 
             mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_sched_cls.return_value.stop = AsyncMock()
             mock_audit_cls.return_value = MagicMock(flush=AsyncMock())
 
             mock_enrichment = MagicMock()
@@ -220,7 +229,7 @@ class TestEnrichmentWorkerLifecycle:
 
             mock_search_task = MagicMock()
             mock_search_task.done = MagicMock(return_value=True)
-            mock_asyncio.create_task.side_effect = [MagicMock(), MagicMock(), MagicMock(), mock_search_task]
+            mock_asyncio.create_task.side_effect = [mock_search_task]
 
             from memory_mcp.server import lifespan
 
@@ -234,6 +243,232 @@ class TestEnrichmentWorkerLifecycle:
             assert enrich_call[0][0] == collections["memories"]
 
 
+async def _run_lifespan(config, vector_engine=None, rank_fusion=True):
+    """Run lifespan startup + shutdown with all services mocked."""
+    mock_db_manager, _ = _make_mock_db_manager()
+    with patch("memory_mcp.server.MCPConfig", return_value=config), \
+         patch("memory_mcp.server.DatabaseManager") as mock_db_cls, \
+         patch("memory_mcp.server.ProviderManager"), \
+         patch("memory_mcp.server.MemoryService"), \
+         patch("memory_mcp.server.CacheService"), \
+         patch("memory_mcp.server.AuditService") as mock_audit_cls, \
+         patch("memory_mcp.server.EnrichmentWorker") as mock_enrich_cls, \
+         patch("memory_mcp.server.ConsolidationWorker") as mock_consol_cls, \
+         patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
+         patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
+         patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
+         patch("memory_mcp.server.create_worker_host") as mock_host_factory, \
+         patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+         patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+               return_value=vector_engine) as mock_ove, \
+         patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+               return_value=rank_fusion) as mock_rfa, \
+         patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock) as mock_ei, \
+         patch("memory_mcp.server.asyncio") as mock_asyncio:
+
+        mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+        mock_sched_cls.return_value.stop = AsyncMock()
+        mock_host_factory.return_value.stop = AsyncMock()
+        mock_audit_cls.return_value = MagicMock(flush=AsyncMock())
+        mock_pl_cls.return_value = MagicMock(seed_defaults=AsyncMock(return_value=0))
+        mock_ds_cls.return_value = MagicMock(seed_defaults=AsyncMock(return_value=0))
+        mock_reg_instance = MagicMock()
+        mock_reg_cls.initialize.return_value = mock_reg_instance
+        mock_asyncio.create_task.side_effect = [MagicMock(done=MagicMock(return_value=True))]
+
+        from memory_mcp.server import lifespan
+
+        ctx = lifespan(MagicMock())
+        await ctx.__aenter__()
+        await ctx.__aexit__(None, None, None)
+
+        return {
+            "enrich_cls": mock_enrich_cls,
+            "consol_cls": mock_consol_cls,
+            "scheduler": mock_sched_cls.return_value,
+            "host_factory": mock_host_factory,
+            "registry": mock_reg_instance,
+            "ensure_indexes": mock_ei,
+            "prompt_library": mock_pl_cls.return_value,
+            "create_task": mock_asyncio.create_task,
+            "rank_fusion_available": mock_rfa,
+        }
+
+
+class TestWorkerIsolation:
+    """WORKER_ISOLATION moves enrichment/consolidation off the request loop."""
+
+    async def test_default_runs_workers_in_request_loop(self):
+        mocks = await _run_lifespan(_make_config())
+
+        mocks["host_factory"].assert_not_called()
+        mocks["enrich_cls"].assert_called_once()
+        mocks["consol_cls"].assert_called_once()
+        job_names = [c[0][0] for c in mocks["scheduler"].add_job.call_args_list]
+        assert job_names == ["audit_flush", "access_flush", "enrichment", "consolidation"]
+
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    async def test_isolated_mode_uses_worker_host(self, mode):
+        from memory_mcp.services.scheduler import SchedulerGroup
+
+        mocks = await _run_lifespan(_make_config(worker_isolation=mode))
+
+        host = mocks["host_factory"].return_value
+        mocks["enrich_cls"].assert_not_called()
+        mocks["consol_cls"].assert_not_called()
+        job_names = [c[0][0] for c in mocks["scheduler"].add_job.call_args_list]
+        assert job_names == ["audit_flush", "access_flush"]
+        host.start.assert_called_once()
+        host.stop.assert_awaited_once()
+        group = mocks["registry"].scheduler
+        assert isinstance(group, SchedulerGroup)
+        assert group.members == (mocks["scheduler"], host)
+
+    async def test_recall_cache_shared_with_workers(self):
+        from memory_mcp.services.recall_cache import RecallCache
+
+        mocks = await _run_lifespan(_make_config())
+        cache = mocks["registry"].recall_cache
+        assert isinstance(cache, RecallCache)
+        assert mocks["consol_cls"].call_args.kwargs["recall_cache"] is cache
+
+        mocks = await _run_lifespan(_make_config(worker_isolation="thread"))
+        assert mocks["host_factory"].call_args[0][1] is mocks["registry"].recall_cache
+
+    async def test_query_planner_registered(self):
+        from memory_mcp.services.query_planner import QueryPlanner
+
+        mocks = await _run_lifespan(_make_config(exact_search_max_memories=500))
+        assert isinstance(mocks["registry"].planner, QueryPlanner)
+        assert mocks["registry"].working_set is None
+        # Opt-in: the exact plan is off by default.
+        mocks = await _run_lifespan(_make_config())
+        assert mocks["registry"].planner is None
+
+    async def test_fresh_overlay_shared_with_tools(self):
+        from memory_mcp.services.fresh_overlay import FreshOverlay
+
+        mocks = await _run_lifespan(_make_config())
+        assert isinstance(mocks["registry"].fresh_overlay, FreshOverlay)
+        mocks = await _run_lifespan(_make_config(fresh_overlay_ttl_seconds=0))
+        assert mocks["registry"].fresh_overlay is None
+
+    async def test_working_set_enabled(self):
+        from memory_mcp.services.working_set import WorkingSetCache
+
+        mocks = await _run_lifespan(
+            _make_config(working_set_max_mb=64, exact_search_max_memories=500),
+        )
+        assert isinstance(mocks["registry"].working_set, WorkingSetCache)
+        mocks = await _run_lifespan(_make_config(working_set_max_mb=64))
+        assert mocks["registry"].working_set is None
+
+    async def test_recall_cache_can_be_disabled(self):
+        mocks = await _run_lifespan(_make_config(recall_cache_enabled=False))
+        assert mocks["registry"].recall_cache is None
+
+
+class TestRoles:
+    """ROLE splits API replicas from the worker fleet."""
+
+    async def test_api_role_skips_migrations_seeding_and_workers(self):
+        mocks = await _run_lifespan(_make_config(role="api", worker_isolation="process"))
+
+        mocks["ensure_indexes"].assert_not_called()
+        mocks["prompt_library"].seed_defaults.assert_not_called()
+        mocks["create_task"].assert_not_called()
+        mocks["enrich_cls"].assert_not_called()
+        mocks["host_factory"].assert_not_called()
+        job_names = [c[0][0] for c in mocks["scheduler"].add_job.call_args_list]
+        assert job_names == ["audit_flush", "access_flush"]
+        assert mocks["registry"].scheduler is mocks["scheduler"]
+
+    async def test_access_write_behind_can_be_disabled(self):
+        mocks = await _run_lifespan(_make_config(access_write_behind_enabled=False))
+        job_names = [c[0][0] for c in mocks["scheduler"].add_job.call_args_list]
+        assert "access_flush" not in job_names
+
+    async def test_candidate_tuning_job_when_enabled(self):
+        from memory_mcp.services.candidate_tuner import CandidateTuner
+
+        mocks = await _run_lifespan(_make_config())
+        assert mocks["registry"].candidate_tuner is None
+
+        mocks = await _run_lifespan(_make_config(role="api", candidate_tuning_enabled=True))
+        assert isinstance(mocks["registry"].candidate_tuner, CandidateTuner)
+        job_names = [c[0][0] for c in mocks["scheduler"].add_job.call_args_list]
+        assert job_names == ["audit_flush", "access_flush", "candidate_tuning"]
+
+    async def test_client_fusion_when_rank_fusion_missing(self):
+        mocks = await _run_lifespan(_make_config(), rank_fusion=False)
+        assert mocks["registry"].client_fusion is True
+
+        mocks = await _run_lifespan(_make_config())
+        assert mocks["registry"].client_fusion is False
+
+    async def test_hybrid_fusion_setting_skips_probe(self):
+        mocks = await _run_lifespan(_make_config(hybrid_fusion="client"))
+        assert mocks["registry"].client_fusion is True
+        mocks["rank_fusion_available"].assert_not_called()
+
+        mocks = await _run_lifespan(_make_config(), vector_engine=MagicMock(), rank_fusion=False)
+        assert mocks["registry"].client_fusion is False
+        mocks["rank_fusion_available"].assert_not_called()
+
+        with pytest.raises(ValueError, match="Unknown hybrid fusion"):
+            await _run_lifespan(_make_config(hybrid_fusion="python"))
+
+    async def test_local_vector_engine_syncs_and_saves(self):
+        engine = MagicMock()
+        mocks = await _run_lifespan(
+            _make_config(role="api", candidate_tuning_enabled=True), vector_engine=engine,
+        )
+        assert mocks["registry"].vector_engine is engine
+        assert mocks["registry"].candidate_tuner is None
+        job_names = [c[0][0] for c in mocks["scheduler"].add_job.call_args_list]
+        assert job_names == ["audit_flush", "access_flush", "vector_sync"]
+        engine.save.assert_called_once()
+
+    async def test_all_role_runs_migrations(self):
+        mocks = await _run_lifespan(_make_config(role="all"))
+        mocks["ensure_indexes"].assert_called_once()
+        mocks["prompt_library"].seed_defaults.assert_called_once()
+
+    async def test_unknown_role_raises(self):
+        with pytest.raises(ValueError, match="Unknown role"):
+            await _run_lifespan(_make_config(role="frontend"))
+
+    async def test_run_worker_owns_schema_and_jobs(self):
+        from memory_mcp.server import run_worker
+
+        mock_db_manager, _ = _make_mock_db_manager()
+        stop = asyncio.Event()
+        stop.set()
+        runtime = MagicMock(close=AsyncMock())
+        with patch("memory_mcp.server.DatabaseManager") as mock_db_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock) as mock_ei, \
+             patch("memory_mcp.server.ensure_search_indexes", new_callable=AsyncMock), \
+             patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
+             patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
+             patch("memory_mcp.server.WorkerRuntime") as mock_runtime_cls:
+            mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_pl_cls.return_value = MagicMock(seed_defaults=AsyncMock(return_value=0))
+            mock_ds_cls.return_value = MagicMock(seed_defaults=AsyncMock(return_value=0))
+            mock_runtime_cls.build.return_value = runtime
+
+            await run_worker(_make_config(role="worker"), stop_event=stop)
+
+        mock_ei.assert_called_once_with(mock_db_manager.db)
+        # Evolution only: the worker's engine loads users on demand.
+        assert mock_ove.call_args.kwargs == {"persist": False, "lazy": True}
+        mock_pl_cls.return_value.seed_defaults.assert_called_once()
+        mock_runtime_cls.build.assert_called_once()
+        runtime.scheduler.start.assert_called_once()
+        runtime.close.assert_awaited_once()
+
+
 class TestEnsureSearchIndexesBg:
     """_ensure_search_indexes_bg wraps ensure_search_indexes non-fatally."""
 
@@ -306,11 +541,17 @@ class TestLifespanSeeding:
              patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
              patch("memory_mcp.server.GovernanceService") as mock_gov_cls, \
              patch("memory_mcp.server.AuditFlushWorker") as mock_afw_cls, \
+             patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
              patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+                   return_value=True) as mock_rfa, \
              patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock), \
              patch("memory_mcp.server.asyncio") as mock_asyncio:
 
             mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_sched_cls.return_value.stop = AsyncMock()
             mock_audit_cls.return_value = MagicMock(flush=AsyncMock())
             mock_enrich_cls.return_value = MagicMock(run=AsyncMock())
             mock_consol_cls.return_value = MagicMock(run=AsyncMock())
@@ -336,9 +577,7 @@ class TestLifespanSeeding:
             mock_reg_cls.initialize.return_value = mock_reg_instance
 
             mock_search_task = MagicMock(done=MagicMock(return_value=True))
-            mock_asyncio.create_task.side_effect = [
-                MagicMock(), MagicMock(), MagicMock(), mock_search_task,
-            ]
+            mock_asyncio.create_task.side_effect = [mock_search_task]
 
             from memory_mcp.server import lifespan
             app = MagicMock()
@@ -364,11 +603,17 @@ class TestLifespanSeeding:
              patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
              patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
              patch("memory_mcp.server.AuditFlushWorker") as mock_afw_cls, \
+             patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
              patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+                   return_value=True) as mock_rfa, \
              patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock), \
              patch("memory_mcp.server.asyncio") as mock_asyncio:
 
             mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_sched_cls.return_value.stop = AsyncMock()
             mock_audit_cls.return_value = MagicMock(flush=AsyncMock())
             mock_enrich_cls.return_value = MagicMock(run=AsyncMock())
             mock_consol_cls.return_value = MagicMock(run=AsyncMock())
@@ -389,9 +634,7 @@ class TestLifespanSeeding:
             mock_reg_cls.initialize.return_value = mock_reg_instance
 
             mock_search_task = MagicMock(done=MagicMock(return_value=True))
-            mock_asyncio.create_task.side_effect = [
-                MagicMock(), MagicMock(), MagicMock(), mock_search_task,
-            ]
+            mock_asyncio.create_task.side_effect = [mock_search_task]
 
             from memory_mcp.server import lifespan
             app = MagicMock()
@@ -418,11 +661,17 @@ class TestLifespanSeeding:
              patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
              patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
              patch("memory_mcp.server.AuditFlushWorker") as mock_afw_cls, \
+             patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
              patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+                   return_value=True) as mock_rfa, \
              patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock), \
              patch("memory_mcp.server.asyncio") as mock_asyncio:
 
             mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_sched_cls.return_value.stop = AsyncMock()
             mock_audit_cls.return_value = MagicMock(flush=AsyncMock())
             mock_enrich_cls.return_value = MagicMock(run=AsyncMock())
             mock_consol_cls.return_value = MagicMock(run=AsyncMock())
@@ -442,9 +691,7 @@ class TestLifespanSeeding:
             mock_reg_cls.initialize.return_value = mock_reg_instance
 
             mock_search_task = MagicMock(done=MagicMock(return_value=True))
-            mock_asyncio.create_task.side_effect = [
-                MagicMock(), MagicMock(), MagicMock(), mock_search_task,
-            ]
+            mock_asyncio.create_task.side_effect = [mock_search_task]
 
             from memory_mcp.server import lifespan
             app = MagicMock()
@@ -470,11 +717,17 @@ class TestLifespanSeeding:
              patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
              patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
              patch("memory_mcp.server.AuditFlushWorker") as mock_afw_cls, \
+             patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
              patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+                   return_value=True) as mock_rfa, \
              patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock), \
              patch("memory_mcp.server.asyncio") as mock_asyncio:
 
             mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_sched_cls.return_value.stop = AsyncMock()
             mock_audit_cls.return_value = MagicMock(flush=AsyncMock())
             mock_enrich_cls.return_value = MagicMock(run=AsyncMock())
             mock_consol_cls.return_value = MagicMock(run=AsyncMock())
@@ -494,9 +747,7 @@ class TestLifespanSeeding:
             mock_reg_cls.initialize.return_value = mock_reg_instance
 
             mock_search_task = MagicMock(done=MagicMock(return_value=True))
-            mock_asyncio.create_task.side_effect = [
-                MagicMock(), MagicMock(), MagicMock(), mock_search_task,
-            ]
+            mock_asyncio.create_task.side_effect = [mock_search_task]
 
             from memory_mcp.server import lifespan
             app = MagicMock()
@@ -522,11 +773,17 @@ class TestLifespanSeeding:
              patch("memory_mcp.server.PromptLibrary") as mock_pl_cls, \
              patch("memory_mcp.server.DecisionService") as mock_ds_cls, \
              patch("memory_mcp.server.AuditFlushWorker") as mock_afw_cls, \
+             patch("memory_mcp.server.JobScheduler") as mock_sched_cls, \
              patch("memory_mcp.server.ServiceRegistry") as mock_reg_cls, \
+             patch("memory_mcp.server.open_vector_engine", new_callable=AsyncMock,
+                   return_value=None) as mock_ove, \
+             patch("memory_mcp.server.rank_fusion_available", new_callable=AsyncMock,
+                   return_value=True) as mock_rfa, \
              patch("memory_mcp.server.ensure_indexes", new_callable=AsyncMock), \
              patch("memory_mcp.server.asyncio") as mock_asyncio:
 
             mock_db_cls.initialize = AsyncMock(return_value=mock_db_manager)
+            mock_sched_cls.return_value.stop = AsyncMock()
             mock_audit_cls.return_value = MagicMock(flush=AsyncMock())
             mock_enrich_cls.return_value = MagicMock(run=AsyncMock())
             mock_consol_cls.return_value = MagicMock(run=AsyncMock())
@@ -547,9 +804,7 @@ class TestLifespanSeeding:
             mock_reg_cls.initialize.return_value = mock_reg_instance
 
             mock_search_task = MagicMock(done=MagicMock(return_value=True))
-            mock_asyncio.create_task.side_effect = [
-                MagicMock(), MagicMock(), MagicMock(), mock_search_task,
-            ]
+            mock_asyncio.create_task.side_effect = [mock_search_task]
 
             from memory_mcp.server import lifespan
             app = MagicMock()
@@ -586,6 +841,29 @@ class TestMainEntryPoint:
                 transport="streamable-http", host="0.0.0.0", port=9999,
             )
 
+    def test_main_worker_role_runs_headless_worker(self):
+        mock_config = _make_config(role="worker")
+        with patch("memory_mcp.__main__.mcp") as mock_mcp, \
+             patch("memory_mcp.__main__.run_worker") as mock_run_worker, \
+             patch("memory_mcp.__main__.asyncio") as mock_asyncio, \
+             patch("memory_mcp.__main__.MCPConfig", return_value=mock_config):
+            from memory_mcp.__main__ import main
+            main()
+            mock_run_worker.assert_called_once_with(mock_config)
+            mock_asyncio.run.assert_called_once()
+            mock_mcp.run.assert_not_called()
+
+    def test_main_multi_worker_uses_supervisor(self):
+        mock_config = _make_config(http_workers=4)
+        with patch("memory_mcp.__main__.mcp") as mock_mcp, \
+             patch("memory_mcp.__main__.Supervisor") as mock_sup_cls, \
+             patch("memory_mcp.__main__.MCPConfig", return_value=mock_config):
+            from memory_mcp.__main__ import main
+            main()
+            mock_sup_cls.assert_called_once_with(mock_config)
+            mock_sup_cls.return_value.run.assert_called_once()
+            mock_mcp.run.assert_not_called()
+
     def test_main_stdio_transport(self):
         mock_config = _make_config(transport="stdio")
         with patch("memory_mcp.__main__.mcp") as mock_mcp, \
@@ -0,0 +1,94 @@
+"""Tests for the multi-process HTTP supervisor."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.supervisor import Supervisor, resolve_worker_count, worker_role
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+class TestWorkerCount:
+
+    def test_explicit_count(self):
+        assert resolve_worker_count(4) == 4
+
+    def test_zero_means_cpu_count(self):
+        with patch("memory_mcp.supervisor.os.cpu_count", return_value=8):
+            assert resolve_worker_count(0) == 8
+
+    def test_negative_rejected(self):
+        with pytest.raises(ValueError):
+            resolve_worker_count(-1)
+
+
+class TestWorkerRole:
+    """Only process 0 runs migrations and background jobs."""
+
+    def test_process_zero_keeps_configured_role(self):
+        assert worker_role("all", 0) == "all"
+
+    def test_other_processes_serve_only(self):
+        assert worker_role("all", 1) == "api"
+        assert worker_role("all", 7) == "api"
+
+    def test_api_role_stays_api(self):
+        assert worker_role("api", 0) == "api"
+
+
+class TestSupervisor:
+
+    def _supervisor(self, workers=3):
+        sup = Supervisor(_make_config(http_workers=workers))
+        sup._ctx = MagicMock()
+        sup._sock = MagicMock()
+        return sup
+
+    def test_spawn_passes_socket_and_role(self):
+        sup = self._supervisor()
+        sup._spawn(0)
+        sup._spawn(2)
+
+        calls = sup._ctx.Process.call_args_list
+        assert calls[0].kwargs["args"] == (0, sup._sock, "all")
+        assert calls[1].kwargs["args"] == (2, sup._sock, "api")
+        assert sup._ctx.Process.return_value.start.call_count == 2
+
+    def test_dead_processes_are_restarted(self):
+        sup = self._supervisor(workers=2)
+        alive = MagicMock(is_alive=MagicMock(return_value=True))
+        dead = MagicMock(is_alive=MagicMock(return_value=False), exitcode=1)
+        sup._procs = [alive, dead]
+        sup._started_at = [0.0, 0.0]
+
+        with patch.object(sup, "_spawn") as mock_spawn:
+            assert sup._restart_dead() == 1
+        mock_spawn.assert_called_once_with(1)
+
+    def test_no_restart_while_stopping(self):
+        sup = self._supervisor(workers=1)
+        sup._procs = [MagicMock(is_alive=MagicMock(return_value=False))]
+        sup._stopping = True
+        with patch.object(sup, "_spawn") as mock_spawn:
+            assert sup._restart_dead() == 0
+        mock_spawn.assert_not_called()
+
+    def test_stop_terminates_and_closes_socket(self):
+        sup = self._supervisor(workers=2)
+        sock = sup._sock
+        procs = [MagicMock(is_alive=MagicMock(side_effect=[True, False])) for _ in range(2)]
+        sup._procs = procs
+
+        sup.stop()
+
+        for proc in procs:
+            proc.terminate.assert_called_once()
+            proc.join.assert_called_once()
+            proc.kill.assert_not_called()
+        sock.close.assert_called_once()
@@ -1,6 +1,8 @@
 """Tests for MCP tool functions (memory, cache, search)."""
 
+import asyncio
 import importlib
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -20,6 +22,7 @@ def _make_registry(config=None):
     reg = MagicMock(spec=ServiceRegistry)
     reg.config = config or _make_config()
     reg.memory_service = AsyncMock()
+    reg.memory_service.recall_cached = MagicMock(return_value=False)
     reg.cache_service = AsyncMock()
     reg.audit_service = AsyncMock()
     reg.audit_service.log = AsyncMock()
@@ -27,6 +30,20 @@ def _make_registry(config=None):
     reg.providers.embedding = AsyncMock()
     reg.providers.embedding.generate_embedding = AsyncMock(return_value=[0.1] * 1536)
     reg.check_access = AsyncMock(return_value=None)
+
+    async def check_access_and_embed(user_id, operation, query):
+        return await reg.check_access(user_id, operation)
+
+    reg.check_access_and_embed = AsyncMock(side_effect=check_access_and_embed)
+    reg.recall_cache = None
+    reg.query_embeddings = None
+    reg.candidate_tuner = None
+    reg.planner = None
+    reg.working_set = None
+    reg.fresh_overlay = None
+    reg.vector_engine = None
+    reg.prefetcher = None
+    reg.client_fusion = False
     return reg
 
 
@@ -156,13 +173,16 @@ class TestStoreMemoryNormalization:
 
 
 class TestRecallMemory:
-    """TC-046: recall_memory tool delegates to memory_service.recall."""
+    """TC-046: recall_memory tool delegates to memory_service.recall_page."""
 
     async def test_recall_memory_success(self):
         reg = _make_registry()
-        reg.memory_service.recall = AsyncMock(return_value=[
-            {"_id": "m1", "content": "test", "importance": 0.7}
-        ])
+        reg.memory_service.recall_page = AsyncMock(return_value={
+            "results": [{"_id": "m1", "content": "test", "importance": 0.7}],
+            "next_cursor": None,
+            "plan": "exact",
+            "degraded": False,
+        })
 
         mcp = MagicMock()
         tools = _capture_tool(mcp)
@@ -177,6 +197,215 @@ class TestRecallMemory:
 
         assert result["count"] == 1
         assert result["results"][0]["content"] == "test"
+        assert result["next_cursor"] is None
+        assert result["plan"] == "exact"
+        assert result["degraded"] is False
+        kwargs = reg.memory_service.recall_page.call_args.kwargs
+        assert kwargs["cursor"] is None
+        assert kwargs["conversation_id"] is None and kwargs["time_range"] is None
+        reg.check_access_and_embed.assert_awaited_once_with("user1", "recall_memory", "test query")
+
+
+class TestSpeculativeEmbedOnCacheHit:
+    """A recall cache hit costs no provider embedding, speculative or not."""
+
+    def _registry(self):
+        from memory_mcp.services.memory import MemoryService
+        from memory_mcp.services.query_embeddings import QueryEmbeddingCache
+        from memory_mcp.services.recall_cache import RecallCache
+
+        config = _make_config()
+        providers = MagicMock()
+        providers.embedding.generate_embedding = AsyncMock(return_value=[0.1] * 1536)
+        col = AsyncMock()
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        col.aggregate = AsyncMock(return_value=cursor)
+        recall_cache = RecallCache(config)
+        query_embeddings = QueryEmbeddingCache(providers.embedding, config)
+        reg = ServiceRegistry.initialize(
+            config=config,
+            memory_service=MemoryService(
+                col, config, providers,
+                recall_cache=recall_cache, query_embeddings=query_embeddings,
+            ),
+            cache_service=AsyncMock(),
+            audit_service=AsyncMock(),
+            providers=providers,
+        )
+        reg.recall_cache = recall_cache
+        reg.query_embeddings = query_embeddings
+        return reg, providers.embedding.generate_embedding
+
+    def _tools(self, register):
+        mcp = MagicMock()
+        tools = _capture_tool(mcp)
+        register(mcp)
+        return tools
+
+    async def test_repeat_recall_embeds_once(self):
+        from memory_mcp.tools.memory_tools import register_memory_tools
+        reg, generate = self._registry()
+        tools = self._tools(register_memory_tools)
+
+        first = await tools["recall_memory"](user_id="user1", query="Deploy on Friday?")
+        # Same cache entry, different text for the query embedding cache.
+        second = await tools["recall_memory"](user_id="user1", query="deploy on  friday?")
+
+        assert (first["plan"], second["plan"]) == ("ann", "cache")
+        assert reg.recall_cache.hits == 1
+        generate.assert_awaited_once()
+
+    async def test_prefetched_page_needs_no_embedding(self):
+        from memory_mcp.tools.memory_tools import register_memory_tools
+        reg, generate = self._registry()
+        tools = self._tools(register_memory_tools)
+        key = reg.recall_cache.key("recall", "user1", "deploy on friday?", limit=10)
+        reg.recall_cache.put(key, ([], [], datetime.now(timezone.utc)), reg.recall_cache.generation("user1"))
+
+        result = await tools["recall_memory"](user_id="user1", query="Deploy on Friday?")
+
+        assert result["plan"] == "cache"
+        generate.assert_not_called()
+
+    async def test_cached_hybrid_page_needs_no_embedding(self):
+        from memory_mcp.tools.search_tools import _hybrid_cache_key, register_search_tools
+        reg, generate = self._registry()
+        tools = self._tools(register_search_tools)
+        key = _hybrid_cache_key(reg.recall_cache, "user1", "deploy plans", ["stm", "ltm"], None, None, 10, 0.0)
+        reg.recall_cache.put(key, [{"_id": "m1"}], reg.recall_cache.generation("user1"))
+
+        result = await tools["hybrid_search"](user_id="user1", query="deploy plans")
+
+        assert result["results"] == [{"_id": "m1"}]
+        generate.assert_not_called()
+
+
+class TestRecallMemoryBatch:
+    """recall_memory_batch: one governance check charged per query, one recall_many, one audit entry."""
+
+    async def test_batch_delegates_to_recall_many(self):
+        reg = _make_registry()
+        reg.memory_service.recall_many = AsyncMock(return_value={
+            "results": [{"query": "a", "memory_ids": ["m1"]}, {"query": "b", "memory_ids": ["m1"]}],
+            "memories": [{"_id": "m1", "content": "test"}],
+        })
+
+        mcp = MagicMock()
+        tools = _capture_tool(mcp)
+
+        from memory_mcp.tools.memory_tools import register_memory_tools
+        register_memory_tools(mcp)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["recall_memory_batch"](
+                user_id="user1", queries=["a", "b"], limit=5,
+            )
+
+        assert result["count"] == 1
+        reg.check_access.assert_awaited_once_with("user1", "recall_memory", cost=2)
+        reg.memory_service.recall_many.assert_awaited_once_with(
+            "user1", ["a", "b"], tier=None, memory_type=None, tags=None, limit=5,
+        )
+        reg.audit_service.log.assert_awaited_once()
+
+    async def test_batch_over_remaining_quota_rejected(self):
+        from memory_mcp.services.rate_limiter import RateLimiter
+
+        reg = _make_registry(_make_config(rate_limit_enabled=True, rate_limit_max_requests=100))
+        reg.check_access = ServiceRegistry.check_access.__get__(reg)
+        reg.governance_service = None
+        rate_limits = MagicMock()
+        rate_limits.count_documents = AsyncMock(return_value=95)
+        rate_limits.insert_many = AsyncMock()
+        reg.rate_limiter = RateLimiter(rate_limits, reg.config)
+
+        mcp = MagicMock()
+        tools = _capture_tool(mcp)
+
+        from memory_mcp.tools.memory_tools import register_memory_tools
+        register_memory_tools(mcp)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            denied = await tools["recall_memory_batch"](
+                user_id="user1", queries=[f"q{i}" for i in range(10)],
+            )
+            reg.memory_service.recall_many = AsyncMock(return_value={"results": [], "memories": []})
+            allowed = await tools["recall_memory_batch"](
+                user_id="user1", queries=[f"q{i}" for i in range(5)],
+            )
+
+        assert "Rate limit exceeded" in denied["error"]
+        assert allowed["count"] == 0
+        assert len(rate_limits.insert_many.call_args[0][0]) == 5
+        assert reg.audit_service.log.call_args[0][2] == "recall_memory_batch"
+
+    async def test_batch_too_many_queries_logs_error(self):
+        reg = _make_registry()
+        reg.memory_service.recall_many = AsyncMock(side_effect=ValueError("At most 20 queries"))
+
+        mcp = MagicMock()
+        tools = _capture_tool(mcp)
+
+        from memory_mcp.tools.memory_tools import register_memory_tools
+        register_memory_tools(mcp)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            with pytest.raises(ValueError):
+                await tools["recall_memory_batch"](user_id="user1", queries=["q"] * 21)
+
+        assert reg.audit_service.log.call_args[0][3] == "error"
+
+
+class TestGetConversationContext:
+
+    async def test_delegates_and_audits(self):
+        reg = _make_registry()
+        reg.memory_service.conversation_context = AsyncMock(return_value={
+            "turns": [{"_id": "m1", "content": "hi"}], "next_cursor": None,
+        })
+
+        mcp = MagicMock()
+        tools = _capture_tool(mcp)
+
+        from memory_mcp.tools.memory_tools import register_memory_tools
+        register_memory_tools(mcp)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["get_conversation_context"](
+                user_id="user1", conversation_id="c1", limit=5, full_turns=2,
+            )
+
+        assert result == {"turns": [{"_id": "m1", "content": "hi"}], "next_cursor": None, "count": 1}
+        reg.check_access.assert_awaited_once_with("user1", "recall_memory")
+        reg.memory_service.conversation_context.assert_awaited_once_with(
+            "user1", "c1", limit=5, cursor=None, full_turns=2,
+        )
+        assert reg.audit_service.log.call_args[0][2] == "get_conversation_context"
+
+
+class TestRelatedMemories:
+
+    async def test_delegates_and_audits(self):
+        reg = _make_registry()
+        reg.memory_service.related = AsyncMock(return_value=[
+            {"_id": "m2", "content": "near", "hops": 0, "related_score": 0.9},
+        ])
+
+        mcp = MagicMock()
+        tools = _capture_tool(mcp)
+
+        from memory_mcp.tools.memory_tools import register_memory_tools
+        register_memory_tools(mcp)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg):
+            result = await tools["related_memories"](user_id="user1", memory_id="m1", depth=2)
+
+        assert result["count"] == 1
+        assert result["results"][0]["_id"] == "m2"
+        reg.check_access.assert_awaited_once_with("user1", "recall_memory")
+        reg.memory_service.related.assert_awaited_once_with("user1", "m1", depth=2, limit=10)
+        assert reg.audit_service.log.call_args[0][2] == "related_memories"
 
 
 class TestDeleteMemory:
@@ -404,6 +633,399 @@ class TestRankFusionPipeline:
         assert "rankConstant" not in combination
 
 
+class TestHybridSearchPagination:
+    """hybrid_search cursors skip served rows and reuse the query embedding."""
+
+    async def test_cursor_page_skips_and_widens_window(self):
+        from memory_mcp.services.query_embeddings import QueryEmbeddingCache
+
+        reg = _make_registry()
+        reg.query_embeddings = QueryEmbeddingCache(reg.providers.embedding, reg.config)
+
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+
+        from memory_mcp.tools.search_tools import register_search_tools
+        register_search_tools(mcp_mock)
+
+        mock_col = MagicMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(
+            side_effect=lambda _: [{"_id": f"m{i}", "content": "r"} for i in range(15)]
+        )
+        mock_col.aggregate = AsyncMock(return_value=mock_cursor)
+        mock_db = MagicMock()
+        mock_db.__getitem__ = MagicMock(return_value=mock_col)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg), \
+             patch("memory_mcp.tools.search_tools._get_db", new_callable=AsyncMock, return_value=mock_db):
+            first = await tools["hybrid_search"](user_id="user1", query="test", limit=15)
+            second = await tools["hybrid_search"](
+                user_id="user1", query="test", cursor=first["next_cursor"],
+            )
+            with pytest.raises(ValueError):
+                await tools["hybrid_search"](
+                    user_id="user2", query="test", cursor=first["next_cursor"],
+                )
+
+        assert first["next_cursor"] is not None
+        assert second["next_cursor"] is not None
+        reg.providers.embedding.generate_embedding.assert_awaited_once_with("test")
+        # Only the first page embeds the query alongside the access check.
+        assert [c.args[2] for c in reg.check_access_and_embed.await_args_list] == ["test", None, None]
+
+        first_pipeline = mock_col.aggregate.call_args_list[0][0][0]
+        assert first_pipeline[1] == {"$limit": 15}
+        pipeline = mock_col.aggregate.call_args_list[1][0][0]
+        assert pipeline[1] == {"$skip": 15}
+        assert pipeline[2] == {"$limit": 15}
+        inputs = pipeline[0]["$rankFusion"]["input"]["pipelines"]
+        # Each leg returns (offset + limit) x HYBRID_LEG_DEPTH_FACTOR rows.
+        assert inputs["vectorPipeline"][0]["$vectorSearch"]["limit"] == 60
+        assert inputs["vectorPipeline"][0]["$vectorSearch"]["numCandidates"] == 300
+        assert inputs["fullTextPipeline"][2] == {"$limit": 60}
+
+
+class TestHybridSearchBudgets:
+    """hybrid_search sizes each leg from the request and skips legs that cannot help."""
+
+    async def _search(self, reg=None, **kwargs):
+        reg = reg or _make_registry()
+
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+
+        from memory_mcp.tools.search_tools import register_search_tools
+        register_search_tools(mcp_mock)
+
+        mock_col = MagicMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[{"_id": "m1", "content": "r"}])
+        mock_col.aggregate = AsyncMock(return_value=mock_cursor)
+        mock_db = MagicMock()
+        mock_db.__getitem__ = MagicMock(return_value=mock_col)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg), \
+             patch("memory_mcp.tools.search_tools._get_db", new_callable=AsyncMock, return_value=mock_db):
+            result = await tools["hybrid_search"](user_id="user1", **kwargs)
+        return result, reg, mock_col.aggregate.call_args[0][0]
+
+    async def test_leg_depth_follows_limit(self):
+        _, _, small = await self._search(query="deploy notes", limit=3)
+        _, _, large = await self._search(query="deploy notes", limit=100)
+
+        def depths(pipeline):
+            legs = pipeline[0]["$rankFusion"]["input"]["pipelines"]
+            vector = legs["vectorPipeline"][0]["$vectorSearch"]
+            return vector["limit"], vector["numCandidates"], legs["fullTextPipeline"][2]["$limit"]
+
+        assert depths(small) == (6, 30, 6)
+        assert depths(large) == (200, 1000, 200)
+
+    async def test_selective_filters_widen_candidates(self):
+        _, _, pipeline = await self._search(query="deploy notes", limit=3, tags=["ops"])
+        vector = pipeline[0]["$rankFusion"]["input"]["pipelines"]["vectorPipeline"][0]
+        assert (vector["$vectorSearch"]["limit"], vector["$vectorSearch"]["numCandidates"]) == (6, 60)
+
+    async def test_stopword_query_skips_text_leg(self):
+        result, reg, pipeline = await self._search(query="what is it?", limit=5)
+        assert "$vectorSearch" in pipeline[0]
+        assert pipeline[1:] == [{"$limit": 5}, {"$project": {"embedding": 0}}]
+        assert result["results"] == [{"_id": "m1", "content": "r"}]
+        assert reg.audit_service.log.call_args.kwargs["legs"] == ["vector"]
+
+    @pytest.mark.parametrize("query", ["INC-4821", "65f1c0ffee00d1", "retry_backoff", '"exact phrase"'])
+    async def test_lookup_skips_embedding(self, query):
+        result, reg, pipeline = await self._search(query=query, limit=5)
+        reg.providers.embedding.generate_embedding.assert_not_called()
+        assert "$search" in pipeline[0]
+        assert pipeline[-2:] == [{"$limit": 5}, {"$project": {"embedding": 0}}]
+        assert reg.audit_service.log.call_args.kwargs["legs"] == ["text"]
+
+    async def test_lookup_applies_memory_type_and_tags(self):
+        _, _, pipeline = await self._search(
+            query="INC-4821", limit=5, memory_type="incident", tags=["ops", "p1"],
+        )
+        assert "$search" in pipeline[0]
+        match = pipeline[1]["$match"]
+        assert match["user_id"] == "user1" and match["memory_type"] == "incident"
+        assert match["$and"] == [{"tags": "ops"}, {"tags": "p1"}]
+
+    @pytest.mark.parametrize("query", ['"the"', '"to be or"'])
+    async def test_lookup_of_stopwords_uses_vector_leg(self, query):
+        result, reg, pipeline = await self._search(query=query, limit=5)
+        reg.providers.embedding.generate_embedding.assert_awaited_once()
+        assert "$vectorSearch" in pipeline[0]
+        assert result["results"] == [{"_id": "m1", "content": "r"}]
+        assert reg.audit_service.log.call_args.kwargs["legs"] == ["vector"]
+
+    async def test_single_leg_pages_skip_served_rows(self):
+        from memory_mcp.core.cursors import encode_cursor
+
+        cursor = encode_cursor({
+            "kind": "hybrid", "user_id": "user1", "query": "INC-4821", "tier": ["stm", "ltm"],
+            "memory_type": None, "tags": None, "limit": 5, "served": 5,
+        })
+        _, _, pipeline = await self._search(query="ignored", cursor=cursor)
+        assert pipeline[2] == {"$limit": 20}
+        assert pipeline[-3:] == [{"$skip": 5}, {"$limit": 5}, {"$project": {"embedding": 0}}]
+
+
+    async def test_edited_cursor_limit_clamped(self):
+        from memory_mcp.core.cursors import encode_cursor
+
+        cursor = encode_cursor({
+            "kind": "hybrid", "user_id": "user1", "query": "INC-4821", "tier": ["stm", "ltm"],
+            "memory_type": None, "tags": None, "limit": 10_000, "served": 5,
+        })
+        _, _, pipeline = await self._search(query="ignored", cursor=cursor)
+        assert pipeline[-2] == {"$limit": 100}
+
+
+class TestHybridSearchDegraded:
+    """Past EMBEDDING_DEADLINE_SECONDS hybrid_search serves the text leg alone."""
+
+    async def test_slow_embedding_serves_text_leg(self):
+        reg = _make_registry(_make_config(embedding_deadline_seconds=0.01))
+        release = asyncio.Event()
+
+        async def slow_embedding(query):
+            await release.wait()
+            return [0.1] * 1536
+
+        reg.providers.embedding.generate_embedding = AsyncMock(side_effect=slow_embedding)
+        result, reg, pipeline = await TestHybridSearchBudgets()._search(
+            reg, query="what is it?", limit=5,
+        )
+        release.set()
+
+        # A stopword query still gets the text leg once the vector leg is gone.
+        assert "$search" in pipeline[0]
+        assert pipeline[-2:] == [{"$limit": 5}, {"$project": {"embedding": 0}}]
+        assert result["degraded"] is True
+        assert result["next_cursor"] is None
+        assert reg.audit_service.log.call_args.kwargs["legs"] == ["text"]
+        assert reg.audit_service.log.call_args.kwargs["degraded"] is True
+
+    async def test_degraded_page_applies_memory_type_and_tags(self):
+        reg = _make_registry(_make_config(embedding_deadline_seconds=1))
+        reg.providers.embedding.generate_embedding = AsyncMock(side_effect=RuntimeError("throttled"))
+        result, _, pipeline = await TestHybridSearchBudgets()._search(
+            reg, query="deploy notes", memory_type="procedure", tags=["ops"],
+        )
+        assert result["degraded"] is True
+        assert "$search" in pipeline[0]
+        match = pipeline[1]["$match"]
+        assert match["memory_type"] == "procedure" and match["$and"] == [{"tags": "ops"}]
+
+    async def test_provider_error_degrades_instead_of_failing(self):
+        reg = _make_registry(_make_config(embedding_deadline_seconds=1))
+        reg.providers.embedding.generate_embedding = AsyncMock(side_effect=RuntimeError("throttled"))
+        result, _, pipeline = await TestHybridSearchBudgets()._search(reg, query="deploy notes")
+        assert "$search" in pipeline[0]
+        assert result["degraded"] is True
+
+    async def test_fast_embedding_not_degraded(self):
+        reg = _make_registry(_make_config(embedding_deadline_seconds=1))
+        result, _, pipeline = await TestHybridSearchBudgets()._search(reg, query="deploy notes")
+        assert "$rankFusion" in pipeline[0]
+        assert result["degraded"] is False
+
+
+class TestHybridSearchDiversity:
+    """diversity > 0 fuses a larger pool and picks the page by MMR."""
+
+    async def _search(self, projected=False, **kwargs):
+        reg = _make_registry()
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+
+        from memory_mcp.tools.search_tools import register_search_tools
+        register_search_tools(mcp_mock)
+
+        vectors = {"m0": [1.0, 0.0], "m1": [1.0, 0.01], "m2": [0.0, 1.0], "m3": [0.7, 0.7]}
+        fused = [{"_id": f"m{i}", "content": f"r{i}"} for i in range(4)]
+        if projected:
+            for doc in fused:
+                doc["embedding"] = vectors[doc["_id"]]
+        mock_col = MagicMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[dict(d) for d in fused])
+        mock_col.aggregate = AsyncMock(return_value=mock_cursor)
+        find_cursor = MagicMock()
+        find_cursor.to_list = AsyncMock(
+            return_value=[{"_id": k, "embedding": v} for k, v in vectors.items()],
+        )
+        mock_col.find = MagicMock(return_value=find_cursor)
+        mock_db = MagicMock()
+        mock_db.__getitem__ = MagicMock(return_value=mock_col)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg), \
+             patch("memory_mcp.tools.search_tools._get_db", new_callable=AsyncMock, return_value=mock_db):
+            result = await tools["hybrid_search"](user_id="user1", **kwargs)
+        self.find = mock_col.find
+        return result, mock_col.aggregate.call_args[0][0]
+
+    async def test_near_duplicate_skipped(self):
+        result, pipeline = await self._search(query="deploy notes", limit=2, diversity=0.5)
+        assert [r["_id"] for r in result["results"]] == ["m0", "m2"]
+        # Pool of limit x DIVERSITY_CANDIDATE_FACTOR rows, no $skip, embeddings kept.
+        assert pipeline[1:] == [{"$limit": 8}]
+
+    async def test_pool_embeddings_reused(self):
+        result, _ = await self._search(projected=True, query="deploy notes", limit=2, diversity=0.5)
+        assert [r["_id"] for r in result["results"]] == ["m0", "m2"]
+        assert all("embedding" not in r for r in result["results"])
+        self.find.assert_not_called()
+
+    async def test_continuation_replays_picks(self):
+        first, _ = await self._search(query="deploy notes", limit=2, diversity=0.5)
+        second, pipeline = await self._search(query="ignored", cursor=first["next_cursor"])
+        assert [r["_id"] for r in second["results"]] == ["m1", "m3"]
+        assert pipeline[1] == {"$limit": 16}
+
+
+class TestHybridSearchFreshOverlay:
+    """hybrid_search fuses memories the index has not returned yet into page one."""
+
+    async def test_fresh_memory_fused_into_first_page(self):
+        from memory_mcp.services.fresh_overlay import FreshOverlay
+
+        reg = _make_registry()
+        reg.fresh_overlay = FreshOverlay(reg.config)
+        reg.providers.embedding.generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+        reg.fresh_overlay.add("user1", [
+            {"_id": "fresh", "content": "new", "embedding": [1.0, 0.0], "tier": "stm"},
+            {"_id": "unrelated", "content": "x", "embedding": [-1.0, 0.0], "tier": "stm"},
+        ])
+
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+
+        from memory_mcp.tools.search_tools import register_search_tools
+        register_search_tools(mcp_mock)
+
+        mock_col = MagicMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(
+            return_value=[{"_id": f"m{i}", "content": "r"} for i in range(3)]
+        )
+        mock_col.aggregate = AsyncMock(return_value=mock_cursor)
+        mock_db = MagicMock()
+        mock_db.__getitem__ = MagicMock(return_value=mock_col)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg), \
+             patch("memory_mcp.tools.search_tools._get_db", new_callable=AsyncMock, return_value=mock_db):
+            result = await tools["hybrid_search"](user_id="user1", query="test", limit=3)
+
+        assert [r["_id"] for r in result["results"]] == ["m0", "fresh", "m1"]
+        assert "vs_score" not in result["results"][1]
+        assert "embedding" not in result["results"][1]
+        # Two fused rows were served, so the next page skips two.
+        from memory_mcp.core.cursors import decode_cursor
+        assert decode_cursor(result["next_cursor"], "hybrid", "user1")["served"] == 2
+
+
+class TestHybridSearchClientFusion:
+    """Without $rankFusion, hybrid_search runs both legs concurrently and fuses in Python."""
+
+    async def test_legs_run_concurrently_and_fuse(self):
+        reg = _make_registry()
+        reg.client_fusion = True
+
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+
+        from memory_mcp.tools.search_tools import register_search_tools
+        register_search_tools(mcp_mock)
+
+        legs = {
+            "$vectorSearch": [{"_id": "a", "content": "a"}, {"_id": "b", "content": "b"}],
+            "$search": [{"_id": "c", "content": "c"}, {"_id": "b", "content": "b"}],
+        }
+        started = {name: asyncio.Event() for name in legs}
+        pipelines = []
+
+        async def aggregate(pipeline):
+            pipelines.append(pipeline)
+            name = next(iter(pipeline[0]))
+            started[name].set()
+            # Each leg waits for the other: a sequential implementation times out.
+            other = "$search" if name == "$vectorSearch" else "$vectorSearch"
+            await asyncio.wait_for(started[other].wait(), timeout=1)
+            cursor = AsyncMock()
+            cursor.to_list = AsyncMock(return_value=[dict(d) for d in legs[name]])
+            return cursor
+
+        mock_col = MagicMock()
+        mock_col.aggregate = aggregate
+        mock_db = MagicMock()
+        mock_db.__getitem__ = MagicMock(return_value=mock_col)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg), \
+             patch("memory_mcp.tools.search_tools._get_db", new_callable=AsyncMock, return_value=mock_db):
+            result = await tools["hybrid_search"](user_id="user1", query="test", limit=2)
+
+        assert [r["_id"] for r in result["results"]] == ["b", "a"]
+        assert len(pipelines) == 2
+        assert all("$rankFusion" not in p[0] for p in pipelines)
+        assert all(p[-1] == {"$project": {"embedding": 0}} for p in pipelines)
+        assert result["next_cursor"] is not None
+
+
+class TestHybridSearchLocalEngine:
+    """Without Atlas Search, hybrid_search pages through the local vector ranking."""
+
+    async def test_pages_local_ranking(self):
+        from memory_mcp.services.local_vector import LocalVectorEngine
+
+        reg = _make_registry()
+        reg.config = _make_config(embedding_dimension=2)
+        reg.vector_engine = LocalVectorEngine(MagicMock(), reg.config)
+        reg.vector_engine._synced_at = float("inf")
+        reg.vector_engine.add("memories", [
+            {"_id": f"m{i}", "user_id": "user1", "tier": "stm", "embedding": [1.0, i / 10]}
+            for i in range(3)
+        ])
+        reg.providers.embedding.generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+
+        from memory_mcp.tools.search_tools import register_search_tools
+        register_search_tools(mcp_mock)
+
+        mock_col = MagicMock()
+        mock_col.aggregate = AsyncMock()
+
+        def find(query, projection):
+            cursor = MagicMock()
+            cursor.to_list = AsyncMock(return_value=[
+                {"_id": i, "content": i} for i in query["_id"]["$in"] if i != "m1"
+            ])
+            return cursor
+
+        mock_col.find = MagicMock(side_effect=find)
+        mock_db = MagicMock()
+        mock_db.__getitem__ = MagicMock(return_value=mock_col)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg), \
+             patch("memory_mcp.tools.search_tools._get_db", new_callable=AsyncMock, return_value=mock_db):
+            result = await tools["hybrid_search"](user_id="user1", query="test", limit=2)
+
+        mock_col.aggregate.assert_not_called()
+        assert [r["_id"] for r in result["results"]] == ["m0"]
+        # m1 no longer matches the filter and is dropped from the engine.
+        assert reg.vector_engine.stats()["memories"]["vectors"] == 2
+
+    async def test_text_leg_fused_by_rrf(self):
+        from memory_mcp.tools.search_tools import _rrf
+
+        config = _make_config(rrf_k=60, rrf_vector_weight=1.0, rrf_text_weight=0.7)
+        # b is second on both lists and overtakes a, first on vectors only.
+        assert _rrf(config, ["a", "b", "c"], ["d", "b"]) == ["b", "a", "c", "d"]
+
+
 class TestHybridSearch:
     """TC-051: hybrid_search tool executes $rankFusion pipeline."""
 
@@ -439,6 +1061,37 @@ class TestHybridSearch:
         # aggregate called once (single $rankFusion pipeline)
         assert mock_col.aggregate.call_count == 1
 
+    async def test_hybrid_search_cache_hit_skips_embedding(self):
+        from memory_mcp.services.recall_cache import RecallCache
+
+        reg = _make_registry()
+        reg.recall_cache = RecallCache(reg.config)
+
+        mcp_mock = MagicMock()
+        tools = _capture_tool(mcp_mock)
+
+        from memory_mcp.tools.search_tools import register_search_tools
+        register_search_tools(mcp_mock)
+
+        mock_col = MagicMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(side_effect=lambda _: [{"_id": "m1", "content": "r"}])
+        mock_col.aggregate = AsyncMock(return_value=mock_cursor)
+        mock_db = MagicMock()
+        mock_db.__getitem__ = MagicMock(return_value=mock_col)
+
+        with patch.object(ServiceRegistry, "get", return_value=reg), \
+             patch("memory_mcp.tools.search_tools._get_db", new_callable=AsyncMock, return_value=mock_db):
+            first = await tools["hybrid_search"](user_id="user1", query="Test")
+            second = await tools["hybrid_search"](user_id="user1", query="test")
+            reg.recall_cache.bump("user1")
+            await tools["hybrid_search"](user_id="user1", query="test")
+
+        assert second == first
+        assert reg.providers.embedding.generate_embedding.await_count == 2
+        assert mock_col.aggregate.await_count == 2
+        assert reg.recall_cache.stats()["hits"] == 1
+
 
 class TestSearchWeb:
     """TC-052: search_web tool delegates to Tavily."""
@@ -504,7 +1157,7 @@ class TestRecallMemoryError:
 
     async def test_recall_memory_error_logs_and_raises(self):
         reg = _make_registry()
-        reg.memory_service.recall = AsyncMock(side_effect=RuntimeError("db down"))
+        reg.memory_service.recall_page = AsyncMock(side_effect=RuntimeError("db down"))
 
         mcp = MagicMock()
         tools = _capture_tool(mcp)
@@ -672,7 +1325,7 @@ class TestHybridSearchFilters:
         vector_pipeline = rank_fusion["input"]["pipelines"]["vectorPipeline"]
         vs_filter = vector_pipeline[0]["$vectorSearch"]["filter"]
         assert vs_filter.get("memory_type") == "factual"
-        assert vs_filter.get("tags") == {"$all": ["topic:ai"]}
+        assert vs_filter.get("$and") == [{"tags": "topic:ai"}]
 
 
 class TestGetDb:
@@ -718,6 +1371,15 @@ class TestSearchToolsSanitizeDoc:
         _sanitize_doc(doc)
         assert doc["nested"]["_id"] == str(oid)
 
+    def test_sanitize_list_of_dicts(self):
+        from memory_mcp.tools.search_tools import _sanitize_doc
+        from bson import ObjectId
+        oid = ObjectId()
+        doc = {"neighbors": [{"_id": oid, "score": 0.9}], "refs": [oid]}
+        _sanitize_doc(doc)
+        assert doc["neighbors"] == [{"_id": str(oid), "score": 0.9}]
+        assert doc["refs"] == [str(oid)]
+
 
 # ─── Access Control (check_access) ────────────────────────────
 
@@ -0,0 +1,197 @@
+"""Tests for isolated background worker hosting."""
+
+import asyncio
+import multiprocessing
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.scheduler import CronSchedule, JobScheduler, SchedulerGroup
+from memory_mcp.services.worker_host import (
+    ProcessWorkerHost,
+    ThreadWorkerHost,
+    _serve_worker_process,
+    create_worker_host,
+    register_worker_jobs,
+)
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _fake_runtime(config, func):
+    """A WorkerRuntime stand-in whose scheduler runs ``func`` as 'enrichment'."""
+    scheduler = JobScheduler(None, config)
+    scheduler.add_job("enrichment", func, 3600)
+    runtime = MagicMock()
+    runtime.scheduler = scheduler
+    runtime.close = AsyncMock(side_effect=scheduler.stop)
+    return runtime
+
+
+class TestRegisterWorkerJobs:
+    """register_worker_jobs wires enrichment and consolidation schedules."""
+
+    def test_interval_jobs_registered(self):
+        config = _make_config(enrichment_interval_seconds=15, consolidation_interval_hours=2)
+        scheduler = JobScheduler(None, config)
+        register_worker_jobs(scheduler, config, MagicMock(), MagicMock())
+
+        assert set(scheduler.jobs) == {"enrichment", "consolidation"}
+        assert scheduler.jobs["enrichment"].schedule.seconds == 15
+        assert scheduler.jobs["consolidation"].schedule.seconds == 7200
+        assert scheduler.jobs["enrichment"].run_on_start is True
+
+    def test_cron_schedule_overrides_interval(self):
+        config = _make_config(consolidation_schedule="0 3 * * *")
+        scheduler = JobScheduler(None, config)
+        register_worker_jobs(scheduler, config, MagicMock(), MagicMock())
+
+        job = scheduler.jobs["consolidation"]
+        assert isinstance(job.schedule, CronSchedule)
+        assert job.run_on_start is False
+        assert job.max_runtime_seconds == config.consolidation_max_runtime_seconds
+
+
+class TestCreateWorkerHost:
+
+    def test_thread_and_process(self):
+        assert isinstance(create_worker_host(_make_config(worker_isolation="thread")), ThreadWorkerHost)
+        assert isinstance(create_worker_host(_make_config(worker_isolation="process")), ProcessWorkerHost)
+
+    def test_unknown_mode_raises(self):
+        with pytest.raises(ValueError, match="Unknown worker isolation"):
+            create_worker_host(_make_config(worker_isolation="fork"))
+
+
+class TestThreadWorkerHost:
+    """Jobs run on a separate thread and event loop; control is proxied."""
+
+    async def test_job_runs_off_request_thread(self):
+        config = _make_config(worker_isolation="thread")
+        ran_on = []
+
+        async def job():
+            ran_on.append((threading.get_ident(), asyncio.get_running_loop()))
+            return 1
+
+        runtime = _fake_runtime(config, job)
+        with patch("memory_mcp.services.worker_host.WorkerRuntime.open",
+                   AsyncMock(return_value=runtime)):
+            host = ThreadWorkerHost(config)
+            host.start()
+            await asyncio.to_thread(host._ready.wait, 5)
+
+            result = await host.control("run", "enrichment")
+            assert result["result"] == "triggered"
+            for _ in range(100):
+                if ran_on:
+                    break
+                await asyncio.sleep(0.01)
+            status = await host.control("status")
+            await host.stop()
+
+        assert ran_on[0][0] != threading.get_ident()
+        assert ran_on[0][1] is not asyncio.get_running_loop()
+        assert status["jobs"][0]["run_count"] == 1
+        runtime.close.assert_awaited_once()
+
+    async def test_unknown_job_raises_key_error(self):
+        config = _make_config(worker_isolation="thread")
+        runtime = _fake_runtime(config, AsyncMock(return_value=0))
+        with patch("memory_mcp.services.worker_host.WorkerRuntime.open",
+                   AsyncMock(return_value=runtime)):
+            host = ThreadWorkerHost(config)
+            host.start()
+            await asyncio.to_thread(host._ready.wait, 5)
+            with pytest.raises(KeyError):
+                await host.control("pause", "nope")
+            await host.stop()
+
+    async def test_control_before_start_raises(self):
+        host = ThreadWorkerHost(_make_config())
+        with pytest.raises(RuntimeError):
+            await host.control("status")
+
+
+class TestProcessWorkerHost:
+    """Pipe protocol between the request process and the worker process."""
+
+    async def test_serve_loop_answers_control_and_stops(self):
+        config = _make_config(worker_isolation="process")
+        runtime = _fake_runtime(config, AsyncMock(return_value=0))
+        parent, child = multiprocessing.Pipe()
+
+        with patch("memory_mcp.services.worker_host.WorkerRuntime.open",
+                   AsyncMock(return_value=runtime)):
+            serve = asyncio.create_task(_serve_worker_process(config, child))
+            parent.send((1, "control", "pause", "enrichment"))
+            reply = await asyncio.to_thread(parent.recv)
+            parent.send((2, "control", "run", "missing"))
+            error = await asyncio.to_thread(parent.recv)
+            parent.send((0, "stop"))
+            await asyncio.wait_for(serve, 5)
+
+        assert reply[0] == 1 and reply[1] == "ok"
+        assert reply[2]["jobs"][0]["paused"] is True
+        assert error[:2] == (2, "key_error")
+        runtime.close.assert_awaited_once()
+
+    async def test_control_maps_reply_kinds(self):
+        host = ProcessWorkerHost(_make_config())
+        host._request = MagicMock(return_value=("ok", {"jobs": []}))
+        assert await host.control("status") == {"jobs": []}
+
+        host._request = MagicMock(return_value=("key_error", "Unknown job 'x'"))
+        with pytest.raises(KeyError):
+            await host.control("run", "x")
+
+        host._request = MagicMock(return_value=("error", "boom"))
+        with pytest.raises(RuntimeError):
+            await host.control("run", "enrichment")
+
+    def test_request_discards_stale_replies(self):
+        host = ProcessWorkerHost(_make_config())
+        host._process = MagicMock(is_alive=MagicMock(return_value=True))
+        host._conn = MagicMock()
+        host._conn.poll.return_value = True
+        host._conn.recv.side_effect = [(0, "ok", "stale"), (1, "ok", {"jobs": []})]
+
+        assert host._request("control", "status", None) == ("ok", {"jobs": []})
+
+    def test_request_when_not_running_raises(self):
+        host = ProcessWorkerHost(_make_config())
+        with pytest.raises(RuntimeError):
+            host._request("control", "status", None)
+
+
+class TestSchedulerGroup:
+    """Control actions are routed to the member that owns the job."""
+
+    async def test_routes_by_job_name_and_merges_status(self):
+        config = _make_config()
+        local = JobScheduler(None, config)
+        local.add_job("audit_flush", AsyncMock(), 60)
+        remote = MagicMock()
+        remote.job_names.return_value = ["enrichment"]
+        remote.control = AsyncMock(return_value={"jobs": [{"name": "enrichment"}]})
+        group = SchedulerGroup(local, remote)
+
+        await group.control("pause", "enrichment")
+        remote.control.assert_awaited_with("pause", "enrichment")
+
+        result = await group.control("pause", "audit_flush")
+        assert result["jobs"][0]["paused"] is True
+
+        status = await group.control("status")
+        assert [j["name"] for j in status["jobs"]] == ["audit_flush", "enrichment"]
+
+    async def test_unknown_job_raises_key_error(self):
+        group = SchedulerGroup(JobScheduler(None, _make_config()))
+        with pytest.raises(KeyError):
+            await group.control("run", "nope")
@@ -0,0 +1,124 @@
+"""Tests for per-user vector working sets."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+from bson import ObjectId
+
+from memory_mcp.core.config import MCPConfig
+from memory_mcp.services.working_set import UserVectors, WorkingSetCache
+
+
+def _make_config(**overrides) -> MCPConfig:
+    defaults = {"mongodb_connection_string": "mongodb://localhost:27017"}
+    defaults.update(overrides)
+    return MCPConfig(**defaults, _env_file=None)
+
+
+def _doc(embedding, **fields):
+    return {"_id": ObjectId(), "embedding": embedding, **fields}
+
+
+class TestUserVectors:
+
+    def test_matrix_is_normalized_float32(self):
+        vectors = UserVectors([_doc([3.0, 4.0]), _doc([0.0, 2.0])])
+        assert vectors.matrix.dtype == np.float32
+        assert vectors.matrix.flags["C_CONTIGUOUS"]
+        np.testing.assert_allclose(np.linalg.norm(vectors.matrix, axis=1), [1.0, 1.0], rtol=1e-6)
+
+    def test_top_scores_like_cosine_index(self):
+        a, b, c = _doc([1.0, 0.0]), _doc([0.0, 1.0]), _doc([-1.0, 0.0])
+        ranked = UserVectors([a, b, c]).top([2.0, 0.0], {"user_id": "u1"}, 2)
+        assert [memory_id for memory_id, _ in ranked] == [a["_id"], b["_id"]]
+        assert [round(score, 6) for _, score in ranked] == [1.0, 0.5]
+
+    def test_filters_applied_locally(self):
+        stm = _doc([1.0, 0.0], tier="stm", tags=["x"])
+        ltm = _doc([0.9, 0.1], tier="ltm", memory_type="fact", tags=["x", "y"])
+        other = _doc([0.8, 0.2], tier="ltm", memory_type="preference", tags=["y"])
+        vectors = UserVectors([stm, ltm, other])
+
+        def ids(vs_filter):
+            return [m for m, _ in vectors.top([1.0, 0.0], {"user_id": "u1", **vs_filter}, 10)]
+
+        assert ids({"tier": {"$in": ["ltm"]}}) == [ltm["_id"], other["_id"]]
+        assert ids({"memory_type": "fact"}) == [ltm["_id"]]
+        assert ids({"$and": [{"tags": "x"}, {"tags": "y"}]}) == [ltm["_id"]]
+
+    def test_conversation_and_time_window(self):
+        jan = _doc([1.0, 0.0], conversation_id="c1", created_at=datetime(2026, 1, 10))
+        feb = _doc([0.9, 0.1], conversation_id="c2",
+                   created_at=datetime(2026, 2, 10, tzinfo=timezone.utc))
+        undated = _doc([0.8, 0.2], conversation_id="c1")
+        vectors = UserVectors([jan, feb, undated])
+
+        def ids(vs_filter):
+            return [m for m, _ in vectors.top([1.0, 0.0], {"user_id": "u1", **vs_filter}, 10)]
+
+        assert ids({"conversation_id": "c1"}) == [jan["_id"], undated["_id"]]
+        window = {"$gte": datetime(2026, 2, 1, tzinfo=timezone.utc)}
+        assert ids({"created_at": window}) == [feb["_id"]]
+        window = {"$lte": datetime(2026, 1, 31, tzinfo=timezone.utc)}
+        assert ids({"created_at": window}) == [jan["_id"]]
+        vectors.remove({jan["_id"]})
+        assert ids({"conversation_id": "c1"}) == [undated["_id"]]
+
+    def test_extend_and_remove(self):
+        first = _doc([1.0, 0.0])
+        vectors = UserVectors([first])
+        second = _doc([0.0, 1.0])
+        vectors.extend([second, _doc([1.0, 1.0, 1.0])])  # wrong dimension skipped
+        assert vectors.ids == [first["_id"], second["_id"]]
+        vectors.remove({first["_id"]})
+        assert vectors.ids == [second["_id"]]
+        assert vectors.matrix.shape == (1, 2)
+
+
+class TestWorkingSetCache:
+
+    def test_hit_after_put(self):
+        cache = WorkingSetCache(_make_config(working_set_max_mb=1))
+        assert cache.get("u1") is None
+        cache.put("u1", [_doc([1.0, 0.0])], cache.version("u1"))
+        assert len(cache.get("u1")) == 1
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    def test_write_during_load_not_cached(self):
+        cache = WorkingSetCache(_make_config(working_set_max_mb=1))
+        version = cache.version("u1")
+        cache.add("u1", [_doc([0.0, 1.0])])
+        vectors = cache.put("u1", [_doc([1.0, 0.0])], version)
+        assert len(vectors) == 1
+        assert cache.get("u1") is None
+
+    def test_add_and_discard_apply_to_entry(self):
+        cache = WorkingSetCache(_make_config(working_set_max_mb=1))
+        first = _doc([1.0, 0.0])
+        cache.put("u1", [first], cache.version("u1"))
+        cache.add("u1", [_doc([0.0, 1.0])])
+        assert len(cache.get("u1")) == 2
+        cache.discard("u1", [first["_id"]])
+        assert len(cache.get("u1")) == 1
+        assert cache.stats()["bytes"] == cache.get("u1").nbytes
+
+    def test_budget_evicts_least_recently_used_user(self):
+        cache = WorkingSetCache(_make_config(working_set_max_mb=1))
+        rows = [_doc([1.0] * 256) for _ in range(400)]  # ~0.49 MB each
+        cache.put("u1", rows, 0)
+        cache.put("u2", rows, 0)
+        cache.get("u1")
+        cache.put("u3", rows, 0)
+
+        assert cache.get("u2") is None
+        assert cache.get("u1") is not None
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+    def test_ttl_expiry(self):
+        cache = WorkingSetCache(_make_config(working_set_max_mb=1, working_set_ttl_seconds=60))
+        with patch("memory_mcp.services.working_set.time.monotonic", return_value=100.0):
+            cache.put("u1", [_doc([1.0, 0.0])], 0)
+        with patch("memory_mcp.services.working_set.time.monotonic", return_value=161.0):
+            assert cache.get("u1") is None
+        assert cache.stats()["users"] == 0
@@ -1,4 +1,4 @@
-"""MCP Admin Tools — memory_health, wipe_user_data, cache_invalidate."""
+"""MCP Admin Tools — memory_health, wipe_user_data, cache_invalidate, manage_job."""
 
 import time
 
@@ -60,12 +60,25 @@ def register_admin_tools(mcp):
             await svc.audit_service.log(
                 user_id, "admin", "memory_health", "success", duration_ms,
             )
-            return {
+            health = {
                 "user_id": user_id,
                 "total_memories": total,
                 "tier_stats": tier_stats,
                 "enrichment_stats": enrichment_stats,
             }
+            if svc.recall_cache is not None:
+                health["recall_cache"] = svc.recall_cache.stats()
+            if svc.planner is not None:
+                health["query_planner"] = svc.planner.stats()
+            if svc.working_set is not None:
+                health["working_set"] = svc.working_set.stats()
+            if svc.fresh_overlay is not None:
+                health["fresh_overlay"] = svc.fresh_overlay.stats()
+            if svc.vector_engine is not None:
+                health["vector_engine"] = svc.vector_engine.stats()
+            if svc.prefetcher is not None:
+                health["prefetch"] = svc.prefetcher.stats()
+            return health
         except Exception as e:
             duration_ms = int((time.time() - start) * 1000)
             await svc.audit_service.log(
@@ -102,6 +115,23 @@ def register_admin_tools(mcp):
             memories_result = await db["memories"].delete_many({"user_id": user_id})
             cache_result = await db["semantic_cache"].delete_many({"user_id": user_id})
             audit_result = await db["audit_log"].delete_many({"user_id": user_id})
+            if svc.prefetcher is not None:
+                svc.prefetcher.cancel(user_id)
+            if svc.recall_cache is not None:
+                svc.recall_cache.evict(user_id)
+            if svc.query_embeddings is not None:
+                # Keyed by query text alone, so the user's entries can't be
+                # told apart from anyone else's.
+                svc.query_embeddings.clear()
+            if svc.planner is not None:
+                svc.planner.forget(user_id)
+            if svc.working_set is not None:
+                svc.working_set.evict(user_id)
+            if svc.fresh_overlay is not None:
+                svc.fresh_overlay.evict(user_id)
+            if svc.vector_engine is not None:
+                svc.vector_engine.drop_user("memories", user_id)
+                svc.vector_engine.drop_user("semantic_cache", user_id)
 
             duration_ms = int((time.time() - start) * 1000)
             await svc.audit_service.log(
@@ -160,3 +190,58 @@ def register_admin_tools(mcp):
                 error=str(e),
             )
             raise
+
+    @mcp.tool(
+        name="manage_job",
+        description=(
+            "Inspect or control background jobs (enrichment, consolidation, audit_flush, access_flush, candidate_tuning, vector_sync). "
+            "action: status (default), run (trigger now), pause, or resume."
+        ),
+    )
+    async def manage_job(
+        user_id: str,
+        action: str = "status",
+        job_name: str | None = None,
+    ) -> dict:
+        svc = ServiceRegistry.get()
+        access_err = await svc.check_access(user_id, "manage_job")
+        if access_err:
+            return {"error": access_err}
+        start = time.time()
+
+        if svc.scheduler is None:
+            return {"error": "Job scheduler is not running"}
+        if action not in _JOB_ACTIONS:
+            return {"error": f"Unknown action '{action}'. Use one of: {', '.join(_JOB_ACTIONS)}"}
+        if action != "status" and not job_name:
+            return {"error": f"job_name is required for action '{action}'"}
+
+        try:
+            # The scheduler may be a SchedulerGroup whose jobs live on an
+            # isolated worker thread/process — control() hides that.
+            result: dict = {"action": action}
+            result.update(await svc.scheduler.control(action, job_name))
+
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "admin", "manage_job", "success", duration_ms,
+                action=action, job_name=job_name,
+            )
+            return result
+        except KeyError as e:
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "admin", "manage_job", "error", duration_ms,
+                error=str(e),
+            )
+            return {"error": e.args[0]}
+        except Exception as e:
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "admin", "manage_job", "error", duration_ms,
+                error=str(e),
+            )
+            raise
+
+
+_JOB_ACTIONS = ("status", "run", "pause", "resume")
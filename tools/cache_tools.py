@@ -21,7 +21,7 @@ def register_cache_tools(mcp):
         similarity_threshold: float | None = None,
     ) -> dict:
         svc = ServiceRegistry.get()
-        access_err = await svc.check_access(user_id, "check_cache")
+        access_err = await svc.check_access_and_embed(user_id, "check_cache", query)
         if access_err:
             return {"error": access_err}
         start = time.time()
@@ -1,4 +1,4 @@
-"""MCP Memory Tools — store, recall, delete."""
+"""MCP Memory Tools — store, recall, recall_memory_batch, conversation context, related, delete."""
 
 import time
 
@@ -49,7 +49,11 @@ def register_memory_tools(mcp):
         name="recall_memory",
         description=(
             "Semantically search stored memories. Returns results ranked by "
-            "recency, importance, and relevance."
+            "recency, importance, and relevance. conversation_id and time_range "
+            "({start, end} ISO 8601) narrow the search. Pass next_cursor back as "
+            "cursor to fetch the next page. degraded is true when the results "
+            "come from full-text search because embedding timed out. "
+            "diversity (0-1) trades relevance for fewer near-duplicate results."
         ),
     )
     async def recall_memory(
@@ -59,23 +63,44 @@ def register_memory_tools(mcp):
         tags: list[str] | None = None,
         limit: int = 10,
         tier: list[str] | None = None,
+        cursor: str | None = None,
+        diversity: float = 0.0,
+        conversation_id: str | None = None,
+        time_range: dict | None = None,
     ) -> dict:
         svc = ServiceRegistry.get()
-        access_err = await svc.check_access(user_id, "recall_memory")
+        # A cached first page needs no embedding; continuations reuse theirs.
+        speculate = cursor is None and not svc.memory_service.recall_cached(
+            user_id, query, tier=tier, memory_type=memory_type, tags=tags,
+            limit=limit, diversity=diversity,
+            conversation_id=conversation_id, time_range=time_range,
+        )
+        access_err = await svc.check_access_and_embed(
+            user_id, "recall_memory", query if speculate else None,
+        )
         if access_err:
             return {"error": access_err}
         start = time.time()
         try:
-            results = await svc.memory_service.recall(
+            page = await svc.memory_service.recall_page(
                 user_id, query, tier=tier, memory_type=memory_type,
-                tags=tags, limit=limit,
+                tags=tags, limit=limit, cursor=cursor, diversity=diversity,
+                conversation_id=conversation_id, time_range=time_range,
             )
+            results = page["results"]
             duration_ms = int((time.time() - start) * 1000)
             await svc.audit_service.log(
                 user_id, "memory:read", "recall_memory", "success", duration_ms,
-                query=query, result_count=len(results),
+                query=query, result_count=len(results), plan=page["plan"],
+                degraded=page["degraded"],
             )
-            return {"results": results, "count": len(results)}
+            return {
+                "results": results,
+                "count": len(results),
+                "next_cursor": page["next_cursor"],
+                "plan": page["plan"],
+                "degraded": page["degraded"],
+            }
         except Exception as e:
             duration_ms = int((time.time() - start) * 1000)
             await svc.audit_service.log(
@@ -84,6 +109,128 @@ def register_memory_tools(mcp):
             )
             raise
 
+    @mcp.tool(
+        name="recall_memory_batch",
+        description=(
+            "Run several recall_memory queries in one request. Returns the "
+            "ranked memory ids per query plus each matched memory once."
+        ),
+    )
+    async def recall_memory_batch(
+        user_id: str,
+        queries: list[str],
+        memory_type: str | None = None,
+        tags: list[str] | None = None,
+        limit: int = 10,
+        tier: list[str] | None = None,
+    ) -> dict:
+        svc = ServiceRegistry.get()
+        # Governed as recall_memory, with each query charged to the rate limit.
+        access_err = await svc.check_access(
+            user_id, "recall_memory", cost=max(len(queries), 1),
+        )
+        if access_err:
+            return {"error": access_err}
+        start = time.time()
+        try:
+            result = await svc.memory_service.recall_many(
+                user_id, queries, tier=tier, memory_type=memory_type,
+                tags=tags, limit=limit,
+            )
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "memory:read", "recall_memory_batch", "success", duration_ms,
+                queries=queries, result_count=len(result["memories"]),
+            )
+            result["count"] = len(result["memories"])
+            return result
+        except Exception as e:
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "memory:read", "recall_memory_batch", "error", duration_ms,
+                error=str(e),
+            )
+            raise
+
+    @mcp.tool(
+        name="get_conversation_context",
+        description=(
+            "Return the latest turns of a conversation in chronological order, "
+            "without semantic search. Pass next_cursor back as cursor for the "
+            "turns before them. With full_turns, older turns are returned as "
+            "their summary when one exists."
+        ),
+    )
+    async def get_conversation_context(
+        user_id: str,
+        conversation_id: str,
+        limit: int = 20,
+        cursor: str | None = None,
+        full_turns: int | None = None,
+    ) -> dict:
+        svc = ServiceRegistry.get()
+        # Governed as recall_memory: a read of the user's memories.
+        access_err = await svc.check_access(user_id, "recall_memory")
+        if access_err:
+            return {"error": access_err}
+        start = time.time()
+        try:
+            page = await svc.memory_service.conversation_context(
+                user_id, conversation_id, limit=limit, cursor=cursor,
+                full_turns=full_turns,
+            )
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "memory:read", "get_conversation_context", "success", duration_ms,
+                conversation_id=conversation_id, result_count=len(page["turns"]),
+            )
+            return {**page, "count": len(page["turns"])}
+        except Exception as e:
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "memory:read", "get_conversation_context", "error", duration_ms,
+                error=str(e),
+            )
+            raise
+
+    @mcp.tool(
+        name="related_memories",
+        description=(
+            "Return memories linked to memory_id as nearest neighbors when it was "
+            "enriched, without semantic search. depth (1-3) follows links of links; "
+            "results are ranked by related_score."
+        ),
+    )
+    async def related_memories(
+        user_id: str,
+        memory_id: str,
+        depth: int = 1,
+        limit: int = 10,
+    ) -> dict:
+        svc = ServiceRegistry.get()
+        # Governed as recall_memory: a read of the user's memories.
+        access_err = await svc.check_access(user_id, "recall_memory")
+        if access_err:
+            return {"error": access_err}
+        start = time.time()
+        try:
+            results = await svc.memory_service.related(
+                user_id, memory_id, depth=depth, limit=limit,
+            )
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "memory:read", "related_memories", "success", duration_ms,
+                memory_id=memory_id, result_count=len(results),
+            )
+            return {"results": results, "count": len(results)}
+        except Exception as e:
+            duration_ms = int((time.time() - start) * 1000)
+            await svc.audit_service.log(
+                user_id, "memory:read", "related_memories", "error", duration_ms,
+                error=str(e),
+            )
+            raise
+
     @mcp.tool(
         name="delete_memory",
         description=(
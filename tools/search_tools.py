@@ -1,9 +1,30 @@
 """MCP Search Tools — hybrid search and web search."""
 
 import asyncio
+import math
+import re
 import time
 
+import numpy as np
+
+from memory_mcp.core.collections import MEMORIES, vector_filter
+from memory_mcp.core.cursors import check_page, decode_cursor, encode_cursor
 from memory_mcp.core.registry import ServiceRegistry
+from memory_mcp.services.candidate_tuner import candidate_count
+from memory_mcp.services.diversity import embedding_matrix, mmr, pool_size, validate_diversity
+from memory_mcp.services.local_text import tokenize
+from memory_mcp.services.memory import _sanitize_doc
+from memory_mcp.services.query_embeddings import embed_within
+
+# A single token with a digit or underscore: ticket keys, ids, hashes, versions.
+_IDENTIFIER = re.compile(r"(?=.*[0-9_])[\w.:/#-]+")
+
+# English function words that carry no lexical signal on their own.
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i in is it its me my of on or "
+    "our that the their them they this to was we were what when where which who why "
+    "will with you your".split()
+)
 
 
 def register_search_tools(mcp):
@@ -13,7 +34,10 @@ def register_search_tools(mcp):
         name="hybrid_search",
         description=(
             "Combined vector + full-text search over memories using "
-            "MongoDB $rankFusion for Reciprocal Rank Fusion (RRF)."
+            "MongoDB $rankFusion for Reciprocal Rank Fusion (RRF). "
+            "Pass next_cursor back as cursor to fetch the next page. "
+            "diversity (0-1) trades relevance for fewer near-duplicate results. "
+            "degraded is true when embedding timed out and only full-text results were served."
         ),
     )
     async def hybrid_search(
@@ -23,25 +47,97 @@ def register_search_tools(mcp):
         limit: int = 10,
         memory_type: str | None = None,
         tags: list[str] | None = None,
+        cursor: str | None = None,
+        diversity: float = 0.0,
     ) -> dict:
         svc = ServiceRegistry.get()
-        access_err = await svc.check_access(user_id, "hybrid_search")
+        # Lookups, cached first pages and continuations embed nothing up front.
+        speculate = (
+            cursor is None and not _is_lookup(query)
+            and not (svc.recall_cache is not None and svc.recall_cache.peek(_hybrid_cache_key(
+                svc.recall_cache, user_id, query, tier or ["stm", "ltm"], memory_type, tags,
+                min(limit, svc.config.max_results_per_query), diversity,
+            )))
+        )
+        access_err = await svc.check_access_and_embed(
+            user_id, "hybrid_search", query if speculate else None,
+        )
         if access_err:
             return {"error": access_err}
         config = svc.config
         start = time.time()
 
         try:
-            limit = min(limit, config.max_results_per_query)
-            tiers = tier or ["stm", "ltm"]
-            query_embedding = await svc.providers.embedding.generate_embedding(query)
+            if cursor is not None:
+                # Continuation: query, filters and page size come from the cursor.
+                state = check_page(
+                    decode_cursor(cursor, "hybrid", user_id),
+                    config.max_results_per_query, config.pagination_max_depth,
+                )
+                query, tiers, limit = state["query"], state["tier"], state["limit"]
+                memory_type, tags = state["memory_type"], state["tags"]
+                diversity = state.get("diversity", 0)
+            else:
+                validate_diversity(diversity)
+                limit = min(limit, config.max_results_per_query)
+                tiers = tier or ["stm", "ltm"]
+                state = {
+                    "kind": "hybrid", "user_id": user_id, "query": query, "tier": tiers,
+                    "memory_type": memory_type, "tags": tags, "limit": limit, "served": 0,
+                    "diversity": diversity,
+                }
+            offset = state["served"]
+
+            cache = svc.recall_cache if offset == 0 else None
+            cache_key = generation = None
+            if cache is not None:
+                cache_key = _hybrid_cache_key(
+                    cache, user_id, query, tiers, memory_type, tags, limit, diversity,
+                )
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    results = [dict(r) for r in cached]
+                    duration_ms = int((time.time() - start) * 1000)
+                    await svc.audit_service.log(
+                        user_id, "search", "hybrid_search", "success", duration_ms,
+                        query=query, result_count=len(results), cache_hit=True,
+                    )
+                    return {
+                        "results": results, "count": len(results),
+                        "next_cursor": _next_cursor(config, state, results),
+                        "degraded": False,
+                    }
+                generation = cache.generation(user_id)
+
+            # Skip the legs that cannot help: identifier lookups need no
+            # embedding, queries of stopwords and punctuation no text search.
+            lookup = _is_lookup(query)
+            use_text = bool(_lexical_terms(query))
+            query_embedding = None
+            degraded = False
+            if not lookup:
+                embed = (svc.query_embeddings.embed if svc.query_embeddings is not None
+                         else svc.providers.embedding.generate_embedding)
+                query_embedding = await embed_within(
+                    embed, query, config.embedding_deadline_seconds,
+                )
+                # Past the deadline the text leg answers alone.
+                degraded = query_embedding is None
+                use_text = use_text or degraded
+            # MMR picks from a larger fused pool, replayed from the top on
+            # every page since each pick depends on the ones before it.
+            fetch_offset, fetch_limit = offset, limit
+            if diversity:
+                fetch_offset = 0
+                fetch_limit = pool_size(offset + limit, diversity, config.diversity_candidate_factor)
+            # Each leg must reach past the rows already served, with slack
+            # for the other leg's ranking.
+            window = math.ceil((fetch_offset + fetch_limit) * config.hybrid_leg_depth_factor)
 
             # Vector search filter
-            vs_filter = {"user_id": user_id, "deleted_at": None, "tier": {"$in": tiers}}
-            if memory_type:
-                vs_filter["memory_type"] = memory_type
-            if tags:
-                vs_filter["tags"] = {"$all": tags}
+            vs_filter = vector_filter(
+                MEMORIES, user_id, tier=tiers, memory_type=memory_type, tags=tags,
+            )
 
             # Full-text search filter clauses
             fts_filter_clauses = [
@@ -53,70 +149,129 @@ def register_search_tools(mcp):
                     {"in": {"path": "tier", "value": tiers}}
                 )
 
-            # Build $rankFusion pipeline
-            pipeline = [
-                {
-                    "$rankFusion": {
-                        "input": {
-                            "pipelines": {
-                                "vectorPipeline": [
-                                    {
-                                        "$vectorSearch": {
-                                            "index": "memories_vector_index",
-                                            "path": "embedding",
-                                            "queryVector": query_embedding,
-                                            "numCandidates": 100,
-                                            "limit": 20,
-                                            "filter": vs_filter,
-                                        }
-                                    },
+            vector_pipeline = text_pipeline = None
+            if query_embedding is not None:
+                # Selective memory_type / tags filters leave fewer matches
+                # among the candidates walked.
+                selectivity = config.hybrid_filtered_candidate_factor if memory_type or tags else 1
+                vector_pipeline = [
+                    {
+                        "$vectorSearch": {
+                            "index": "memories_vector_index",
+                            "path": "embedding",
+                            "queryVector": query_embedding,
+                            "numCandidates": candidate_count(
+                                svc.candidate_tuner, "hybrid", math.ceil(window * selectivity),
+                            ),
+                            "limit": window,
+                            "filter": vs_filter,
+                        }
+                    },
+                ]
+            if use_text:
+                text_pipeline = [
+                    {
+                        "$search": {
+                            "index": "memories_fts_index",
+                            "compound": {
+                                "must": [
+                                    {"text": {"query": query, "path": ["content", "summary"]}}
                                 ],
-                                "fullTextPipeline": [
-                                    {
-                                        "$search": {
-                                            "index": "memories_fts_index",
-                                            "compound": {
-                                                "must": [
-                                                    {"text": {"query": query, "path": ["content", "summary"]}}
-                                                ],
-                                                "filter": fts_filter_clauses,
-                                            },
-                                        }
-                                    },
-                                    {"$limit": 20},
-                                ],
-                            }
-                        },
-                        "combination": {
-                            "weights": {
-                                "vectorPipeline": config.rrf_vector_weight,
-                                "fullTextPipeline": config.rrf_text_weight,
+                                "filter": fts_filter_clauses,
                             },
-                        },
-                    }
-                },
-                {"$limit": limit},
-                {
-                    "$project": {
-                        "embedding": 0,
-                    }
-                },
-            ]
+                        }
+                    },
+                    # The FTS index maps no memory_type or tags.
+                    {"$match": vs_filter},
+                    {"$limit": window},
+                ]
 
+            # MMR reuses the pool's embeddings; other pages leave them behind.
+            keep_embeddings = bool(diversity)
+            project = [] if keep_embeddings else [{"$project": {"embedding": 0}}]
             memories_col = (await _get_db())["memories"]
-            cursor = await memories_col.aggregate(pipeline)
-            results = await cursor.to_list(None)
+            if svc.vector_engine is not None:
+                results = await _local_hybrid_page(
+                    config, svc.vector_engine, memories_col,
+                    query if use_text else None, query_embedding,
+                    vs_filter, window, fetch_offset, fetch_limit, keep_embeddings,
+                )
+            elif vector_pipeline is None or text_pipeline is None:
+                # One leg: its own order is the fused order.
+                leg = vector_pipeline or text_pipeline
+                pipeline = [*leg, {"$limit": fetch_limit}, *project]
+                if fetch_offset:
+                    pipeline.insert(len(leg), {"$skip": fetch_offset})
+                cursor = await memories_col.aggregate(pipeline)
+                results = await cursor.to_list(None)
+            elif svc.client_fusion:
+                results = await _client_fusion_page(
+                    config, memories_col, vector_pipeline, text_pipeline,
+                    fetch_offset, fetch_limit, keep_embeddings,
+                )
+            else:
+                pipeline = [
+                    {
+                        "$rankFusion": {
+                            "input": {
+                                "pipelines": {
+                                    "vectorPipeline": vector_pipeline,
+                                    "fullTextPipeline": text_pipeline,
+                                }
+                            },
+                            "combination": {
+                                "weights": {
+                                    "vectorPipeline": config.rrf_vector_weight,
+                                    "fullTextPipeline": config.rrf_text_weight,
+                                },
+                            },
+                        }
+                    },
+                    {"$limit": fetch_limit},
+                    *project,
+                ]
+                if fetch_offset:
+                    pipeline.insert(1, {"$skip": fetch_offset})
+                cursor = await memories_col.aggregate(pipeline)
+                results = await cursor.to_list(None)
+            consumed = len(results)
+            if svc.fresh_overlay is not None and fetch_offset == 0 and query_embedding is not None:
+                fresh = svc.fresh_overlay.candidates(
+                    query_embedding, vs_filter, fetch_limit,
+                    exclude=[r["_id"] for r in results],
+                    min_score=config.fresh_overlay_min_score,
+                )
+                if fresh:
+                    results = _fuse_fresh(config, results, fresh, fetch_limit)
+                    consumed = sum(1 for r in results if "vs_score" not in r)
+                    for r in results:
+                        r.pop("vs_score", None)
+            if diversity:
+                results = (await _diversify(memories_col, results, offset + limit, diversity))[offset:]
+                consumed = len(results)
 
             # Sanitize BSON types for JSON serialization
             for r in results:
                 _sanitize_doc(r)
+            if cache_key is not None and consumed == len(results) and not degraded:
+                # Pages with fresh memories are not cached: their cursor
+                # offset differs from the row count.
+                cache.put(cache_key, [dict(r) for r in results], generation)
 
             duration_ms = int((time.time() - start) * 1000)
             await svc.audit_service.log(
                 user_id, "search", "hybrid_search", "success", duration_ms,
                 query=query, result_count=len(results),
+                legs=[leg for leg, used in (("vector", query_embedding is not None),
+                                            ("text", use_text)) if used],
+                degraded=degraded,
             )
-            return {"results": results, "count": len(results)}
+            return {
+                "results": results, "count": len(results),
+                # Later pages would be fused with the vector leg.
+                "next_cursor": None if degraded else _next_cursor(config, state, results, consumed),
+                "degraded": degraded,
+            }
         except Exception as e:
             duration_ms = int((time.time() - start) * 1000)
             await svc.audit_service.log(
@@ -164,22 +319,148 @@ def register_search_tools(mcp):
             raise
 
 
+def _hybrid_cache_key(
+    cache, user_id: str, query: str, tiers: list[str], memory_type: str | None,
+    tags: list[str] | None, limit: int, diversity: float,
+) -> tuple:
+    """``RecallCache`` key of a hybrid_search first page."""
+    return cache.key(
+        "hybrid", user_id, query,
+        tier=tiers, memory_type=memory_type, tags=tags, limit=limit, diversity=diversity,
+    )
+
+
+def _is_lookup(query: str) -> bool:
+    """Quoted phrases and identifier-like tokens, answered by text search alone.
+
+    Not when text search has nothing to match (``"the"``): those still
+    need the vector leg.
+    """
+    query = query.strip()
+    if not _lexical_terms(query):
+        return False
+    if len(query) > 2 and query[0] == query[-1] == '"':
+        return True
+    return _IDENTIFIER.fullmatch(query) is not None
+
+
+def _lexical_terms(query: str) -> list[str]:
+    """Query tokens worth a full-text search: not stopwords, not single letters."""
+    return [t for t in tokenize(query) if t not in _STOPWORDS and (len(t) > 1 or t.isdigit())]
+
+
+def _rrf(config, vector_ids: list, text_ids: list) -> list:
+    """Ids ordered by weighted Reciprocal Rank Fusion, as ``$rankFusion`` does."""
+    scores: dict = {}
+    for weight, ids in ((config.rrf_vector_weight, vector_ids), (config.rrf_text_weight, text_ids)):
+        for rank, memory_id in enumerate(ids, start=1):
+            scores[memory_id] = scores.get(memory_id, 0.0) + weight / (config.rrf_k + rank)
+    return sorted(scores, key=lambda memory_id: -scores[memory_id])
+
+
+async def _client_fusion_page(
+    config, memories_col, vector_pipeline: list[dict], text_pipeline: list[dict],
+    offset: int, limit: int, keep_embeddings: bool = False,
+) -> list[dict]:
+    """``$rankFusion`` done in Python, for servers without the stage.
+
+    The two legs run concurrently as separate aggregations, so the page
+    costs the slower leg rather than both.
+    """
+    async def leg(pipeline: list[dict]) -> list[dict]:
+        project = [] if keep_embeddings else [{"$project": {"embedding": 0}}]
+        cursor = await memories_col.aggregate([*pipeline, *project])
+        return await cursor.to_list(None)
+
+    vector_docs, text_docs = await asyncio.gather(leg(vector_pipeline), leg(text_pipeline))
+    by_id = {d["_id"]: d for d in text_docs} | {d["_id"]: d for d in vector_docs}
+    fused = _rrf(config, [d["_id"] for d in vector_docs], [d["_id"] for d in text_docs])
+    return [by_id[memory_id] for memory_id in fused[offset:offset + limit]]
+
+
+async def _local_hybrid_page(
+    config, engine, memories_col, query: str | None, query_embedding: list[float] | None,
+    vs_filter: dict, window: int, offset: int, limit: int, keep_embeddings: bool = False,
+) -> list[dict]:
+    """One fused page from the local engine's vector and BM25 rankings.
+
+    Stands in for ``$rankFusion`` over ``$vectorSearch`` and ``$search``
+    on deployments without Atlas Search.  A leg whose input is ``None``
+    is skipped.
+    """
+    vector_ranked = text_ranked = []
+    if query_embedding is not None:
+        vector_ranked = await engine.search("memories", query_embedding, vs_filter, window)
+    if query is not None:
+        text_ranked = await engine.search_text(query, vs_filter, window)
+    fused = _rrf(
+        config, [memory_id for memory_id, _ in vector_ranked],
+        [memory_id for memory_id, _ in text_ranked],
+    )
+    ids = fused[offset:offset + limit]
+    if not ids:
+        return []
+    cursor = memories_col.find(
+        {**vs_filter, "_id": {"$in": ids}}, None if keep_embeddings else {"embedding": 0},
+    )
+    by_id = {d["_id"]: d for d in await cursor.to_list(None)}
+    missing = [memory_id for memory_id in ids if memory_id not in by_id]
+    if missing:
+        engine.remove("memories", vs_filter["user_id"], missing)
+    return [by_id[memory_id] for memory_id in ids if memory_id in by_id]
+
+
+async def _diversify(memories_col, fused: list[dict], k: int, diversity: float) -> list[dict]:
+    """MMR pick of ``k`` rows from the fused order.
+
+    Fusion yields ranks, not similarities, so relevance falls linearly
+    from 1 at the top of the pool.  Embeddings still on the rows are used
+    as is; the others (fresh memories) are read in one query.  The picks
+    are returned without embeddings.
+    """
+    if not fused:
+        return fused
+    vectors = {r["_id"]: r.pop("embedding") for r in fused if "embedding" in r}
+    missing = [r["_id"] for r in fused if r["_id"] not in vectors]
+    if missing:
+        cursor = memories_col.find({"_id": {"$in": missing}}, {"embedding": 1})
+        vectors.update((d["_id"], d.get("embedding")) for d in await cursor.to_list(None))
+    relevance = 1 - np.arange(len(fused), dtype=np.float32) / len(fused)
+    picks = mmr(relevance, embedding_matrix(fused, vectors), k, diversity)
+    return [fused[i] for i in picks]
+
+
+def _fuse_fresh(config, results: list[dict], fresh: list[dict], limit: int) -> list[dict]:
+    """RRF of the fused page with not-yet-indexed memories ranked by vector score.
+
+    The page keeps its order; fresh memories are weighted like the
+    vector pipeline.
+    """
+    k = config.rrf_k
+    scored = [(1 / (k + rank), r) for rank, r in enumerate(results, start=1)]
+    scored += [
+        (config.rrf_vector_weight / (k + rank), r) for rank, r in enumerate(fresh, start=1)
+    ]
+    scored.sort(key=lambda item: -item[0])
+    return [r for _, r in scored[:limit]]
+
+
+def _next_cursor(
+    config, state: dict, results: list[dict], consumed: int | None = None,
+) -> str | None:
+    """Cursor for the page after ``results``, or ``None`` when exhausted.
+
+    ``consumed`` counts the rows taken from the fused pipeline when
+    fresh memories were merged in; it defaults to ``len(results)``.
+    """
+    served = state["served"] + (len(results) if consumed is None else consumed)
+    if len(results) < state["limit"] or served >= config.pagination_max_depth:
+        return None
+    return encode_cursor({**state, "served": served})
+
+
 async def _get_db():
     """Get the DatabaseManager instance."""
     from memory_mcp.core.database import DatabaseManager
 
     return (await DatabaseManager.get_instance()).db
-
-
-def _sanitize_doc(doc: dict) -> None:
-    """Convert BSON types (ObjectId, datetime) to JSON-safe strings in place."""
-    from bson import ObjectId
-    from datetime import datetime
-
-    for key, val in list(doc.items()):
-        if isinstance(val, ObjectId):
-            doc[key] = str(val)
-        elif isinstance(val, datetime):
-            doc[key] = val.isoformat()
-        elif isinstance(val, dict):
-            _sanitize_doc(val)